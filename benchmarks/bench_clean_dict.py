@@ -0,0 +1,121 @@
+"""
+Benchmark: dataclass_to_clean_dict before and after the single-pass rewrite.
+
+The previous cleaner (asdict, then a recursion that cleaned every list item and
+dict value twice) is compared with the current one on a nested mail rule, on
+To Do tasks with recurrence, and on a deliberately deep payload, where the
+double recursion costs 2^depth.
+
+Run from the repository root:
+    uv run python benchmarks/bench_clean_dict.py [--repeat 2000]
+"""
+import argparse
+import statistics
+import sys
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.param_types import (  # noqa: E402
+    DateTimeTimeZone,
+    EmailAddress,
+    EmailAddressValue,
+    ItemBody,
+    MailRule,
+    PatternedRecurrence,
+    RuleActions,
+    RuleConditions,
+    TaskCreateRequest,
+    dataclass_to_clean_dict,
+)
+
+
+def legacy_clean(obj):
+    if is_dataclass(obj):
+        result = {}
+        for k, v in asdict(obj).items():
+            cleaned = legacy_clean(v)
+            if cleaned is not None:
+                result[k] = cleaned
+        return result or None
+    elif isinstance(obj, list):
+        cleaned_list = [legacy_clean(item) for item in obj if legacy_clean(item) is not None]
+        return cleaned_list or None
+    elif isinstance(obj, dict):
+        return {k: legacy_clean(v) for k, v in obj.items() if legacy_clean(v) is not None}
+    else:
+        return obj
+
+
+def _addresses(n: int) -> list:
+    return [EmailAddress(emailAddress=EmailAddressValue(address=f"person{i}@example.com")) for i in range(n)]
+
+
+def _rule() -> MailRule:
+    return MailRule(
+        displayName="Invoices from suppliers",
+        sequence=2,
+        conditions=RuleConditions(
+            subjectContains=["invoice", "factura", "bill"],
+            senderContains=["billing", "accounts"],
+            fromAddresses=_addresses(10),
+            sentToAddresses=_addresses(5),
+            hasAttachments=True,
+        ),
+        actions=RuleActions(moveToFolder="AAMkAGI2AAEOAAA=", forwardTo=_addresses(5), markAsRead=True),
+    )
+
+
+def _tasks() -> list:
+    return [
+        TaskCreateRequest(
+            title=f"Task {i}",
+            body=ItemBody(content="Remember to do things"),
+            dueDateTime=DateTimeTimeZone(dateTime="2025-07-01T09:00:00", timeZone="UTC"),
+            recurrence=PatternedRecurrence(
+                pattern={"type": "weekly", "interval": 1, "daysOfWeek": ["monday", "thursday"], "firstDayOfWeek": "sunday"},
+                range={"type": "numbered", "startDate": "2025-07-01", "numberOfOccurrences": 10, "recurrenceTimeZone": None},
+            ),
+        )
+        for i in range(20)
+    ]
+
+
+def _deep(depth: int) -> PatternedRecurrence:
+    node: dict = {"leaf": [1, 2, None]}
+    for level in range(depth):
+        node = {f"level{level}": [node, {"skip": None}]}
+    return PatternedRecurrence(pattern=node, range={"type": "noEnd"})
+
+
+def _median_ms(function, payload, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(payload)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    payloads = [
+        ("mail rule", _rule(), args.repeat),
+        ("20 recurring tasks", _tasks(), args.repeat),
+        ("depth 6 recurrence", _deep(6), max(5, args.repeat // 100)),
+    ]
+    print("Median time per call")
+    for name, payload, repeat in payloads:
+        assert legacy_clean(payload) == dataclass_to_clean_dict(payload)
+        legacy_ms = _median_ms(legacy_clean, payload, repeat)
+        current_ms = _median_ms(dataclass_to_clean_dict, payload, repeat)
+        print(f"{name:<20} legacy {legacy_ms:8.3f}ms  single-pass {current_ms:7.3f}ms  ({legacy_ms / current_ms:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
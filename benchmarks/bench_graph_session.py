@@ -0,0 +1,104 @@
+"""
+Benchmark: cold vs warm per-call latency of MicrosoftBaseRequest.microsoft_get.
+
+A local stub server that answers like Graph (HTTP/1.1 with keep-alive) is started
+on 127.0.0.1. The same number of GET calls is then issued:
+    - cold: a brand new connection per call (the old ``requests.get`` behaviour).
+    - warm: through the shared pooled session from ``utils.graph_session``.
+
+Run from the repository root:
+    uv run python benchmarks/bench_graph_session.py [--calls 500]
+"""
+import argparse
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.graph_retry import RetryPolicy, configure_retry_policy  # noqa: E402
+from utils.graph_session import close_graph_session  # noqa: E402
+from utils.microsoft_base_request import MicrosoftBaseRequest  # noqa: E402
+
+PAYLOAD = json.dumps({"value": [{"id": f"msg{i}", "subject": "Hi"} for i in range(10)]}).encode()
+
+
+class StubGraphHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; avoid Nagle delaying the body on reused connections
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _measure(call, calls: int) -> list[float]:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<6} mean={statistics.mean(timings):.3f}ms "
+        f"median={statistics.median(timings):.3f}ms p95={p95:.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1.0/me/messages"
+    headers = {"Authorization": "Bearer fake", "Accept": "application/json"}
+
+    def cold_call():
+        with requests.Session() as session:
+            session.get(url, headers=headers).json()
+
+    def warm_call():
+        MicrosoftBaseRequest.microsoft_get(url, "fake")
+
+    # The per-mailbox rate limiter would dominate the warm timings; only the session is measured
+    configure_retry_policy(RetryPolicy(rate_limit=0))
+    try:
+        warm_call()  # open the pooled connection once
+        cold = _measure(cold_call, args.calls)
+        warm = _measure(warm_call, args.calls)
+    finally:
+        close_graph_session()
+        server.shutdown()
+
+    print(f"{args.calls} GET calls against {url}")
+    _report("cold", cold)
+    _report("warm", warm)
+    print(f"speedup (median): {statistics.median(cold) / statistics.median(warm):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
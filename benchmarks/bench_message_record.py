@@ -0,0 +1,86 @@
+"""
+Benchmark: memory and allocations of a 100k-message listing, dicts vs MessageRecord.
+
+A listing of synthetic Graph messages (as returned with the $select of
+microsoft_simplify_message) is simplified into dicts with
+microsoft_simplify_message and into MessageRecord objects. For each form the
+benchmark reports, measured with tracemalloc, the memory blocks still allocated
+once the listing is built, their size and the peak while building it, plus the
+build time and the time to encode the listing in compact mode.
+
+Run from the repository root:
+    uv run python benchmarks/bench_message_record.py [--messages 100000]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.helper_functions.helpers_email import microsoft_simplify_message  # noqa: E402
+from utils.output_encoder import encode_output  # noqa: E402
+from utils.results import MessageRecord  # noqa: E402
+
+
+def _person(i: int) -> dict:
+    return {"emailAddress": {"name": f"Person {i}", "address": f"person{i}@example.com"}}
+
+
+def _message(i: int) -> dict:
+    return {
+        "id": f"AAMkAGI2TG93AAA{i:06d}=",
+        "subject": f"Quarterly report {i}",
+        "from": _person(i),
+        "toRecipients": [_person(i + 1), _person(i + 2)],
+        "ccRecipients": [_person(i + 3)],
+        "flag": {"flagStatus": "notFlagged"},
+        "receivedDateTime": "2024-05-01T10:00:00Z",
+        "categories": ["Work"],
+        "sentDateTime": "2024-05-01T09:59:58Z",
+        "isRead": bool(i % 2),
+        "hasAttachments": False,
+        "importance": "normal",
+        "conversationId": f"AAQkAGI2TG93{i % 10}",
+        "internetMessageId": f"<msg{i}@example.com>",
+        "bodyPreview": "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+    }
+
+
+def _measure(name: str, build, messages: list) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    listing = [build(message) for message in messages]
+    build_s = time.perf_counter() - start
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    statistics = snapshot.statistics("filename")
+    blocks = sum(stat.count for stat in statistics)
+    size = sum(stat.size for stat in statistics)
+
+    start = time.perf_counter()
+    encode_output({"messages": listing}, "compact")
+    encode_s = time.perf_counter() - start
+    print(
+        f"{name:<14} live blocks {blocks:>10,}  retained {size / 2**20:7.1f} MiB  "
+        f"peak {peak / 2**20:7.1f} MiB  build {build_s * 1000:7.1f}ms  encode {encode_s * 1000:7.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+
+    messages = [_message(i) for i in range(args.messages)]
+    print(f"Listing of {args.messages:,} messages (allocations traced by tracemalloc)")
+    _measure("dicts", microsoft_simplify_message, messages)
+    _measure("MessageRecord", MessageRecord.from_graph, messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: size and encode time of a 1k-message listing in every output mode.
+
+A listing of simplified messages, as returned by search_emails_outlook, is
+encoded with encode_output in the pretty, compact and fast modes. The benchmark
+reports the size of each output and the median time encode_output takes.
+
+Run from the repository root:
+    uv run python benchmarks/bench_output_encoder.py [--messages 1000] [--repeat 50]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.helper_functions.helpers_email import microsoft_simplify_message  # noqa: E402
+from utils import output_encoder  # noqa: E402
+from utils.output_encoder import OUTPUT_MODES, encode_output  # noqa: E402
+
+
+def _person(i: int) -> dict:
+    return {"emailAddress": {"name": f"Persona {i} Núñez", "address": f"person{i}@example.com"}}
+
+
+def _message(i: int) -> dict:
+    return {
+        "id": f"AAMkAGI2TG93AAA{i:06d}=",
+        "subject": f"Informe trimestral {i}",
+        "from": _person(i),
+        "toRecipients": [_person(i + 1), _person(i + 2)],
+        "ccRecipients": [_person(i + 3)],
+        "receivedDateTime": "2024-05-01T10:00:00Z",
+        "isRead": bool(i % 2),
+        "hasAttachments": False,
+        "categories": ["Work"],
+        "conversationId": f"AAQkAGI2TG93{i % 10}",
+        "bodyPreview": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+    }
+
+
+def _encode_ms(data: dict, mode: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode_output(data, mode)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    listing = {"messages": [microsoft_simplify_message(_message(i)) for i in range(args.messages)]}
+    encoder = "orjson" if output_encoder.orjson is not None else "stdlib (orjson not installed)"
+    print(f"Listing of {args.messages} messages, median of {args.repeat} encodes, fast mode: {encoder}")
+
+    pretty_bytes = len(encode_output(listing, "pretty").encode())
+    pretty_ms = _encode_ms(listing, "pretty", args.repeat)
+    for mode in OUTPUT_MODES:
+        size = len(encode_output(listing, mode).encode())
+        encode_ms = _encode_ms(listing, mode, args.repeat)
+        print(
+            f"{mode:<8} bytes {size:>10,} ({size / pretty_bytes:6.1%} of pretty)  "
+            f"encode {encode_ms:7.2f}ms ({pretty_ms / encode_ms:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
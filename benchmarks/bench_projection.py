@@ -0,0 +1,210 @@
+"""
+Benchmark: payload size and JSON parse time with and without $select, per endpoint.
+
+For every list endpoint a page of synthetic resources shaped like Graph's full
+responses (including HTML bodies, unique bodies, extended properties...) is
+built, then projected to the fields declared by the endpoint's simplifier, which
+is what Graph returns when the request carries that $select. The benchmark
+reports the size of both JSON pages and the time json.loads takes to parse them.
+
+Run from the repository root:
+    uv run python benchmarks/bench_projection.py [--items 50] [--repeat 200]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.helper_functions.helpers_calendar import simplify_calendar, simplify_event  # noqa: E402
+from utils.helper_functions.helpers_contacts import simplify_contact  # noqa: E402
+from utils.helper_functions.helpers_email import microsoft_simplify_message  # noqa: E402
+from utils.helper_functions.helpers_to_do import simplify_task  # noqa: E402
+
+HTML_BODY = "<html><head><style>p{margin:0}</style></head><body>" + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>" * 120 + "</body></html>"
+
+
+def _person(i: int) -> dict:
+    return {"emailAddress": {"name": f"Person {i}", "address": f"person{i}@example.com"}}
+
+
+def _message(i: int) -> dict:
+    return {
+        "@odata.etag": f'W/"CQAAABYAAAA{i}"',
+        "id": f"AAMkAGI2TG93AAA{i:06d}=",
+        "createdDateTime": "2024-05-01T10:00:00Z",
+        "lastModifiedDateTime": "2024-05-01T10:00:00Z",
+        "changeKey": f"CQAAABYAAAA{i}",
+        "categories": ["Work"],
+        "receivedDateTime": "2024-05-01T10:00:00Z",
+        "sentDateTime": "2024-05-01T09:59:58Z",
+        "hasAttachments": False,
+        "internetMessageId": f"<msg{i}@example.com>",
+        "subject": f"Quarterly report {i}",
+        "bodyPreview": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+        "importance": "normal",
+        "parentFolderId": "AQMkADAwATM0MDAAMS1iNTcwLWI2NTEtMDACLTAwCgAuAAAD",
+        "conversationId": f"AAQkAGI2TG93{i % 10}",
+        "conversationIndex": "AQHYzqZ0jJ0t2d0t2d0t2d0t2d0t2Q==",
+        "isDeliveryReceiptRequested": False,
+        "isReadReceiptRequested": False,
+        "isRead": bool(i % 2),
+        "isDraft": False,
+        "webLink": f"https://outlook.office365.com/owa/?ItemID=AAMkAGI2TG93AAA{i:06d}%3D&exvsurl=1&viewmodel=ReadMessageItem",
+        "inferenceClassification": "focused",
+        "body": {"contentType": "html", "content": HTML_BODY},
+        "uniqueBody": {"contentType": "html", "content": HTML_BODY},
+        "sender": _person(i),
+        "from": _person(i),
+        "toRecipients": [_person(i + 1), _person(i + 2)],
+        "ccRecipients": [_person(i + 3)],
+        "bccRecipients": [],
+        "replyTo": [],
+        "flag": {"flagStatus": "notFlagged"},
+        "internetMessageHeaders": [{"name": f"X-Header-{n}", "value": "value" * 8} for n in range(12)],
+    }
+
+
+def _event(i: int) -> dict:
+    return {
+        "@odata.etag": f'W/"DwAAABYAAAA{i}"',
+        "id": f"AAMkAGI2TGuLAAA{i:06d}=",
+        "createdDateTime": "2024-05-01T10:00:00Z",
+        "lastModifiedDateTime": "2024-05-01T10:00:00Z",
+        "categories": [],
+        "subject": f"Planning {i}",
+        "bodyPreview": "Agenda: " + "item " * 40,
+        "body": {"contentType": "html", "content": HTML_BODY},
+        "importance": "normal",
+        "sensitivity": "normal",
+        "isAllDay": False,
+        "isCancelled": False,
+        "isOrganizer": True,
+        "responseRequested": True,
+        "showAs": "busy",
+        "type": "singleInstance",
+        "webLink": f"https://outlook.office365.com/owa/?itemid=AAMkAGI2TGuLAAA{i:06d}%3D&exvsurl=1&path=/calendar/item",
+        "onlineMeetingUrl": None,
+        "responseStatus": {"response": "organizer", "time": "0001-01-01T00:00:00Z"},
+        "start": {"dateTime": "2024-05-02T09:00:00.0000000", "timeZone": "UTC"},
+        "end": {"dateTime": "2024-05-02T10:00:00.0000000", "timeZone": "UTC"},
+        "location": {"displayName": "Room 1", "locationType": "default", "uniqueIdType": "unknown", "address": {}, "coordinates": {}},
+        "locations": [],
+        "attendees": [
+            {"type": "required", "status": {"response": "none", "time": "0001-01-01T00:00:00Z"}, **_person(n)}
+            for n in range(5)
+        ],
+        "organizer": _person(i),
+    }
+
+
+def _calendar(i: int) -> dict:
+    return {
+        "id": f"AAMkAGI2TGuLAAA{i:06d}=",
+        "name": f"Calendar {i}",
+        "color": "auto",
+        "hexColor": "",
+        "isDefaultCalendar": i == 0,
+        "changeKey": f"DxYSthXJXEWwAQSYQnXvIgAAIxGttg{i}",
+        "canShare": True,
+        "canViewPrivateItems": True,
+        "canEdit": True,
+        "allowedOnlineMeetingProviders": ["teamsForBusiness"],
+        "defaultOnlineMeetingProvider": "teamsForBusiness",
+        "isTallyingResponses": True,
+        "isRemovable": False,
+        "owner": {"name": "Me", "address": "me@example.com"},
+    }
+
+
+def _contact(i: int) -> dict:
+    return {
+        "id": f"AAMkAGI2THk0AAA{i:06d}=",
+        "createdDateTime": "2024-05-01T10:00:00Z",
+        "lastModifiedDateTime": "2024-05-01T10:00:00Z",
+        "changeKey": f"EQAAABYAAAA{i}",
+        "categories": [],
+        "parentFolderId": "AAMkAGI2AAEOAAA=",
+        "fileAs": "",
+        "displayName": f"Contact {i}",
+        "givenName": "Contact",
+        "surname": str(i),
+        "jobTitle": "Engineer",
+        "companyName": "Contoso",
+        "department": "R&D",
+        "businessPhones": ["+1 412 555 0109"],
+        "homePhones": [],
+        "mobilePhone": "+1 412 555 0110",
+        "personalNotes": "Met at the conference. " * 10,
+        "emailAddresses": [{"name": f"Contact {i}", "address": f"contact{i}@example.com"}],
+        "homeAddress": {},
+        "businessAddress": {"street": "1 Main St", "city": "Redmond", "state": "WA", "countryOrRegion": "USA", "postalCode": "98052"},
+        "otherAddress": {},
+    }
+
+
+def _task(i: int) -> dict:
+    return {
+        "@odata.etag": f'W/"xzyPKP0BiUGgld+lMKXwbQAAAgdhkVQ{i}"',
+        "id": f"AAMkADE4MzQ1ZjYzLTJlZjItNDk1NC1{i:06d}",
+        "importance": "normal",
+        "isReminderOn": False,
+        "status": "notStarted",
+        "title": f"Task {i}",
+        "createdDateTime": "2024-05-01T10:00:00Z",
+        "lastModifiedDateTime": "2024-05-01T10:00:00Z",
+        "hasAttachments": False,
+        "categories": [],
+        "body": {"content": "Remember to " + "do things " * 60, "contentType": "text"},
+        "linkedResources": [],
+        "checklistItems": [{"displayName": f"Step {n}", "isChecked": False, "id": f"step{n}"} for n in range(4)],
+    }
+
+
+ENDPOINTS = [
+    ("messages", _message, microsoft_simplify_message),
+    ("events", _event, simplify_event),
+    ("calendars", _calendar, simplify_calendar),
+    ("contacts", _contact, simplify_contact),
+    ("tasks", _task, simplify_task),
+]
+
+
+def _project(resource: dict, fields: tuple) -> dict:
+    return {field: resource[field] for field in fields if field in resource}
+
+
+def _parse_ms(payload: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(payload)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"One page of {args.items} resources per endpoint, median of {args.repeat} parses")
+    for name, build, simplifier in ENDPOINTS:
+        resources = [build(i) for i in range(args.items)]
+        full = json.dumps({"value": resources})
+        projected = json.dumps({"value": [_project(r, simplifier.select_fields) for r in resources]})
+        full_ms = _parse_ms(full, args.repeat)
+        projected_ms = _parse_ms(projected, args.repeat)
+        print(
+            f"{name:<10} $select={','.join(simplifier.select_fields)}\n"
+            f"{'':<10} bytes {len(full):>9,} -> {len(projected):>8,} ({len(full) / len(projected):5.1f}x)  "
+            f"parse {full_ms:7.3f}ms -> {projected_ms:6.3f}ms ({full_ms / projected_ms:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: cold start time and resident memory of six servers vs the combined server.
+
+Each server is started in a fresh interpreter that imports it, lists its tools
+(what an MCP client does right after connecting) and reports its peak resident
+memory. The six servers are started at the same time, like an MCP client does,
+and are compared with a single outlook_aisecretary_mcp process.
+
+Times are measured from process launch to exit, so interpreter start-up is
+included. Peak memory comes from getrusage, so the benchmark needs a POSIX system.
+
+Run from the repository root:
+    uv run python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+SERVERS = [
+    "outlook_mail_mcp",
+    "outlook_calendar_mcp",
+    "outlook_contacts_mcp",
+    "outlook_to_do_mcp",
+    "outlook_categories_mcp",
+    "outlook_mailbox_settings_mcp",
+]
+COMBINED = "outlook_aisecretary_mcp"
+
+CHILD = """
+import asyncio, importlib, json, resource, sys
+module = importlib.import_module(sys.argv[1])
+tools = asyncio.run(module.mcp.list_tools())
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+rss_mib = rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+print(json.dumps({"tools": len(tools), "rss_mib": rss_mib}))
+"""
+
+
+def _start(modules: list[str]) -> tuple[float, list[dict]]:
+    # A token is never requested while starting, so the servers do not need credentials
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    start = time.perf_counter()
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", CHILD, module],
+            cwd=SRC_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for module in modules
+    ]
+    reports = [json.loads(process.communicate()[0].strip().splitlines()[-1]) for process in processes]
+    return (time.perf_counter() - start) * 1000, reports
+
+
+def _report(name: str, runs: list[tuple[float, list[dict]]]) -> None:
+    times = [elapsed for elapsed, _ in runs]
+    memory = [sum(report["rss_mib"] for report in reports) for _, reports in runs]
+    tools = sum(report["tools"] for report in runs[0][1])
+    print(
+        f"{name:<9} processes={len(runs[0][1])} tools={tools} "
+        f"ready median={statistics.median(times):.0f}ms "
+        f"rss total={statistics.median(memory):.1f}MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    _start([COMBINED])  # warm the bytecode cache so both setups start from .pyc files
+    six = [_start(SERVERS) for _ in range(args.runs)]
+    combined = [_start([COMBINED]) for _ in range(args.runs)]
+
+    print(f"{args.runs} cold starts of each setup")
+    _report("six", six)
+    _report("combined", combined)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 if __name__ == "__main__":
     import subprocess
+    import sys
 
     tool_paths = [
         r".\src\outlook_calendar_mcp.py",
@@ -9,6 +10,9 @@ if __name__ == "__main__":
         r".\src\outlook_contacts_mcp.py",
         r".\src\outlook_to_do_mcp.py"
     ]
+    if "--combined" in sys.argv:
+        # A single process exposing the tools of every server
+        tool_paths = [r".\src\outlook_aisecretary_mcp.py"]
 
     for path in tool_paths:
         print(f"Instaling: {path}")
@@ -0,0 +1,119 @@
+"""
+Single MCP server with the tools, resources and prompts of every AISecretary server.
+
+Running the six servers separately costs six Python interpreters, six copies of
+the mcp/msal/requests import chains and six token managers. This server mounts
+the tools, resources and prompts of the enabled subsystems in one process instead.
+Every enabled server module is imported when the server starts and the subsystems
+share one token manager; their request classes (and the HTTP stack behind them)
+are only imported when one of their tools is first called.
+
+The subsystems are chosen with the AISECRETARY_MODULES environment variable, a
+comma-separated list of mail, calendar, contacts, todo, categories and
+mailbox_settings (all of them by default).
+"""
+import importlib
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+# Subsystem name -> server module. Earlier subsystems win when two define the same tool.
+SUBSYSTEMS = {
+    "mail": "outlook_mail_mcp",
+    "calendar": "outlook_calendar_mcp",
+    "contacts": "outlook_contacts_mcp",
+    "todo": "outlook_to_do_mcp",
+    "categories": "outlook_categories_mcp",
+    "mailbox_settings": "outlook_mailbox_settings_mcp",
+}
+
+
+def get_enabled_subsystems() -> list[str]:
+    """
+    Returns the subsystems whose tools are mounted.
+
+    Returns:
+        list[str]: The names listed in AISECRETARY_MODULES, or every subsystem if unset.
+
+    Raises:
+        ValueError: If AISECRETARY_MODULES names an unknown subsystem.
+    """
+    raw = os.getenv("AISECRETARY_MODULES")
+    if not raw:
+        return list(SUBSYSTEMS)
+    names = [name.strip().lower() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SUBSYSTEMS]
+    if unknown:
+        raise ValueError(
+            f"Unknown AISECRETARY_MODULES entries: {', '.join(unknown)}. "
+            f"Valid values: {', '.join(SUBSYSTEMS)}"
+        )
+    return [name for name in SUBSYSTEMS if name in names]
+
+
+def _registered_entries(server: FastMCP) -> tuple:
+    # mcp's FastMCP has no public mount/import API and no public way to read back the
+    # functions a server registered, so this is the only place that reads its managers
+    return (
+        server._tool_manager.list_tools(),
+        server._resource_manager.list_resources(),
+        server._resource_manager.list_templates(),
+        server._prompt_manager.list_prompts(),
+    )
+
+
+def mount_subsystems(server: FastMCP, subsystems: list[str]) -> list[str]:
+    """
+    Registers the tools, resources and prompts of the given subsystems on a server.
+
+    Args:
+        server (FastMCP): The server to register them on.
+        subsystems (list[str]): The subsystems to mount.
+
+    Returns:
+        list[str]: The names of the registered tools.
+    """
+    registered = []
+    uris, prompts = set(), set()
+    for subsystem in subsystems:
+        module = importlib.import_module(SUBSYSTEMS[subsystem])
+        tools, resources, templates, subsystem_prompts = _registered_entries(module.mcp)
+        for tool in tools:
+            if tool.name in registered:
+                continue
+            server.add_tool(
+                tool.fn,
+                name=tool.name,
+                description=tool.description,
+                annotations=tool.annotations,
+            )
+            registered.append(tool.name)
+        for resource in resources:
+            if str(resource.uri) not in uris:
+                server.add_resource(resource)
+                uris.add(str(resource.uri))
+        for template in templates:
+            if template.uri_template not in uris:
+                server.resource(
+                    template.uri_template,
+                    name=template.name,
+                    description=template.description,
+                    mime_type=template.mime_type,
+                )(template.fn)
+                uris.add(template.uri_template)
+        for prompt in subsystem_prompts:
+            if prompt.name not in prompts:
+                server.add_prompt(prompt)
+                prompts.add(prompt.name)
+    return registered
+
+
+mcp = FastMCP("AISecretary-Outlook", dependencies=["mcp[cli]", "msal", "filelock"])
+mount_subsystems(mcp, get_enabled_subsystems())
+
+
+if __name__ == "__main__":
+    from utils.startup_profile import run_server
+
+    # Start the MCP server (or print its start-up profile with --profile-startup)
+    run_server(mcp, __file__)
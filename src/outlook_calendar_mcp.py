@@ -1,10 +1,7 @@
 from typing import Optional
-from utils.calendar_outlook.microsoft_calendar_requests import MicrosoftCalendarRequests
-from utils.calendar_outlook.microsoft_calendar_groups_requests import (
-    MicrosoftCalendarGroupsRequests,
-)
-from utils.token_manager import TokenManager
-from utils.calendar_outlook.microsoft_events_requests import MicrosoftEventsRequests
+from utils.lazy_requests import LazyRequests
+from utils.output_encoder import serialize_tool_outputs
+from utils.token_broker import get_token_manager
 from utils.param_types import (
     CalendarUpdateParams,
     EventChangesParams,
@@ -19,14 +16,20 @@ from mcp.server.fastmcp import FastMCP
 # Create an MCP server
 mcp = FastMCP("Calendar-AISecretary-Outlook", dependencies=["mcp[cli]", "msal", "filelock"])
 
-token_manager = TokenManager()
-events_requests = MicrosoftEventsRequests(token_manager)
-calendar_groups = MicrosoftCalendarGroupsRequests(token_manager)
-calendars = MicrosoftCalendarRequests(token_manager)
+token_manager = get_token_manager()
+events_requests = LazyRequests(
+    ".calendar_outlook.microsoft_events_requests", "AsyncMicrosoftEventsRequests", token_manager
+)
+calendar_groups = LazyRequests(
+    ".calendar_outlook.microsoft_calendar_groups_requests", "AsyncMicrosoftCalendarGroupsRequests", token_manager
+)
+calendars = LazyRequests(
+    ".calendar_outlook.microsoft_calendar_requests", "AsyncMicrosoftCalendarRequests", token_manager
+)
 
 
 @mcp.tool()
-def get_events_outlook_calendar(
+async def get_events_outlook_calendar(
     event_search_params: EventQuery,
     calendar_id: Optional[str] = None,
 ) -> str:
@@ -38,13 +41,15 @@ def get_events_outlook_calendar(
         calendar_id (Optional[str], optional): The ID of the calendar to retrieve events from. Defaults to None.
 
     Returns:
-        str: JSON string containing the list of events.
+        str: JSON string containing the list of events ('events'). If fewer than number_events events were
+        found because the scan stopped early, 'truncated' is true and 'scannedUntil' is the start of the last
+        event read: query again from that date to continue.
     """
-    return events_requests.get_events(event_search_params, calendar_id)
+    return await events_requests.get_events(event_search_params, calendar_id)
 
 
 @mcp.tool()
-def get_event_full_information(event_id: str) -> str:
+async def get_event_full_information(event_id: str) -> str:
     """
     Gets full information about a specific event in the Outlook calendar.
 
@@ -54,11 +59,11 @@ def get_event_full_information(event_id: str) -> str:
     Returns:
         str: JSON string containing the full information of the event.
     """
-    return events_requests.get_event(event_id)
+    return await events_requests.get_event(event_id)
 
 
 @mcp.tool()
-def create_event_outlook_calendar(
+async def create_event_outlook_calendar(
     event_params: EventParams,
     calendar_id: Optional[str] = None,
 ) -> str:
@@ -72,11 +77,11 @@ def create_event_outlook_calendar(
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.create_event(event_params, calendar_id)
+    return await events_requests.create_event(event_params, calendar_id)
 
 
 @mcp.tool()
-def update_event_outlook_calendar(event_id: str, event_params: EventParams) -> str:
+async def update_event_outlook_calendar(event_id: str, event_params: EventParams) -> str:
     """
     Updates an event in the Outlook calendar. Can also update its attachments.
 
@@ -87,11 +92,11 @@ def update_event_outlook_calendar(event_id: str, event_params: EventParams) -> s
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.update_event(event_id, event_params)
+    return await events_requests.update_event(event_id, event_params)
 
 
 @mcp.tool()
-def delete_attachment_from_event(event_id: str, attachment_id: str) -> str:
+async def delete_attachment_from_event(event_id: str, attachment_id: str) -> str:
     """
     Deletes an attachment from an event in the Outlook calendar.
 
@@ -102,11 +107,11 @@ def delete_attachment_from_event(event_id: str, attachment_id: str) -> str:
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.delete_event_attachment(event_id, attachment_id)
+    return await events_requests.delete_event_attachment(event_id, attachment_id)
 
 
 @mcp.tool()
-def delete_event_outlook_calendar(event_id: str) -> str:
+async def delete_event_outlook_calendar(event_id: str) -> str:
     """
     Deletes an event from the Outlook calendar.
 
@@ -116,11 +121,11 @@ def delete_event_outlook_calendar(event_id: str) -> str:
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.delete_event(event_id)
+    return await events_requests.delete_event(event_id)
 
 
 @mcp.tool()
-def accept_invitation_to_event(
+async def accept_invitation_to_event(
     event_id: str, event_response_params: EventResponseParams
 ) -> str:
     """
@@ -133,11 +138,11 @@ def accept_invitation_to_event(
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.accept_event_invitation(event_id, event_response_params)
+    return await events_requests.accept_event_invitation(event_id, event_response_params)
 
 
 @mcp.tool()
-def decline_invitation_to_event(
+async def decline_invitation_to_event(
     event_id: str, event_changes_params: EventChangesParams
 ) -> str:
     """
@@ -150,11 +155,11 @@ def decline_invitation_to_event(
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.decline_event_invitation(event_id, event_changes_params)
+    return await events_requests.decline_event_invitation(event_id, event_changes_params)
 
 
 @mcp.tool()
-def tentatively_accept_event_invitation(
+async def tentatively_accept_event_invitation(
     event_id: str, event_changes_params: EventChangesParams
 ) -> str:
     """
@@ -167,13 +172,13 @@ def tentatively_accept_event_invitation(
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.tentatively_accept_event_invitation(
+    return await events_requests.tentatively_accept_event_invitation(
         event_id, event_changes_params
     )
 
 
 @mcp.tool()
-def cancel_event(event_id: str, comment: Optional[str]) -> str:
+async def cancel_event(event_id: str, comment: Optional[str]) -> str:
     """
     Cancels an event.
 
@@ -184,11 +189,11 @@ def cancel_event(event_id: str, comment: Optional[str]) -> str:
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return events_requests.cancel_event(event_id, comment)
+    return await events_requests.cancel_event(event_id, comment)
 
 
 @mcp.tool()
-def get_calendar_groups(calendar_group_params: CalendarGroupParams) -> str:
+async def get_calendar_groups(calendar_group_params: CalendarGroupParams) -> str:
     """
     Gets calendar groups from the Outlook calendar.
 
@@ -198,11 +203,11 @@ def get_calendar_groups(calendar_group_params: CalendarGroupParams) -> str:
     Returns:
         str: JSON string containing the list of calendar groups.
     """
-    return calendar_groups.get_calendar_groups(calendar_group_params)
+    return await calendar_groups.get_calendar_groups(calendar_group_params)
 
 
 @mcp.tool()
-def create_calendar_group(calendar_group_name: str) -> str:
+async def create_calendar_group(calendar_group_name: str) -> str:
     """
     Creates a new calendar group in the Outlook calendar.
 
@@ -212,11 +217,11 @@ def create_calendar_group(calendar_group_name: str) -> str:
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return calendar_groups.create_calendar_group(calendar_group_name)
+    return await calendar_groups.create_calendar_group(calendar_group_name)
 
 
 @mcp.tool()
-def update_calendar_group(calendar_group_id: str, calendar_group_name: str) -> str:
+async def update_calendar_group(calendar_group_id: str, calendar_group_name: str) -> str:
     """
     Updates an existing calendar group in the Outlook calendar.
 
@@ -227,11 +232,11 @@ def update_calendar_group(calendar_group_id: str, calendar_group_name: str) -> s
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return calendar_groups.update_calendar_group(calendar_group_id, calendar_group_name)
+    return await calendar_groups.update_calendar_group(calendar_group_id, calendar_group_name)
 
 
 @mcp.tool()
-def delete_calendar_group(calendar_group_id: str) -> str:
+async def delete_calendar_group(calendar_group_id: str) -> str:
     """
     Deletes a calendar group in the Outlook calendar.
 
@@ -241,11 +246,11 @@ def delete_calendar_group(calendar_group_id: str) -> str:
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return calendar_groups.delete_calendar_group(calendar_group_id)
+    return await calendar_groups.delete_calendar_group(calendar_group_id)
 
 
 @mcp.tool()
-def get_calendars(
+async def get_calendars(
     calendar_group_id: Optional[str] = None, name: Optional[str] = None
 ) -> str:
     """
@@ -258,11 +263,11 @@ def get_calendars(
     Returns:
         str: JSON string containing the list of calendars.
     """
-    return calendars.get_calendars(calendar_group_id, name)
+    return await calendars.get_calendars(calendar_group_id, name)
 
 
 @mcp.tool()
-def get_calendar(calendar_id: str) -> str:
+async def get_calendar(calendar_id: str) -> str:
     """
     Retrieves a specific calendar from the Outlook calendar.
 
@@ -272,11 +277,11 @@ def get_calendar(calendar_id: str) -> str:
     Returns:
         str: JSON string containing the details of the calendar.
     """
-    return calendars.get_calendar(calendar_id)
+    return await calendars.get_calendar(calendar_id)
 
 
 @mcp.tool()
-def create_calendar(calendar_name: str, calendar_group_id: Optional[str] = None) -> str:
+async def create_calendar(calendar_name: str, calendar_group_id: Optional[str] = None) -> str:
     """
     Creates a new calendar in the Outlook calendar.
 
@@ -287,11 +292,11 @@ def create_calendar(calendar_name: str, calendar_group_id: Optional[str] = None)
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return calendars.create_calendar(calendar_name, calendar_group_id)
+    return await calendars.create_calendar(calendar_name, calendar_group_id)
 
 
 @mcp.tool()
-def update_calendar(
+async def update_calendar(
     calendar_id: str, calendar_update_params: CalendarUpdateParams
 ) -> str:
     """
@@ -304,11 +309,11 @@ def update_calendar(
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return calendars.update_calendar(calendar_id, calendar_update_params)
+    return await calendars.update_calendar(calendar_id, calendar_update_params)
 
 
 @mcp.tool()
-def delete_calendar(calendar_id: str) -> str:
+async def delete_calendar(calendar_id: str) -> str:
     """
     Deletes a calendar in the Outlook calendar.
 
@@ -318,11 +323,11 @@ def delete_calendar(calendar_id: str) -> str:
     Returns:
         str: JSON string containing the response from the Microsoft Graph API.
     """
-    return calendars.delete_calendar(calendar_id)
+    return await calendars.delete_calendar(calendar_id)
 
 
 @mcp.tool()
-def get_schedule(schedule_params: ScheduleParams) -> str:
+async def get_schedule(schedule_params: ScheduleParams) -> str:
     """
     Gets the availability (free/busy) of one or more users.
 
@@ -332,18 +337,18 @@ def get_schedule(schedule_params: ScheduleParams) -> str:
     Returns:
         str: JSON string containing the availability information.
     """
-    return calendars.get_schedule(schedule_params)
+    return await calendars.get_schedule(schedule_params)
 
 
 @mcp.resource("outlook://calendars")
-def get_calendars_resource() -> str:
+async def get_calendars_resource() -> str:
     """
     Gets the calendars of the Outlook mailbox.
 
     Returns:
         str: A JSON string containing the calendars.
     """
-    return calendars.get_calendars()
+    return await calendars.get_calendars()
 
 
 @mcp.prompt()
@@ -373,6 +378,13 @@ def create_event_at_calendar_prompt(
     """
     return f"Fisrtly I want you to look for a calendar with a similar name to {calendar_name} and obtain its id, you can do this by geting the information about the calendars with the tool get_calendars. Then: Create an event named '{event_name}' starting at {start_time} and ending at {end_time}. Location: {location if location else 'No location provided'}. Description: {description if description else 'No description provided'}. The event will be created in the calendar with the id obtained from the previous step. The day of the event is {day}, the month is {month}, and the year is {year}. If you cannot find a calendar with a similar name, create a new calendar with that name and then create the event in it."
 
+
+# Tool results are serialized here, once, in the output mode of each tool
+serialize_tool_outputs(mcp)
+
+
 if __name__ == "__main__":
-    # Start the MCP server
-    mcp.run()
+    from utils.startup_profile import run_server
+
+    # Start the MCP server (or print its start-up profile with --profile-startup)
+    run_server(mcp, __file__)
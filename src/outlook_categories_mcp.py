@@ -1,6 +1,7 @@
-from utils.categories.microsoft_categories_requests import MicrosoftCategoriesRequests
 from utils.param_types import *
-from utils.token_manager import TokenManager
+from utils.lazy_requests import LazyRequests
+from utils.output_encoder import serialize_tool_outputs
+from utils.token_broker import get_token_manager
 
 
 # server.py
@@ -8,23 +9,25 @@ from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("Categories-AISecretary-Outlook", dependencies=["mcp[cli]", "msal", "filelock"])
 
-token_manager = TokenManager()
-categories_requests = MicrosoftCategoriesRequests(token_manager)
+token_manager = get_token_manager()
+categories_requests = LazyRequests(
+    ".categories.microsoft_categories_requests", "AsyncMicrosoftCategoriesRequests", token_manager
+)
 
 
 @mcp.tool()
-def get_categores() -> str:
+async def get_categores() -> str:
     """
     Gets the categories of Outlook.
 
     Returns:
         str: A JSON string containing the categories.
     """
-    return categories_requests.get_categories_microsoft_api()
+    return await categories_requests.get_categories_microsoft_api()
 
 
 @mcp.tool()
-def create_edit_category(category_params: CategoryParams) -> str:
+async def create_edit_category(category_params: CategoryParams) -> str:
     """
     Creates or edits a category in Outlook. In order to now the equivalence between colors and preset colors, you can use the tool get_preset_colors.
 
@@ -34,11 +37,11 @@ def create_edit_category(category_params: CategoryParams) -> str:
     Returns:
         str: The id of the created or edited category with more information, or an error message.
     """
-    return categories_requests.create_edit_category_microsoft_api(category_params)
+    return await categories_requests.create_edit_category_microsoft_api(category_params)
 
 
 @mcp.tool()
-def delete_category(category_id: str) -> str:
+async def delete_category(category_id: str) -> str:
     """
     Deletes a category from Outlook.
 
@@ -48,11 +51,11 @@ def delete_category(category_id: str) -> str:
     Returns:
         str: A confirmation message or an error message.
     """
-    return categories_requests.delete_category_microsoft_api(category_id)
+    return await categories_requests.delete_category_microsoft_api(category_id)
 
 
 @mcp.tool()
-def add_delete_category_to_email(
+async def add_delete_category_to_email(
     handle_category_to_resource_params: HandleCategoryToResourceParams,
 ) -> str:
     """
@@ -65,12 +68,12 @@ def add_delete_category_to_email(
     Returns:
         str: A confirmation message or an error message.
     """
-    return categories_requests.add_delete_category_to_email(
+    return await categories_requests.add_delete_category_to_email(
         handle_category_to_resource_params
     )
 
 @mcp.tool()
-def add_delete_category_to_event(
+async def add_delete_category_to_event(
     handle_category_to_resource_params: HandleCategoryToResourceParams,
 ) -> str:
     """
@@ -83,10 +86,10 @@ def add_delete_category_to_event(
     Returns:
         str: A confirmation message or an error message.
     """
-    return categories_requests.add_delete_category_to_event(handle_category_to_resource_params)
+    return await categories_requests.add_delete_category_to_event(handle_category_to_resource_params)
 
 @mcp.tool()
-def add_delete_category_to_task(
+async def add_delete_category_to_task(
     todo_list_id: str,
     handle_category_to_resource_params: HandleCategoryToResourceParams,
 ) -> str:
@@ -101,12 +104,12 @@ def add_delete_category_to_task(
     Returns:
         str: A confirmation message or an error message.
     """
-    return categories_requests.add_delete_category_to_task(
+    return await categories_requests.add_delete_category_to_task(
         todo_list_id, handle_category_to_resource_params
     )
 
 @mcp.tool()
-def get_preset_colors() -> str:
+async def get_preset_colors() -> str:
     """
     Gets the equivalence between colors and preset colors for the categories in Outlook.
     This is useful for understanding the available color options for categories (it gives the presetX to color equivalence).
@@ -114,28 +117,28 @@ def get_preset_colors() -> str:
     Returns:
         str: A JSON string containing the preset colors.
     """
-    return categories_requests.get_preset_color_equivalence_microsoft()
+    return await categories_requests.get_preset_color_equivalence_microsoft()
 
 @mcp.resource("outlook://categories")
-def get_categories() -> str:
+async def get_categories() -> str:
     """
     Gets the categories of the Outlook mailbox.
 
     Returns:
         str: A JSON string containing the categories.
     """
-    return categories_requests.get_categories_microsoft_api()
+    return await categories_requests.get_categories_microsoft_api()
 
 
 @mcp.resource("outlook://preset/colors")
-def get_preset_colors() -> str:
+async def get_preset_colors() -> str:
     """
     Gets the equivalence between colors and preset colors for the categories in the Outlook mailbox.
 
     Returns:
         str: A JSON string containing the preset colors.
     """
-    return categories_requests.get_preset_color_equivalence_microsoft()
+    return await categories_requests.get_preset_color_equivalence_microsoft()
 
 
 @mcp.prompt()
@@ -155,6 +158,13 @@ def create_edit_category_prompt(
     """
     return f"Use the tool get_preset_colors to get the equivalence of the preset colors to colors. Then use the tool get_categories to get the categoires, if the category provided is very similar to one category, edit it, otherwise create it. The name of the category is {category_name} and the color is {category_color}."
 
+
+# Tool results are serialized here, once, in the output mode of each tool
+serialize_tool_outputs(mcp)
+
+
 if __name__ == "__main__":
-    # Start the MCP server
-    mcp.run()
+    from utils.startup_profile import run_server
+
+    # Start the MCP server (or print its start-up profile with --profile-startup)
+    run_server(mcp, __file__)
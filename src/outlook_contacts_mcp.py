@@ -1,9 +1,7 @@
 from typing import Optional
-from utils.token_manager import TokenManager
-from utils.contacts.microsoft_contact_folders_requests import (
-    MicrosoftContactFoldersRequests,
-)
-from utils.contacts.microsoft_contacts_requests import MicrosoftContactsRequests
+from utils.lazy_requests import LazyRequests
+from utils.output_encoder import serialize_tool_outputs
+from utils.token_broker import get_token_manager
 from utils.param_types import Contact
 
 # server.py
@@ -12,13 +10,17 @@ from mcp.server.fastmcp import FastMCP
 # Create an MCP server
 mcp = FastMCP("Contacts-AISecretary-Outlook", dependencies=["mcp[cli]", "msal", "filelock"])
 
-token_manager = TokenManager()
-contact_folders_requests = MicrosoftContactFoldersRequests(token_manager)
-contacts = MicrosoftContactsRequests(token_manager)
+token_manager = get_token_manager()
+contact_folders_requests = LazyRequests(
+    ".contacts.microsoft_contact_folders_requests", "AsyncMicrosoftContactFoldersRequests", token_manager
+)
+contacts = LazyRequests(
+    ".contacts.microsoft_contacts_requests", "AsyncMicrosoftContactsRequests", token_manager
+)
 
 
 @mcp.tool()
-def create_contact_folder(folder_name: str) -> str:
+async def create_contact_folder(folder_name: str) -> str:
     """Creates a new contact folder in Microsoft Outlook.
 
     Args:
@@ -27,25 +29,25 @@ def create_contact_folder(folder_name: str) -> str:
     Returns:
         str: A message indicating the result of the operation.
     """
-    response = contact_folders_requests.create_contact_folder(folder_name)
+    response = await contact_folders_requests.create_contact_folder(folder_name)
 
     return response
 
 
 @mcp.tool()
-def get_contact_folders() -> str:
+async def get_contact_folders() -> str:
     """Retrieves all contact folders from Microsoft Outlook.
 
     Returns:
         str: A JSON string containing the list of contact folders.
     """
-    response = contact_folders_requests.get_contact_folders()
+    response = await contact_folders_requests.get_contact_folders()
 
     return response
 
 
 @mcp.tool()
-def delete_contact_folder(folder_id: str) -> str:
+async def delete_contact_folder(folder_id: str) -> str:
     """Deletes a contact folder by its ID.
 
     Args:
@@ -54,13 +56,13 @@ def delete_contact_folder(folder_id: str) -> str:
     Returns:
         str: A message indicating the result of the operation.
     """
-    response = contact_folders_requests.delete_contact_folder(folder_id)
+    response = await contact_folders_requests.delete_contact_folder(folder_id)
 
     return response
 
 
 @mcp.tool()
-def get_contacts(folder_id: Optional[str], name: str = None) -> str:
+async def get_contacts(folder_id: Optional[str], name: str = None) -> str:
     """Retrieves contacts from a specific folder in Microsoft Outlook. If no folder ID is provided, it retrieves contacts from the default folder (this defaulf folder has no ID).
 
     Args:
@@ -70,13 +72,13 @@ def get_contacts(folder_id: Optional[str], name: str = None) -> str:
     Returns:
         str: A JSON string containing the list of contacts.
     """
-    response = contacts.get_contacts(folder_id, name)
+    response = await contacts.get_contacts(folder_id, name)
 
     return response
 
 
 @mcp.tool()
-def get_contact_info(contact_id: str) -> str:
+async def get_contact_info(contact_id: str) -> str:
     """Retrieves detailed information about a specific contact by its ID.
 
     Args:
@@ -85,13 +87,13 @@ def get_contact_info(contact_id: str) -> str:
     Returns:
         str: A JSON string containing the details of the contact.
     """
-    response = contacts.get_contact_info(contact_id)
+    response = await contacts.get_contact_info(contact_id)
 
     return response
 
 
 @mcp.tool()
-def create_update_contact(contact: Contact, folder_id: Optional[str], contact_id: Optional[str]) -> str:
+async def create_update_contact(contact: Contact, folder_id: Optional[str], contact_id: Optional[str]) -> str:
     """Creates a new contact in a specific folder in Microsoft Outlook, if folder_id is None, it will be created in the default folder. If contact_id is provided, it updates the existing contact with that ID.
 
     Args:
@@ -101,12 +103,12 @@ def create_update_contact(contact: Contact, folder_id: Optional[str], contact_id
     Returns:
         str: A JSON string containing the details of the created contact.
     """
-    response = contacts.create_edit_contact(contact, folder_id, contact_id)
+    response = await contacts.create_edit_contact(contact, folder_id, contact_id)
 
     return response
 
 @mcp.tool()
-def delete_contact(contact_id: str) -> str:
+async def delete_contact(contact_id: str) -> str:
     """Deletes a contact by its ID.
 
     Args:
@@ -115,10 +117,17 @@ def delete_contact(contact_id: str) -> str:
     Returns:
         str: A message indicating the result of the operation.
     """
-    response = contacts.delete_contact(contact_id)
+    response = await contacts.delete_contact(contact_id)
 
     return response
 
+
+# Tool results are serialized here, once, in the output mode of each tool
+serialize_tool_outputs(mcp)
+
+
 if __name__ == "__main__":
-    # Start the MCP server
-    mcp.run()
+    from utils.startup_profile import run_server
+
+    # Start the MCP server (or print its start-up profile with --profile-startup)
+    run_server(mcp, __file__)
@@ -1,10 +1,8 @@
 from utils.param_types import *
-from utils.email.microsoft_folders_requests import MicrosoftFoldersRequests
-from utils.email.microsoft_messages_requests import MicrosoftMessagesRequests
-from utils.email.microsoft_rules_requests import MicrosoftRulesRequests
-from utils.email.microsoft_flag_requests import MicrosoftFlagRequests
-from utils.categories.microsoft_categories_requests import MicrosoftCategoriesRequests
-from utils.token_manager import TokenManager
+from utils.lazy_requests import LazyRequests
+from utils.odata import ODataFilter
+from utils.output_encoder import serialize_tool_outputs
+from utils.token_broker import get_token_manager
 
 # server.py
 from mcp.server.fastmcp import FastMCP
@@ -12,23 +10,33 @@ from mcp.server.fastmcp import FastMCP
 # Create an MCP server
 mcp = FastMCP("Mail-AISecretary-Outlook", dependencies=["mcp[cli]", "msal", "filelock"])
 
-token_manager = TokenManager()
-
-filter_dateTime = "receivedDateTime ge 2016-01-01T00:00:00Z"  # Needed to have the params of orderBy in the filter
-
-folders_requests = MicrosoftFoldersRequests(token_manager)
-messages_requests = MicrosoftMessagesRequests(token_manager)
-rules_requests = MicrosoftRulesRequests(token_manager)
-flag_requests = MicrosoftFlagRequests(token_manager)
-categories_requests = MicrosoftCategoriesRequests(token_manager)
+token_manager = get_token_manager()
+
+folders_requests = LazyRequests(
+    ".email.microsoft_folders_requests", "AsyncMicrosoftFoldersRequests", token_manager
+)
+messages_requests = LazyRequests(
+    ".email.microsoft_messages_requests", "AsyncMicrosoftMessagesRequests", token_manager
+)
+rules_requests = LazyRequests(
+    ".email.microsoft_rules_requests", "AsyncMicrosoftRulesRequests", token_manager
+)
+flag_requests = LazyRequests(
+    ".email.microsoft_flag_requests", "AsyncMicrosoftFlagRequests", token_manager
+)
+categories_requests = LazyRequests(
+    ".categories.microsoft_categories_requests", "AsyncMicrosoftCategoriesRequests", token_manager
+)
 
 
 @mcp.tool()
-def search_emails_outlook(email_query: EmailQuery) -> str:
+async def search_emails_outlook(email_query: EmailQuery) -> str:
     """
     Searches emails in Outlook mailbox using Microsoft Graph API with advanced filtering capabilities.
 
-    You can't use both search and filter parameters at the same time. If you do, it will return an error message. If you want to use this tool with filter and with search, you can use the tool twice, once with the search parameters and once with the filter parameters and then combine the results.
+    Search and filter parameters can be used together: the emails returned match both.
+
+    To get the latest N emails, set number_emails to N and order_by to receivedDateTime descending. If there are more emails, the result has a 'cursor'; call the tool again with that cursor to get the next page.
 
     Args:
         email_query (EmailQuery): The query parameters for searching emails, including filters and pagination options.
@@ -36,13 +44,13 @@ def search_emails_outlook(email_query: EmailQuery) -> str:
     Returns:
         str: A JSON string containing the emails and pagination information if available.
     """
-    return messages_requests.get_messages_from_folder_microsoft_api(
+    return await messages_requests.get_messages_from_folder_microsoft_api(
         email_query=email_query
     )
 
 
 @mcp.tool()
-def get_conversation_emails(conversation_id: str, number_email: int) -> str:
+async def get_conversation_emails(conversation_id: str, number_email: int) -> str:
     """
     Gets the emails from the conversation with conversation_id in the Outlook mailbox.
 
@@ -55,13 +63,15 @@ def get_conversation_emails(conversation_id: str, number_email: int) -> str:
     """
     params = {
         "$top": number_email,
-        "$filter": "conversationId eq '" + conversation_id + "'",
+        **ODataFilter().eq("conversationId", conversation_id).params(),
     }
-    return messages_requests.get_conversation_messages_microsoft_api(params)
+    return await messages_requests.get_conversation_messages_microsoft_api(
+        params, conversation_id=conversation_id
+    )
 
 
 @mcp.tool()
-def mark_email_as_read(email_id: str) -> str:
+async def mark_email_as_read(email_id: str) -> str:
     """
     Marks an email as read.
 
@@ -71,11 +81,11 @@ def mark_email_as_read(email_id: str) -> str:
     Returns:
         str: Information about the changed email.
     """
-    return messages_requests.mark_as_read_unread_microsoft_api(email_id)
+    return await messages_requests.mark_as_read_unread_microsoft_api(email_id)
 
 
 @mcp.tool()
-def mark_email_as_unread(email_id: str) -> str:
+async def mark_email_as_unread(email_id: str) -> str:
     """
     Marks an email as unread.
 
@@ -85,11 +95,26 @@ def mark_email_as_unread(email_id: str) -> str:
     Returns:
         str: Information about the changed email.
     """
-    return messages_requests.mark_as_read_unread_microsoft_api(email_id, is_read=False)
+    return await messages_requests.mark_as_read_unread_microsoft_api(email_id, is_read=False)
 
 
 @mcp.tool()
-def get_full_email_and_attachments(email_id: str) -> str:
+async def mark_emails_as_read_unread_bulk(email_ids: List[str], is_read: bool = True) -> str:
+    """
+    Marks several emails as read or unread at once. Use it instead of calling mark_email_as_read many times.
+
+    Args:
+        email_ids (List[str]): The IDs of the emails to update.
+        is_read (bool): True to mark the emails as read, False to mark them as unread. Defaults to True.
+
+    Returns:
+        str: A summary with the number of succeeded and failed emails and the result of each one.
+    """
+    return await messages_requests.bulk_mark_as_read_unread_microsoft_api(email_ids, is_read)
+
+
+@mcp.tool()
+async def get_full_email_and_attachments(email_id: str) -> str:
     """
     Gets the full email and its attachments.
 
@@ -99,11 +124,11 @@ def get_full_email_and_attachments(email_id: str) -> str:
     Returns:
         str: A JSON string containing the full email and its attachments' names. The files will be downloaded.
     """
-    return messages_requests.get_full_message_and_attachments(email_id)
+    return await messages_requests.get_full_message_and_attachments(email_id)
 
 
 @mcp.tool()
-def delete_email(email_id: str) -> str:
+async def delete_email(email_id: str) -> str:
     """
     Deletes an email from the Outlook mailbox.
 
@@ -113,11 +138,25 @@ def delete_email(email_id: str) -> str:
     Returns:
         str: A confirmation message.
     """
-    return messages_requests.delete_message_microsoft_api(email_id)
+    return await messages_requests.delete_message_microsoft_api(email_id)
 
 
 @mcp.tool()
-def create_edit_draft_email(draft_email_data: DraftEmailData) -> str:
+async def delete_emails_bulk(email_ids: List[str]) -> str:
+    """
+    Deletes several emails from the Outlook mailbox at once.
+
+    Args:
+        email_ids (List[str]): The IDs of the emails to delete.
+
+    Returns:
+        str: A summary with the number of succeeded and failed emails and the result of each one.
+    """
+    return await messages_requests.bulk_delete_messages_microsoft_api(email_ids)
+
+
+@mcp.tool()
+async def create_edit_draft_email(draft_email_data: DraftEmailData) -> str:
     """
     Creates or edits a draft email in the Outlook mailbox.
 
@@ -127,14 +166,14 @@ def create_edit_draft_email(draft_email_data: DraftEmailData) -> str:
     Returns:
         str: The ID of the created or edited draft email, or an error message.
     """
-    return messages_requests.create_edit_draft_microsoft_api(
+    return await messages_requests.create_edit_draft_microsoft_api(
         draft_email_data=draft_email_data
     )
 
 
 @mcp.tool()
-def add_attachment_to_draft_email(
-    draft_id: str, attachment_path: str, content_type: str = "application/octet-stream"
+async def add_attachment_to_draft_email(
+    draft_id: str, attachment_path: str, content_type: Optional[str] = None
 ) -> str:
     """
     Adds an attachment to a draft email.
@@ -142,18 +181,18 @@ def add_attachment_to_draft_email(
     Args:
         draft_id (str): The ID of the draft email to which the attachment will be added.
         attachment_path (str): The path to the attachment file.
-        content_type (str, optional): The MIME type of the attachment. Defaults to "application/octet-stream".
+        content_type (Optional[str], optional): The MIME type of the attachment. Guessed from the file name if not given.
 
     Returns:
         str: The information about the attachment or an error message.
     """
-    return messages_requests.add_attachment_to_draft_microsoft_api(
+    return await messages_requests.add_attachment_to_draft_microsoft_api(
         draft_id=draft_id, attachment_path=attachment_path, content_type=content_type
     )
 
 
 @mcp.tool()
-def delete_attachment_from_draft_email(draft_id: str, attachment_id: str) -> str:
+async def delete_attachment_from_draft_email(draft_id: str, attachment_id: str) -> str:
     """
     Deletes an attachment from a draft email.
 
@@ -164,13 +203,13 @@ def delete_attachment_from_draft_email(draft_id: str, attachment_id: str) -> str
     Returns:
         str: A confirmation message or an error message.
     """
-    return messages_requests.delete_attachment_from_draft_microsoft_api(
+    return await messages_requests.delete_attachment_from_draft_microsoft_api(
         draft_id, attachment_id
     )
 
 
 @mcp.tool()
-def send_draft_email(draft_id: str) -> str:
+async def send_draft_email(draft_id: str) -> str:
     """
     Sends a draft email.
 
@@ -180,11 +219,11 @@ def send_draft_email(draft_id: str) -> str:
     Returns:
         str: A confirmation message or an error message.
     """
-    return messages_requests.send_draft_email_microsoft_api(draft_id)
+    return await messages_requests.send_draft_email_microsoft_api(draft_id)
 
 
 @mcp.tool()
-def move_or_copy_email(email_operation_params: EmailOperationParams) -> str:
+async def move_or_copy_email(email_operation_params: EmailOperationParams) -> str:
     """
     Moves or copies an email to a different folder.
 
@@ -194,11 +233,45 @@ def move_or_copy_email(email_operation_params: EmailOperationParams) -> str:
     Returns:
         str: The data of the copied/moved email or an error message.
     """
-    return messages_requests.move_or_copy_email_microsoft_api(email_operation_params)
+    return await messages_requests.move_or_copy_email_microsoft_api(email_operation_params)
+
+
+@mcp.tool()
+async def move_or_copy_emails_bulk(bulk_email_operation_params: BulkEmailOperationParams) -> str:
+    """
+    Moves or copies several emails to a different folder at once.
+
+    Args:
+        bulk_email_operation_params (BulkEmailOperationParams): The parameters for the move or copy operation.
+
+    Returns:
+        str: A summary with the number of succeeded and failed emails and the result of each one, including the new ID of every moved or copied email.
+    """
+    return await messages_requests.bulk_move_or_copy_emails_microsoft_api(
+        bulk_email_operation_params
+    )
 
 
 @mcp.tool()
-def create_reply_to_email(email_reply_params: EmailReplyParams) -> str:
+async def add_delete_category_to_emails_bulk(
+    bulk_handle_category_params: BulkHandleCategoryParams,
+) -> str:
+    """
+    Adds or deletes categories to/from several emails at once.
+
+    Args:
+        bulk_handle_category_params (BulkHandleCategoryParams): The parameters for adding or deleting the categories.
+
+    Returns:
+        str: A summary with the number of succeeded and failed emails and the result of each one.
+    """
+    return await messages_requests.bulk_add_delete_category_microsoft_api(
+        bulk_handle_category_params
+    )
+
+
+@mcp.tool()
+async def create_reply_to_email(email_reply_params: EmailReplyParams) -> str:
     """
     Creates the draft for the reply of an email. It does not add content; for editing it you can use tools such as create_edit_draft_email.
 
@@ -208,11 +281,11 @@ def create_reply_to_email(email_reply_params: EmailReplyParams) -> str:
     Returns:
         str: Information about the created reply or an error message.
     """
-    return messages_requests.reply_to_email_microsoft_api(email_reply_params)
+    return await messages_requests.reply_to_email_microsoft_api(email_reply_params)
 
 
 @mcp.tool()
-def forward_email(email_forward_params: EmailForwardParams) -> str:
+async def forward_email(email_forward_params: EmailForwardParams) -> str:
     """
     Creates the draft for the forward of an email. It does not add content; for editing it you can use tools such as create_edit_draft_email.
 
@@ -222,11 +295,11 @@ def forward_email(email_forward_params: EmailForwardParams) -> str:
     Returns:
         str: A confirmation message or an error message.
     """
-    return messages_requests.forward_email_microsoft_api(email_forward_params)
+    return await messages_requests.forward_email_microsoft_api(email_forward_params)
 
 
 @mcp.tool()
-def create_edit_folder(folder_params: FolderParams) -> str:
+async def create_edit_folder(folder_params: FolderParams) -> str:
     """
     Creates or edits a folder in the Outlook mailbox.
 
@@ -236,11 +309,11 @@ def create_edit_folder(folder_params: FolderParams) -> str:
     Returns:
         str: The ID of the created or edited folder with more information, or an error message.
     """
-    return folders_requests.create_edit_folder_microsoft_api(folder_params)
+    return await folders_requests.create_edit_folder_microsoft_api(folder_params)
 
 
 @mcp.tool()
-def delete_folder(folder_id: str) -> str:
+async def delete_folder(folder_id: str) -> str:
     """
     Deletes a folder from the Outlook mailbox.
 
@@ -250,11 +323,11 @@ def delete_folder(folder_id: str) -> str:
     Returns:
         str: A confirmation message or an error message.
     """
-    return folders_requests.delete_folder_microsoft_api(folder_id)
+    return await folders_requests.delete_folder_microsoft_api(folder_id)
 
 
 @mcp.tool()
-def get_folders_info_at_outlook() -> str:
+async def get_folders_info_at_outlook() -> str:
     """
     Gets the names and the folder_id of the folders in Outlook.
 
@@ -263,11 +336,11 @@ def get_folders_info_at_outlook() -> str:
     Returns:
         str: A JSON string containing the folders. If there are more folders, it will return the nextLink to get the next page of folders.
     """
-    return folders_requests.get_folder_names()
+    return await folders_requests.get_folder_names()
 
 
 @mcp.tool()
-def get_subfolders(folder_id: str) -> str:
+async def get_subfolders(folder_id: str) -> str:
     """
     Gets the subfolders of a specific folder in the Outlook mailbox.
 
@@ -277,11 +350,11 @@ def get_subfolders(folder_id: str) -> str:
     Returns:
         str: A JSON string containing the subfolders information. If there are more subfolders, it will return the nextLink to get the next page of subfolders.
     """
-    return folders_requests.get_subfolders_microsoft_api(folder_id)
+    return await folders_requests.get_subfolders_microsoft_api(folder_id)
 
 
 @mcp.tool()
-def add_delete_flag_or_mark_as_complete(email_id: str, flag: str):
+async def add_delete_flag_or_mark_as_complete(email_id: str, flag: str):
     """
     Marks an email with a flag, removes its flags, or marks it as completed.
 
@@ -295,22 +368,40 @@ def add_delete_flag_or_mark_as_complete(email_id: str, flag: str):
     Returns:
         str: The info about the email that was updated.
     """
-    return flag_requests.manage_flags_microsoft_api(email_id, flag)
+    return await flag_requests.manage_flags_microsoft_api(email_id, flag)
 
 
 @mcp.tool()
-def get_message_rules() -> str:
+async def add_delete_flag_or_mark_as_complete_bulk(email_ids: List[str], flag: str):
+    """
+    Marks several emails with a flag, removes their flags, or marks them as completed at once.
+
+    Args:
+        email_ids (List[str]): The IDs of the emails to update.
+        flag (str): The type of the flag to apply to the emails. Possible values:
+            - "flagged": it is marked
+            - "notFlagged": it is not marked
+            - "complete": it is marked as completed
+
+    Returns:
+        str: A summary with the number of succeeded and failed emails and the result of each one.
+    """
+    return await flag_requests.bulk_manage_flags_microsoft_api(email_ids, flag)
+
+
+@mcp.tool()
+async def get_message_rules() -> str:
     """
     Gets the message rules of the Outlook mailbox.
 
     Returns:
         str: A JSON string containing the message rules.
     """
-    return rules_requests.get_message_rules_microsoft_api()
+    return await rules_requests.get_message_rules_microsoft_api()
 
 
 @mcp.tool()
-def create_edit_message_rule(mail_rule: MailRule, rule_id: Optional[str] = None):
+async def create_edit_message_rule(mail_rule: MailRule, rule_id: Optional[str] = None):
     """
     Creates or edits a message rule in the Outlook mailbox.
 
@@ -321,11 +412,11 @@ def create_edit_message_rule(mail_rule: MailRule, rule_id: Optional[str] = None)
     Returns:
         str: A confirmation message or an error message.
     """
-    return rules_requests.create_message_rule_microsoft_api(mail_rule, rule_id)
+    return await rules_requests.create_message_rule_microsoft_api(mail_rule, rule_id)
 
 
 @mcp.tool()
-def delete_message_rule(rule_id: str):
+async def delete_message_rule(rule_id: str):
     """
     Deletes a message rule in the Outlook mailbox.
 
@@ -335,11 +426,11 @@ def delete_message_rule(rule_id: str):
     Returns:
         str: A confirmation message or an error message.
     """
-    return rules_requests.delete_message_rule_microsoft_api(rule_id)
+    return await rules_requests.delete_message_rule_microsoft_api(rule_id)
 
 
 @mcp.tool()
-def get_next_link(next_link: str):
+async def get_next_link(next_link: str):
     """
     Gets the next page of the given link.
 
@@ -349,18 +440,18 @@ def get_next_link(next_link: str):
     Returns:
         str: A JSON string containing the next page of the given link.
     """
-    return rules_requests.get_next_link_microsoft_api(next_link)
+    return await rules_requests.get_next_link_microsoft_api(next_link)
 
 
 @mcp.resource("outlook://root/folders")
-def get_user_folders() -> str:
+async def get_user_folders() -> str:
     """
     Gets the folders of the Outlook mailbox.
 
     Returns:
         str: A JSON string containing the folders. If there are more folders, it will return the nextLink to get the next page of folders.
     """
-    return folders_requests.get_folder_names()
+    return await folders_requests.get_folder_names()
 
 
 @mcp.prompt()
@@ -454,6 +545,12 @@ def create_draft_email(
     return f"Create a draft email with subject '{subject}' and body '{body}' to {to_recipients} with CC {cc_recipients} and importance {importance}"
 
 
+# Tool results are serialized here, once, in the output mode of each tool
+serialize_tool_outputs(mcp)
+
+
 if __name__ == "__main__":
-    # Start the MCP server
-    mcp.run()
+    from utils.startup_profile import run_server
+
+    # Start the MCP server (or print its start-up profile with --profile-startup)
+    run_server(mcp, __file__)
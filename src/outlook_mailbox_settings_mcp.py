@@ -1,25 +1,28 @@
-from utils.token_manager import TokenManager
+from utils.lazy_requests import LazyRequests
+from utils.output_encoder import serialize_tool_outputs
+from utils.token_broker import get_token_manager
 from mcp.server.fastmcp import FastMCP
-from utils.mailbox_settings.microsoft_mailbox_settings import MicrosoftMailboxSettings
 from utils.param_types import MailboxSettingsParams
 # Create an MCP server
 mcp = FastMCP("MailboxSettings-AISecretary-Outlook", dependencies=["mcp[cli]", "msal", "filelock"])
 
-token_manager = TokenManager()
-mailbox_settings = MicrosoftMailboxSettings(token_manager)
+token_manager = get_token_manager()
+mailbox_settings = LazyRequests(
+    ".mailbox_settings.microsoft_mailbox_settings", "AsyncMicrosoftMailboxSettings", token_manager
+)
 
 @mcp.tool()
-def get_mailbox_settings() -> str:
+async def get_mailbox_settings() -> str:
     """
     Retrieves the mailbox settings from Outlook.
 
     Returns:
         str: JSON string containing the mailbox settings.
     """
-    return mailbox_settings.get_mailbox_settings()
+    return await mailbox_settings.get_mailbox_settings()
 
 @mcp.tool()
-def update_mailbox_settings(mailbox_settings_params: MailboxSettingsParams) -> str:
+async def update_mailbox_settings(mailbox_settings_params: MailboxSettingsParams) -> str:
     """
     Updates the mailbox settings in Outlook.
 
@@ -29,8 +32,15 @@ def update_mailbox_settings(mailbox_settings_params: MailboxSettingsParams) -> s
     Returns:
         str: JSON string containing the updated mailbox settings.
     """
-    return mailbox_settings.update_mailbox_settings(mailbox_settings_params)
+    return await mailbox_settings.update_mailbox_settings(mailbox_settings_params)
+
+
+# Tool results are serialized here, once, in the output mode of each tool
+serialize_tool_outputs(mcp)
+
 
 if __name__ == "__main__":
-    # Start the MCP server
-    mcp.run()
+    from utils.startup_profile import run_server
+
+    # Start the MCP server (or print its start-up profile with --profile-startup)
+    run_server(mcp, __file__)
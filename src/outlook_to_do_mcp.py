@@ -1,30 +1,33 @@
 from typing import Optional
-from utils.token_manager import TokenManager
+from utils.lazy_requests import LazyRequests
+from utils.output_encoder import serialize_tool_outputs
+from utils.token_broker import get_token_manager
 from mcp.server.fastmcp import FastMCP
 from utils.param_types import TaskCreateRequest
-from utils.to_do.microsoft_to_do_lists_requests import MicrosoftToDoListsRequests
-from utils.to_do.microsoft_to_do_tasks_requests import MicrosoftToDoTasksRequests
-
 # Create an MCP server
 mcp = FastMCP("ToDo-AISecretary-Outlook", dependencies=["mcp[cli]", "msal", "filelock"])
 
-token_manager = TokenManager()
+token_manager = get_token_manager()
 
-to_do_lists_requests = MicrosoftToDoListsRequests(token_manager)
-to_do_tasks_requests = MicrosoftToDoTasksRequests(token_manager)
+to_do_lists_requests = LazyRequests(
+    ".to_do.microsoft_to_do_lists_requests", "AsyncMicrosoftToDoListsRequests", token_manager
+)
+to_do_tasks_requests = LazyRequests(
+    ".to_do.microsoft_to_do_tasks_requests", "AsyncMicrosoftToDoTasksRequests", token_manager
+)
 
 @mcp.tool()
-def get_todo_lists() -> str:
+async def get_todo_lists() -> str:
     """
     Retrieves the list of to-do lists from Microsoft To-Do.
 
     Returns:
         str: JSON string containing the list of to-do lists.
     """
-    return to_do_lists_requests.get_todo_lists()
+    return await to_do_lists_requests.get_todo_lists()
 
 @mcp.tool()
-def create_todo_list(list_name: str) -> str:
+async def create_todo_list(list_name: str) -> str:
     """
     Creates a new to-do list in Microsoft To-Do.
 
@@ -34,10 +37,10 @@ def create_todo_list(list_name: str) -> str:
     Returns:
         str: JSON string containing the details of the created to-do list.
     """
-    return to_do_lists_requests.create_todo_list(list_name)
+    return await to_do_lists_requests.create_todo_list(list_name)
 
 @mcp.tool()
-def delete_todo_list(list_id: str) -> str:
+async def delete_todo_list(list_id: str) -> str:
     """
     Deletes a to-do list by its ID in Microsoft To-Do.
 
@@ -47,10 +50,10 @@ def delete_todo_list(list_id: str) -> str:
     Returns:
         str: Confirmation message or error details.
     """
-    return to_do_lists_requests.delete_todo_list(list_id)
+    return await to_do_lists_requests.delete_todo_list(list_id)
 
 @mcp.tool()
-def get_tasks_in_list(todo_list_id: str, task_filter: Optional[TaskCreateRequest] = None, top: int = 100) -> str:
+async def get_tasks_in_list(todo_list_id: str, task_filter: Optional[TaskCreateRequest] = None, top: int = 100) -> str:
     """
     Retrieves tasks from a specified to-do list with optional filtering.
 
@@ -62,9 +65,9 @@ def get_tasks_in_list(todo_list_id: str, task_filter: Optional[TaskCreateRequest
     Returns:
         str: JSON string containing the list of tasks in the specified to-do list.
     """
-    return to_do_tasks_requests.get_tasks_in_list(todo_list_id, task_filter=task_filter, top=top)
+    return await to_do_tasks_requests.get_tasks_in_list(todo_list_id, task_filter=task_filter, top=top)
 @mcp.tool()
-def get_task_in_list(todo_list_id: str, task_id: str) -> str:
+async def get_task_in_list(todo_list_id: str, task_id: str) -> str:
     """
     Retrieves details of a specific task in a specified to-do list.
 
@@ -75,10 +78,10 @@ def get_task_in_list(todo_list_id: str, task_id: str) -> str:
     Returns:
         str: JSON string containing the details of the specified task.
     """
-    return to_do_tasks_requests.get_task_in_list(todo_list_id, task_id)
+    return await to_do_tasks_requests.get_task_in_list(todo_list_id, task_id)
 
 @mcp.tool()
-def create_update_task_in_list(todo_list_id: str, task_create_request: TaskCreateRequest, task_id: Optional[str]) -> str:
+async def create_update_task_in_list(todo_list_id: str, task_create_request: TaskCreateRequest, task_id: Optional[str]) -> str:
     """
     Creates or updates a new task in a specified to-do list.
 
@@ -89,10 +92,10 @@ def create_update_task_in_list(todo_list_id: str, task_create_request: TaskCreat
     Returns:
         str: JSON string containing the details of the created task.
     """
-    return to_do_tasks_requests.create_update_task_in_list(todo_list_id, task_create_request, task_id=task_id)
+    return await to_do_tasks_requests.create_update_task_in_list(todo_list_id, task_create_request, task_id=task_id)
 
 @mcp.tool()
-def delete_task_in_list(todo_list_id: str, task_id: str) -> str:
+async def delete_task_in_list(todo_list_id: str, task_id: str) -> str:
     """
     Deletes a task from a specified to-do list.
 
@@ -103,7 +106,15 @@ def delete_task_in_list(todo_list_id: str, task_id: str) -> str:
     Returns:
         str: Confirmation message or error details.
     """
-    return to_do_tasks_requests.delete_task_in_list(todo_list_id, task_id)
+    return await to_do_tasks_requests.delete_task_in_list(todo_list_id, task_id)
+
+
+# Tool results are serialized here, once, in the output mode of each tool
+serialize_tool_outputs(mcp)
+
 
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    from utils.startup_profile import run_server
+
+    # Start the MCP server (or print its start-up profile with --profile-startup)
+    run_server(mcp, __file__)
@@ -0,0 +1,79 @@
+"""
+Async variants of the request classes, for the async MCP tools.
+
+The request classes are synchronous: they send their Graph requests on the
+shared pooled requests.Session (see graph_session). make_async_requests wraps
+one of them in a class whose public methods are coroutines that run the
+synchronous method in a worker thread with asyncio.to_thread. This is a
+thread-offload wrapper, not an async HTTP engine: each call still blocks a
+worker thread while it waits for Graph, but the event loop stays free, so one
+server process serves several tool calls at the same time.
+"""
+import asyncio
+import inspect
+from functools import wraps
+
+from .microsoft_base_request import MicrosoftBaseRequest
+from .token_manager import TokenManager
+
+
+class AsyncMicrosoftBaseRequest:
+    """
+    Base of the classes built by make_async_requests.
+
+    Attributes:
+        token_manager (TokenManager): Instance to manage authentication tokens.
+        sync_requests (MicrosoftBaseRequest): The synchronous request object the coroutines run.
+    """
+
+    def __init__(self, token_manager: TokenManager, sync_requests: MicrosoftBaseRequest):
+        """
+        Initializes the async variant around a synchronous request object.
+
+        Args:
+            token_manager (TokenManager): An instance of TokenManager to handle authentication tokens.
+            sync_requests (MicrosoftBaseRequest): The synchronous request object.
+        """
+        self.token_manager = token_manager
+        self.sync_requests = sync_requests
+
+
+def make_async_requests(requests_class: type[MicrosoftBaseRequest]) -> type:
+    """
+    Builds the async variant of a synchronous request class.
+
+    Every public method of ``requests_class`` becomes a coroutine with the same
+    signature and docstring, which runs the synchronous method in a worker thread.
+    The Graph logic is kept in one place, the synchronous class.
+
+    Args:
+        requests_class (type[MicrosoftBaseRequest]): The synchronous request class.
+
+    Returns:
+        type: A subclass of AsyncMicrosoftBaseRequest named ``Async<ClassName>``.
+    """
+    def __init__(self, token_manager: TokenManager):
+        AsyncMicrosoftBaseRequest.__init__(self, token_manager, requests_class(token_manager))
+
+    def make_method(name: str):
+        sync_method = getattr(requests_class, name)
+
+        @wraps(sync_method)
+        async def method(self, *args, **kwargs):
+            return await asyncio.to_thread(
+                getattr(self.sync_requests, name), *args, **kwargs
+            )
+        return method
+
+    base_attributes = set(dir(MicrosoftBaseRequest))
+    namespace = {
+        "__init__": __init__,
+        "__doc__": f"Async variant of {requests_class.__name__}.\n\n{inspect.getdoc(requests_class) or ''}",
+        "__module__": requests_class.__module__,
+    }
+    for name, value in inspect.getmembers(requests_class, callable):
+        if name.startswith("_") or name in base_attributes:
+            continue
+        namespace[name] = make_method(name)
+
+    return type(f"Async{requests_class.__name__}", (AsyncMicrosoftBaseRequest,), namespace)
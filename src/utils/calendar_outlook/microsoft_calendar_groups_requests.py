@@ -1,7 +1,9 @@
-import json
-
 from ..param_types import CalendarGroupParams
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..odata import ODataFilter
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 from ..constants import CALENDAR_GROUPS_URL
 
 
@@ -11,7 +13,8 @@ class MicrosoftCalendarGroupsRequests(MicrosoftBaseRequest):
     Inherits from MicrosoftBaseRequest to manage authentication and token retrieval.
     """
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_calendar_groups(self, calendar_group_params: CalendarGroupParams) -> str:
+    @cached("calendar_groups")
+    def get_calendar_groups(self, calendar_group_params: CalendarGroupParams) -> ToolResult:
         """
         Retrieves calendar groups from Microsoft Graph API.
 
@@ -19,24 +22,21 @@ class MicrosoftCalendarGroupsRequests(MicrosoftBaseRequest):
             calendar_group_params (CalendarGroupParams): Parameters for filtering and limiting the calendar groups.
 
         Returns:
-            str: A JSON string containing the calendar groups.
+            ToolResult: The calendar groups.
         """
         params = {
-            "top": calendar_group_params.top,
-            "filter": (
-                f"name eq '{calendar_group_params.filter_name}'"
-                if calendar_group_params.filter_name
-                else None
-            ),
+            "$top": calendar_group_params.top,
+            **ODataFilter().eq("name", calendar_group_params.filter_name or None).params(),
         }
         status_code, response = self.microsoft_get(
             CALENDAR_GROUPS_URL, self.token_manager.get_token(), params=params
         )
 
-        return json.dumps(response.get("value", []), indent=2)
+        return response.get("value", [])
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def create_calendar_group(self, calendar_group_name: str) -> str:
+    @invalidates("calendar_groups")
+    def create_calendar_group(self, calendar_group_name: str) -> ToolResult:
         """
         Creates a new calendar group in Microsoft Graph API.
 
@@ -44,7 +44,7 @@ class MicrosoftCalendarGroupsRequests(MicrosoftBaseRequest):
             calendar_group_name (str): The name of the calendar group to be created.
 
         Returns:
-            str: A JSON string containing the response from the API.
+            ToolResult: The response from the API.
         """
         data = {"name": calendar_group_name}
 
@@ -52,12 +52,13 @@ class MicrosoftCalendarGroupsRequests(MicrosoftBaseRequest):
             CALENDAR_GROUPS_URL, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("calendar_groups")
     def update_calendar_group(
         self, calendar_group_id: str, calendar_group_name: str
-    ) -> str:
+    ) -> ToolResult:
         """
         Updates an existing calendar group in Microsoft Graph API.
 
@@ -66,7 +67,7 @@ class MicrosoftCalendarGroupsRequests(MicrosoftBaseRequest):
             calendar_group_name (str): The new name for the calendar group.
 
         Returns:
-            str: A JSON string containing the response from the API.
+            ToolResult: The response from the API.
         """
         url = f"{CALENDAR_GROUPS_URL}/{calendar_group_id}"
         data = {"name": calendar_group_name}
@@ -75,9 +76,10 @@ class MicrosoftCalendarGroupsRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_calendar_group(self, calendar_group_id: str) -> str:
+    @invalidates("calendar_groups", "calendars")
+    def delete_calendar_group(self, calendar_group_id: str) -> ToolResult:
         """
         Deletes a calendar group in Microsoft Graph API.
 
@@ -85,14 +87,17 @@ class MicrosoftCalendarGroupsRequests(MicrosoftBaseRequest):
             calendar_group_id (str): The ID of the calendar group to be deleted.
 
         Returns:
-            str: A JSON string containing the response from the API or a status message if deleted.
+            ToolResult: The response from the API or a status message if deleted.
         """
         url = f"{CALENDAR_GROUPS_URL}/{calendar_group_id}"
 
         status_code, response = self.microsoft_delete(url, self.token_manager.get_token())
 
         return (
-            json.dumps(response, indent=2)
+            response
             if response
-            else json.dumps({"status": "deleted"}, indent=2)
+            else {"status": "deleted"}
         )
+
+
+AsyncMicrosoftCalendarGroupsRequests = make_async_requests(MicrosoftCalendarGroupsRequests)
@@ -1,10 +1,14 @@
 from dataclasses import asdict
-import json
 
 from ..helper_functions.helpers_calendar import simplify_calendar
 from ..param_types import CalendarUpdateParams, ScheduleParams
 from ..constants import CALENDAR_SCHEDULES_URL, GRAPH_BASE_URL
+from ..async_microsoft_base_request import make_async_requests
+from ..graph_pagination import DEFAULT_PAGE_SIZE
+from ..graph_projection import select_params
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 
 
 class MicrosoftCalendarRequests(MicrosoftBaseRequest):
@@ -27,7 +31,8 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
         return f"{GRAPH_BASE_URL}/calendars"
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_calendars(self, calendar_group_id: str = None, name: str = None) -> str:
+    @cached("calendars")
+    def get_calendars(self, calendar_group_id: str = None, name: str = None) -> ToolResult:
         """
         Retrieves calendars from Microsoft Graph API.
 
@@ -36,27 +41,24 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             name (str): The name of the calendar to filter.
 
         Returns:
-            str: A JSON string containing the calendars.
+            ToolResult: The calendars.
         """
 
         final_url = self._get_url(calendar_group_id)
 
-        status_code, response = self.microsoft_get(final_url, self.token_manager.get_token())
+        calendars = self.microsoft_paginate(
+            final_url, params=select_params(simplify_calendar), page_size=DEFAULT_PAGE_SIZE
+        )
 
-        if name:
-            response["value"] = [
-                calendar
-                for calendar in response.get("value", [])
-                if calendar.get("name") == name
-            ]
         simplify_calendars = []
-        calendars = response.get("value", [])
         for calendar in calendars:
+            if name and calendar.get("name") != name:
+                continue
             simplify_calendars.append(simplify_calendar(calendar))
-        return json.dumps({"calendars: ": simplify_calendars}, indent=2)
+        return {"calendars: ": simplify_calendars}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_calendar(self, calendar_id: str) -> str:
+    def get_calendar(self, calendar_id: str) -> ToolResult:
         """
         Retrieves a specific calendar from Microsoft Graph API.
 
@@ -64,16 +66,17 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             calendar_id (str): The ID of the calendar to be retrieved.
 
         Returns:
-            str: A JSON string containing the details of the calendar.
+            ToolResult: The details of the calendar.
         """
         url = f"{self._get_url()}/{calendar_id}"
 
         status_code, response = self.microsoft_get(url, self.token_manager.get_token())
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def create_calendar(self, calendar_name: str, calendar_group_id: str = None) -> str:
+    @invalidates("calendars")
+    def create_calendar(self, calendar_name: str, calendar_group_id: str = None) -> ToolResult:
         """
         Creates a new calendar in Microsoft Graph API.
 
@@ -82,7 +85,7 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             calendar_group_id (str): The ID of the calendar group where the calendar will be created. If None, the calendar is created in the default group.
 
         Returns:
-            str: A JSON string containing the response from the API.
+            ToolResult: The response from the API.
         """
         final_url = self._get_url(calendar_group_id)
 
@@ -92,12 +95,13 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             final_url, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("calendars")
     def update_calendar(
         self, calendar_id: str, calendar_update_params: CalendarUpdateParams
-    ) -> str:
+    ) -> ToolResult:
         """
         Updates an existing calendar in Microsoft Graph API.
 
@@ -106,7 +110,7 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             calendar_name (str): The new name for the calendar.
 
         Returns:
-            str: A JSON string containing the response from the API.
+            ToolResult: The response from the API.
         """
         url = f"{self._get_url()}/{calendar_id}"
         data = {"name": calendar_update_params.name}
@@ -120,10 +124,11 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_calendar(self, calendar_id: str) -> str:
+    @invalidates("calendars")
+    def delete_calendar(self, calendar_id: str) -> ToolResult:
         """
         Deletes a calendar from Microsoft Graph API.
 
@@ -131,21 +136,21 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             calendar_id (str): The ID of the calendar to be deleted.
 
         Returns:
-            str: A JSON string containing the response from the API.
+            ToolResult: The response from the API.
         """
         url = f"{self._get_url()}/{calendar_id}"
 
         status_code, response = self.microsoft_delete(url, self.token_manager.get_token())
         if status_code != 204:
-            return json.dumps({"error": "Failed to delete calendar"}, indent=2)
+            return {"error": "Failed to delete calendar"}
         response = {
             "message": "Calendar deleted successfully",
             "status_code": status_code,
         }
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_schedule(self, schedule_params: ScheduleParams) -> str:
+    def get_schedule(self, schedule_params: ScheduleParams) -> ToolResult:
         """
         Retrieves the schedule of a user or a list of users.
 
@@ -153,7 +158,7 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             schedule_params (ScheduleParams): Parameters for the schedule request.
 
         Returns:
-            str: A JSON string containing the schedule information.
+            ToolResult: The schedule information.
         """
         data = {
             "schedules": schedule_params.schedules,
@@ -166,4 +171,7 @@ class MicrosoftCalendarRequests(MicrosoftBaseRequest):
             CALENDAR_SCHEDULES_URL, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
+
+
+AsyncMicrosoftCalendarRequests = make_async_requests(MicrosoftCalendarRequests)
@@ -1,5 +1,5 @@
+from datetime import timedelta
 from typing import List, Optional
-import json
 from ..param_types import (
     EventChangesParams,
     EventParams,
@@ -8,13 +8,23 @@ from ..param_types import (
 )
 from ..helper_functions.helpers_calendar import (
     construct_data_for_response_events,
+    event_matches_query,
+    event_query_select_fields,
     event_query_to_graph_params,
     simplify_event,
     event_params_to_dict,
     simplify_event_with_attachment_names,
 )
+from ..async_microsoft_base_request import make_async_requests
+from ..graph_batch import BatchRequest
+from ..graph_pagination import STREAMED_PAGE_SIZE, GraphPaginator
+from ..graph_projection import select_params
 from ..microsoft_base_request import MicrosoftBaseRequest
-from ..constants import CALENDAR_URL, CALENDAR_EVENTS_URL
+from ..results import EventListResult, ToolResult
+from ..constants import CALENDAR_URL, CALENDAR_EVENTS_URL, CALENDAR_VIEW_URL
+
+# Length of the calendarView range when the query only sets one of its ends
+CALENDAR_VIEW_DEFAULT_RANGE = timedelta(days=365)
 
 
 class MicrosoftEventsRequests(MicrosoftBaseRequest):
@@ -30,27 +40,22 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         else:
             return f"{CALENDAR_URL}s/{calendar_id}/events"
 
-    def _add_attachment(
+    def _add_attachments(
         self, url: str, response_id: str, attachments: List[str]
-    ) -> int:
-        for file in attachments:
-            file_name, encoded_content = self.read_file_and_encode_base64(file)
-            attachment = {
-                "@odata.type": "#microsoft.graph.fileAttachment",
-                "name": file_name,
-                "contentBytes": encoded_content,
-                "contentType": "application/pdf",
-            }
-
-            url_attachment = f"{url}/{response_id}/attachments"
-
-            status_code, response_attachment = self.microsoft_post(
-                url_attachment, self.token_manager.get_token(), data=attachment
-            )
-            return status_code
+    ) -> List[dict]:
+        # Every file is uploaded at once (bounded by ATTACHMENTS_MAX_CONCURRENCY), with its MIME type guessed from its name
+        return self.upload_attachments(f"{url}/{response_id}/attachments", attachments)
+
+    @staticmethod
+    def _with_attachment_results(response: dict, results: List[dict]) -> dict:
+        response["attachments"] = results
+        failed = sum(1 for result in results if not result["success"])
+        if failed:
+            response["error"] = f"Failed to add {failed} of {len(results)} attachments"
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_events(self, event_query: EventQuery, calendar_id: str = None) -> str:
+    def get_events(self, event_query: EventQuery, calendar_id: str = None) -> ToolResult:
         """Retrieve events from a calendar based on query parameters.
 
         Args:
@@ -58,62 +63,59 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             calendar_id (str, optional): The ID of the calendar. Defaults to None.
 
         Returns:
-            str: A JSON-formatted string containing the list of events.
+            ToolResult: The events. If the page budget runs out before number_events events
+            are found, the result is marked truncated.
         """
         params = event_query_to_graph_params(event_query)
-        url = self._get_url(calendar_id)
-
-        has_filter = "filter" in params
-        has_dates = "startDateTime" in params and "endDateTime" in params
-
-        response_filter = None
-        response_dates = None
-
-        if has_filter:
-            filter_params = {
-                k: v
-                for k, v in params.items()
-                if k not in ("search", "startDateTime", "endDateTime")
-            }
-            status_code, response_filter = self.microsoft_get(
-                url, self.token_manager.get_token(), params=filter_params
-            )
-            response_filter = [
-                simplify_event(e) for e in response_filter.get("value", [])
-            ]
-        if has_dates:
-            date_params = {
-                k: v for k, v in params.items() if k not in ("search", "filter")
-            }
-            if calendar_id is not None:
-                calendar_url = (
-                    f"https://graph.microsoft.com/v1.0/me/{calendar_id}/calendarView"
-                )
-            else:
-                calendar_url = f"https://graph.microsoft.com/v1.0/me/calendarView"
-            status_code, response_dates = self.microsoft_get(
-                calendar_url, self.token_manager.get_token(), params=date_params
+        number_events = event_query.number_events
+
+        if "startDateTime" not in params and "endDateTime" not in params:
+            # Without a date range, Graph evaluates the $filter on the events collection
+            events = self.microsoft_paginate(
+                self._get_url(calendar_id),
+                params=select_params(simplify_event, params),
+                max_items=number_events,
             )
-            response_dates = [
-                simplify_event(e) for e in response_dates.get("value", [])
-            ]
-
-        if has_filter:
-            response_final = response_filter
-            if has_dates:
-                date_ids = {msg["id"] for msg in response_dates}
-                response_final = [
-                    msg for msg in response_final if msg["id"] in date_ids
-                ]
-        elif has_dates:
-            response_final = response_dates
-        else:
-            status_code, response = self.microsoft_get(
-                url, self.token_manager.get_token(), params=params
-            )
-            response_final = [simplify_event(e) for e in response.get("value", [])]
+            return self._event_list([simplify_event(event) for event in events], events, number_events)
+
+        # calendarView expands recurring events in the range but takes no $filter, so the
+        # filters and search are evaluated on the streamed pages, in a single request
+        start, end = params.get("startDateTime"), params.get("endDateTime")
+        date_filter = event_query.filters.date_filter
+        if start is None:
+            start = (date_filter.end_date - CALENDAR_VIEW_DEFAULT_RANGE).isoformat()
+        if end is None:
+            end = (date_filter.start_date + CALENDAR_VIEW_DEFAULT_RANGE).isoformat()
+        view_params = {"startDateTime": start, "endDateTime": end, "$orderby": "start/dateTime"}
+        url = f"{CALENDAR_URL}s/{calendar_id}/calendarView" if calendar_id else CALENDAR_VIEW_URL
+        events = self.microsoft_paginate(
+            url,
+            params=select_params(
+                simplify_event, view_params, extra_fields=event_query_select_fields(event_query)
+            ),
+            page_size=max(number_events, STREAMED_PAGE_SIZE),
+        )
 
-        return json.dumps(response_final, indent=2)
+        matched, last = [], None
+        for event in events:
+            last = event
+            if event_matches_query(event, event_query):
+                matched.append(simplify_event(event))
+                if len(matched) >= number_events:
+                    # No more pages are requested
+                    break
+        result = self._event_list(matched, events, number_events)
+        if result.get("truncated") and last is not None:
+            result["scannedUntil"] = last.get("start", {}).get("dateTime")
+        return result
+
+    @staticmethod
+    def _event_list(found: List[dict], events: GraphPaginator, number_events: int) -> EventListResult:
+        result = {"events": found}
+        # A paginator also stops at max_items, which is not a truncation
+        if events.truncated and len(found) < number_events:
+            result["truncated"] = True
+        return result
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def get_event(self, event_id: str):
@@ -123,26 +125,40 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             event_id (str): The ID of the event to retrieve.
 
         Returns:
-            str: A JSON-formatted string containing the event details and attachments.
+            ToolResult: The event details and attachments.
         """
-        url = self._get_url()
-        url = f"{url}/{event_id}"
-        status_code, response = self.microsoft_get(url, self.token_manager.get_token())
-        response = simplify_event_with_attachment_names(
-            response, self.token_manager.get_token()
+        url = f"{self._get_url()}/{event_id}"
+
+        # Event and attachments are fetched in a single $batch round trip
+        responses = self.microsoft_batch(
+            [
+                BatchRequest(
+                    id="event",
+                    method="GET",
+                    url=url,
+                    params=select_params(simplify_event_with_attachment_names),
+                ),
+                # Metadata only: the content of every file is streamed to disk afterwards
+                BatchRequest(
+                    id="attachments",
+                    method="GET",
+                    url=f"{url}/attachments",
+                    params={"$select": "id,name,contentType,size"},
+                ),
+            ],
+            self.token_manager.get_token(),
         )
+        event = responses["event"].raise_for_status().body
+        attachments = responses["attachments"].raise_for_status().body.get("value", [])
 
-        attachments_url = f"{url}/attachments"
-        status_code, attachments_response = self.microsoft_get(
-            attachments_url, self.token_manager.get_token()
+        response = simplify_event_with_attachment_names(event, attachments)
+        response["attachments"] = self.download_attachments(
+            attachments, lambda attachment_id: f"{url}/attachments/{attachment_id}/$value"
         )
-        attachments = attachments_response.get("value", [])
-
-        response["attachments"] = self.download_attachments(attachments)
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def create_event(self, event_params: EventParams, calendar_id: str = None) -> str:
+    def create_event(self, event_params: EventParams, calendar_id: str = None) -> ToolResult:
         """Create a new event in a calendar.
 
         Args:
@@ -150,7 +166,8 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             calendar_id (str, optional): The ID of the calendar. Defaults to None.
 
         Returns:
-            str: A JSON-formatted string containing the created event or an error message.
+            ToolResult: The created event, with the outcome of every
+            attachment upload under "attachments", or an error message.
         """
         url = self._get_url(calendar_id)
 
@@ -163,15 +180,12 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         response_id = response.get("id", "")
 
         if event_params.attachments:
-            status_code = self._add_attachment(
-                url, response_id, event_params.attachments
-            )
-            if status_code != 201:
-                return json.dumps({"error": "Failed to add attachments"}, indent=2)
-        return json.dumps(response, indent=2)
+            results = self._add_attachments(url, response_id, event_params.attachments)
+            response = self._with_attachment_results(response, results)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def update_event(self, event_id: str, event_params: EventParams) -> str:
+    def update_event(self, event_id: str, event_params: EventParams) -> ToolResult:
         """Update an existing event.
 
         Args:
@@ -179,7 +193,8 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             event_params (EventParams): The updated event parameters.
 
         Returns:
-            str: A JSON-formatted string containing the updated event or an error message.
+            ToolResult: The updated event, with the outcome of every
+            attachment upload under "attachments", or an error message.
         """
         url = self._get_url()
 
@@ -192,15 +207,12 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         response_id = response.get("id", "")
 
         if event_params.attachments:
-            status_code = self._add_attachment(
-                url, response_id, event_params.attachments
-            )
-            if status_code != 201:
-                return json.dumps({"error": "Failed to add attachments"}, indent=2)
-        return json.dumps(response, indent=2)
+            results = self._add_attachments(url, response_id, event_params.attachments)
+            response = self._with_attachment_results(response, results)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_event_attachment(self, event_id: str, attachment_id: str) -> str:
+    def delete_event_attachment(self, event_id: str, attachment_id: str) -> ToolResult:
         """Delete an attachment from an event.
 
         Args:
@@ -208,7 +220,7 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             attachment_id (str): The ID of the attachment to delete.
 
         Returns:
-            str: A JSON-formatted string indicating success or failure.
+            ToolResult: A result indicating success or failure.
         """
         url = self._get_url()
 
@@ -218,19 +230,19 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         )
 
         if status_code == 204:
-            return json.dumps({"message": "Attachment deleted successfully"}, indent=2)
+            return {"message": "Attachment deleted successfully"}
         else:
-            return json.dumps({"error": "Failed to delete attachment"}, indent=2)
+            return {"error": "Failed to delete attachment"}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_event(self, event_id: str) -> str:
+    def delete_event(self, event_id: str) -> ToolResult:
         """Delete an event by its ID.
 
         Args:
             event_id (str): The ID of the event to delete.
 
         Returns:
-            str: A JSON-formatted string indicating success or failure.
+            ToolResult: A result indicating success or failure.
         """
         url = self._get_url()
 
@@ -239,14 +251,14 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         )
 
         if status_code == 204:
-            return json.dumps({"message": "Event deleted successfully"}, indent=2)
+            return {"message": "Event deleted successfully"}
         else:
-            return json.dumps({"error": "Failed to delete event"}, indent=2)
+            return {"error": "Failed to delete event"}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def accept_event_invitation(
         self, event_id: str, event_response_params: EventResponseParams
-    ) -> str:
+    ) -> ToolResult:
         """Accept an event invitation.
 
         Args:
@@ -254,7 +266,7 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             event_response_params (EventResponseParams): Parameters for the response, such as comments and whether to send a response.
 
         Returns:
-            str: A JSON-formatted string indicating success or failure.
+            ToolResult: A result indicating success or failure.
         """
         data = {"sendResponse": event_response_params.send_response}
         if event_response_params.comment is not None:
@@ -265,14 +277,14 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             data=data,
         )
         if status_code == 202:
-            return json.dumps({"message": "Event invitation accepted"}, indent=2)
+            return {"message": "Event invitation accepted"}
         else:
-            return json.dumps({"error": "Failed to accept event invitation"}, indent=2)
+            return {"error": "Failed to accept event invitation"}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def decline_event_invitation(
         self, event_id: str, event_changes_params: EventChangesParams
-    ) -> str:
+    ) -> ToolResult:
         """Decline an event invitation.
 
         Args:
@@ -280,7 +292,7 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             event_changes_params (EventChangesParams): Parameters for the response, such as comments.
 
         Returns:
-            str: A JSON-formatted string indicating success or failure.
+            ToolResult: A result indicating success or failure.
         """
         data = construct_data_for_response_events(event_changes_params)
 
@@ -291,9 +303,9 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         )
 
         if status_code == 202:
-            return json.dumps({"message": "Event invitation declined"}, indent=2)
+            return {"message": "Event invitation declined"}
         else:
-            return json.dumps({"error": "Failed to accept event invitation"}, indent=2)
+            return {"error": "Failed to accept event invitation"}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def tentatively_accept_event_invitation(
@@ -306,7 +318,7 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             event_changes_params (EventChangesParams): Parameters for the response, such as comments.
 
         Returns:
-            str: A JSON-formatted string indicating success or failure.
+            ToolResult: A result indicating success or failure.
         """
         data = construct_data_for_response_events(event_changes_params)
 
@@ -317,16 +329,12 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         )
 
         if status_code == 202:
-            return json.dumps(
-                {"message": "Event invitation tentatively accepted"}, indent=2
-            )
+            return {"message": "Event invitation tentatively accepted"}
         else:
-            return json.dumps(
-                {"error": "Failed to tentatively accept event invitation"}, indent=2
-            )
+            return {"error": "Failed to tentatively accept event invitation"}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def cancel_event(self, event_id: str, comment: Optional[str] = None) -> str:
+    def cancel_event(self, event_id: str, comment: Optional[str] = None) -> ToolResult:
         """Cancel an event.
 
         Args:
@@ -334,7 +342,7 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
             comment (str, optional): An optional comment to include with the cancellation.
 
         Returns:
-            str: A JSON-formatted string indicating success or failure.
+            ToolResult: A result indicating success or failure.
         """
         data = {}
 
@@ -348,6 +356,9 @@ class MicrosoftEventsRequests(MicrosoftBaseRequest):
         )
 
         if status_code == 202:
-            return json.dumps({"message": "Event canceled"}, indent=2)
+            return {"message": "Event canceled"}
         else:
-            return json.dumps({"error": "Failed to cancel the even"}, indent=2)
+            return {"error": "Failed to cancel the even"}
+
+
+AsyncMicrosoftEventsRequests = make_async_requests(MicrosoftEventsRequests)
@@ -1,10 +1,11 @@
-import json
-
 from ..helper_functions.helpers_calendar import simplify_event
 from ..param_types import *
 from ..helper_functions.helpers_email import *
 from ..constants import MASTER_CATEGORIES_URL, MESSAGES_URL, CALENDAR_EVENTS_URL, TODO_TASK_BY_ID 
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 
 
 class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
@@ -16,12 +17,13 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
     """
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_categories_microsoft_api(self) -> str:
+    @cached("categories")
+    def get_categories_microsoft_api(self) -> ToolResult:
         """
         Retrieves the categories from the user's mailbox.
 
         Returns:
-            str: JSON-formatted list of categories with their IDs and display names.
+            ToolResult: The list of categories with their IDs and display names.
         """
         (status_code, response) = self.microsoft_get(
             MASTER_CATEGORIES_URL, self.token_manager.get_token()
@@ -31,12 +33,13 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
             {"id": cat.get("id"), "displayName": cat.get("displayName")}
             for cat in categories
         ]
-        return json.dumps(simplified_categories, indent=2)
+        return simplified_categories
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("categories")
     def create_edit_category_microsoft_api(
         self, category_params: CategoryParams
-    ) -> str:
+    ) -> ToolResult:
         """
         Creates a new category or edits an existing one.
 
@@ -44,7 +47,7 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
             category_params (CategoryParams): Parameters for the category (name, color, id).
 
         Returns:
-            str: JSON-formatted response from the Microsoft API.
+            ToolResult: The response from the Microsoft API.
         """
         url = MASTER_CATEGORIES_URL
         params = {
@@ -62,10 +65,11 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
             (status_code, response) = self.microsoft_patch(
                 url, self.token_manager.get_token(), params
             )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_category_microsoft_api(self, category_id: str) -> str:
+    @invalidates("categories")
+    def delete_category_microsoft_api(self, category_id: str) -> ToolResult:
         """
         Deletes a category by its ID.
 
@@ -73,21 +77,19 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
             category_id (str): The ID of the category to delete.
 
         Returns:
-            str: JSON-formatted message indicating success or error.
+            ToolResult: A result indicating success or error.
         """
         url = f"{MASTER_CATEGORIES_URL}/{category_id}"
         (status_code, response) = self.microsoft_delete(url, self.token_manager.get_token())
         if status_code != 204:
-            return json.dumps({"error": response}, indent=2)
-        return json.dumps(
-            {"message": f"Category with ID {category_id} deleted successfully."},
-            indent=2,
-        )
+            return {"error": response}
+        return {"message": f"Category with ID {category_id} deleted successfully."}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages")
     def add_delete_category_to_email(
         self, handle_category_to_resource_params: HandleCategoryToResourceParams
-    ) -> str:
+    ) -> ToolResult:
         """
         Adds or removes categories from an email message.
 
@@ -96,12 +98,14 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
                 Parameters including resource_id, category_names, and remove flag.
 
         Returns:
-            str: JSON-formatted response with the updated message.
+            ToolResult: The updated message.
         """
         url = f"{MESSAGES_URL}/{handle_category_to_resource_params.resource_id}"
-        # get current categories
-        status_code, message_data = self.microsoft_get(url, self.token_manager.get_token())
-        existing_categories = message_data.get("categories", [])
+        # The PATCH body depends on the current categories, so this GET cannot be batched with it.
+        # Only the categories are fetched to keep the first round trip small.
+        status_code, message_data = self.microsoft_get(
+            url, self.token_manager.get_token(), params={"$select": "categories"}
+        )
 
         existing_categories = set(message_data.get("categories", []))
         new_categories = set(handle_category_to_resource_params.category_names)
@@ -116,12 +120,12 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token(), data
         )
         response = microsoft_simplify_message(response)
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def add_delete_category_to_event(
         self, handle_category_to_resource_params: HandleCategoryToResourceParams
-    ) -> str:
+    ) -> ToolResult:
         """
         Adds or removes categories from a Microsoft calendar event.
 
@@ -130,10 +134,12 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
                 Parameters including resource_id, category_names, and remove flag.
 
         Returns:
-            str: JSON-formatted response with the updated event.
+            ToolResult: The updated event.
         """
         url = f"{CALENDAR_EVENTS_URL}/{handle_category_to_resource_params.resource_id}"
-        status_code, event_data = self.microsoft_get(url, self.token_manager.get_token())
+        status_code, event_data = self.microsoft_get(
+            url, self.token_manager.get_token(), params={"$select": "categories"}
+        )
         existing_categories = set(event_data.get("categories", []))
         new_categories = set(handle_category_to_resource_params.category_names)
         updated_categories = (
@@ -146,12 +152,12 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token(), data
         )
         response = simplify_event(response)
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def add_delete_category_to_task(
         self, todo_list_id, handle_category_to_resource_params: HandleCategoryToResourceParams
-    ) -> str:
+    ) -> ToolResult:
         """
         Adds or removes categories from a Microsoft To Do task.
 
@@ -161,10 +167,12 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
                 Parameters including resource_id, category_names, and remove flag.
 
         Returns:
-            str: JSON-formatted response with the updated task.
+            ToolResult: The updated task.
         """
         url = TODO_TASK_BY_ID(todo_list_id, handle_category_to_resource_params.resource_id)
-        status_code, task_data = self.microsoft_get(url, self.token_manager.get_token())
+        status_code, task_data = self.microsoft_get(
+            url, self.token_manager.get_token(), params={"$select": "categories"}
+        )
         existing_categories = set(task_data.get("categories", []))
         new_categories = set(handle_category_to_resource_params.category_names)
         updated_categories = (
@@ -176,7 +184,7 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
         status_code, response = self.microsoft_patch(
             url, self.token_manager.get_token(), data
         )
-        return json.dumps(response, indent=2)
+        return response
     
 
     def get_preset_color_equivalence_microsoft(self) -> str:
@@ -187,3 +195,6 @@ class MicrosoftCategoriesRequests(MicrosoftBaseRequest):
             str: JSON-formatted color scheme equivalence.
         """
         return get_preset_color_scheme()
+
+
+AsyncMicrosoftCategoriesRequests = make_async_requests(MicrosoftCategoriesRequests)
@@ -1,4 +1,8 @@
-GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0/me"
+GRAPH_API_ROOT = "https://graph.microsoft.com/v1.0"
+GRAPH_BASE_URL = f"{GRAPH_API_ROOT}/me"
+
+# JSON batching
+BATCH_URL = f"{GRAPH_API_ROOT}/$batch"
 
 # Settings
 MAILBOX_SETTINGS_URL = f"{GRAPH_BASE_URL}/mailboxSettings"
@@ -27,18 +31,21 @@ CONTACTS_BY_FOLDER_URL = lambda folder_id: f"{CONTACT_FOLDERS_URL}/{folder_id}/c
 MAIL_FOLDERS_URL = f"{GRAPH_BASE_URL}/mailFolders"
 MAIL_FOLDER_CHILDREN_URL = lambda folder_id: f"{MAIL_FOLDERS_URL}/{folder_id}/childFolders"
 MESSAGES_IN_FOLDER_URL = lambda folder_id: f"{MAIL_FOLDERS_URL}/{folder_id}/messages"
+MESSAGES_DELTA_URL = lambda folder_id: f"{MAIL_FOLDERS_URL}/{folder_id}/messages/delta"
 
 # Messages (Emails)
 MESSAGES_URL = f"{GRAPH_BASE_URL}/messages"
 MESSAGE_BY_ID_URL = lambda message_id: f"{MESSAGES_URL}/{message_id}"
 MESSAGE_ATTACHMENTS_URL = lambda message_id: f"{MESSAGES_URL}/{message_id}/attachments"
 ATTACHMENT_BY_ID_URL = lambda message_id, attachment_id: f"{MESSAGES_URL}/{message_id}/attachments/{attachment_id}"
+ATTACHMENT_VALUE_URL = lambda message_id, attachment_id: f"{MESSAGES_URL}/{message_id}/attachments/{attachment_id}/$value"
 MESSAGE_RULES_URL = f"{GRAPH_BASE_URL}/mailFolders/inbox/messageRules"
 MESSAGE_RULES_URL_BY_ID_URL = lambda rule_id: f"{MESSAGE_RULES_URL}/{rule_id}"
 
 # Draft emails
 DRAFT_BY_ID_URL = lambda draft_id: f"{MESSAGES_URL}/{draft_id}"
 ADD_ATTACHMENT_TO_DRAFT_URL = lambda draft_id: f"{MESSAGES_URL}/{draft_id}/attachments"
+CREATE_UPLOAD_SESSION_URL = lambda attachments_url: f"{attachments_url}/createUploadSession"
 SEND_DRAFT_URL = lambda draft_id: f"{MESSAGES_URL}/{draft_id}/send"
 
 # Email operations
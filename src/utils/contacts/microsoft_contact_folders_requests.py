@@ -1,6 +1,8 @@
-import json
 from ..constants import CONTACT_FOLDERS_URL
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 
 
 class MicrosoftContactFoldersRequests(MicrosoftBaseRequest):
@@ -10,7 +12,8 @@ class MicrosoftContactFoldersRequests(MicrosoftBaseRequest):
     """
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def create_contact_folder(self, folder_name: str) -> str:
+    @invalidates("contact_folders")
+    def create_contact_folder(self, folder_name: str) -> ToolResult:
         """
         Creates a new contact folder in Microsoft Outlook.
 
@@ -18,30 +21,32 @@ class MicrosoftContactFoldersRequests(MicrosoftBaseRequest):
             folder_name (str): The name of the contact folder to create.
 
         Returns:
-            str: A JSON string containing the API response with the created folder details.
+            ToolResult: The API response with the created folder details.
         """
         data = {"displayName": folder_name}
 
         status_code, response = self.microsoft_post(
             CONTACT_FOLDERS_URL, self.token_manager.get_token(), data=data
         )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_contact_folders(self) -> str:
+    @cached("contact_folders")
+    def get_contact_folders(self) -> ToolResult:
         """
         Retrieves all contact folders from Microsoft Outlook.
 
         Returns:
-            str: A JSON string containing the API response with the list of contact folders.
+            ToolResult: The API response with the list of contact folders.
         """
         status_code, response = self.microsoft_get(
             CONTACT_FOLDERS_URL, self.token_manager.get_token()
         )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_contact_folder(self, folder_id: str) -> str:
+    @invalidates("contact_folders")
+    def delete_contact_folder(self, folder_id: str) -> ToolResult:
         """
         Deletes a contact folder by its ID.
 
@@ -49,7 +54,7 @@ class MicrosoftContactFoldersRequests(MicrosoftBaseRequest):
             folder_id (str): The ID of the contact folder to delete.
 
         Returns:
-            str: A JSON string containing the API response confirming the deletion.
+            ToolResult: The API response confirming the deletion.
         """
         url = f"{CONTACT_FOLDERS_URL}/{folder_id}"
         status_code, response = self.microsoft_delete(url, self.token_manager.get_token())
@@ -59,4 +64,7 @@ class MicrosoftContactFoldersRequests(MicrosoftBaseRequest):
         elif status_code == 404:
             response = {"error": "Contact folder not found."}
 
-        return json.dumps(response, indent=2)
\ No newline at end of file
+        return response
+
+
+AsyncMicrosoftContactFoldersRequests = make_async_requests(MicrosoftContactFoldersRequests)
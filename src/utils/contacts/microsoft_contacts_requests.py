@@ -1,9 +1,13 @@
-from dataclasses import asdict
-import json
 from typing import Optional
+from ..async_microsoft_base_request import make_async_requests
+from ..graph_pagination import DEFAULT_PAGE_SIZE
+from ..graph_projection import select_params
+from ..helper_functions.helpers_contacts import simplify_contact
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..odata import ODataFilter
+from ..results import ToolResult
 from ..constants import CONTACTS_BY_FOLDER_URL, CONTACTS_BY_ID_URL, CONTACTS_URL
-from ..param_types import Contact
+from ..param_types import Contact, dataclass_to_clean_dict
 
 
 class MicrosoftContactsRequests(MicrosoftBaseRequest):
@@ -14,7 +18,7 @@ class MicrosoftContactsRequests(MicrosoftBaseRequest):
     @MicrosoftBaseRequest.handle_microsoft_errors
     def get_contacts(
         self, folder_id: Optional[str] = None, name: Optional[str] = None
-    ) -> str:
+    ) -> ToolResult:
         """
         Retrieves all contacts from Microsoft Outlook.
 
@@ -22,29 +26,20 @@ class MicrosoftContactsRequests(MicrosoftBaseRequest):
             name (Optional[str]): Optional name filter for contacts.
 
         Returns:
-            str: A JSON string containing the API response with the list of contacts.
+            ToolResult: The API response with the list of contacts.
         """
-        params = {}
-        if name:
-            params["$filter"] = f"startswith(displayName, '{name}')"
+        params = ODataFilter().startswith("displayName", name or None).params()
 
         url = CONTACTS_BY_FOLDER_URL(folder_id) if folder_id else CONTACTS_URL
-        status_code, response = self.microsoft_get(
-            url, self.token_manager.get_token(), params=params
+        contacts = self.microsoft_paginate(
+            url, params=select_params(simplify_contact, params), page_size=DEFAULT_PAGE_SIZE
         )
-        simplified_contacts = [
-            {
-                "id": contact.get("id"),
-                "givenName": contact.get("givenName"),
-                "surname": contact.get("surname"),
-            }
-            for contact in response.get("value", [])
-        ]
+        simplified_contacts = [simplify_contact(contact) for contact in contacts]
 
-        return json.dumps(simplified_contacts, indent=2)
+        return simplified_contacts
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_contact_info(self, contact_id: str) -> str:
+    def get_contact_info(self, contact_id: str) -> ToolResult:
         """
         Retrieves detailed information about a specific contact by its ID.
 
@@ -52,11 +47,11 @@ class MicrosoftContactsRequests(MicrosoftBaseRequest):
             contact_id (str): The ID of the contact to retrieve.
 
         Returns:
-            str: A JSON string containing the API response with the contact details.
+            ToolResult: The API response with the contact details.
         """
         url = f"{CONTACTS_URL}/{contact_id}"
         status_code, response = self.microsoft_get(url, self.token_manager.get_token())
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def create_edit_contact(
@@ -64,7 +59,7 @@ class MicrosoftContactsRequests(MicrosoftBaseRequest):
         contact: Contact,
         folder_id: Optional[str] = None,
         contact_id: Optional[str] = None,
-    ) -> str:
+    ) -> ToolResult:
         """
         Creates a new contact in Microsoft Outlook.
 
@@ -73,9 +68,9 @@ class MicrosoftContactsRequests(MicrosoftBaseRequest):
             folder_id (Optional[str]): The ID of the contact folder where the contact will be created.
 
         Returns:
-            str: A JSON string containing the API response with the created contact details.
+            ToolResult: The API response with the created contact details.
         """
-        data = asdict(contact)
+        data = dataclass_to_clean_dict(contact)
         url = CONTACTS_BY_FOLDER_URL(folder_id) if folder_id else CONTACTS_URL
 
         if contact_id:
@@ -84,15 +79,15 @@ class MicrosoftContactsRequests(MicrosoftBaseRequest):
                 url, self.token_manager.get_token(), data=data
             )
 
-            return json.dumps(response, indent=2)
+            return response
 
         status_code, response = self.microsoft_post(
             url, self.token_manager.get_token(), data=data
         )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_contact(self, contact_id: str) -> str:
+    def delete_contact(self, contact_id: str) -> ToolResult:
         """
         Deletes a contact by its ID.
 
@@ -100,11 +95,14 @@ class MicrosoftContactsRequests(MicrosoftBaseRequest):
             contact_id (str): The ID of the contact to delete.
 
         Returns:
-            str: A message indicating the result of the operation.
+            ToolResult: A message indicating the result of the operation.
         """
         url = CONTACTS_BY_ID_URL(contact_id)
         status_code, response = self.microsoft_delete(url, self.token_manager.get_token())
         if status_code == 204:
-            return json.dumps({"message": "Contact deleted successfully."}, indent=2)
+            return {"message": "Contact deleted successfully."}
         else:
-            return json.dumps({"error": "Failed to delete contact."}, indent=2)
+            return {"error": "Failed to delete contact."}
+
+
+AsyncMicrosoftContactsRequests = make_async_requests(MicrosoftContactsRequests)
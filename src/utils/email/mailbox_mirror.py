@@ -0,0 +1,457 @@
+"""
+Local SQLite mirror of the mailbox, kept current through Graph delta queries.
+
+The mirror stores the fields produced by microsoft_simplify_message (including
+the body preview) for the messages of a few folders. Each folder is synced with
+/mailFolders/{id}/messages/delta and its deltaLink is persisted, so after a
+restart only the changes since the last sync are downloaded. A deltaLink Graph no
+longer accepts (410 Gone, syncStateNotFound) is dropped and the folder is downloaded
+again. Each sync reads at most MAILBOX_MIRROR_SYNC_PAGES pages per folder and stores
+the nextLink where it stopped, so a large first download is spread over several
+reads, which are answered by Graph until the folder is complete.
+
+When the mirror is enabled, searches and conversations are answered from it as
+long as every mirrored folder was synced recently; a stale folder is brought up
+to date with an incremental delta sync first. Methods that change messages
+invalidate the "messages" namespace of the response cache, which marks the
+mirror stale so the next read syncs those changes.
+
+Keyword and subject searches are answered by a BM25 index (search_index) built
+from the stored messages on first use and updated by every sync, with the
+EmailFilters evaluated on the same messages. Unlike Graph $search, keywords are
+matched against the subject, sender, recipients, body preview and categories,
+not the whole body.
+
+The mirror is opt-in and configured through environment variables:
+    - MAILBOX_MIRROR_ENABLED: "true" to enable the mirror. Defaults to "false".
+    - MAILBOX_MIRROR_PATH: Path of the SQLite database, relative to the project root.
+      Defaults to "mailbox_mirror.sqlite3".
+    - MAILBOX_MIRROR_FOLDERS: Comma-separated folders to mirror. Defaults to "inbox,sentitems".
+    - MAILBOX_MIRROR_MAX_AGE: Seconds a folder is considered fresh after a sync. Defaults to 300.
+    - MAILBOX_MIRROR_SYNC_PAGES: Pages read per folder and sync. Defaults to 20.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import requests
+
+from ..constants import MESSAGES_DELTA_URL
+from ..helper_functions.helpers_email import microsoft_simplify_message
+from ..param_types import EmailQuery
+from ..response_cache import response_cache
+from .search_index import MailSearchIndex
+
+# The projection of microsoft_simplify_message plus the folder, used by folder-scoped searches
+MIRROR_SELECT_FIELDS = ",".join(microsoft_simplify_message.select_fields + ("parentFolderId",))
+DELTA_PAGE_SIZE = 50
+# Error codes of a deltaLink Graph no longer accepts; the folder must be downloaded again
+EXPIRED_SYNC_STATE_CODES = {"syncStateNotFound", "syncStateInvalid", "resyncRequired"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    mirror_folder TEXT NOT NULL,
+    conversation_id TEXT,
+    subject TEXT,
+    sender_name TEXT,
+    sender_address TEXT,
+    body_preview TEXT,
+    received TEXT,
+    is_read INTEGER,
+    has_attachments INTEGER,
+    importance TEXT,
+    categories TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_received ON messages (received DESC);
+CREATE INDEX IF NOT EXISTS messages_conversation ON messages (conversation_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    mirror_folder TEXT PRIMARY KEY,
+    folder_id TEXT,
+    delta_link TEXT,
+    synced_at REAL
+);
+"""
+
+
+def _to_graph_datetime(value: datetime) -> str:
+    """Formats a datetime like Graph does (UTC, "Z" suffix) so stored values compare as strings."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class MailboxMirror:
+    """
+    SQLite store of the mirrored folders and their delta sync state.
+
+    Attributes:
+        folders (List[str]): The mirrored folders (well-known names or folder IDs).
+        max_age (float): Seconds a folder is considered fresh after a sync.
+        max_sync_pages (int): Pages read per folder and sync.
+    """
+
+    def __init__(
+        self, db_path: str, folders: List[str], max_age: float = 300, max_sync_pages: int = 20
+    ):
+        """
+        Opens (and creates if needed) the mirror database.
+
+        Args:
+            db_path (str): Path of the SQLite database. ":memory:" keeps it in memory.
+            folders (List[str]): The folders to mirror.
+            max_age (float, optional): Seconds a folder is considered fresh after a sync. Defaults to 300.
+            max_sync_pages (int, optional): Pages read per folder and sync. Defaults to 20.
+        """
+        self.folders = folders
+        self.max_age = max_age
+        self.max_sync_pages = max_sync_pages
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._index: Optional[MailSearchIndex] = None
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["MailboxMirror"]:
+        """
+        Builds the mirror from the MAILBOX_MIRROR_* environment variables.
+
+        Returns:
+            Optional[MailboxMirror]: The mirror, or None if it is not enabled.
+        """
+        if os.getenv("MAILBOX_MIRROR_ENABLED", "false").lower() != "true":
+            return None
+        base_dir = Path(__file__).resolve().parents[3]
+        db_path = base_dir / os.getenv("MAILBOX_MIRROR_PATH", "mailbox_mirror.sqlite3")
+        folders = [
+            folder.strip()
+            for folder in os.getenv("MAILBOX_MIRROR_FOLDERS", "inbox,sentitems").split(",")
+            if folder.strip()
+        ]
+        return cls(
+            str(db_path),
+            folders,
+            float(os.getenv("MAILBOX_MIRROR_MAX_AGE", 300)),
+            int(os.getenv("MAILBOX_MIRROR_SYNC_PAGES", 20)),
+        )
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def covers(self, folder_id: Optional[str]) -> bool:
+        """
+        Whether a query on the given folder can be answered from the mirror.
+
+        Args:
+            folder_id (Optional[str]): The folder of the query. None means every mirrored folder.
+
+        Returns:
+            bool: True if the folder is mirrored (by well-known name or by ID).
+        """
+        if folder_id is None or folder_id in self.folders:
+            return True
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM sync_state WHERE folder_id = ?", (folder_id,)
+            ).fetchone()
+        return row is not None
+
+    def is_fresh(self) -> bool:
+        """True if every mirrored folder was synced less than max_age seconds ago."""
+        return not self.stale_folders()
+
+    def stale_folders(self) -> List[str]:
+        """
+        Returns the mirrored folders that need a sync.
+
+        Returns:
+            List[str]: The folders never synced or synced more than max_age seconds ago.
+        """
+        with self._lock:
+            synced = {
+                row["mirror_folder"]: row["synced_at"] or 0
+                for row in self._connection.execute(
+                    "SELECT mirror_folder, synced_at FROM sync_state"
+                )
+            }
+        limit = time.time() - self.max_age
+        return [folder for folder in self.folders if synced.get(folder, 0) <= limit]
+
+    def mark_stale(self) -> None:
+        """Forces the next read to sync every folder. The delta links are kept."""
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE sync_state SET synced_at = 0")
+
+    def sync(
+        self,
+        get: Callable[..., tuple],
+        get_token: Callable[[], str],
+        folders: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Brings folders up to date with Graph delta queries.
+
+        A folder without a stored deltaLink is fully downloaded; otherwise only the
+        changes since the last sync are requested. At most max_sync_pages pages are
+        read per folder: a folder whose round is not finished keeps the nextLink and
+        stays stale, and the next sync continues from it.
+
+        Args:
+            get (Callable): The GET verb, called as get(url, token, params=params, headers=headers).
+            get_token (Callable[[], str]): Returns a valid token.
+            folders (Optional[List[str]]): The folders to sync. Defaults to the stale folders.
+        """
+        # One sync at a time, so concurrent tool calls do not download the same changes twice
+        with self._sync_lock:
+            for folder in folders if folders is not None else self.stale_folders():
+                self._sync_folder(folder, get, get_token)
+
+    def _sync_folder(
+        self, folder: str, get: Callable[..., tuple], get_token: Callable[[], str]
+    ) -> None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT delta_link, folder_id FROM sync_state WHERE mirror_folder = ?", (folder,)
+            ).fetchone()
+        link = row["delta_link"] if row else None
+        folder_id = row["folder_id"] if row else None
+        try:
+            self._sync_round(folder, link, folder_id, get, get_token)
+        except requests.HTTPError as e:
+            if not link or not _sync_state_expired(e):
+                raise
+            # The deltaLink expired: forget it and download the folder again
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "UPDATE sync_state SET delta_link = NULL, synced_at = 0 WHERE mirror_folder = ?",
+                    (folder,),
+                )
+            self._sync_round(folder, None, folder_id, get, get_token)
+
+    def _sync_round(
+        self,
+        folder: str,
+        link: Optional[str],
+        folder_id: Optional[str],
+        get: Callable[..., tuple],
+        get_token: Callable[[], str],
+    ) -> None:
+        full = link is None
+        url = link or MESSAGES_DELTA_URL(folder)
+        params = {"$select": MIRROR_SELECT_FIELDS} if full else None
+        headers = {"Prefer": f"odata.maxpagesize={DELTA_PAGE_SIZE}"}
+
+        upserts, removed = [], []
+        for _ in range(self.max_sync_pages):
+            status_code, response = get(url, get_token(), params=params, headers=headers)
+            for message in response.get("value", []):
+                if "@removed" in message:
+                    removed.append(message["id"])
+                else:
+                    folder_id = message.get("parentFolderId") or folder_id
+                    upserts.append(microsoft_simplify_message(message))
+            if "@odata.nextLink" not in response:
+                next_link, synced_at = response.get("@odata.deltaLink"), time.time()
+                break
+            url, params = response["@odata.nextLink"], None
+        else:
+            # Page budget spent: keep the nextLink, the folder stays stale until the round ends
+            next_link, synced_at = url, 0
+
+        # Changes are applied in a single transaction per sync
+        with self._lock, self._connection:
+            if full:
+                self._connection.execute("DELETE FROM messages WHERE mirror_folder = ?", (folder,))
+            self._connection.executemany("DELETE FROM messages WHERE id = ?", [(i,) for i in removed])
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._row(folder, message) for message in upserts],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                (folder, folder_id, next_link, synced_at),
+            )
+            if full:
+                # Rebuilt from the stored messages on next use
+                self._index = None
+            index = self._index
+        if index is not None:
+            for message_id in removed:
+                index.remove(message_id)
+            for message in upserts:
+                index.add(message, folder)
+
+    @staticmethod
+    def _row(folder: str, simplified: dict) -> tuple:
+        return (
+            simplified["id"],
+            folder,
+            simplified["conversationId"],
+            simplified["subject"],
+            simplified["from"]["name"],
+            (simplified["from"]["address"] or "").lower(),
+            simplified["bodyPreview"],
+            simplified["receivedDateTime"],
+            int(bool(simplified["isRead"])),
+            int(bool(simplified["hasAttachments"])),
+            (simplified["importance"] or "").lower(),
+            json.dumps(simplified["categories"] or []),
+            json.dumps(simplified),
+        )
+
+    @staticmethod
+    def _folder_clause(folder_id: Optional[str]) -> tuple:
+        if folder_id is None:
+            return [], []
+        clause = (
+            "(mirror_folder = ? OR mirror_folder IN "
+            "(SELECT mirror_folder FROM sync_state WHERE folder_id = ?))"
+        )
+        return [clause], [folder_id, folder_id]
+
+    def search_index(self) -> MailSearchIndex:
+        """
+        Returns the full-text index of the stored messages, building it on first use.
+
+        Returns:
+            MailSearchIndex: The index, kept up to date by every sync.
+        """
+        with self._lock:
+            if self._index is None:
+                index = MailSearchIndex()
+                for row in self._connection.execute("SELECT mirror_folder, data FROM messages"):
+                    index.add(json.loads(row["data"]), row["mirror_folder"])
+                self._index = index
+            return self._index
+
+    def _mirror_folders(self, folder_id: Optional[str]) -> List[str]:
+        if folder_id is None:
+            return list(self.folders)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT mirror_folder FROM sync_state WHERE mirror_folder = ? OR folder_id = ?",
+                (folder_id, folder_id),
+            ).fetchall()
+        return [row["mirror_folder"] for row in rows]
+
+    def search(self, email_query: EmailQuery) -> List[dict]:
+        """
+        Answers an email query from the local store.
+
+        Keyword and subject searches are ranked by relevance (BM25) and combined with
+        the filters in a single pass; filter-only queries return the newest messages first.
+
+        Args:
+            email_query (EmailQuery): The query, with the same meaning as for Graph.
+
+        Returns:
+            List[dict]: The matching simplified messages.
+        """
+        search = email_query.search
+        if search and (search.keyword or search.subject):
+            return self.search_index().search(
+                search.keyword or search.subject,
+                fields=None if search.keyword else ["subject"],
+                filters=email_query.filters,
+                groups=self._mirror_folders(email_query.folder_id),
+                limit=email_query.number_emails,
+            )
+
+        clauses, values = self._folder_clause(email_query.folder_id)
+        filters = email_query.filters
+        if filters:
+            if filters.date_filter and filters.date_filter.start_date:
+                clauses.append("received >= ?")
+                values.append(_to_graph_datetime(filters.date_filter.start_date))
+            if filters.date_filter and filters.date_filter.end_date:
+                clauses.append("received <= ?")
+                values.append(_to_graph_datetime(filters.date_filter.end_date))
+            if filters.importance:
+                clauses.append("importance = ?")
+                values.append(filters.importance.lower())
+            if filters.senderName:
+                clauses.append("sender_name = ?")
+                values.append(filters.senderName)
+            if filters.sender:
+                clauses.append("sender_address = ?")
+                values.append(filters.sender.lower())
+            if filters.unread_only:
+                clauses.append("is_read = 0")
+            if filters.has_attachments:
+                clauses.append("has_attachments = 1")
+            if filters.categories:
+                placeholders = ", ".join("?" for _ in filters.categories)
+                clauses.append(
+                    f"EXISTS (SELECT 1 FROM json_each(categories) WHERE value IN ({placeholders}))"
+                )
+                values.extend(filters.categories)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT data FROM messages {where} ORDER BY received DESC LIMIT ?"
+        with self._lock:
+            rows = self._connection.execute(query, [*values, email_query.number_emails]).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def conversation(self, conversation_id: str, limit: int) -> List[dict]:
+        """
+        Returns the messages of a conversation from the local store, oldest first.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            limit (int): Maximum number of messages to return.
+
+        Returns:
+            List[dict]: The simplified messages of the conversation.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data FROM messages WHERE conversation_id = ? ORDER BY received LIMIT ?",
+                (conversation_id, limit),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+
+def _sync_state_expired(error: requests.HTTPError) -> bool:
+    """True if Graph rejected a deltaLink because its sync state expired."""
+    response = error.response
+    if response is None:
+        return False
+    if response.status_code == 410:
+        return True
+    try:
+        code = response.json().get("error", {}).get("code")
+    except ValueError:
+        return False
+    return code in EXPIRED_SYNC_STATE_CODES
+
+
+_mirror_lock = threading.Lock()
+_mirror: Optional[MailboxMirror] = None
+_mirror_loaded = False
+
+
+def get_mailbox_mirror() -> Optional[MailboxMirror]:
+    """
+    Returns the process-wide mailbox mirror, opening it on first use.
+
+    Returns:
+        Optional[MailboxMirror]: The mirror, or None if MAILBOX_MIRROR_ENABLED is not "true".
+    """
+    global _mirror, _mirror_loaded
+    if not _mirror_loaded:
+        with _mirror_lock:
+            if not _mirror_loaded:
+                _mirror = MailboxMirror.from_env()
+                if _mirror is not None:
+                    response_cache.on_invalidate("messages", _mirror.mark_stale)
+                _mirror_loaded = True
+    return _mirror
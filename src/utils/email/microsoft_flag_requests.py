@@ -1,9 +1,10 @@
-import json
-
 from ..param_types import *
 from ..helper_functions.helpers_email import *
-from ..constants import MESSAGES_URL
+from ..constants import MESSAGE_BY_ID_URL, MESSAGES_URL
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import invalidates
 
 class MicrosoftFlagRequests(MicrosoftBaseRequest):
     """
@@ -13,6 +14,7 @@ class MicrosoftFlagRequests(MicrosoftBaseRequest):
     """
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages")
     def manage_flags_microsoft_api(self, email_id: str, flag: str):
         """
         Sets or updates the flag status of an email message.
@@ -22,11 +24,11 @@ class MicrosoftFlagRequests(MicrosoftBaseRequest):
             flag (str): The flag status to set. Must be one of 'complete', 'notFlagged', or 'flagged'.
 
         Returns:
-            str: A JSON-formatted string containing the API response or an error message if the flag is invalid.
+            ToolResult: The API response or an error message if the flag is invalid.
         """
         url = MESSAGES_URL + f"/{email_id}"
         if flag not in ["complete", "notFlagged", "flagged"]:
-            return json.dumps({"error": "Not valid flag submited"}, indent=2)
+            return {"error": "Not valid flag submited"}
 
         data = {"flag": {"flagStatus": f"{flag}"}}
 
@@ -34,4 +36,28 @@ class MicrosoftFlagRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token(), data=data
         )
         response = microsoft_simplify_message(response)
-        return json.dumps(response, indent=2)
+        return response
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages")
+    def bulk_manage_flags_microsoft_api(self, email_ids: List[str], flag: str):
+        """
+        Sets or updates the flag status of several email messages using batched requests.
+
+        Args:
+            email_ids (List[str]): The unique identifiers of the email messages to flag.
+            flag (str): The flag status to set. Must be one of 'complete', 'notFlagged', or 'flagged'.
+
+        Returns:
+            ToolResult: The per-email result summary or an error message if the flag is invalid.
+        """
+        if flag not in ["complete", "notFlagged", "flagged"]:
+            return {"error": "Not valid flag submited"}
+
+        summary = self.microsoft_bulk(
+            email_ids, "PATCH", MESSAGE_BY_ID_URL, {"flag": {"flagStatus": flag}}
+        )
+        return summary
+
+
+AsyncMicrosoftFlagRequests = make_async_requests(MicrosoftFlagRequests)
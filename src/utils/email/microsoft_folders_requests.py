@@ -1,9 +1,11 @@
-import json
-
 from ..param_types import *
 from ..helper_functions.helpers_email import *
 from ..constants import MAIL_FOLDER_CHILDREN_URL, MAIL_FOLDERS_URL
+from ..async_microsoft_base_request import make_async_requests
+from ..graph_pagination import DEFAULT_PAGE_SIZE
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 
 
 class MicrosoftFoldersRequests(MicrosoftBaseRequest):
@@ -15,17 +17,15 @@ class MicrosoftFoldersRequests(MicrosoftBaseRequest):
     """
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_folder_names(self) -> str:
+    @cached("mail_folders")
+    def get_folder_names(self) -> ToolResult:
         """
         Retrieves the names and details of all mail folders in the user's mailbox.
 
         Returns:
-            str: A JSON-formatted string containing a list of folders with their IDs, display names, and item counts. Includes '@odata.nextLink' if pagination is required.
+            ToolResult: A list of folders with their IDs, display names, and item counts. Includes 'nextLink' if the page budget was reached.
         """
-        (status_code, response) = self.microsoft_get(
-            MAIL_FOLDERS_URL, self.token_manager.get_token()
-        )
-        folders = response.get("value", [])
+        folders = self.microsoft_paginate(MAIL_FOLDERS_URL, page_size=DEFAULT_PAGE_SIZE)
         simplified_folders = []
 
         for folder in folders:
@@ -38,14 +38,14 @@ class MicrosoftFoldersRequests(MicrosoftBaseRequest):
 
         result = {"folders": simplified_folders}
 
-        # Agregar @odata.nextLink si existe
-        if "@odata.nextLink" in response:
-            result["nextLink"] = response["@odata.nextLink"]
+        if folders.next_link:
+            result["nextLink"] = folders.next_link
 
-        return json.dumps(result, indent=2)
+        return result
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_subfolders_microsoft_api(self, folder_id: str) -> str:
+    @cached("mail_folders")
+    def get_subfolders_microsoft_api(self, folder_id: str) -> ToolResult:
         """
         Retrieves the subfolders of a specified mail folder.
 
@@ -53,11 +53,10 @@ class MicrosoftFoldersRequests(MicrosoftBaseRequest):
             folder_id (str): The ID of the parent folder whose subfolders are to be retrieved.
 
         Returns:
-            str: A JSON-formatted string containing a list of subfolders with their IDs, display names, and item counts. Includes '@odata.nextLink' if pagination is required.
+            ToolResult: A list of subfolders with their IDs, display names, and item counts. Includes 'nextLink' if the page budget was reached.
         """
         url = MAIL_FOLDER_CHILDREN_URL(folder_id)
-        (status_code, response) = self.microsoft_get(url, self.token_manager.get_token())
-        folders = response.get("value", [])
+        folders = self.microsoft_paginate(url, page_size=DEFAULT_PAGE_SIZE)
         simplified_folders = []
 
         for folder in folders:
@@ -70,13 +69,14 @@ class MicrosoftFoldersRequests(MicrosoftBaseRequest):
 
         result = {"folders": simplified_folders}
 
-        if "@odata.nextLink" in response:
-            result["nextLink"] = response["@odata.nextLink"]
+        if folders.next_link:
+            result["nextLink"] = folders.next_link
 
-        return json.dumps(result, indent=2)
+        return result
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def create_edit_folder_microsoft_api(self, folder_params: FolderParams) -> str:
+    @invalidates("mail_folders")
+    def create_edit_folder_microsoft_api(self, folder_params: FolderParams) -> ToolResult:
         """
         Creates a new mail folder or edits an existing one in the user's mailbox.
 
@@ -86,14 +86,14 @@ class MicrosoftFoldersRequests(MicrosoftBaseRequest):
             folder_params (FolderParams): Parameters for the folder, including name, parent folder ID, and folder ID.
 
         Returns:
-            str: A JSON-formatted string indicating the result of the operation or an error message if the folder name is missing.
+            ToolResult: A result indicating the result of the operation or an error message if the folder name is missing.
         """
         url = MAIL_FOLDERS_URL
         data = {
             "displayName": folder_params.folder_name,
         }
         if not folder_params.folder_name:
-            return json.dumps({"error": "Folder name is required."}, indent=2)
+            return {"error": "Folder name is required."}
 
         if folder_params.parent_folder_id:
             url = MAIL_FOLDER_CHILDREN_URL(folder_params.parent_folder_id)
@@ -110,10 +110,11 @@ class MicrosoftFoldersRequests(MicrosoftBaseRequest):
                 url, self.token_manager.get_token(), data
             )
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_folder_microsoft_api(self, folder_id: str) -> str:
+    @invalidates("mail_folders")
+    def delete_folder_microsoft_api(self, folder_id: str) -> ToolResult:
         """
         Deletes a mail folder from the user's mailbox.
 
@@ -121,12 +122,13 @@ class MicrosoftFoldersRequests(MicrosoftBaseRequest):
             folder_id (str): The ID of the folder to delete.
 
         Returns:
-            str: A JSON-formatted string indicating success or an error message if the deletion fails.
+            ToolResult: A result indicating success or an error message if the deletion fails.
         """
         url = f"{MAIL_FOLDERS_URL}/{folder_id}"
         (status_code, response) = self.microsoft_delete(url, self.token_manager.get_token())
         if status_code != 204:
-            return json.dumps({"error": response}, indent=2)
-        return json.dumps(
-            {"message": f"Folder with ID {folder_id} deleted successfully."}, indent=2
-        )
+            return {"error": response}
+        return {"message": f"Folder with ID {folder_id} deleted successfully."}
+
+
+AsyncMicrosoftFoldersRequests = make_async_requests(MicrosoftFoldersRequests)
@@ -1,9 +1,7 @@
-import json
-
-
 from ..helper_functions.helpers_email import (
     build_filter_params,
     build_search_params,
+    message_matches_filters,
     microsoft_simplify_message,
     remove_duplicate_messages,
 )
@@ -11,6 +9,7 @@ from ..param_types import *
 from ..constants import (
     ADD_ATTACHMENT_TO_DRAFT_URL,
     ATTACHMENT_BY_ID_URL,
+    ATTACHMENT_VALUE_URL,
     COPY_EMAIL_URL,
     CREATE_REPLY_ALL_URL,
     CREATE_REPLY_URL,
@@ -23,7 +22,16 @@ from ..constants import (
     MOVE_EMAIL_URL,
     SEND_DRAFT_URL,
 )
+from ..async_microsoft_base_request import make_async_requests
+from ..graph_batch import BatchRequest, summarize_batch_results
+from ..graph_pagination import STREAMED_PAGE_SIZE, decode_cursor, encode_cursor
+from ..graph_projection import select_params
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import MessageListResult, MessageRecord, ToolResult
+from ..response_cache import invalidates
+from .mailbox_mirror import MailboxMirror, get_mailbox_mirror
+from .query_planner import FILTER_FIRST, plan_email_query
+from .search_index import message_matches_text
 
 
 class MicrosoftMessagesRequests(MicrosoftBaseRequest):
@@ -39,7 +47,7 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
         email_query: Optional[EmailQuery] = None,
         params: Optional[dict] = None,
         folder_id: Optional[str] = None,
-    ) -> str:
+    ) -> ToolResult:
         """Retrieves messages from a specified folder using search and filter parameters.
 
         Args:
@@ -48,60 +56,44 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
             folder_id (Optional[str]): The ID of the folder to retrieve messages from.
 
         Returns:
-            str: A JSON string containing the retrieved messages.
+            ToolResult: The retrieved messages.
         """
 
         if params is not None:
             return self._get_and_format_messages(params, folder_id)
 
         if email_query is None:
-            raise json.dumps({"error": "You must provided search params"}, indent=2)
+            return {"error": "You must provided search params"}
 
-        has_search = bool(
-            email_query.search
-            and (email_query.search.keyword or email_query.search.subject)
-        )
-        has_filters = bool(
-            email_query.filters
-            and (
-                email_query.filters.date_filter
-                or email_query.filters.importance
-                or email_query.filters.sender
-                or email_query.filters.unread_only
-                or email_query.filters.has_attachments
-                or email_query.filters.categories
+        if email_query.cursor:
+            return self._get_and_format_messages(
+                {"$top": email_query.number_emails}, cursor=email_query.cursor
             )
-        )
+
+        # The mirror lists the newest received messages first and keeps no total count
+        if not email_query.include_count and email_query.order_by in (None, EmailOrder()):
+            mirror = self._fresh_mirror(email_query.folder_id)
+            if mirror is not None:
+                return {"messages": mirror.search(email_query)}
 
         search_params = build_search_params(email_query.search)
-        filter_params = build_filter_params(email_query.filters)
+        # Graph does not sort $search results, which come newest first
+        filter_params = build_filter_params(email_query.filters, email_query.order_by)
+        has_search = "$search" in search_params
+        has_filters = "$filter" in filter_params
 
-        if "$top" not in search_params:
-            search_params["$top"] = email_query.number_emails
-        if "$top" not in filter_params:
-            filter_params["$top"] = email_query.number_emails
+        for query_params in (search_params, filter_params):
+            query_params.setdefault("$top", email_query.number_emails)
+            if email_query.include_count:
+                query_params["$count"] = "true"
 
-        # If both search and filter are provided, we need to intersect the results
+        # Graph rejects $search with $filter, so one side is sent and the other evaluated here
         if has_search and has_filters:
-            search_result = self._get_and_format_messages(
-                search_params, email_query.folder_id
+            if email_query.include_count:
+                return {"error": "include_count is not supported when search and filters are combined"}
+            return self._get_searched_and_filtered_messages(
+                email_query, search_params, filter_params
             )
-            filter_result = self._get_and_format_messages(
-                filter_params, email_query.folder_id
-            )
-
-            search_messages = json.loads(search_result).get("messages", [])
-            filter_messages = json.loads(filter_result).get("messages", [])
-
-            # Intersect the results based on message IDs
-            search_ids = {msg["id"] for msg in search_messages}
-            filtered_ids = {msg["id"]: msg for msg in filter_messages}
-
-            intersected = [
-                filtered_ids[msg_id] for msg_id in search_ids if msg_id in filtered_ids
-            ]
-            unique_messages = remove_duplicate_messages(intersected)
-            return json.dumps({"messages": unique_messages}, indent=2)
 
         # Just search or filter
         final_params = search_params if has_search else filter_params
@@ -111,29 +103,42 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
         return self._get_and_format_messages(final_params, email_query.folder_id)
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_conversation_messages_microsoft_api(self, params: dict) -> str:
+    def get_conversation_messages_microsoft_api(
+        self, params: dict, conversation_id: Optional[str] = None
+    ) -> ToolResult:
         """Retrieves messages in a conversation based on provided parameters.
 
         Args:
             params (dict): Query parameters for the API call.
+            conversation_id (Optional[str]): The ID of the conversation. If given, the
+                messages can be answered from the mailbox mirror when it is enabled.
 
         Returns:
-            str: A JSON string containing the conversation messages.
+            ToolResult: The conversation messages.
         """
-        (status_code, response) = self.microsoft_get(
-            MESSAGES_URL, self.token_manager.get_token(), params=params
+        if conversation_id is not None:
+            mirror = self._fresh_mirror()
+            if mirror is not None:
+                messages = mirror.conversation(conversation_id, params.get("$top", 10))
+                return {"messages": messages}
+
+        # $top is the number of messages wanted; pages are followed until it is reached
+        messages = self.microsoft_paginate(
+            MESSAGES_URL,
+            params=select_params(microsoft_simplify_message, params),
+            max_items=params.get("$top"),
         )
-        messages = response.get("value", [])
-        simplified_messages = [microsoft_simplify_message(msg) for msg in messages]
-        result = {"messages": simplified_messages}
-        if "@odata.nextLink" in response:
-            result["nextLink"] = response["@odata.nextLink"]
-        return json.dumps(result, indent=2)
+        # Records stay compact until the tool encodes its output
+        result = {"messages": [MessageRecord.from_graph(msg) for msg in messages]}
+        if messages.next_link:
+            result["nextLink"] = messages.next_link
+        return result
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages")
     def mark_as_read_unread_microsoft_api(
         self, message_id: str, is_read: bool = True
-    ) -> str:
+    ) -> ToolResult:
         """Marks a message as read or unread.
 
         Args:
@@ -141,81 +146,125 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
             is_read (bool, optional): Whether to mark as read (True) or unread (False). Defaults to True.
 
         Returns:
-            str: A JSON string containing the updated message.
+            ToolResult: The updated message.
         """
         url = MESSAGE_BY_ID_URL(message_id)
         data = {"isRead": is_read}
-        self.microsoft_patch(url, self.token_manager.get_token(), data)
-        (status_code, response) = self.microsoft_get(url, self.token_manager.token)
-        return json.dumps(microsoft_simplify_message(response), indent=2)
+        # Graph answers the PATCH with the updated message, so no extra GET is needed
+        (status_code, response) = self.microsoft_patch(
+            url, self.token_manager.get_token(), data
+        )
+        return microsoft_simplify_message(response)
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages")
+    def bulk_mark_as_read_unread_microsoft_api(
+        self, message_ids: List[str], is_read: bool = True
+    ) -> ToolResult:
+        """Marks several messages as read or unread using batched requests.
+
+        Args:
+            message_ids (List[str]): The IDs of the messages to update.
+            is_read (bool, optional): Whether to mark as read (True) or unread (False). Defaults to True.
+
+        Returns:
+            ToolResult: The per-message result summary.
+        """
+        summary = self.microsoft_bulk(
+            message_ids, "PATCH", MESSAGE_BY_ID_URL, {"isRead": is_read}
+        )
+        return summary
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_full_message_and_attachments(self, message_id: str) -> str:
+    def get_full_message_and_attachments(self, message_id: str) -> ToolResult:
         """Retrieves a full message and its attachments.
 
         Args:
             message_id (str): The ID of the message to retrieve.
 
         Returns:
-            str: A JSON string containing the message and its attachments.
+            ToolResult: The message and its attachments.
         """
-        base_url = MESSAGE_BY_ID_URL(message_id)
-
-        (status_code, msg_data) = self.microsoft_get(
-            base_url, self.token_manager.get_token()
+        # Message and attachments are fetched in a single $batch round trip
+        responses = self.microsoft_batch(
+            [
+                BatchRequest(
+                    id="message",
+                    method="GET",
+                    url=MESSAGE_BY_ID_URL(message_id),
+                    params=select_params(microsoft_simplify_message, extra_fields=("body",)),
+                ),
+                # Metadata only: the content of every file is streamed to disk afterwards
+                BatchRequest(
+                    id="attachments",
+                    method="GET",
+                    url=MESSAGE_ATTACHMENTS_URL(message_id),
+                    params={"$select": "id,name,contentType,size"},
+                ),
+            ],
+            self.token_manager.get_token(),
         )
-        attachments_url = MESSAGE_ATTACHMENTS_URL(message_id)
-        (att_status, att_data) = self.microsoft_get(
-            attachments_url, self.token_manager.get_token()
+        msg_data = responses["message"].raise_for_status().body
+        attachments = responses["attachments"].raise_for_status().body.get("value", [])
+        downloaded_attachments = self.download_attachments(
+            attachments,
+            lambda attachment_id: ATTACHMENT_VALUE_URL(message_id, attachment_id),
         )
-        attachments = att_data.get("value", [])
-        downloaded_attachments = self.download_attachments(attachments)
-        return json.dumps(
-            microsoft_simplify_message(
-                msg_data,
-                full=True,
-                attachments=attachments,
-                attachments_download_path=downloaded_attachments,
-            ),
-            indent=2,
+        return microsoft_simplify_message(
+            msg_data,
+            full=True,
+            attachments=attachments,
+            attachments_download_path=downloaded_attachments,
         )
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_message_microsoft_api(self, message_id: str) -> str:
+    @invalidates("messages", "mail_folders")
+    def delete_message_microsoft_api(self, message_id: str) -> ToolResult:
         """Deletes a message by its ID.
 
         Args:
             message_id (str): The ID of the message to delete.
 
         Returns:
-            str: A JSON string indicating the result of the deletion.
+            ToolResult: The result of the deletion.
         """
         url = MESSAGE_BY_ID_URL(message_id)
 
         (status_code, response) = self.microsoft_delete(url, self.token_manager.get_token())
         if status_code != 204:
-            return json.dumps({"error": response}, indent=2)
-        return json.dumps(
-            {"message": f"Message with ID {message_id} deleted successfully."}, indent=2
-        )
+            return {"error": response}
+        return {"message": f"Message with ID {message_id} deleted successfully."}
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages", "mail_folders")
+    def bulk_delete_messages_microsoft_api(self, message_ids: List[str]) -> ToolResult:
+        """Deletes several messages using batched requests.
+
+        Args:
+            message_ids (List[str]): The IDs of the messages to delete.
+
+        Returns:
+            ToolResult: The per-message result summary.
+        """
+        summary = self.microsoft_bulk(message_ids, "DELETE", MESSAGE_BY_ID_URL)
+        return summary
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def create_edit_draft_microsoft_api(self, draft_email_data: DraftEmailData) -> str:
+    @invalidates("mail_folders")
+    def create_edit_draft_microsoft_api(self, draft_email_data: DraftEmailData) -> ToolResult:
         """Creates or edits a draft email message.
 
         Args:
             draft_email_data (DraftEmailData): The data for the draft email.
 
         Returns:
-            str: A JSON string containing the created or updated draft message.
+            ToolResult: The created or updated draft message.
         """
         if not draft_email_data.subject or not draft_email_data.body:
-            return json.dumps({"error": "Subject and body are required."}, indent=2)
+            return {"error": "Subject and body are required."}
         url = MESSAGES_URL
         if draft_email_data.importance.lower() not in ["low", "normal", "high"]:
-            return json.dumps(
-                {"error": "Importance must be one of: low, normal, high."}, indent=2
-            )
+            return {"error": "Importance must be one of: low, normal, high."}
         data = {
             "subject": draft_email_data.subject,
             "body": {"contentType": "HTML", "content": draft_email_data.body},
@@ -246,66 +295,52 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
             (status_code, response) = self.microsoft_post(
                 url, self.token_manager.get_token(), data
             )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def add_attachment_to_draft_microsoft_api(
-        self, draft_id: str, attachment_path: str, content_type: str
-    ) -> str:
+        self, draft_id: str, attachment_path: str, content_type: Optional[str] = None
+    ) -> ToolResult:
         """Adds an attachment to a draft email.
 
+        Files larger than 3 MB are streamed through an upload session.
+
         Args:
             draft_id (str): The ID of the draft email.
             attachment_path (str): The file path of the attachment.
-            content_type (str): The MIME type of the attachment.
+            content_type (Optional[str]): The MIME type of the attachment. Guessed from the file name if not given.
 
         Returns:
-            str: A JSON string containing the attachment details.
+            ToolResult: The attachment details.
         """
         url = ADD_ATTACHMENT_TO_DRAFT_URL(draft_id)
         try:
-            attachment_name, attachment_content = self.read_file_and_encode_base64(
-                attachment_path
-            )
+            response_data = self.upload_attachment(url, attachment_path, content_type)
         except FileNotFoundError as e:
-            return json.dumps({"error": str(e)}, indent=2)
-        data = {
-            "@odata.type": "#microsoft.graph.fileAttachment",
-            "name": attachment_name,
-            "contentBytes": attachment_content,
-            "contentType": content_type,
-        }
-        status_code, response = self.microsoft_post(
-            url, self.token_manager.get_token(), data
-        )
-        response_data = {
-            "attachment_id": response.get("id"),
-            "name": response.get("name"),
-            "contentType": response.get("contentType"),
-            "size": response.get("size"),
-        }
-        return json.dumps(response_data, indent=2)
+            return {"error": str(e)}
+        return response_data
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def send_draft_email_microsoft_api(self, draft_id: str) -> str:
+    @invalidates("messages", "mail_folders")
+    def send_draft_email_microsoft_api(self, draft_id: str) -> ToolResult:
         """Sends a draft email message.
 
         Args:
             draft_id (str): The ID of the draft email to send.
 
         Returns:
-            str: A JSON string indicating the result of the send operation.
+            ToolResult: The result of the send operation.
         """
 
         (status_code, response) = self.microsoft_post(
             SEND_DRAFT_URL(draft_id), self.token_manager.get_token(), data={}
         )
-        return json.dumps({"message": "Email sent successfully."}, indent=2)
+        return {"message": "Email sent successfully."}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
     def delete_attachment_from_draft_microsoft_api(
         self, draft_id: str, attachment_id: str
-    ) -> str:
+    ) -> ToolResult:
         """Deletes an attachment from a draft email.
 
         Args:
@@ -313,7 +348,7 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
             attachment_id (str): The ID of the attachment to delete.
 
         Returns:
-            str: A JSON string indicating the result of the deletion.
+            ToolResult: The result of the deletion.
         """
 
         (status_code, response) = self.microsoft_delete(
@@ -321,23 +356,21 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
             self.token_manager.get_token(),
         )
         if status_code != 204:
-            return json.dumps({"error": response}, indent=2)
-        return json.dumps(
-            {"message": f"Attachment with ID {attachment_id} deleted successfully."},
-            indent=2,
-        )
+            return {"error": response}
+        return {"message": f"Attachment with ID {attachment_id} deleted successfully."}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages", "mail_folders")
     def move_or_copy_email_microsoft_api(
         self, email_operation_params: EmailOperationParams
-    ) -> str:
+    ) -> ToolResult:
         """Moves or copies an email to another folder.
 
         Args:
             email_operation_params (EmailOperationParams): Parameters for the move or copy operation.
 
         Returns:
-            str: A JSON string containing the result of the operation.
+            ToolResult: The result of the operation.
         """
         url = (
             MOVE_EMAIL_URL(email_operation_params.email_id)
@@ -348,17 +381,101 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
         (status_code, response) = self.microsoft_post(
             url, self.token_manager.get_token(), data
         )
-        return json.dumps(response, indent=2)
+        return response
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages", "mail_folders")
+    def bulk_move_or_copy_emails_microsoft_api(
+        self, bulk_email_operation_params: BulkEmailOperationParams
+    ) -> ToolResult:
+        """Moves or copies several emails to another folder using batched requests.
+
+        Args:
+            bulk_email_operation_params (BulkEmailOperationParams): Parameters for the move or copy operation.
+
+        Returns:
+            ToolResult: The per-email result summary, with the new ID of every moved or copied email.
+        """
+        url_builder = (
+            MOVE_EMAIL_URL if bulk_email_operation_params.move else COPY_EMAIL_URL
+        )
+        data = {"destinationId": bulk_email_operation_params.destination_folder_id or "inbox"}
+        summary = self.microsoft_bulk(
+            bulk_email_operation_params.email_ids, "POST", url_builder, data
+        )
+        return summary
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("messages")
+    def bulk_add_delete_category_microsoft_api(
+        self, bulk_handle_category_params: BulkHandleCategoryParams
+    ) -> ToolResult:
+        """Adds or removes categories from several emails using batched requests.
+
+        The current categories of every email are read in one set of batches and the
+        updated lists are written in a second one.
+
+        Args:
+            bulk_handle_category_params (BulkHandleCategoryParams): Parameters for the category operation.
+
+        Returns:
+            ToolResult: The per-email result summary.
+        """
+        message_ids = list(dict.fromkeys(bulk_handle_category_params.email_ids))
+        request_ids = [str(index) for index in range(len(message_ids))]
+        token = self.token_manager.get_token()
+
+        current = self.microsoft_batch(
+            [
+                BatchRequest(
+                    id=request_id,
+                    method="GET",
+                    url=MESSAGE_BY_ID_URL(message_id),
+                    params={"$select": "categories"},
+                )
+                for request_id, message_id in zip(request_ids, message_ids)
+            ],
+            token,
+        )
+
+        category_names = set(bulk_handle_category_params.category_names)
+        patch_requests = []
+        for request_id, message_id in zip(request_ids, message_ids):
+            if not current[request_id].ok:
+                continue
+            existing_categories = current[request_id].body.get("categories", [])
+            if bulk_handle_category_params.remove:
+                updated_categories = [
+                    category for category in existing_categories if category not in category_names
+                ]
+            else:
+                updated_categories = existing_categories + sorted(
+                    category_names.difference(existing_categories)
+                )
+            patch_requests.append(
+                BatchRequest(
+                    id=request_id,
+                    method="PATCH",
+                    url=MESSAGE_BY_ID_URL(message_id),
+                    body={"categories": updated_categories},
+                )
+            )
+
+        responses = dict(current)
+        if patch_requests:
+            responses.update(self.microsoft_batch(patch_requests, token))
+        return summarize_batch_results(message_ids, responses, request_ids)
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def reply_to_email_microsoft_api(self, email_reply_params: EmailReplyParams) -> str:
+    @invalidates("mail_folders")
+    def reply_to_email_microsoft_api(self, email_reply_params: EmailReplyParams) -> ToolResult:
         """Replies to an email message.
 
         Args:
             email_reply_params (EmailReplyParams): Parameters for the reply operation.
 
         Returns:
-            str: A JSON string containing the reply draft message.
+            ToolResult: The reply draft message.
         """
         url = (
             CREATE_REPLY_ALL_URL(email_reply_params.email_id)
@@ -369,19 +486,20 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
         (status_code, response) = self.microsoft_post(
             url, self.token_manager.get_token(), data
         )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("mail_folders")
     def forward_email_microsoft_api(
         self, email_forward_params: EmailForwardParams
-    ) -> str:
+    ) -> ToolResult:
         """Forwards an email message to specified recipients.
 
         Args:
             email_forward_params (EmailForwardParams): Parameters for the forward operation.
 
         Returns:
-            str: A JSON string containing the result of the forward operation.
+            ToolResult: The result of the forward operation.
         """
         url = FORWARD_EMAIL_URL(email_forward_params.email_id)
         data = {
@@ -406,23 +524,99 @@ class MicrosoftMessagesRequests(MicrosoftBaseRequest):
         (status_code, response) = self.microsoft_post(
             url, self.token_manager.get_token(), data
         )
-        return json.dumps(response, indent=2)
+        return response
 
-    def _get_and_format_messages(
-        self, params: dict, folder_id: Optional[str] = None
-    ) -> str:
+    def _fresh_mirror(self, folder_id: Optional[str] = None) -> Optional[MailboxMirror]:
+        """Returns the mailbox mirror, synced, if it is enabled and covers the folder."""
+        mirror = get_mailbox_mirror()
+        if mirror is None or not mirror.covers(folder_id):
+            return None
+        try:
+            mirror.sync(self.microsoft_get, self.token_manager.get_token)
+        except Exception:
+            # Graph is queried directly when the mirror cannot be brought up to date
+            return None
+        # A folder whose first download is still in progress is not answered from the mirror
+        return mirror if mirror.is_fresh() else None
+
+    def _get_searched_and_filtered_messages(
+        self, email_query: EmailQuery, search_params: dict, filter_params: dict
+    ) -> MessageListResult:
+        """Streams the more selective side of the query from Graph and keeps the messages that
+        satisfy the other side, until number_emails messages are found. The result is marked
+        truncated when the page budget runs out first."""
+        search = email_query.search
+        extra_fields = ()
+        if plan_email_query(email_query) == FILTER_FIRST:
+            params = filter_params
+            if search.keyword:
+                # $search matches keywords in the whole body, not only in its preview
+                extra_fields = ("body",)
+
+                def matches(msg, record) -> bool:
+                    body = (msg.get("body") or {}).get("content")
+                    return message_matches_text(record, search.keyword, body=body)
+            else:
+                def matches(msg, record) -> bool:
+                    return message_matches_text(record, search.subject, ["subject"])
+        else:
+            params = search_params
+
+            def matches(msg, record) -> bool:
+                return message_matches_filters(record, email_query.filters)
+
+        # Matches are a fraction of what is read, so pages are larger than number_emails
+        query = {key: value for key, value in params.items() if key not in ("$top", "$count")}
+        url = MESSAGES_IN_FOLDER_URL(email_query.folder_id) if email_query.folder_id else MESSAGES_URL
+        pages = self.microsoft_paginate(
+            url,
+            params=select_params(microsoft_simplify_message, query, extra_fields=extra_fields),
+            page_size=max(email_query.number_emails, STREAMED_PAGE_SIZE),
+        )
 
-        base_url = MESSAGES_IN_FOLDER_URL(folder_id) if folder_id else MESSAGES_URL
+        found, seen_ids = [], set()
+        for msg in pages:
+            record = MessageRecord.from_graph(msg)
+            if record.id in seen_ids or not matches(msg, record):
+                continue
+            seen_ids.add(record.id)
+            found.append(record)
+            if len(found) >= email_query.number_emails:
+                # No more pages are requested
+                break
+        result = {"messages": found}
+        if pages.truncated and len(found) < email_query.number_emails:
+            # The nextLink resumes the unfiltered stream, so no cursor is offered
+            result["truncated"] = True
+        return result
 
-        status_code, response = self.microsoft_get(
-            base_url, self.token_manager.get_token(), params=params
-        )
-        messages = response.get("value", [])
-        simplified_messages = [microsoft_simplify_message(msg) for msg in messages]
-        unique_messages = remove_duplicate_messages(simplified_messages)
+    def _get_and_format_messages(
+        self, params: dict, folder_id: Optional[str] = None, cursor: Optional[str] = None
+    ) -> MessageListResult:
+
+        if cursor:
+            try:
+                url = decode_cursor(cursor)
+            except ValueError as e:
+                return {"error": str(e)}
+            # The link already carries the query of the page it resumes, $select included
+            query = None
+        else:
+            url = MESSAGES_IN_FOLDER_URL(folder_id) if folder_id else MESSAGES_URL
+            query = select_params(microsoft_simplify_message, params)
+
+        messages = self.microsoft_paginate(url, params=query, max_items=params.get("$top"))
+        records = [MessageRecord.from_graph(msg) for msg in messages]
+        unique_messages = remove_duplicate_messages(records)
 
         result = {"messages": unique_messages}
-        if "@odata.nextLink" in response:
-            result["nextLink"] = response["@odata.nextLink"]
+        if messages.next_link:
+            result["nextLink"] = messages.next_link
+            result["cursor"] = encode_cursor(messages.next_link)
+        if messages.count is not None:
+            result["count"] = messages.count
+
+        return result
+
 
-        return json.dumps(result, indent=2)
+AsyncMicrosoftMessagesRequests = make_async_requests(MicrosoftMessagesRequests)
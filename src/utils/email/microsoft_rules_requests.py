@@ -1,9 +1,10 @@
-import json
-
 from ..param_types import *
 from ..helper_functions.helpers_email import *
 from ..constants import MESSAGE_RULES_URL, MESSAGE_RULES_URL_BY_ID_URL
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 
 
 class MicrosoftRulesRequests(MicrosoftBaseRequest):
@@ -16,22 +17,24 @@ class MicrosoftRulesRequests(MicrosoftBaseRequest):
     """
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_message_rules_microsoft_api(self) -> str:
+    @cached("message_rules")
+    def get_message_rules_microsoft_api(self) -> ToolResult:
         """Retrieves all message rules from the user's inbox.
 
         Returns:
-            str: A JSON-formatted string containing the list of message rules.
+            ToolResult: The list of message rules.
         """
 
         (status_code, response) = self.microsoft_get(
             MESSAGE_RULES_URL, self.token_manager.get_token()
         )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("message_rules")
     def create_message_rule_microsoft_api(
         self, mail_rule: MailRule, rule_id: Optional[str] = None
-    ) -> str:
+    ) -> ToolResult:
         """Creates or updates a message rule in the user's inbox.
 
         Args:
@@ -39,7 +42,7 @@ class MicrosoftRulesRequests(MicrosoftBaseRequest):
             rule_id (Optional[str], optional): The ID of the rule to update. If None, a new rule is created.
 
         Returns:
-            str: A JSON-formatted string containing the created or updated rule's details.
+            ToolResult: The created or updated rule's details.
         """
 
         if rule_id:
@@ -55,37 +58,39 @@ class MicrosoftRulesRequests(MicrosoftBaseRequest):
                 self.token_manager.get_token(),
                 data=dataclass_to_clean_dict(mail_rule),
             )
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_message_rule_microsoft_api(self, rule_id: str) -> str:
+    @invalidates("message_rules")
+    def delete_message_rule_microsoft_api(self, rule_id: str) -> ToolResult:
         """Deletes a message rule from the user's inbox.
 
         Args:
             rule_id (str): The ID of the rule to delete.
 
         Returns:
-            str: A JSON-formatted string indicating success or containing an error message.
+            ToolResult: A result indicating success or containing an error message.
         """
         url = MESSAGE_RULES_URL_BY_ID_URL(rule_id)
         (status_code, response) = self.microsoft_delete(url, self.token_manager.get_token())
         if status_code != 204:
-            return json.dumps({"error": response}, indent=2)
-        return json.dumps(
-            {"message": f"Rule with ID {rule_id} deleted successfully."}, indent=2
-        )
+            return {"error": response}
+        return {"message": f"Rule with ID {rule_id} deleted successfully."}
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_next_link_microsoft_api(self, next_link: str) -> str:
+    def get_next_link_microsoft_api(self, next_link: str) -> ToolResult:
         """Retrieves the next page of results from a paginated Microsoft Graph API response.
 
         Args:
             next_link (str): The URL for the next page of results.
 
         Returns:
-            str: A JSON-formatted string containing the next page of results.
+            ToolResult: The next page of results.
         """
         (status_code, response) = self.microsoft_get(
             next_link, self.token_manager.get_token()
         )
-        return json.dumps(response, indent=2)
+        return response
+
+
+AsyncMicrosoftRulesRequests = make_async_requests(MicrosoftRulesRequests)
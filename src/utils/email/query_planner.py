@@ -0,0 +1,109 @@
+"""
+Planner of email queries that combine a search with filters.
+
+Graph does not accept $search and $filter in the same message query, so one side
+is sent to Graph and the other one is evaluated locally on the streamed pages:
+    - search first: $search on Graph, with the EmailFilters evaluated on each message.
+    - filter first: $filter (and $orderby) on Graph, with the search terms matched
+      on each message (subject for subject searches; subject, people, categories and
+      the full body, which is then selected, for keyword searches).
+
+The side sent to Graph should be the more selective one, so fewer pages are read
+before number_emails matches are found. The selectivity of each side (the fraction
+of the mailbox expected to match) is estimated from the kind of each criterion.
+Queries with an order always filter first, since Graph only sorts $filter queries.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ..helper_functions.helpers_email import _as_utc
+from ..param_types import EmailFilters, EmailQuery, SearchParams
+from .search_index import tokenize
+
+SEARCH_FIRST = "search_first"
+FILTER_FIRST = "filter_first"
+
+# Expected fraction of the mailbox matching each criterion
+SENDER_SELECTIVITY = 0.02
+CATEGORY_SELECTIVITY = 0.05
+IMPORTANCE_SELECTIVITY = {"high": 0.05, "low": 0.05, "normal": 0.9}
+UNREAD_SELECTIVITY = 0.3
+ATTACHMENTS_SELECTIVITY = 0.2
+TERM_SELECTIVITY = 0.05
+SUBJECT_TERM_SELECTIVITY = 0.02
+# Days of mail a date range is compared with when estimating its selectivity
+MAILBOX_DAYS = 365
+
+
+def estimate_filter_selectivity(filters: Optional[EmailFilters], now: Optional[datetime] = None) -> float:
+    """
+    Estimates the fraction of the mailbox that satisfies some filters.
+
+    Args:
+        filters (Optional[EmailFilters]): The filters.
+        now (Optional[datetime]): The current time, for open date ranges. Defaults to now.
+
+    Returns:
+        float: The estimate, between 0 and 1 (1 without filters).
+    """
+    if not filters:
+        return 1.0
+    selectivity = 1.0
+    if filters.date_filter and (filters.date_filter.start_date or filters.date_filter.end_date):
+        selectivity *= _date_selectivity(filters.date_filter.start_date, filters.date_filter.end_date, now)
+    if filters.importance:
+        selectivity *= IMPORTANCE_SELECTIVITY.get(filters.importance.lower(), 1.0)
+    if filters.sender:
+        selectivity *= SENDER_SELECTIVITY
+    if filters.senderName:
+        selectivity *= SENDER_SELECTIVITY
+    if filters.unread_only:
+        selectivity *= UNREAD_SELECTIVITY
+    if filters.has_attachments:
+        selectivity *= ATTACHMENTS_SELECTIVITY
+    if filters.categories:
+        selectivity *= min(1.0, CATEGORY_SELECTIVITY * len(filters.categories))
+    return selectivity
+
+
+def estimate_search_selectivity(search: Optional[SearchParams]) -> float:
+    """
+    Estimates the fraction of the mailbox that matches a search.
+
+    Args:
+        search (Optional[SearchParams]): The search. A keyword is used before a subject, as for Graph.
+
+    Returns:
+        float: The estimate, between 0 and 1 (1 without search terms).
+    """
+    if not search:
+        return 1.0
+    if search.keyword:
+        return TERM_SELECTIVITY ** len(set(tokenize(search.keyword)))
+    return SUBJECT_TERM_SELECTIVITY ** len(set(tokenize(search.subject)))
+
+
+def plan_email_query(email_query: EmailQuery, now: Optional[datetime] = None) -> str:
+    """
+    Chooses the side of a search and filter query that is sent to Graph.
+
+    Args:
+        email_query (EmailQuery): A query with both search and filters.
+        now (Optional[datetime]): The current time, for open date ranges. Defaults to now.
+
+    Returns:
+        str: SEARCH_FIRST or FILTER_FIRST.
+    """
+    if email_query.order_by:
+        return FILTER_FIRST
+    filter_selectivity = estimate_filter_selectivity(email_query.filters, now)
+    if filter_selectivity < estimate_search_selectivity(email_query.search):
+        return FILTER_FIRST
+    return SEARCH_FIRST
+
+
+def _date_selectivity(start: Optional[datetime], end: Optional[datetime], now: Optional[datetime]) -> float:
+    end = _as_utc(end) if end else now or datetime.now(timezone.utc)
+    start = _as_utc(start) if start else end - timedelta(days=MAILBOX_DAYS)
+    days = (end - start).total_seconds() / 86400
+    return min(1.0, max(days, 1) / MAILBOX_DAYS)
@@ -0,0 +1,242 @@
+"""
+In-memory full-text index over simplified messages, ranked with BM25.
+
+Every indexed field (subject, sender, recipients, body preview and categories)
+keeps its own inverted index and length statistics; the score of a message is
+the weighted sum of the BM25 score of each field. A message matches a query
+when every query term appears in at least one of the searched fields. Text is
+lowercased and accents are removed, so "reunion" also finds "Reunión".
+
+Structured EmailFilters predicates are evaluated on the indexed messages, so a
+search and a filter are answered together instead of intersecting two capped
+Graph result sets.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from ..helper_functions.helpers_email import message_matches_filters
+
+# Relative weight of a match in each field
+FIELD_WEIGHTS: Dict[str, float] = {
+    "subject": 2.0,
+    "sender": 1.5,
+    "recipients": 1.0,
+    "bodyPreview": 1.0,
+    "categories": 1.5,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Splits text into lowercase, accent-free terms.
+
+    Args:
+        text (Optional[str]): The text to split.
+
+    Returns:
+        List[str]: The terms, in order.
+    """
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    without_accents = "".join(c for c in normalized if not unicodedata.combining(c))
+    return _TOKEN_PATTERN.findall(without_accents)
+
+
+def _people_text(people: Iterable[dict]) -> str:
+    return " ".join(f"{p.get('name') or ''} {p.get('address') or ''}" for p in people)
+
+
+def message_fields(message: dict) -> Dict[str, str]:
+    """
+    Extracts the text of every indexed field from a simplified message.
+
+    Args:
+        message (dict): A message simplified with microsoft_simplify_message.
+
+    Returns:
+        Dict[str, str]: The text by field name.
+    """
+    return {
+        "subject": message.get("subject") or "",
+        "sender": _people_text([message.get("from") or {}]),
+        "recipients": _people_text(
+            (message.get("toRecipients") or []) + (message.get("ccRecipients") or [])
+        ),
+        "bodyPreview": message.get("bodyPreview") or "",
+        "categories": " ".join(message.get("categories") or []),
+    }
+
+
+def message_matches_text(
+    message: dict, text: str, fields: Optional[List[str]] = None, body: Optional[str] = None
+) -> bool:
+    """
+    Tells whether a message contains every term of a query, as the index matches them.
+
+    Args:
+        message (dict): A simplified message (or MessageRecord).
+        text (str): The query text.
+        fields (Optional[List[str]]): The fields to search. Defaults to every indexed field.
+        body (Optional[str]): The full body of the message (text or HTML), searched on top of the fields.
+
+    Returns:
+        bool: True if every term appears in at least one of the fields or the body.
+    """
+    texts = message_fields(message)
+    field_terms = [set(tokenize(texts[field])) for field in fields or FIELD_WEIGHTS]
+    if body:
+        field_terms.append(set(tokenize(_TAG_PATTERN.sub(" ", body))))
+    return all(any(term in terms for terms in field_terms) for term in tokenize(text))
+
+
+class _FieldIndex:
+    """Inverted index and length statistics of a single field."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.total_length = 0
+
+    def add(self, doc_id: str, terms: List[str]) -> None:
+        for term, frequency in Counter(terms).items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+        self.lengths[doc_id] = len(terms)
+        self.total_length += len(terms)
+
+    def remove(self, doc_id: str, terms: Iterable[str]) -> None:
+        for term in set(terms):
+            documents = self.postings.get(term)
+            if documents is not None:
+                documents.pop(doc_id, None)
+                if not documents:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(doc_id, 0)
+
+    def score(self, doc_id: str, term: str, document_count: int) -> float:
+        documents = self.postings.get(term)
+        if not documents or doc_id not in documents:
+            return 0.0
+        frequency = documents[doc_id]
+        idf = math.log(1 + (document_count - len(documents) + 0.5) / (len(documents) + 0.5))
+        average_length = self.total_length / document_count if document_count else 0
+        norm = 1 - BM25_B + BM25_B * (self.lengths[doc_id] / average_length if average_length else 0)
+        return idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+
+
+class MailSearchIndex:
+    """
+    Thread-safe BM25 index of simplified messages.
+
+    Attributes:
+        documents (Dict[str, dict]): The indexed messages by ID.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, dict] = {}
+        self._groups: Dict[str, str] = {}
+        self._terms: Dict[str, Dict[str, List[str]]] = {}
+        self._fields = {field: _FieldIndex() for field in FIELD_WEIGHTS}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, message: dict, group: str = "") -> None:
+        """
+        Indexes a message, replacing any previous version with the same ID.
+
+        Args:
+            message (dict): A message simplified with microsoft_simplify_message.
+            group (str, optional): A label searches can be restricted to (e.g. the mirrored folder).
+        """
+        doc_id = message["id"]
+        terms = {field: tokenize(text) for field, text in message_fields(message).items()}
+        with self._lock:
+            self._remove(doc_id)
+            self.documents[doc_id] = message
+            self._groups[doc_id] = group
+            self._terms[doc_id] = terms
+            for field, field_terms in terms.items():
+                self._fields[field].add(doc_id, field_terms)
+
+    def remove(self, doc_id: str) -> None:
+        """
+        Removes a message from the index. Unknown IDs are ignored.
+
+        Args:
+            doc_id (str): The ID of the message.
+        """
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for field, field_terms in terms.items():
+            self._fields[field].remove(doc_id, field_terms)
+        del self.documents[doc_id]
+        del self._groups[doc_id]
+
+    def search(
+        self,
+        text: str,
+        fields: Optional[List[str]] = None,
+        filters=None,
+        groups: Optional[Iterable[str]] = None,
+        limit: int = 10,
+    ) -> List[dict]:
+        """
+        Returns the best ranked messages containing every term of the query.
+
+        Args:
+            text (str): The query text.
+            fields (Optional[List[str]]): The fields to search. Defaults to every indexed field.
+            filters (Optional[EmailFilters]): Structured filters the messages must also satisfy.
+            groups (Optional[Iterable[str]]): Only messages added with one of these groups are returned.
+            limit (int, optional): Maximum number of messages to return. Defaults to 10.
+
+        Returns:
+            List[dict]: The matching messages, best match first (newest first on ties).
+        """
+        terms = list(dict.fromkeys(tokenize(text)))
+        fields = fields or list(FIELD_WEIGHTS)
+        if not terms:
+            return []
+        allowed_groups = set(groups) if groups is not None else None
+        with self._lock:
+            document_count = len(self.documents)
+            candidates: Optional[set] = None
+            for term in terms:
+                matching = set()
+                for field in fields:
+                    matching.update(self._fields[field].postings.get(term, ()))
+                candidates = matching if candidates is None else candidates & matching
+                if not candidates:
+                    return []
+
+            ranked = []
+            for doc_id in candidates:
+                if allowed_groups is not None and self._groups[doc_id] not in allowed_groups:
+                    continue
+                message = self.documents[doc_id]
+                if not message_matches_filters(message, filters):
+                    continue
+                score = sum(
+                    FIELD_WEIGHTS[field] * self._fields[field].score(doc_id, term, document_count)
+                    for term in terms
+                    for field in fields
+                )
+                ranked.append((score, message.get("receivedDateTime") or "", message))
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [message for _, _, message in ranked[:limit]]
@@ -0,0 +1,235 @@
+"""
+Building blocks for Microsoft Graph JSON batching ($batch).
+
+A batch packs up to 20 sub-requests into a single POST. This module provides:
+    - BatchRequest / BatchResponse: one sub-request and its individual result.
+    - chunk_batch_requests: splits requests into batches of at most 20 while keeping
+      every request in the same batch as the requests it depends on (dependsOn).
+    - GraphBatchError: raised when a sub-request failed, carrying its status and body.
+    - summarize_batch_results: per-item summary used by the bulk tools.
+
+The executor itself is MicrosoftBaseRequest.microsoft_batch.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote, urlencode
+
+from .constants import GRAPH_API_ROOT
+
+MAX_BATCH_SIZE = 20
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+FAILED_DEPENDENCY_STATUS = 424
+
+
+class GraphBatchError(Exception):
+    """
+    Error of a single sub-request inside a JSON batch.
+
+    Attributes:
+        request_id (str): The ID of the failed sub-request.
+        status (int): The HTTP status code of the sub-request.
+        body (Any): The body returned for the sub-request.
+    """
+
+    def __init__(self, request_id: str, status: int, body: Any):
+        self.request_id = request_id
+        self.status = status
+        self.body = body
+        super().__init__(f"Batch request '{request_id}' failed: {status} - {body}")
+
+
+@dataclass
+class BatchRequest:
+    """
+    A sub-request of a JSON batch.
+
+    Args:
+        id (str): Unique ID of the sub-request inside the batch.
+        method (str): HTTP method (GET, POST, PATCH, DELETE...).
+        url (str): Absolute Graph URL or URL relative to the API root (e.g. "/me/messages").
+        params (Optional[dict]): Query parameters appended to the URL.
+        body (Optional[dict]): JSON body of the sub-request.
+        depends_on (List[str]): IDs of the sub-requests that must succeed before this one runs.
+    """
+
+    id: str
+    method: str
+    url: str
+    params: Optional[dict] = None
+    body: Optional[dict] = None
+    depends_on: List[str] = field(default_factory=list)
+
+    def absolute_url(self) -> str:
+        """Returns the URL of the sub-request under GRAPH_API_ROOT, without its query."""
+        if self.url.startswith(GRAPH_API_ROOT):
+            return self.url
+        return f"{GRAPH_API_ROOT}/{self.url.lstrip('/')}"
+
+    def to_json(self) -> dict:
+        """Serializes the sub-request in the format expected by the $batch endpoint."""
+        url = self.url
+        if url.startswith(GRAPH_API_ROOT):
+            url = url[len(GRAPH_API_ROOT):]
+        if self.params:
+            query = urlencode(self.params, safe="$(),/:'", quote_via=quote)
+            url = f"{url}?{query}"
+        data = {"id": self.id, "method": self.method.upper(), "url": url}
+        if self.body is not None:
+            data["body"] = self.body
+            data["headers"] = {"Content-Type": "application/json"}
+        if self.depends_on:
+            data["dependsOn"] = list(self.depends_on)
+        return data
+
+
+@dataclass
+class BatchResponse:
+    """
+    The individual result of a sub-request of a JSON batch.
+
+    Args:
+        id (str): The ID of the sub-request.
+        status (int): The HTTP status code of the sub-request.
+        body (Any): The JSON body of the sub-request response, if any.
+        headers (Dict[str, str]): The headers of the sub-request response.
+    """
+
+    id: str
+    status: int
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if the sub-request succeeded (2xx)."""
+        return 200 <= self.status < 300
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds the server asked to wait before retrying, 0 if not given."""
+        for key, value in self.headers.items():
+            if key.lower() == "retry-after":
+                try:
+                    return float(value)
+                except ValueError:
+                    return 0
+        return 0
+
+    def raise_for_status(self) -> "BatchResponse":
+        """
+        Raises GraphBatchError if the sub-request failed.
+
+        Returns:
+            BatchResponse: The response itself, to allow chaining.
+        """
+        if not self.ok:
+            raise GraphBatchError(self.id, self.status, self.body)
+        return self
+
+    @classmethod
+    def from_json(cls, data: dict) -> "BatchResponse":
+        """Builds a BatchResponse from an item of the $batch "responses" array."""
+        return cls(
+            id=str(data.get("id")),
+            status=int(data.get("status", 0)),
+            body=data.get("body"),
+            headers=data.get("headers") or {},
+        )
+
+
+def chunk_batch_requests(requests: List[BatchRequest]) -> List[List[BatchRequest]]:
+    """
+    Splits sub-requests into batches of at most MAX_BATCH_SIZE.
+
+    Graph only resolves dependsOn inside a single batch, so requests linked by
+    dependencies are kept together, preserving the original order.
+
+    Args:
+        requests (List[BatchRequest]): The sub-requests to split.
+
+    Returns:
+        List[List[BatchRequest]]: The batches, in order.
+
+    Raises:
+        ValueError: If IDs are duplicated, a dependency is unknown or a dependency
+            group is larger than MAX_BATCH_SIZE.
+    """
+    by_id = {}
+    for request in requests:
+        if request.id in by_id:
+            raise ValueError(f"Duplicated batch request id '{request.id}'")
+        by_id[request.id] = request
+
+    # Union-find over dependsOn links to group requests that must travel together
+    parent = {request_id: request_id for request_id in by_id}
+
+    def find(request_id: str) -> str:
+        while parent[request_id] != request_id:
+            parent[request_id] = parent[parent[request_id]]
+            request_id = parent[request_id]
+        return request_id
+
+    for request in requests:
+        for dependency in request.depends_on:
+            if dependency not in by_id:
+                raise ValueError(
+                    f"Batch request '{request.id}' depends on unknown id '{dependency}'"
+                )
+            parent[find(request.id)] = find(dependency)
+
+    groups: Dict[str, List[BatchRequest]] = {}
+    for request in requests:
+        groups.setdefault(find(request.id), []).append(request)
+
+    batches: List[List[BatchRequest]] = []
+    current: List[BatchRequest] = []
+    for group in groups.values():
+        if len(group) > MAX_BATCH_SIZE:
+            raise ValueError(
+                f"A dependency group of {len(group)} requests exceeds the batch limit of {MAX_BATCH_SIZE}"
+            )
+        if len(current) + len(group) > MAX_BATCH_SIZE:
+            batches.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def summarize_batch_results(
+    item_ids: List[str], responses: Dict[str, BatchResponse], request_ids: List[str]
+) -> dict:
+    """
+    Builds the per-item summary returned by bulk operations.
+
+    Args:
+        item_ids (List[str]): The IDs of the affected resources (e.g. email IDs), in order.
+        responses (Dict[str, BatchResponse]): The batch responses by sub-request ID.
+        request_ids (List[str]): The sub-request ID used for each item, in the same order as item_ids.
+
+    Returns:
+        dict: Counts of succeeded and failed items and the individual result of each item.
+    """
+    results = []
+    for item_id, request_id in zip(item_ids, request_ids):
+        response = responses[request_id]
+        result = {"id": item_id, "status": response.status, "success": response.ok}
+        # Moved or copied resources get a new ID, which is needed to keep working with them
+        new_id = response.body.get("id") if isinstance(response.body, dict) else None
+        if response.ok and new_id and new_id != item_id:
+            result["new_id"] = new_id
+        if not response.ok:
+            error = response.body.get("error") if isinstance(response.body, dict) else None
+            if isinstance(error, dict):
+                result["error"] = error.get("message") or error.get("code")
+            else:
+                result["error"] = error or "Request was not processed"
+        results.append(result)
+
+    succeeded = sum(1 for result in results if result["success"])
+    return {
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
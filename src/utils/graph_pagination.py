@@ -0,0 +1,149 @@
+"""
+Lazy pagination over Microsoft Graph collections.
+
+Graph returns collections one page at a time, with an ``@odata.nextLink`` pointing
+to the next page. GraphPaginator follows those links on demand while it is
+iterated, so callers can stream items or assemble a full response without the
+LLM having to call get_next_link once per page.
+
+The default page budget can be tuned with the GRAPH_MAX_PAGES environment
+variable (defaults to 10). When a budget stops the iteration early, the link of
+the first page that was not read is kept in ``next_link`` so the caller can
+still hand it back. encode_cursor wraps such a link in an opaque cursor that
+tools return and accept back to resume the same query.
+"""
+import base64
+import binascii
+import os
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .constants import GRAPH_API_ROOT
+
+DEFAULT_MAX_PAGES = 10
+# Page size for collections whose server default is small (10 items for folders and contacts)
+DEFAULT_PAGE_SIZE = 100
+# Page size when items are streamed and checked locally against part of a query
+STREAMED_PAGE_SIZE = 50
+
+
+def get_default_max_pages() -> int:
+    """
+    Returns the page budget used when a paginator is not given one.
+
+    Returns:
+        int: The value of GRAPH_MAX_PAGES, or DEFAULT_MAX_PAGES if unset.
+    """
+    return int(os.getenv("GRAPH_MAX_PAGES", DEFAULT_MAX_PAGES))
+
+
+def encode_cursor(next_link: str) -> str:
+    """
+    Wraps a nextLink in an opaque cursor.
+
+    Args:
+        next_link (str): The @odata.nextLink (with its $skip or $skiptoken) of a Graph page.
+
+    Returns:
+        str: The cursor, URL-safe.
+    """
+    return base64.urlsafe_b64encode(next_link.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Returns the nextLink wrapped in a cursor.
+
+    Args:
+        cursor (str): A cursor returned by encode_cursor.
+
+    Returns:
+        str: The nextLink.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not point to Microsoft Graph.
+    """
+    try:
+        next_link = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor") from None
+    # The link is requested with the user's token, so it must not lead anywhere else
+    if not next_link.startswith(f"{GRAPH_API_ROOT}/"):
+        raise ValueError("Invalid cursor")
+    return next_link
+
+
+class GraphPaginator:
+    """
+    Iterable over the items of a Graph collection that fetches pages lazily.
+
+    Attributes:
+        next_link (Optional[str]): Link to the first page that was not read because a
+            budget was reached. None if the collection was fully read.
+        pages_fetched (int): Number of pages requested so far.
+        truncated (bool): True if a budget stopped the iteration before the end of the collection.
+        count (Optional[int]): The @odata.count of the first page, sent by Graph when $count=true was requested.
+    """
+
+    def __init__(
+        self,
+        get: Callable[..., tuple],
+        get_token: Callable[[], str],
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ):
+        """
+        Initializes the paginator. No request is sent until it is iterated.
+
+        Args:
+            get (Callable): The GET verb, called as get(url, token, params=params).
+            get_token (Callable[[], str]): Returns a valid token. Called once per page, so long
+                iterations survive token refreshes.
+            url (str): The URL of the collection.
+            params (Optional[dict]): Query parameters of the first page. Following pages use the
+                query already encoded in @odata.nextLink.
+            max_items (Optional[int]): Maximum number of items to yield. None for no limit.
+            max_pages (Optional[int]): Maximum number of pages to request. Defaults to GRAPH_MAX_PAGES.
+            page_size (Optional[int]): Page size requested from the server ($top).
+        """
+        self._get = get
+        self._get_token = get_token
+        self._url = url
+        self._params = dict(params or {})
+        if page_size:
+            self._params["$top"] = page_size
+        self.max_items = max_items
+        self.max_pages = max_pages if max_pages is not None else get_default_max_pages()
+        self.next_link: Optional[str] = None
+        self.pages_fetched = 0
+        self.truncated = False
+        self.count: Optional[int] = None
+
+    def __iter__(self) -> Iterator[dict]:
+        url, params = self._url, self._params
+        yielded = 0
+        while url:
+            if self.pages_fetched >= self.max_pages:
+                self.next_link = url
+                self.truncated = True
+                return
+            status_code, response = self._get(url, self._get_token(), params=params)
+            self.pages_fetched += 1
+            if self.pages_fetched == 1:
+                self.count = response.get("@odata.count")
+            next_link = response.get("@odata.nextLink")
+            items = response.get("value", [])
+            for item in items:
+                if self.max_items is not None and yielded >= self.max_items:
+                    # The rest of this page would be skipped by its nextLink, so no link is kept
+                    self.truncated = True
+                    return
+                yield item
+                yielded += 1
+            if self.max_items is not None and yielded >= self.max_items and next_link:
+                self.truncated = True
+                self.next_link = next_link
+                return
+            url, params = next_link, None
@@ -0,0 +1,62 @@
+"""
+$select projections derived from the simplifiers.
+
+Graph returns every property of a resource unless told otherwise, including
+complete HTML bodies, while the simplifiers only keep a few fields. Each
+simplifier declares the Graph properties it reads with @projection, and the
+request methods build their query parameters with select_params, so a GET only
+transfers (and parses) what the response will contain:
+
+    @projection("id", "name")
+    def simplify_calendar(calendar: dict) -> dict: ...
+
+    calendars = self.microsoft_paginate(url, params=select_params(simplify_calendar))
+"""
+from typing import Callable, Iterable, Optional
+
+
+def projection(*fields: str, expand: Optional[str] = None) -> Callable:
+    """
+    Decorator that records the Graph properties a simplifier reads.
+
+    Args:
+        *fields (str): The properties read by the simplifier.
+        expand (Optional[str]): Related resources the simplifier reads, sent as $expand.
+
+    Returns:
+        Callable: The decorator, which returns the simplifier unchanged apart from
+        its ``select_fields`` and ``expand`` attributes.
+    """
+    def decorator(simplifier: Callable) -> Callable:
+        simplifier.select_fields = tuple(fields)
+        simplifier.expand = expand
+        return simplifier
+    return decorator
+
+
+def select_params(
+    simplifier: Callable,
+    params: Optional[dict] = None,
+    extra_fields: Iterable[str] = (),
+) -> dict:
+    """
+    Adds the $select (and $expand) of a simplifier to query parameters.
+
+    A $select or $expand already present in params is kept.
+
+    Args:
+        simplifier (Callable): A simplifier decorated with @projection.
+        params (Optional[dict]): The query parameters. They are not modified.
+        extra_fields (Iterable[str]): Properties needed on top of the simplifier's (e.g. "body").
+
+    Returns:
+        dict: A copy of params with the projection.
+    """
+    params = dict(params or {})
+    fields = getattr(simplifier, "select_fields", ())
+    if fields and "$select" not in params:
+        params["$select"] = ",".join(dict.fromkeys((*fields, *extra_fields)))
+    expand = getattr(simplifier, "expand", None)
+    if expand and "$expand" not in params:
+        params["$expand"] = expand
+    return params
@@ -0,0 +1,373 @@
+"""
+Resilience layer for Microsoft Graph requests.
+
+Graph throttles with 429 (and sometimes 503) responses carrying a Retry-After
+header, and occasionally answers with transient 5xx errors. This module provides:
+    - RetryPolicy: which responses are retried, how many times and with which backoff.
+    - TokenBucket: client-side rate limiter. One bucket is kept per mailbox so the
+      process stays under the Outlook per-mailbox limits before Graph has to throttle it.
+      Only Graph URLs that target a mailbox are limited; a $batch is charged one token
+      per sub-request (see wait_for_rate_limit).
+    - RetryMetrics: counters of attempted, succeeded and given up retries.
+    - send_with_retry: run a request under the policy.
+
+Only idempotent methods are retried after server errors or connection failures.
+A 429 is retried for every method: Graph rejects throttled requests before
+processing them, so sending them again cannot apply a change twice.
+
+The defaults can be tuned through environment variables:
+    - GRAPH_MAX_RETRIES: Maximum number of retries per request. Defaults to 3.
+    - GRAPH_BACKOFF_BASE: Base delay in seconds of the exponential backoff. Defaults to 0.5.
+    - GRAPH_BACKOFF_MAX: Maximum delay in seconds between two attempts. Defaults to 30.
+    - GRAPH_RATE_LIMIT: Requests per second allowed per mailbox. Defaults to 16
+      (Outlook allows 10,000 requests every 10 minutes per mailbox).
+    - GRAPH_RATE_BURST: Requests that can be sent at once before the rate applies. Defaults to 16.
+"""
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .constants import GRAPH_API_ROOT
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+THROTTLED_STATUS = 429
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry configuration of Graph requests.
+
+    Args:
+        max_retries (int): Maximum number of retries per request.
+        backoff_base (float): Base delay in seconds of the exponential backoff.
+        backoff_max (float): Maximum delay in seconds between two attempts.
+        retry_statuses (FrozenSet[int]): HTTP statuses that are retried.
+        rate_limit (float): Requests per second allowed per mailbox.
+        rate_burst (int): Requests that can be sent at once before the rate applies.
+    """
+
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: FrozenSet[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+    rate_limit: float = 16.0
+    rate_burst: int = 16
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """
+        Builds the policy from the GRAPH_* environment variables.
+
+        Returns:
+            RetryPolicy: The policy, using defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            max_retries=int(os.getenv("GRAPH_MAX_RETRIES", defaults.max_retries)),
+            backoff_base=float(os.getenv("GRAPH_BACKOFF_BASE", defaults.backoff_base)),
+            backoff_max=float(os.getenv("GRAPH_BACKOFF_MAX", defaults.backoff_max)),
+            rate_limit=float(os.getenv("GRAPH_RATE_LIMIT", defaults.rate_limit)),
+            rate_burst=int(os.getenv("GRAPH_RATE_BURST", defaults.rate_burst)),
+        )
+
+    def should_retry(self, method: str, status: int) -> bool:
+        """Whether a response with the given status can be retried for the given method."""
+        if status not in self.retry_statuses:
+            return False
+        return status == THROTTLED_STATUS or method.upper() in IDEMPOTENT_METHODS
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the retry number ``attempt`` (0-based), using full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Requests reserve a token and are told how long to wait for it, so concurrent
+    threads share the rate without holding the lock while they sleep.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens stored.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Takes tokens, borrowing them from the future if the bucket is empty.
+
+        Args:
+            tokens (int, optional): The number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds to wait before the tokens can be used.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RetryMetrics:
+    """
+    Thread-safe counters of the retry layer.
+
+    Attributes:
+        retries_attempted (int): Retries sent.
+        retries_succeeded (int): Requests that succeeded after at least one retry.
+        retries_given_up (int): Requests that still failed after the last allowed retry.
+        throttled (int): 429 responses received.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Sets every counter back to zero."""
+        with self._lock:
+            self.retries_attempted = 0
+            self.retries_succeeded = 0
+            self.retries_given_up = 0
+            self.throttled = 0
+
+    def record(self, name: str) -> None:
+        """Increments the counter with the given name."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Returns the current value of every counter.
+
+        Returns:
+            Dict[str, int]: The counters by name.
+        """
+        with self._lock:
+            return {
+                "retries_attempted": self.retries_attempted,
+                "retries_succeeded": self.retries_succeeded,
+                "retries_given_up": self.retries_given_up,
+                "throttled": self.throttled,
+            }
+
+
+_lock = threading.Lock()
+_policy: Optional[RetryPolicy] = None
+_buckets: Dict[str, TokenBucket] = {}
+retry_metrics = RetryMetrics()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Returns the active retry policy, reading it from the environment on first use.
+
+    Returns:
+        RetryPolicy: The active policy.
+    """
+    global _policy
+    if _policy is None:
+        with _lock:
+            if _policy is None:
+                _policy = RetryPolicy.from_env()
+    return _policy
+
+
+def configure_retry_policy(policy: RetryPolicy) -> None:
+    """
+    Replaces the active retry policy and resets the per-mailbox buckets.
+
+    Args:
+        policy (RetryPolicy): The new policy.
+    """
+    global _policy
+    with _lock:
+        _policy = policy
+        _buckets.clear()
+
+
+def get_retry_metrics() -> Dict[str, int]:
+    """
+    Returns the retry counters of the process.
+
+    Returns:
+        Dict[str, int]: Retries attempted, succeeded and given up, and throttled responses.
+    """
+    return retry_metrics.snapshot()
+
+
+def mailbox_key(url: str) -> Optional[str]:
+    """
+    Returns the mailbox a Graph URL targets ("me", "users/<id>").
+
+    Args:
+        url (str): The request URL.
+
+    Returns:
+        Optional[str]: The key of the mailbox bucket, or None for URLs outside GRAPH_API_ROOT
+        (upload sessions, other hosts) and Graph URLs without a mailbox (e.g. $batch).
+    """
+    if not url.startswith(GRAPH_API_ROOT + "/"):
+        return None
+    path = urlparse(url).path
+    root = urlparse(GRAPH_API_ROOT).path
+    segments = [segment for segment in path[len(root):].split("/") if segment]
+    if segments[:1] == ["me"]:
+        return "me"
+    if segments[:1] == ["users"] and len(segments) > 1:
+        return f"users/{segments[1].lower()}"
+    return None
+
+
+def get_mailbox_bucket(url: str) -> Optional[TokenBucket]:
+    """
+    Returns the token bucket of the mailbox a URL targets, creating it on first use.
+
+    Args:
+        url (str): The request URL.
+
+    Returns:
+        Optional[TokenBucket]: The bucket shared by every request to that mailbox, or None
+        if the URL is not rate limited.
+    """
+    key = mailbox_key(url)
+    return _get_bucket(key) if key is not None else None
+
+
+def _get_bucket(key: str) -> TokenBucket:
+    bucket = _buckets.get(key)
+    if bucket is None:
+        policy = get_retry_policy()
+        with _lock:
+            bucket = _buckets.setdefault(
+                key, TokenBucket(policy.rate_limit, policy.rate_burst)
+            )
+    return bucket
+
+
+def wait_for_rate_limit(urls: Iterable[str]) -> None:
+    """
+    Takes one token per URL from the bucket of its mailbox, sleeping until they are available.
+
+    A $batch passes the URLs of its sub-requests, so it is charged like the requests it carries.
+
+    Args:
+        urls (Iterable[str]): Absolute URLs of the requests about to be sent. URLs that are
+            not rate limited (see mailbox_key) are skipped.
+    """
+    tokens = Counter(key for key in map(mailbox_key, urls) if key is not None)
+    wait = max((_get_bucket(key).reserve(count) for key, count in tokens.items()), default=0.0)
+    if wait:
+        time.sleep(wait)
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """
+    Parses the Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        headers (Mapping[str, str]): The response headers.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _next_delay(policy: RetryPolicy, attempt: int, response) -> float:
+    retry_after = retry_after_seconds(response.headers) if response is not None else None
+    if retry_after is not None:
+        return min(retry_after, policy.backoff_max)
+    return policy.backoff(attempt)
+
+
+def send_with_retry(
+    method: str,
+    url: str,
+    send: Callable[[], requests.Response],
+    policy: Optional[RetryPolicy] = None,
+) -> requests.Response:
+    """
+    Sends a request through the mailbox rate limiter, retrying it under the retry policy.
+
+    Args:
+        method (str): The HTTP method, used to decide whether the request is idempotent.
+        url (str): The request URL, used to pick the mailbox bucket. URLs without one are not rate limited.
+        send (Callable[[], requests.Response]): Sends the request once.
+        policy (Optional[RetryPolicy]): The policy to apply. Defaults to the active policy.
+
+    Returns:
+        requests.Response: The last response. Raising for its status is left to the caller.
+
+    Raises:
+        requests.ConnectionError, requests.Timeout: If the connection still fails after the last retry.
+    """
+    policy = policy or get_retry_policy()
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        wait_for_rate_limit([url])
+        try:
+            response = send()
+        except (requests.ConnectionError, requests.Timeout):
+            if not idempotent or attempt >= policy.max_retries:
+                if attempt:
+                    retry_metrics.record("retries_given_up")
+                raise
+            response = None
+        else:
+            if response.status_code == THROTTLED_STATUS:
+                retry_metrics.record("throttled")
+            if not policy.should_retry(method, response.status_code):
+                if attempt and response.ok:
+                    retry_metrics.record("retries_succeeded")
+                elif attempt:
+                    retry_metrics.record("retries_given_up")
+                return response
+            if attempt >= policy.max_retries:
+                retry_metrics.record("retries_given_up")
+                return response
+            # A streamed response holds its pooled connection until it is closed
+            response.close()
+        time.sleep(_next_delay(policy, attempt, response))
+        attempt += 1
+        retry_metrics.record("retries_attempted")
+
@@ -0,0 +1,144 @@
+"""
+Shared, connection-pooled HTTP session for the Microsoft Graph API.
+
+Every request class talks to the same host (graph.microsoft.com), so a single
+process-wide ``requests.Session`` is kept alive and reused. This avoids paying a
+new TCP + TLS handshake on every call.
+
+The pool can be tuned through environment variables (loaded from the same .env
+as the TokenManager):
+    - GRAPH_POOL_CONNECTIONS: Number of host pools to cache. Defaults to 10.
+    - GRAPH_POOL_MAXSIZE: Maximum number of connections kept per host. Defaults to 20.
+    - GRAPH_CONNECT_TIMEOUT: Connect timeout in seconds. Defaults to 5.
+    - GRAPH_READ_TIMEOUT: Read timeout in seconds. Defaults to 60.
+    - GRAPH_KEEP_ALIVE: "false" to close the connection after every request. Defaults to "true".
+"""
+import os
+import threading
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass(frozen=True)
+class GraphSessionConfig:
+    """
+    Configuration of the pooled Graph session.
+
+    Args:
+        pool_connections (int): Number of connection pools (one per host) to cache.
+        pool_maxsize (int): Maximum number of connections kept alive per host.
+        connect_timeout (float): Seconds to wait while establishing a connection.
+        read_timeout (float): Seconds to wait for the server to send data.
+        keep_alive (bool): Whether connections are reused between requests.
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 20
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    keep_alive: bool = True
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """(connect, read) timeout tuple as expected by requests."""
+        return (self.connect_timeout, self.read_timeout)
+
+    @classmethod
+    def from_env(cls) -> "GraphSessionConfig":
+        """
+        Builds the configuration from the GRAPH_* environment variables.
+
+        Returns:
+            GraphSessionConfig: The configuration, using defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            pool_connections=int(
+                os.getenv("GRAPH_POOL_CONNECTIONS", defaults.pool_connections)
+            ),
+            pool_maxsize=int(os.getenv("GRAPH_POOL_MAXSIZE", defaults.pool_maxsize)),
+            connect_timeout=float(
+                os.getenv("GRAPH_CONNECT_TIMEOUT", defaults.connect_timeout)
+            ),
+            read_timeout=float(os.getenv("GRAPH_READ_TIMEOUT", defaults.read_timeout)),
+            keep_alive=os.getenv("GRAPH_KEEP_ALIVE", "true").lower() != "false",
+        )
+
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_config: GraphSessionConfig | None = None
+
+
+def _build_session(config: GraphSessionConfig) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_graph_config() -> GraphSessionConfig:
+    """
+    Returns the active session configuration, reading it from the environment on first use.
+
+    Returns:
+        GraphSessionConfig: The active configuration.
+    """
+    global _config
+    if _config is None:
+        with _lock:
+            if _config is None:
+                _config = GraphSessionConfig.from_env()
+    return _config
+
+
+def get_graph_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session, creating it on first use.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        config = get_graph_config()
+        with _lock:
+            if _session is None:
+                _session = _build_session(config)
+    return _session
+
+
+def configure_graph_session(config: GraphSessionConfig) -> None:
+    """
+    Replaces the active configuration and rebuilds the shared session.
+
+    Args:
+        config (GraphSessionConfig): The new configuration.
+    """
+    global _session, _config
+    with _lock:
+        old_session = _session
+        _config = config
+        _session = _build_session(config)
+    if old_session is not None:
+        old_session.close()
+
+
+def close_graph_session() -> None:
+    """Closes the shared session. A new one is created on the next request."""
+    global _session
+    with _lock:
+        old_session = _session
+        _session = None
+    if old_session is not None:
+        old_session.close()
+
@@ -1,5 +1,8 @@
+from typing import List
+
+from ..graph_projection import projection
+from ..odata import ODataFilter
 from ..param_types import EventChangesParams, EventParams, EventQuery
-from ..microsoft_base_request import MicrosoftBaseRequest
 
 def event_params_to_dict(event_params: EventParams) -> dict:
     """Converts EventParams object to a dictionary suitable for Microsoft Graph API.
@@ -121,7 +124,7 @@ def event_query_to_graph_params(event_query: EventQuery) -> dict:
         params["$top"] = str(event_query.number_events)
 
     filters = event_query.filters
-    filter_clauses = []
+    odata_filter = ODataFilter()
 
     # Fechas para calendarView (no se incluyen en $filter)
     if filters.date_filter:
@@ -131,32 +134,86 @@ def event_query_to_graph_params(event_query: EventQuery) -> dict:
             params["endDateTime"] = filters.date_filter.end_date.isoformat()
 
     # Filtros para $filter
-    if filters.importance:
-        filter_clauses.append(f"importance eq '{filters.importance}'")
-    if filters.is_all_day is not None:
-        filter_clauses.append(f"isAllDay eq {str(filters.is_all_day).lower()}")
-    if filters.has_attachments is not None:
-        filter_clauses.append(f"hasAttachments eq {str(filters.has_attachments).lower()}")
-    if filters.categories:
-        for cat in filters.categories:
-            filter_clauses.append(f"categories/any(c:c eq '{cat}')")
-    if filters.is_cancelled is not None:
-        filter_clauses.append(f"isCancelled eq {str(filters.is_cancelled).lower()}")
+    odata_filter.eq("importance", filters.importance or None)
+    odata_filter.eq("isAllDay", filters.is_all_day)
+    odata_filter.eq("hasAttachments", filters.has_attachments)
+    for cat in filters.categories or ():
+        odata_filter.any_eq("categories", cat)
+    odata_filter.eq("isCancelled", filters.is_cancelled)
 
     # Convertir búsquedas a filtros con contains()
     search = event_query.search
     if search:
-        if search.body:
-            filter_clauses.append(f"contains(body/content, '{search.body}')")
-        if search.subject:
-                filter_clauses.append(f"contains(subject, '{search.subject}')")
+        odata_filter.contains("body/content", search.body or None)
+        odata_filter.contains("subject", search.subject or None)
 
-    if filter_clauses:
-        params["$filter"] = " and ".join(filter_clauses)
+    params.update(odata_filter.params())
 
     return params
 
 
+def event_query_select_fields(event_query: EventQuery) -> List[str]:
+    """Returns the event properties event_matches_query reads, besides those of simplify_event.
+
+    Args:
+        event_query (EventQuery): The event query parameters.
+
+    Returns:
+        List[str]: The properties, to add to the $select of the request.
+    """
+    filters = event_query.filters
+    fields = [
+        name
+        for name, value in (
+            ("importance", filters.importance),
+            ("isAllDay", filters.is_all_day),
+            ("hasAttachments", filters.has_attachments),
+            ("categories", filters.categories),
+            ("isCancelled", filters.is_cancelled),
+        )
+        if value is not None
+    ]
+    if event_query.search and event_query.search.body:
+        fields.append("body")
+    return fields
+
+
+def event_matches_query(event: dict, event_query: EventQuery) -> bool:
+    """Evaluates the filters and search of an event query on a Graph event, with the same
+    meaning as the $filter built by event_query_to_graph_params.
+
+    Args:
+        event (dict): The event object from Microsoft Graph API.
+        event_query (EventQuery): The event query parameters.
+
+    Returns:
+        bool: True if the event satisfies every filter and search term.
+    """
+    filters = event_query.filters
+    if filters.importance and (event.get("importance") or "").lower() != filters.importance.lower():
+        return False
+    for name, value in (
+        ("isAllDay", filters.is_all_day),
+        ("hasAttachments", filters.has_attachments),
+        ("isCancelled", filters.is_cancelled),
+    ):
+        if value is not None and bool(event.get(name)) != value:
+            return False
+    if filters.categories and not set(filters.categories).issubset(event.get("categories") or ()):
+        return False
+
+    search = event_query.search
+    if search:
+        # contains() in Graph is case-insensitive
+        if search.subject and search.subject.lower() not in (event.get("subject") or "").lower():
+            return False
+        body = (event.get("body") or {}).get("content") or ""
+        if search.body and search.body.lower() not in body.lower():
+            return False
+    return True
+
+
+@projection("id", "subject", "start", "end")
 def simplify_event(event: dict) -> dict:
     """Simplifies an event object to a more manageable format.
 
@@ -174,17 +231,28 @@ def simplify_event(event: dict) -> dict:
     }
 
 
-def simplify_event_with_attachment_names(event: dict, token: str) -> dict:
+@projection(
+    "id",
+    "subject",
+    "start",
+    "end",
+    "organizer",
+    "attendees",
+    "webLink",
+    "location",
+    "body",
+)
+def simplify_event_with_attachment_names(event: dict, attachments: list = None) -> dict:
     """Simplifies an event object and includes attachment names if present.
 
     Args:
         event (dict): The event object from Microsoft Graph API.
-        token (str): The authentication token for Microsoft Graph API.
+        attachments (list, optional): The attachment objects of the event, already retrieved. Defaults to None.
 
     Returns:
         dict: A simplified event dictionary including attachment names.
     """
-    simplified_event = {
+    return {
         "id": event.get("id"),
         "subject": event.get("subject"),
         "start": event.get("start", {}).get("dateTime"),
@@ -196,20 +264,11 @@ def simplify_event_with_attachment_names(event: dict, token: str) -> dict:
         "web_link": event.get("webLink"),
         "location": event.get("location", {}).get("displayName"),
         "html_description": event.get("body", {}).get("content"),
-        "attachment_names": []
+        "attachment_names": [
+            attachment.get("name") for attachment in (attachments or [])
+        ],
     }
 
-    if event.get("hasAttachments"):
-        event_id = event["id"]
-        url = f"https://graph.microsoft.com/v1.0/me/events/{event_id}/attachments"
-       
-        status_code, response = MicrosoftBaseRequest.microsoft_get(url, token)
-        if status_code == 200:
-            for attachment in response.get("value", []):
-                simplified_event["attachment_names"].append(attachment.get("name"))
-
-    return simplified_event
-
 
 def construct_data_for_response_events(event_changes_params: EventChangesParams) -> dict:
     """Constructs the data dictionary for responding to an event (accept, decline, etc.).
@@ -242,6 +301,7 @@ def construct_data_for_response_events(event_changes_params: EventChangesParams)
     return data
 
 
+@projection("id", "name")
 def simplify_calendar(calendar: dict) -> dict:
     """Simplifies a calendar object to a more manageable format.
 
@@ -0,0 +1,21 @@
+"""
+Helper functions for processing Microsoft Graph API contacts.
+"""
+from ..graph_projection import projection
+
+
+@projection("id", "givenName", "surname")
+def simplify_contact(contact: dict) -> dict:
+    """Simplifies a contact object to a more manageable format.
+
+    Args:
+        contact (dict): The contact object from Microsoft Graph API.
+
+    Returns:
+        dict: A simplified contact dictionary with selected fields.
+    """
+    return {
+        "id": contact.get("id"),
+        "givenName": contact.get("givenName"),
+        "surname": contact.get("surname"),
+    }
@@ -5,15 +5,35 @@ This module provides utilities to:
     - Simplify Microsoft Graph API message objects for easier handling.
     - Build OData filter and search parameters for querying emails.
     - Remove duplicate messages from lists.
+    - Evaluate email filters locally on simplified messages.
     - Handle color schemes and dataclass cleaning for Microsoft Outlook/Graph API email data.
 """
-import json
-from dataclasses import asdict, is_dataclass
-from typing import Any, List
-
-from ..param_types import DateFilter
-
-
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from ..graph_projection import projection
+from ..odata import ODataFilter, orderby, search_phrase
+from ..results import MessageRecord, ToolResult
+from ..param_types import DateFilter, EmailOrder, dataclass_to_clean_dict
+
+
+@projection(
+    "id",
+    "subject",
+    "from",
+    "toRecipients",
+    "ccRecipients",
+    "flag",
+    "receivedDateTime",
+    "categories",
+    "sentDateTime",
+    "isRead",
+    "hasAttachments",
+    "importance",
+    "conversationId",
+    "internetMessageId",
+    "bodyPreview",
+)
 def microsoft_simplify_message(
     msg: dict,
     full: bool = False,
@@ -24,44 +44,14 @@ def microsoft_simplify_message(
 
     Args:
         msg (dict): The message object from Microsoft Graph API.
-        full (bool, optional): If True, includes full body and attachments. Defaults to False.
+        full (bool, optional): If True, includes full body and attachments (select "body" on top of the projection). Defaults to False.
         attachments (list, optional): List of attachment objects. Defaults to None.
         attachments_download_path (list, optional): List of download paths for attachments. Defaults to None.
 
     Returns:
         dict: A simplified message dictionary.
     """
-    data = {
-        "id": msg.get("id"),
-        "subject": msg.get("subject"),
-        "from": {
-            "name": msg.get("from", {}).get("emailAddress", {}).get("name"),
-            "address": msg.get("from", {}).get("emailAddress", {}).get("address"),
-        },
-        "toRecipients": [
-            {
-                "name": r.get("emailAddress", {}).get("name"),
-                "address": r.get("emailAddress", {}).get("address"),
-            }
-            for r in msg.get("toRecipients", [])
-        ],
-        "ccRecipients": [
-            {
-                "name": r.get("emailAddress", {}).get("name"),
-                "address": r.get("emailAddress", {}).get("address"),
-            }
-            for r in msg.get("ccRecipients", [])
-        ],
-        "flag": msg.get("flag"),
-        "receivedDateTime": msg.get("receivedDateTime"),
-        "categories": msg.get("categories"),
-        "sentDateTime": msg.get("sentDateTime"),
-        "isRead": msg.get("isRead"),
-        "hasAttachments": msg.get("hasAttachments"),
-        "importance": msg.get("importance"),
-        "conversationId": msg.get("conversationId"),
-        "internetMessageId": msg.get("internetMessageId"),
-    }
+    data = MessageRecord.from_graph(msg).to_dict(body_preview=not full)
 
     if full:
         data["body"] = {
@@ -84,17 +74,14 @@ def microsoft_simplify_message(
         if attachments_download_path:
             data["attachments_download_path"] = attachments_download_path
 
-    else:
-        data["bodyPreview"] = msg.get("bodyPreview")
-
     return data
 
 
-def get_preset_color_scheme() -> str:
+def get_preset_color_scheme() -> ToolResult:
     """Returns a preset color scheme for the Microsoft Graph API.
 
     Returns:
-        str: JSON string of preset color names and their hex codes.
+        ToolResult: The preset color names and their hex codes.
     """
     preset_colors = {
         "preset0": ("Rojo", "#E81123"),
@@ -124,40 +111,7 @@ def get_preset_color_scheme() -> str:
         "preset24": ("Rosa pastel", "#FFD1DC"),
         "preset25": ("Lavanda", "#E6E6FA"),
     }
-    return json.dumps(preset_colors, indent=2)
-
-
-def dataclass_to_clean_dict(obj: Any) -> Any:
-    """Recursively converts a dataclass to a dictionary, omitting None values and cleaning nested structures.
-
-    Args:
-        obj (Any): The dataclass instance or nested structure.
-
-    Returns:
-        Any: A cleaned dictionary or list, or the original value if not a dataclass, list, or dict.
-    """
-    if is_dataclass(obj):
-        result = {}
-        for k, v in asdict(obj).items():
-            cleaned = dataclass_to_clean_dict(v)
-            if cleaned is not None:
-                result[k] = cleaned
-        return result or None
-    elif isinstance(obj, list):
-        cleaned_list = [
-            dataclass_to_clean_dict(item)
-            for item in obj
-            if dataclass_to_clean_dict(item) is not None
-        ]
-        return cleaned_list or None
-    elif isinstance(obj, dict):
-        return {
-            k: dataclass_to_clean_dict(v)
-            for k, v in obj.items()
-            if dataclass_to_clean_dict(v) is not None
-        }
-    else:
-        return obj
+    return preset_colors
 
 
 def build_date_filter(date_filter: DateFilter) -> str:
@@ -169,12 +123,17 @@ def build_date_filter(date_filter: DateFilter) -> str:
     Returns:
         str: OData filter string for date range, or empty string if not applicable.
     """
-    clauses = []
-    if date_filter.start_date:
-        clauses.append(f"receivedDateTime ge {date_filter.start_date.isoformat()}")
-    if date_filter.end_date:
-        clauses.append(f"receivedDateTime le {date_filter.end_date.isoformat()}")
-    return " and ".join(clauses) if clauses else ""
+    return _date_filter(ODataFilter(), date_filter).build() or ""
+
+
+def _date_filter(odata_filter: ODataFilter, date_filter: DateFilter) -> ODataFilter:
+    return odata_filter.compare("receivedDateTime", "ge", date_filter.start_date).compare(
+        "receivedDateTime", "le", date_filter.end_date
+    )
+
+
+# Earlier than any message, for the clause that lets Graph sort filtered messages
+_ORDER_FLOOR = datetime(1970, 1, 1)
 
 
 def build_categories_filter(categories: List[str]) -> str:
@@ -186,20 +145,7 @@ def build_categories_filter(categories: List[str]) -> str:
     Returns:
         str: OData filter string for categories, or empty string if not applicable.
     """
-    if not categories:
-        return ""
-
-    # Escape single quotes in category names by doubling them (OData standard)
-    escaped_categories = [c.replace("'", "''") for c in categories if c]
-
-    if not escaped_categories:
-        return ""
-
-    # Build individual category conditions
-    category_conditions = [f"categories/any(c:c eq '{c}')" for c in escaped_categories]
-
-    # Combine with OR and wrap in parentheses
-    return f"({' or '.join(category_conditions)})"
+    return ODataFilter().any_in("categories", categories).build() or ""
 
 
 def remove_duplicate_messages(messages: List[dict]) -> List[dict]:
@@ -235,36 +181,91 @@ def build_search_params(search) -> dict:
     if not search:
         return {}
     if search.keyword:
-        return {"$search": f'"{search.keyword}"'}
+        return {"$search": search_phrase(search.keyword)}
     if search.subject:
-        return {"$search": f'"subject:{search.subject}"'}
+        return {"$search": search_phrase(search.subject, "subject")}
     return {}
 
 
-def build_filter_params(filters) -> dict:
+def build_filter_params(filters, order_by: Optional[EmailOrder] = None) -> dict:
     """Builds filter parameters for Microsoft Graph API queries.
 
+    Graph only sorts filtered messages when the $orderby property is also the first one
+    filtered on, so with an order an always-true clause on that property comes first.
+
     Args:
         filters: An object with filter attributes (date_filter, importance, sender, unread_only, has_attachments, categories).
+        order_by (Optional[EmailOrder]): The sort order, sent as $orderby.
 
     Returns:
-        dict: Dictionary with $filter parameter for the API, or empty dict.
+        dict: Dictionary with the $filter and $orderby parameters for the API, or empty dict.
     """
-    parts = []
+    odata_filter = ODataFilter()
+    if order_by:
+        odata_filter.compare(order_by.field, "ge", _ORDER_FLOOR)
     if filters.date_filter:
-        date_filter = build_date_filter(filters.date_filter)
-        if date_filter:
-            parts.append(date_filter)
-    if filters.importance:
-        parts.append(f"importance eq '{filters.importance}'")
-    if filters.senderName:
-        parts.append(f"from/emailAddress/name eq '{filters.senderName}'")
-    if filters.sender:
-        parts.append(f"from/emailAddress/address eq '{filters.sender}'")
+        _date_filter(odata_filter, filters.date_filter)
+    odata_filter.eq("importance", filters.importance or None)
+    odata_filter.eq("from/emailAddress/name", filters.senderName or None)
+    odata_filter.eq("from/emailAddress/address", filters.sender or None)
     if filters.unread_only:
-        parts.append("isRead eq false")
+        odata_filter.eq("isRead", False)
     if filters.has_attachments:
-        parts.append("hasAttachments eq true")
-    if filters.categories:
-        parts.append(build_categories_filter(filters.categories))
-    return {"$filter": " and ".join(parts)} if parts else {}
+        odata_filter.eq("hasAttachments", True)
+    odata_filter.any_in("categories", filters.categories)
+
+    if not order_by:
+        return odata_filter.params()
+    params = {"$orderby": orderby(order_by.field, order_by.descending)}
+    if len(odata_filter) > 1:
+        params.update(odata_filter.params())
+    return params
+
+
+def _parse_graph_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parses a Graph date (e.g. 2025-06-19T10:00:00Z) as an aware UTC datetime."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Graph reads naive dates in filters as UTC, so the local evaluation does the same
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def message_matches_filters(message: dict, filters) -> bool:
+    """Evaluates email filters on a simplified message, with the same meaning as build_filter_params.
+
+    Args:
+        message (dict): A message simplified with microsoft_simplify_message.
+        filters: An object with filter attributes (date_filter, importance, sender, senderName, unread_only, has_attachments, categories).
+
+    Returns:
+        bool: True if the message satisfies every filter.
+    """
+    if not filters:
+        return True
+    if filters.date_filter and (filters.date_filter.start_date or filters.date_filter.end_date):
+        received = _parse_graph_datetime(message.get("receivedDateTime"))
+        if received is None:
+            return False
+        if filters.date_filter.start_date and received < _as_utc(filters.date_filter.start_date):
+            return False
+        if filters.date_filter.end_date and received > _as_utc(filters.date_filter.end_date):
+            return False
+    if filters.importance and (message.get("importance") or "").lower() != filters.importance.lower():
+        return False
+    sender = message.get("from") or {}
+    if filters.senderName and sender.get("name") != filters.senderName:
+        return False
+    if filters.sender and (sender.get("address") or "").lower() != filters.sender.lower():
+        return False
+    if filters.unread_only and message.get("isRead"):
+        return False
+    if filters.has_attachments and not message.get("hasAttachments"):
+        return False
+    if filters.categories and not set(filters.categories).intersection(message.get("categories") or []):
+        return False
+    return True
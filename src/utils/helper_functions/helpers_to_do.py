@@ -0,0 +1,21 @@
+"""
+Helper functions for processing Microsoft To Do tasks.
+"""
+from ..graph_projection import projection
+
+
+@projection("id", "title", "status")
+def simplify_task(task: dict) -> dict:
+    """Simplifies a To Do task object to a more manageable format.
+
+    Args:
+        task (dict): The task object from Microsoft Graph API.
+
+    Returns:
+        dict: A simplified task dictionary with selected fields.
+    """
+    return {
+        "id": task["id"],
+        "title": task["title"],
+        "status": task["status"],
+    }
@@ -0,0 +1,56 @@
+"""
+Lazy stand-ins for the request objects of the MCP servers.
+
+A server only needs its request classes when one of its tools is called.
+LazyRequests records which class to build and imports its module (and with it
+the HTTP stack) on the first attribute access, so starting a server, or
+mounting several of them in one process, does not pay for subsystems that are
+never used.
+"""
+import importlib
+import threading
+
+
+class LazyRequests:
+    """
+    Proxy that builds a request object the first time one of its attributes is used.
+
+    Example:
+        messages_requests = LazyRequests(
+            ".email.microsoft_messages_requests", "AsyncMicrosoftMessagesRequests", token_manager
+        )
+        await messages_requests.get_messages_from_folder_microsoft_api(...)  # imports the module here
+    """
+
+    def __init__(self, module_name: str, class_name: str, token_manager):
+        """
+        Initializes the proxy without importing anything.
+
+        Args:
+            module_name (str): The module of the class, relative to the utils package (e.g. ".email.microsoft_messages_requests").
+            class_name (str): The name of the request class.
+            token_manager: The token manager passed to the class.
+        """
+        self._module_name = module_name
+        self._class_name = class_name
+        self._token_manager = token_manager
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module = importlib.import_module(self._module_name, package=__package__)
+                    requests_class = getattr(module, self._class_name)
+                    self._instance = requests_class(self._token_manager)
+        return self._instance
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the request object has been built."""
+        return self._instance is not None
+
+    def __getattr__(self, name: str):
+        # Only called for attributes the proxy itself does not have
+        return getattr(self._load(), name)
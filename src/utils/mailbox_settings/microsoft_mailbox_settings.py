@@ -1,7 +1,9 @@
-import json
 from ..param_types import MailboxSettingsParams
 from ..constants import MAILBOX_SETTINGS_URL
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 
 
 class MicrosoftMailboxSettings(MicrosoftBaseRequest):
@@ -11,23 +13,25 @@ class MicrosoftMailboxSettings(MicrosoftBaseRequest):
     """
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_mailbox_settings(self) -> str:
+    @cached("mailbox_settings")
+    def get_mailbox_settings(self) -> ToolResult:
         """
         Retrieves the mailbox settings from Microsoft Graph API.
 
         Returns:
-            str: A JSON string containing the mailbox settings.
+            ToolResult: The mailbox settings.
         """
         status_code, response = self.microsoft_get(
             MAILBOX_SETTINGS_URL, self.token_manager.get_token()
         )
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("mailbox_settings")
     def update_mailbox_settings(
         self, mailbox_settings_params: MailboxSettingsParams
-    ) -> str:
+    ) -> ToolResult:
         """
         Updates the mailbox settings in Microsoft Graph API.
 
@@ -35,7 +39,7 @@ class MicrosoftMailboxSettings(MicrosoftBaseRequest):
             mailbox_settings_params (MailboxSettingsParams): The parameters for updating mailbox settings.
 
         Returns:
-            str: A JSON string containing the response from the API.
+            ToolResult: The response from the API.
         """
         data = {}
 
@@ -74,4 +78,7 @@ class MicrosoftMailboxSettings(MicrosoftBaseRequest):
             MAILBOX_SETTINGS_URL, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
+
+
+AsyncMicrosoftMailboxSettings = make_async_requests(MicrosoftMailboxSettings)
@@ -1,16 +1,99 @@
 import os
+import re
+import mimetypes
 import json
+import time
 import base64
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+from .constants import BATCH_URL, CREATE_UPLOAD_SESSION_URL
+from .graph_batch import (
+    FAILED_DEPENDENCY_STATUS,
+    RETRYABLE_STATUS_CODES,
+    BatchRequest,
+    BatchResponse,
+    GraphBatchError,
+    chunk_batch_requests,
+    summarize_batch_results,
+)
+from .graph_pagination import GraphPaginator
+from .graph_retry import send_with_retry, wait_for_rate_limit
+from .graph_session import get_graph_config, get_graph_session
 from .token_manager import TokenManager
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Graph rejects inline (base64) attachments above 3 MB; larger files use an upload session
+LARGE_ATTACHMENT_THRESHOLD = 3 * 1024 * 1024
+# Upload session chunks must be a multiple of 320 KiB
+UPLOAD_CHUNK_SIZE = 10 * 320 * 1024
+MAX_UPLOAD_RESUMES = 3
+
+
+def get_download_dir() -> str:
+    """
+    Returns the folder attachments are downloaded to.
+
+    Returns:
+        str: ATTACHMENTS_DOWNLOAD_DIR if set, otherwise ~/Downloads/attachments.
+    """
+    default_dir = os.path.join(os.path.expanduser("~"), "Downloads", "attachments")
+    return os.path.expanduser(os.getenv("ATTACHMENTS_DOWNLOAD_DIR", default_dir))
+
+
+def get_download_concurrency() -> int:
+    """
+    Returns the maximum number of attachments downloaded at once.
+
+    Returns:
+        int: ATTACHMENTS_MAX_CONCURRENCY if set, otherwise 4.
+    """
+    return max(1, int(os.getenv("ATTACHMENTS_MAX_CONCURRENCY", 4)))
+
+
+def get_batch_concurrency() -> int:
+    """
+    Returns the maximum number of $batch requests sent at once.
+
+    Every batch carries up to 20 requests to the same mailbox, and Outlook allows
+    about 4 concurrent requests per mailbox, so batches are sent one at a time by default.
+
+    Returns:
+        int: GRAPH_BATCH_CONCURRENCY if set, otherwise 1.
+    """
+    return max(1, int(os.getenv("GRAPH_BATCH_CONCURRENCY", 1)))
+
+
+def _reserve_download_path(download_dir: str, name: str) -> str:
+    # Only the base name is kept so an attachment cannot be written outside the download folder.
+    # The file is created empty (O_EXCL), so a name is never handed out twice, even across processes
+    stem, extension = os.path.splitext(os.path.basename(name))
+    counter = 0
+    while True:
+        suffix = f" ({counter})" if counter else ""
+        file_path = os.path.join(download_dir, f"{stem}{suffix}{extension}")
+        try:
+            os.close(os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+            return file_path
+        except FileExistsError:
+            counter += 1
+
+
+def _attachment_id_from_location(location: str | None) -> str | None:
+    # The last chunk of an upload session answers with Location: .../attachments('<id>')
+    match = re.search(r"attachments\('([^']+)'\)", location or "", re.IGNORECASE)
+    return match.group(1) if match else None
+
+
 class MicrosoftBaseRequest:
     """
     Base class for making requests to the Microsoft Graph API.
 
     Provides helper methods for GET, POST, PATCH, DELETE requests, error handling,
-    file encoding, and attachment downloading.
+    file encoding, and attachment downloading. All requests go through the shared,
+    connection-pooled session from graph_session, so every request class reuses
+    the same keep-alive connections, and through the retry layer from graph_retry,
+    which rate limits per mailbox and retries throttled and transient failures.
 
     Attributes:
         token_manager (TokenManager): Instance to manage authentication tokens.
@@ -41,18 +124,19 @@ class MicrosoftBaseRequest:
             try:
                 return func(*args, **kwargs)
             except requests.HTTPError as e:
-                return json.dumps(
-                    {"error": f"HTTP error: {e.response.status_code} - {e.response.text}"},
-                    indent=2,
-                )
+                return {"error": f"HTTP error: {e.response.status_code} - {e.response.text}"}
+            except GraphBatchError as e:
+                return {"error": f"HTTP error: {e.status} - {json.dumps(e.body)}"}
             except requests.RequestException as e:
-                return json.dumps({"error": f"Request failed: {str(e)}"}, indent=2)
+                return {"error": f"Request failed: {str(e)}"}
             except Exception as e:
-                return json.dumps({"error": f"Internal error: {str(e)}"}, indent=2)
+                return {"error": f"Internal error: {str(e)}"}
         return wrapper
     
     @staticmethod
-    def microsoft_get(url: str, token: str, params: dict | None = None):
+    def microsoft_get(
+        url: str, token: str, params: dict | None = None, headers: dict | None = None
+    ):
         """
         Sends a GET request to the Microsoft Graph API.
 
@@ -60,13 +144,24 @@ class MicrosoftBaseRequest:
             url (str): The endpoint URL.
             token (str): Bearer token for authentication.
             params (Optional[dict]): Query parameters for the request.
+            headers (Optional[dict]): Extra headers for the request (e.g. Prefer).
 
         Returns:
             Tuple[int, dict]: The HTTP status code and the JSON response.
         """
         params = params or {}
-        headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
-        response = requests.get(url, headers=headers, params=params)
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+            **(headers or {}),
+        }
+        response = send_with_retry(
+            "GET",
+            url,
+            lambda: get_graph_session().get(
+                url, headers=headers, params=params, timeout=get_graph_config().timeout
+            ),
+        )
         response.raise_for_status()
         return response.status_code, response.json()
     @staticmethod
@@ -83,10 +178,13 @@ class MicrosoftBaseRequest:
             Tuple[int, dict]: The HTTP status code and the JSON response (empty dict if no JSON).
         """
         data = data or {}
-        response = requests.post(
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        response = send_with_retry(
+            "POST",
             url,
-            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-            json=data,
+            lambda: get_graph_session().post(
+                url, headers=headers, json=data, timeout=get_graph_config().timeout
+            ),
         )
         response.raise_for_status()
         try:
@@ -109,7 +207,13 @@ class MicrosoftBaseRequest:
         """
         data = data or {}
         headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        response = requests.patch(url, headers=headers, json=data)
+        response = send_with_retry(
+            "PATCH",
+            url,
+            lambda: get_graph_session().patch(
+                url, headers=headers, json=data, timeout=get_graph_config().timeout
+            ),
+        )
         response.raise_for_status()
         return response.status_code, response.json()
     @staticmethod
@@ -125,10 +229,172 @@ class MicrosoftBaseRequest:
             Tuple[int, str]: The HTTP status code and the response text.
         """
         headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
-        response = requests.delete(url, headers=headers)
+        response = send_with_retry(
+            "DELETE",
+            url,
+            lambda: get_graph_session().delete(
+                url, headers=headers, timeout=get_graph_config().timeout
+            ),
+        )
         response.raise_for_status()
         return response.status_code, response.text
 
+    @staticmethod
+    def microsoft_batch(
+        batch_requests: list[BatchRequest],
+        token: str,
+        max_retries: int = 2,
+        max_concurrency: int | None = None,
+    ) -> dict[str, BatchResponse]:
+        """
+        Sends several requests through the Microsoft Graph JSON batch endpoint ($batch).
+
+        Requests are packed into batches of up to 20, keeping requests linked by
+        dependsOn in the same batch. Sub-requests that fail with a throttling or
+        transient error (429, 5xx) are sent again in a new batch, waiting for the
+        Retry-After given by Graph. Server errors are only retried for idempotent methods.
+        When more than one batch is needed, up to max_concurrency batches are in flight at once.
+
+        Args:
+            batch_requests (list[BatchRequest]): The sub-requests to send.
+            token (str): Bearer token for authentication.
+            max_retries (int, optional): Maximum number of retries for failed sub-requests. Defaults to 2.
+            max_concurrency (Optional[int]): Maximum number of batches sent in parallel.
+                Defaults to GRAPH_BATCH_CONCURRENCY (1).
+
+        Returns:
+            dict[str, BatchResponse]: The individual response of each sub-request, by ID, in request order.
+        """
+        results: dict[str, BatchResponse] = {}
+        pending = list(batch_requests)
+        if max_concurrency is None:
+            max_concurrency = get_batch_concurrency()
+
+        def send_chunk(chunk: list[BatchRequest]) -> dict:
+            # The $batch URL has no mailbox: each sub-request is charged to its own
+            wait_for_rate_limit(r.absolute_url() for r in chunk)
+            status_code, response = MicrosoftBaseRequest.microsoft_post(
+                BATCH_URL, token, {"requests": [r.to_json() for r in chunk]}
+            )
+            return response
+
+        for attempt in range(max_retries + 1):
+            chunks = chunk_batch_requests(pending)
+            if len(chunks) > 1 and max_concurrency > 1:
+                with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as executor:
+                    chunk_responses = list(executor.map(send_chunk, chunks))
+            else:
+                chunk_responses = [send_chunk(chunk) for chunk in chunks]
+            for response in chunk_responses:
+                for item in response.get("responses", []):
+                    batch_response = BatchResponse.from_json(item)
+                    results[batch_response.id] = batch_response
+
+            retry_ids = set()
+            for request in pending:
+                result = results.get(request.id)
+                if result is None:
+                    continue
+                if result.status == 429 or (
+                    result.status in RETRYABLE_STATUS_CODES
+                    and request.method.upper() in ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+                ):
+                    retry_ids.add(request.id)
+            for request in pending:
+                # Requests skipped because a retried dependency failed are retried with it
+                if results.get(request.id) and results[request.id].status == FAILED_DEPENDENCY_STATUS:
+                    if any(dependency in retry_ids for dependency in request.depends_on):
+                        retry_ids.add(request.id)
+
+            if not retry_ids or attempt == max_retries:
+                break
+
+            wait = max(results[request_id].retry_after for request_id in retry_ids)
+            time.sleep(wait or min(2**attempt, 8))
+            pending = [
+                BatchRequest(
+                    id=request.id,
+                    method=request.method,
+                    url=request.url,
+                    params=request.params,
+                    body=request.body,
+                    depends_on=[d for d in request.depends_on if d in retry_ids],
+                )
+                for request in pending
+                if request.id in retry_ids
+            ]
+
+        return {
+            request.id: results.get(request.id, BatchResponse(id=request.id, status=0))
+            for request in batch_requests
+        }
+
+    def microsoft_paginate(
+        self,
+        url: str,
+        params: dict | None = None,
+        max_items: int | None = None,
+        max_pages: int | None = None,
+        page_size: int | None = None,
+    ) -> GraphPaginator:
+        """
+        Returns a lazy iterator over every item of a Graph collection, following @odata.nextLink.
+
+        Args:
+            url (str): The URL of the collection.
+            params (Optional[dict]): Query parameters of the first page.
+            max_items (Optional[int]): Maximum number of items to return. None for no limit.
+            max_pages (Optional[int]): Maximum number of pages to request. Defaults to GRAPH_MAX_PAGES.
+            page_size (Optional[int]): Page size requested from the server ($top).
+
+        Returns:
+            GraphPaginator: The iterator. Its next_link holds the link to resume from when a budget was reached.
+        """
+        return GraphPaginator(
+            self.microsoft_get,
+            self.token_manager.get_token,
+            url,
+            params=params,
+            max_items=max_items,
+            max_pages=max_pages,
+            page_size=page_size,
+        )
+
+    def microsoft_bulk(
+        self,
+        item_ids: list[str],
+        method: str,
+        url_builder,
+        data: dict | None = None,
+        max_concurrency: int | None = None,
+    ) -> dict:
+        """
+        Applies the same operation to many resources through batched, concurrency-limited requests.
+
+        Duplicated IDs are only processed once.
+
+        Args:
+            item_ids (list[str]): The IDs of the resources to update.
+            method (str): The HTTP method of every sub-request.
+            url_builder (Callable[[str], str]): Builds the URL of a resource from its ID.
+            data (Optional[dict]): The body sent with every sub-request.
+            max_concurrency (Optional[int]): Maximum number of batches sent in parallel.
+                Defaults to GRAPH_BATCH_CONCURRENCY (1).
+
+        Returns:
+            dict: The per-item summary built by summarize_batch_results.
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        request_ids = [str(index) for index in range(len(item_ids))]
+        batch_requests = [
+            BatchRequest(id=request_id, method=method, url=url_builder(item_id), body=data)
+            for request_id, item_id in zip(request_ids, item_ids)
+        ]
+        responses = self.microsoft_batch(
+            batch_requests, self.token_manager.get_token(), max_concurrency=max_concurrency
+        )
+        return summarize_batch_results(item_ids, responses, request_ids)
+
     @staticmethod
     def read_file_and_encode_base64(file_path: str) -> tuple[str, str]:
         """
@@ -151,35 +417,277 @@ class MicrosoftBaseRequest:
         return filename, encoded_content
 
     @staticmethod
-    def download_attachments(attachments: list) -> list:
+    def microsoft_download(
+        url: str, token: str, file_path: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> int:
         """
-        Downloads file attachments from a list of Microsoft Graph attachment objects.
+        Streams a binary resource (e.g. an attachment $value) to a file in fixed-size chunks.
+
+        Only one chunk is held in memory at a time. The content is written to a
+        temporary file that replaces file_path once the download is complete.
 
         Args:
-            attachments (list): List of attachment objects from Microsoft Graph API.
+            url (str): The endpoint URL.
+            token (str): Bearer token for authentication.
+            file_path (str): The path of the file to write.
+            chunk_size (int, optional): Size in bytes of every chunk. Defaults to 1 MiB.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        headers = {"Authorization": f"Bearer {token}"}
+        response = send_with_retry(
+            "GET",
+            url,
+            lambda: get_graph_session().get(
+                url, headers=headers, stream=True, timeout=get_graph_config().timeout
+            ),
+        )
+        with response:
+            response.raise_for_status()
+            partial_path = f"{file_path}.part"
+            written = 0
+            try:
+                with open(partial_path, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        file.write(chunk)
+                        written += len(chunk)
+            except Exception:
+                # A broken stream or a failed write leaves no partial file behind
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                raise
+        os.replace(partial_path, file_path)
+        return written
+
+    def download_attachments(self, attachments: list, url_builder) -> list:
+        """
+        Downloads file attachments to the download directory, streaming each one from its $value endpoint.
+
+        The attachments only need their metadata (id, name, contentType); the
+        content is never loaded in memory. Up to ATTACHMENTS_MAX_CONCURRENCY files
+        are downloaded at once.
+
+        Args:
+            attachments (list): List of attachment objects from Microsoft Graph API (metadata only).
+            url_builder (Callable[[str], str]): Builds the $value URL of an attachment from its ID.
 
         Returns:
             list: List of dictionaries with details about the downloaded attachments (name, contentType, path, attachment_id).
+                A file whose name is already taken in the download directory gets a " (1)", " (2)"... suffix.
         """
-        download_dir = os.path.join(os.path.expanduser("~"), "Downloads", "attachments")
+        download_dir = get_download_dir()
         os.makedirs(download_dir, exist_ok=True)
-        downloaded_attachments = []
-        for att in attachments:
-            if att.get("@odata.type") == "#microsoft.graph.fileAttachment":
-                name = att.get("name")
-                content_type = att.get("contentType")
-                content_bytes = att.get("contentBytes")
-                id = att.get("id")
-                if name and content_bytes:
-                    file_path = os.path.join(download_dir, name)
-                    with open(file_path, "wb") as f:
-                        f.write(base64.b64decode(content_bytes))
-                    downloaded_attachments.append(
-                        {
-                            "name": name,
-                            "contentType": content_type,
-                            "path": file_path,
-                            "attachment_id": id,
-                        }
+        files = [
+            att
+            for att in attachments
+            if att.get("@odata.type", "#microsoft.graph.fileAttachment")
+            == "#microsoft.graph.fileAttachment"
+            and att.get("name")
+            and att.get("id")
+        ]
+        if not files:
+            return []
+        token = self.token_manager.get_token()
+        # Names are reserved before any download starts, so files with the same name never overwrite each other
+        paths = [_reserve_download_path(download_dir, att["name"]) for att in files]
+
+        def download(att: dict, file_path: str) -> dict:
+            try:
+                self.microsoft_download(url_builder(att["id"]), token, file_path)
+            except Exception:
+                os.remove(file_path)
+                raise
+            return {
+                "name": att["name"],
+                "contentType": att.get("contentType"),
+                "path": file_path,
+                "attachment_id": att["id"],
+            }
+
+        max_workers = min(get_download_concurrency(), len(files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(download, files, paths))
+
+    @staticmethod
+    def _upload_session_offset(upload_url: str, size: int) -> int:
+        """
+        Asks an upload session for the first byte it has not received yet.
+
+        Args:
+            upload_url (str): The pre-authenticated URL of the upload session.
+            size (int): The size of the file, returned when nothing else is expected.
+
+        Returns:
+            int: The offset to resume the upload from.
+        """
+        response = send_with_retry(
+            "GET",
+            upload_url,
+            lambda: get_graph_session().get(upload_url, timeout=get_graph_config().timeout),
+        )
+        response.raise_for_status()
+        ranges = response.json().get("nextExpectedRanges") or []
+        if not ranges:
+            return size
+        return int(ranges[0].split("-")[0])
+
+    @staticmethod
+    def microsoft_upload_session(
+        upload_url: str,
+        file_path: str,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_resumes: int = MAX_UPLOAD_RESUMES,
+    ) -> str | None:
+        """
+        Uploads a file to a Graph upload session in ranged chunks.
+
+        Chunks are read from the file one at a time, so memory use does not grow
+        with the file size. If a chunk cannot be sent, the session is asked for the
+        next expected range and the upload resumes from there, up to max_resumes times.
+
+        Args:
+            upload_url (str): The pre-authenticated uploadUrl returned by createUploadSession.
+            file_path (str): The path of the file to upload.
+            chunk_size (int, optional): Size in bytes of every chunk, a multiple of 320 KiB. Defaults to 3.2 MiB.
+            max_resumes (int, optional): Times the upload is resumed after a failed chunk. Defaults to 3.
+
+        Returns:
+            Optional[str]: The ID of the created attachment, if Graph returned it.
+
+        Raises:
+            requests.RequestException: If a chunk still fails after the last resume.
+        """
+        size = os.path.getsize(file_path)
+        offset = 0
+        resumes = 0
+        location = None
+        with open(file_path, "rb") as file:
+            while offset < size:
+                file.seek(offset)
+                chunk = file.read(min(chunk_size, size - offset))
+                # The upload URL is pre-authenticated: sending the bearer token is rejected
+                headers = {
+                    "Content-Length": str(len(chunk)),
+                    "Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{size}",
+                }
+                try:
+                    response = send_with_retry(
+                        "PUT",
+                        upload_url,
+                        lambda: get_graph_session().put(
+                            upload_url,
+                            headers=headers,
+                            data=chunk,
+                            timeout=get_graph_config().timeout,
+                        ),
                     )
-        return downloaded_attachments
\ No newline at end of file
+                    response.raise_for_status()
+                except requests.RequestException:
+                    if resumes >= max_resumes:
+                        raise
+                    resumes += 1
+                    offset = MicrosoftBaseRequest._upload_session_offset(upload_url, size)
+                    continue
+                offset += len(chunk)
+                location = response.headers.get("Location", location)
+        return _attachment_id_from_location(location)
+
+    def upload_attachment(
+        self, attachments_url: str, file_path: str, content_type: str | None = None
+    ) -> dict:
+        """
+        Adds a file attachment to a message or event.
+
+        Files under 3 MB are sent inline in a single request. Larger files go
+        through an upload session and are streamed in chunks, so attachments of
+        hundreds of MB can be added without loading them in memory.
+
+        Args:
+            attachments_url (str): The attachments collection of the message or event.
+            file_path (str): The path of the file to attach.
+            content_type (Optional[str]): The MIME type of the file. Guessed from the file name if not given.
+
+        Returns:
+            dict: The attachment details (attachment_id, name, contentType, size).
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+        name = os.path.basename(file_path)
+        size = os.path.getsize(file_path)
+        content_type = (
+            content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+        )
+        token = self.token_manager.get_token()
+        if size < LARGE_ATTACHMENT_THRESHOLD:
+            name, content = self.read_file_and_encode_base64(file_path)
+            status_code, response = self.microsoft_post(
+                attachments_url,
+                token,
+                data={
+                    "@odata.type": "#microsoft.graph.fileAttachment",
+                    "name": name,
+                    "contentBytes": content,
+                    "contentType": content_type,
+                },
+            )
+            return {
+                "attachment_id": response.get("id"),
+                "name": response.get("name", name),
+                "contentType": response.get("contentType", content_type),
+                "size": response.get("size", size),
+            }
+        status_code, session = self.microsoft_post(
+            CREATE_UPLOAD_SESSION_URL(attachments_url),
+            token,
+            data={
+                "AttachmentItem": {
+                    "attachmentType": "file",
+                    "name": name,
+                    "size": size,
+                    "contentType": content_type,
+                }
+            },
+        )
+        attachment_id = self.microsoft_upload_session(session["uploadUrl"], file_path)
+        return {
+            "attachment_id": attachment_id,
+            "name": name,
+            "contentType": content_type,
+            "size": size,
+        }
+
+    def upload_attachments(
+        self, attachments_url: str, file_paths: list, content_type: str | None = None
+    ) -> list:
+        """
+        Adds several file attachments to a message or event in parallel.
+
+        Up to ATTACHMENTS_MAX_CONCURRENCY files are uploaded at once. A failed file
+        does not stop the others.
+
+        Args:
+            attachments_url (str): The attachments collection of the message or event.
+            file_paths (list): The paths of the files to attach.
+            content_type (Optional[str]): The MIME type of every file. Guessed from each file name if not given.
+
+        Returns:
+            list: One result per file, in order, with the path, a success flag and either
+            the attachment details or an error.
+        """
+        if not file_paths:
+            return []
+
+        def upload(file_path: str) -> dict:
+            try:
+                attachment = self.upload_attachment(attachments_url, file_path, content_type)
+            except (OSError, requests.RequestException, KeyError) as e:
+                return {"path": file_path, "success": False, "error": str(e)}
+            return {"path": file_path, "success": True, **attachment}
+
+        max_workers = min(get_download_concurrency(), len(file_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(upload, file_paths))
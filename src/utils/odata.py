@@ -0,0 +1,212 @@
+"""
+Builder of the OData query options ($filter, $search, $orderby) sent to Graph.
+
+Values are never pasted into a query by hand: every clause is built from a
+property path, an operator and a Python value, which is written as an OData
+literal (strings quoted with single quotes doubled, booleans as true/false,
+datetimes in UTC with a trailing Z). Property paths and operators are validated,
+so a malformed query raises ValueError here instead of a 400 from Graph.
+
+The text of a clause with the values left out (its shape, e.g.
+"importance eq {}") is compiled once per (kind, property, operator) and cached,
+so repeated queries only format their values:
+
+    params = (
+        ODataFilter()
+        .eq("importance", filters.importance)
+        .eq("from/emailAddress/address", filters.sender)
+        .any_in("categories", filters.categories)
+        .params()
+    )
+"""
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional
+
+COMPARISON_OPERATORS = ("eq", "ne", "gt", "ge", "lt", "le")
+STRING_FUNCTIONS = ("contains", "startswith", "endswith")
+
+# A property or a navigation path, e.g. "from/emailAddress/address"
+_PATH = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(/[A-Za-z_][A-Za-z0-9_]*)*")
+
+
+def literal(value: Any) -> str:
+    """
+    Writes a Python value as an OData literal.
+
+    Args:
+        value (Any): A str, bool, int, float, datetime or None. Naive datetimes are read as UTC.
+
+    Returns:
+        str: The literal, e.g. 'O''Brien', true, 2025-06-19T10:00:00Z or null.
+
+    Raises:
+        ValueError: If the value has no OData literal.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat() + "Z"
+    raise ValueError(f"Value of type {type(value).__name__} can't be used in an OData query")
+
+
+def search_phrase(text: str, prop: Optional[str] = None) -> str:
+    """
+    Writes the value of a $search, quoted, with embedded quotes and backslashes escaped.
+
+    Args:
+        text (str): The text to search for.
+        prop (Optional[str]): The property to search in (e.g. "subject"). Defaults to every property.
+
+    Returns:
+        str: The $search value, e.g. "subject:quarterly report".
+    """
+    if prop is not None:
+        _check_path(prop)
+        text = f"{prop}:{text}"
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _check_path(path: str) -> None:
+    if not isinstance(path, str) or not _PATH.fullmatch(path):
+        raise ValueError(f"Invalid OData property path: {path!r}")
+
+
+@lru_cache(maxsize=256)
+def _clause_template(kind: str, path: str, operator: str) -> str:
+    # Validated and compiled once per query shape; only the literal is formatted per call
+    _check_path(path)
+    if kind == "compare":
+        if operator not in COMPARISON_OPERATORS:
+            raise ValueError(f"Invalid OData comparison operator: {operator!r}")
+        return f"{path} {operator} {{}}"
+    if kind == "function":
+        if operator not in STRING_FUNCTIONS:
+            raise ValueError(f"Invalid OData string function: {operator!r}")
+        return f"{operator}({path}, {{}})"
+    if kind == "any":
+        if operator not in COMPARISON_OPERATORS:
+            raise ValueError(f"Invalid OData comparison operator: {operator!r}")
+        return f"{path}/any(c:c {operator} {{}})"
+    raise ValueError(f"Unknown OData clause kind: {kind!r}")
+
+
+def orderby(path: str, descending: bool = False) -> str:
+    """
+    Writes an $orderby value.
+
+    Args:
+        path (str): The property path to sort by.
+        descending (bool, optional): Whether the order is descending. Defaults to False.
+
+    Returns:
+        str: The $orderby value, e.g. "receivedDateTime desc".
+    """
+    _check_path(path)
+    return f"{path} {'desc' if descending else 'asc'}"
+
+
+class ODataFilter:
+    """
+    A $filter made of clauses joined with "and".
+
+    Every method returns the filter itself so calls can be chained, and skips the
+    clause when its value is None, so optional query fields can be passed as they are.
+    """
+
+    __slots__ = ("_clauses",)
+
+    def __init__(self):
+        self._clauses: List[str] = []
+
+    def compare(self, path: str, operator: str, value: Any) -> "ODataFilter":
+        """
+        Adds a comparison, e.g. receivedDateTime ge 2025-06-19T00:00:00Z.
+
+        Args:
+            path (str): The property path.
+            operator (str): One of COMPARISON_OPERATORS.
+            value (Any): The value compared with. The clause is skipped if None.
+
+        Returns:
+            ODataFilter: The filter.
+        """
+        if value is not None:
+            self._clauses.append(_clause_template("compare", path, operator).format(literal(value)))
+        return self
+
+    def eq(self, path: str, value: Any) -> "ODataFilter":
+        """Adds "path eq value", unless value is None."""
+        return self.compare(path, "eq", value)
+
+    def contains(self, path: str, text: Optional[str]) -> "ODataFilter":
+        """Adds "contains(path, 'text')", unless text is None."""
+        return self._function("contains", path, text)
+
+    def startswith(self, path: str, text: Optional[str]) -> "ODataFilter":
+        """Adds "startswith(path, 'text')", unless text is None."""
+        return self._function("startswith", path, text)
+
+    def any_eq(self, path: str, value: Any) -> "ODataFilter":
+        """Adds "path/any(c:c eq value)" (the collection contains value), unless value is None."""
+        if value is not None:
+            self._clauses.append(_clause_template("any", path, "eq").format(literal(value)))
+        return self
+
+    def any_in(self, path: str, values: Optional[Iterable[Any]]) -> "ODataFilter":
+        """
+        Adds a clause true when the collection contains at least one of the values.
+
+        Args:
+            path (str): The path of the collection, e.g. "categories".
+            values (Optional[Iterable[Any]]): The values. Empty and None values are skipped.
+
+        Returns:
+            ODataFilter: The filter.
+        """
+        template = _clause_template("any", path, "eq")
+        conditions = [template.format(literal(v)) for v in values or () if v]
+        if conditions:
+            self._clauses.append(f"({' or '.join(conditions)})")
+        return self
+
+    def _function(self, function: str, path: str, text: Optional[str]) -> "ODataFilter":
+        if text is not None:
+            if not isinstance(text, str):
+                raise ValueError(f"{function} needs a string, not {type(text).__name__}")
+            self._clauses.append(_clause_template("function", path, function).format(literal(text)))
+        return self
+
+    def build(self) -> Optional[str]:
+        """
+        Returns the $filter value.
+
+        Returns:
+            Optional[str]: The clauses joined with "and", or None if there are none.
+        """
+        return " and ".join(self._clauses) if self._clauses else None
+
+    def params(self) -> dict:
+        """
+        Returns the filter as query parameters.
+
+        Returns:
+            dict: {"$filter": ...}, or an empty dict if there are no clauses.
+        """
+        odata_filter = self.build()
+        return {"$filter": odata_filter} if odata_filter else {}
+
+    def __len__(self) -> int:
+        return len(self._clauses)
+
+    def __str__(self) -> str:
+        return self.build() or ""
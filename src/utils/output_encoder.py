@@ -0,0 +1,130 @@
+"""
+Encoder of the JSON returned by the tools.
+
+Request methods return Python structures (see results); they are turned into
+the JSON string a tool returns once, at the tool boundary, by encode_output.
+How it is written depends on the output mode:
+    - pretty: indented with two spaces, as the tools always answered. The default.
+    - compact: no whitespace between tokens and non-ASCII text kept as is, which
+      makes listings noticeably smaller and cheaper in context tokens.
+    - fast: the compact output written by orjson when it is installed, and by
+      the standard library (as compact) when it is not.
+
+The mode is chosen through environment variables:
+    - GRAPH_OUTPUT_MODE: The mode of every tool. Defaults to "pretty".
+    - GRAPH_OUTPUT_MODE_<TOOL>: The mode of one tool, e.g. GRAPH_OUTPUT_MODE_LIST_EMAILS=compact.
+
+Every server calls serialize_tool_outputs(mcp) once its tools are registered, so
+each tool encodes its result in its own mode.
+"""
+import inspect
+import json
+import os
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+OUTPUT_MODES = ("pretty", "compact", "fast")
+DEFAULT_OUTPUT_MODE = "pretty"
+
+# Name of the tool being run. asyncio.to_thread copies it into the worker thread of the request
+_current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+
+def get_output_mode(tool: Optional[str] = None) -> str:
+    """
+    Returns the output mode of a tool.
+
+    Args:
+        tool (Optional[str]): The tool name. Defaults to the tool being run, if any.
+
+    Returns:
+        str: One of OUTPUT_MODES.
+
+    Raises:
+        ValueError: If the configured mode is not one of OUTPUT_MODES.
+    """
+    tool = tool or _current_tool.get()
+    raw = os.getenv(f"GRAPH_OUTPUT_MODE_{tool.upper()}") if tool else None
+    mode = (raw or os.getenv("GRAPH_OUTPUT_MODE") or DEFAULT_OUTPUT_MODE).strip().lower()
+    if mode not in OUTPUT_MODES:
+        raise ValueError(
+            f"Unknown output mode '{mode}'. Valid values: {', '.join(OUTPUT_MODES)}"
+        )
+    return mode
+
+
+def encode_output(data: Any, mode: Optional[str] = None) -> str:
+    """
+    Serializes a tool result to JSON.
+
+    Args:
+        data (Any): The result (dicts, lists, strings, numbers, booleans, None and
+            objects with a to_dict method, such as MessageRecord).
+        mode (Optional[str]): One of OUTPUT_MODES. Defaults to get_output_mode().
+
+    Returns:
+        str: The JSON string.
+    """
+    mode = mode or get_output_mode()
+    if mode == "pretty":
+        return json.dumps(data, indent=2, default=_to_json)
+    if mode == "fast" and orjson is not None:
+        try:
+            return orjson.dumps(data, default=_to_json, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers above 64 bits, which the standard library handles
+            pass
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=_to_json)
+
+
+def _to_json(value: Any) -> Any:
+    # Compact result objects (e.g. MessageRecord) become dicts only here, while they are written
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def serialize_tool_outputs(server) -> None:
+    """
+    Makes every tool (and function resource) registered on a server return its result encoded
+    in the tool's output mode.
+
+    Results that are already strings (e.g. plain messages) are returned unchanged.
+
+    Args:
+        server (FastMCP): The server, once all its tools and resources are registered.
+    """
+    # FastMCP has no public way to wrap the functions behind a server's tools and resources
+    entries = [
+        *server._tool_manager.list_tools(),
+        *server._resource_manager.list_resources(),
+        *server._resource_manager.list_templates(),
+    ]
+    for entry in entries:
+        fn = getattr(entry, "fn", None)
+        if fn is None or getattr(fn, "__tool_name__", None) is not None:
+            continue
+        entry.fn = _serialized(fn, entry.name)
+
+
+def _serialized(fn, name: str):
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = _current_tool.set(name)
+        try:
+            result = fn(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result if isinstance(result, str) else encode_output(result)
+        finally:
+            _current_tool.reset(token)
+
+    wrapper.__tool_name__ = name
+    return wrapper
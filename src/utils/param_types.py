@@ -1,7 +1,59 @@
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime as DateTime
 
-from typing import Any, Dict, List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal, Tuple
+
+from .odata import ODataFilter
+
+# Field names of every dataclass cleaned so far, computed once per class
+_FIELD_PLANS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _field_plan(cls: type) -> Optional[Tuple[str, ...]]:
+    plan = _FIELD_PLANS.get(cls)
+    if plan is None and hasattr(cls, "__dataclass_fields__"):
+        plan = _FIELD_PLANS[cls] = tuple(f.name for f in fields(cls))
+    return plan
+
+
+def _clean(value: Any) -> Any:
+    # Every value is visited once, and dataclasses are read field by field instead of deep-copied first
+    if isinstance(value, list):
+        items = [cleaned for cleaned in map(_clean, value) if cleaned is not None]
+        return items or None
+    if isinstance(value, dict):
+        return {
+            key: cleaned
+            for key, cleaned in zip(value, map(_clean, value.values()))
+            if cleaned is not None
+        }
+    plan = _field_plan(type(value))
+    if plan is not None:
+        result = {}
+        for name in plan:
+            cleaned = _clean(getattr(value, name))
+            if cleaned is not None:
+                result[name] = cleaned
+        return result
+    return value
+
+
+def dataclass_to_clean_dict(obj: Any) -> Any:
+    """Recursively converts a dataclass to a dictionary, omitting None values and cleaning nested structures.
+
+    Empty lists are omitted too, and so is the whole object when nothing is left.
+    Works in a single pass over the fields, with the field names of each class cached.
+
+    Args:
+        obj (Any): The dataclass instance or nested structure.
+
+    Returns:
+        Any: A cleaned dictionary or list, or the original value if not a dataclass, list, or dict.
+    """
+    cleaned = _clean(obj)
+    if _field_plan(type(obj)) is not None:
+        return cleaned or None
+    return cleaned
 
 
 @dataclass
@@ -56,6 +108,22 @@ class EmailFilters:
     categories: Optional[List[str]] = None
 
 
+@dataclass
+class EmailOrder:
+    """
+    Sort order of an email query ($orderby in Graph API).
+
+    Searches (keyword or subject) are always sorted by Graph, newest first, so the order only applies to filter queries.
+
+    Args:
+        field (str): Date to sort by ('receivedDateTime' or 'sentDateTime'). Default is 'receivedDateTime'.
+        descending (bool): If True, newest emails first. Default is True.
+    """
+
+    field: Literal["receivedDateTime", "sentDateTime"] = "receivedDateTime"
+    descending: bool = True
+
+
 @dataclass
 class EmailQuery:
     """
@@ -66,12 +134,18 @@ class EmailQuery:
         search (Optional[SearchParams]): Search parameters for the email query.
         number_emails (int): Number of emails to retrieve. Default is 10.
         folder_id (Optional[str]): ID of the folder to query emails from. If None, queries all folders.
+        order_by (Optional[EmailOrder]): Sort order of the emails, e.g. newest first to get the latest N emails.
+        include_count (bool): If True, the result includes the total number of matching emails ('count'). Not supported when search and filters are combined.
+        cursor (Optional[str]): The 'cursor' of a previous result, to get the next page of that same query. The other fields are then ignored, except number_emails.
     """
 
     filters: EmailFilters = field(default_factory=EmailFilters)
     search: Optional[SearchParams] = None
     number_emails: int = 10
     folder_id: Optional[str] = None
+    order_by: Optional[EmailOrder] = None
+    include_count: bool = False
+    cursor: Optional[str] = None
 
 
 @dataclass
@@ -156,6 +230,22 @@ class EmailOperationParams:
     move: bool = True
 
 
+@dataclass
+class BulkEmailOperationParams:
+    """
+    Parameters for moving or copying several emails at once.
+
+    Args:
+        email_ids (List[str]): IDs of the emails to move or copy.
+        destination_folder_id (Optional[str]): ID of the folder to move or copy the emails to. If None, moves or copies to the inbox.
+        move (bool): If True, moves the emails. If False, copies them.
+    """
+
+    email_ids: List[str]
+    destination_folder_id: Optional[str] = None
+    move: bool = True
+
+
 @dataclass
 class FolderParams:
     """
@@ -211,6 +301,22 @@ class HandleCategoryToResourceParams:
     remove: bool = False
 
 
+@dataclass
+class BulkHandleCategoryParams:
+    """
+    Parameters for adding or removing categories to/from several emails at once.
+
+    Args:
+        email_ids (List[str]): IDs of the emails to add or remove the categories to/from.
+        category_names (List[str]): Names of the categories to add or remove.
+        remove (bool): If True, removes the categories from the emails. If False, adds them.
+    """
+
+    email_ids: List[str]
+    category_names: List[str] = field(default_factory=list)
+    remove: bool = False
+
+
 @dataclass
 class EmailAddressValue:
     """
@@ -807,16 +913,9 @@ class TaskCreateRequest:
     recurrence: Optional[PatternedRecurrence] = None
     status: Optional[Literal["notStarted", "inProgress", "completed", "waitingOnOthers", "deferred"]] = "notStarted"
 
-    def to_json_object(self):
-        def serialize(obj):
-            if isinstance(obj, list):
-                return [serialize(i) for i in obj]
-            elif hasattr(obj, "__dataclass_fields__"):
-                return {k: serialize(v) for k, v in asdict(obj).items() if v is not None}
-            else:
-                return obj
-
-        return serialize(self)
+    def to_json_object(self) -> dict:
+        """Returns the task as a Graph request body, without unset fields."""
+        return dataclass_to_clean_dict(self)
     
 
 @dataclass
@@ -842,22 +941,15 @@ class TodoTaskFilter:
     created_before: Optional[DateTime] = None  
 
     def to_odata_filter(self) -> Optional[str]:
-        """Builds the $filter string for Microsoft Graph from the provided fields."""
-        filters = []
-
-        if self.status:
-            filters.append(f"status eq '{self.status}'")
-        if self.importance:
-            filters.append(f"importance eq '{self.importance}'")
-        if self.is_reminder_on is not None:
-            filters.append(f"isReminderOn eq {str(self.is_reminder_on).lower()}")
-        if self.due_before:
-            filters.append(f"dueDateTime/dateTime lt {self.due_before.isoformat()}Z")
-        if self.due_after:
-            filters.append(f"dueDateTime/dateTime gt {self.due_after.isoformat()}Z")
-        if self.created_before:
-            filters.append(f"createdDateTime lt {self.created_before.isoformat()}Z")
-        if self.created_after:
-            filters.append(f"createdDateTime gt {self.created_after.isoformat()}Z")
-
-        return " and ".join(filters) if filters else None
\ No newline at end of file
+        """Builds the $filter string for Microsoft Graph from the provided fields, or None if none is set."""
+        return (
+            ODataFilter()
+            .eq("status", self.status or None)
+            .eq("importance", self.importance or None)
+            .eq("isReminderOn", self.is_reminder_on)
+            .compare("dueDateTime/dateTime", "lt", self.due_before)
+            .compare("dueDateTime/dateTime", "gt", self.due_after)
+            .compare("createdDateTime", "lt", self.created_before)
+            .compare("createdDateTime", "gt", self.created_after)
+            .build()
+        )
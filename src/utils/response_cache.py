@@ -0,0 +1,286 @@
+"""
+In-memory cache for Graph resources that rarely change (folders, categories,
+calendars, rules, settings...).
+
+Responses are stored per resource namespace with their own TTL, evicted in LRU
+order when the entry or size limits are reached, and dropped as soon as a
+create/edit/delete method of the same resource succeeds. Hit and miss counters
+are kept per namespace.
+
+Request methods opt in with two decorators, placed under handle_microsoft_errors
+so only successful responses are cached:
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    @cached("mail_folders")
+    def get_folder_names(self) -> ToolResult: ...
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    @invalidates("mail_folders")
+    def delete_folder_microsoft_api(self, folder_id: str) -> ToolResult: ...
+
+The cache can be tuned through environment variables:
+    - GRAPH_CACHE_ENABLED: "false" to disable the cache. Defaults to "true".
+    - GRAPH_CACHE_MAX_ENTRIES: Maximum number of cached responses. Defaults to 256.
+    - GRAPH_CACHE_MAX_BYTES: Maximum total size of the cached responses. Defaults to 4 MiB.
+    - GRAPH_CACHE_TTL_<NAMESPACE>: TTL in seconds of a namespace, e.g. GRAPH_CACHE_TTL_MAIL_FOLDERS.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Default TTL in seconds of every cached namespace
+DEFAULT_TTLS: Dict[str, float] = {
+    "mail_folders": 300,
+    "message_rules": 600,
+    "categories": 600,
+    "calendars": 600,
+    "calendar_groups": 600,
+    "contact_folders": 600,
+    "todo_lists": 300,
+    "mailbox_settings": 900,
+}
+FALLBACK_TTL = 300
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache of responses.
+
+    Cached results are shared between callers, which must not modify them.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept.
+        max_bytes (int): Maximum total size of the cached values.
+        enabled (bool): Whether values are stored and returned.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 4 * 1024 * 1024, enabled: bool = True):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of entries kept. Defaults to 256.
+            max_bytes (int, optional): Maximum total size of the cached values. Defaults to 4 MiB.
+            enabled (bool, optional): Whether values are stored and returned. Defaults to True.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        # (namespace, key) -> (expires at, value, approximate size)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._listeners: Dict[str, List[Callable[[], None]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """
+        Builds the cache from the GRAPH_CACHE_* environment variables.
+
+        Returns:
+            ResponseCache: The cache, using defaults for unset variables.
+        """
+        return cls(
+            max_entries=int(os.getenv("GRAPH_CACHE_MAX_ENTRIES", 256)),
+            max_bytes=int(os.getenv("GRAPH_CACHE_MAX_BYTES", 4 * 1024 * 1024)),
+            enabled=os.getenv("GRAPH_CACHE_ENABLED", "true").lower() != "false",
+        )
+
+    @staticmethod
+    def ttl(namespace: str) -> float:
+        """Returns the TTL of a namespace, honoring GRAPH_CACHE_TTL_<NAMESPACE>."""
+        default = DEFAULT_TTLS.get(namespace, FALLBACK_TTL)
+        return float(os.getenv(f"GRAPH_CACHE_TTL_{namespace.upper()}", default))
+
+    def _count(self, namespace: str, counter: str) -> None:
+        stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "evictions": 0})
+        stats[counter] += 1
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        expires_at, value, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, namespace: str, key: str) -> Any:
+        """
+        Returns a cached value if present and not expired.
+
+        Args:
+            namespace (str): The resource namespace.
+            key (str): The key of the call inside the namespace.
+
+        Returns:
+            Any: The cached value, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove((namespace, key))
+                self._count(namespace, "misses")
+                return None
+            self._entries.move_to_end((namespace, key))
+            self._count(namespace, "hits")
+            return entry[1]
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """
+        Stores a value with the TTL of its namespace, evicting the least recently used entries if needed.
+
+        Values larger than max_bytes are not stored.
+
+        Args:
+            namespace (str): The resource namespace.
+            key (str): The key of the call inside the namespace.
+            value (Any): The response (a JSON value or a JSON string).
+        """
+        size = _approximate_size(value)
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._remove((namespace, key))
+            self._entries[(namespace, key)] = (time.monotonic() + self.ttl(namespace), value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._count(oldest[0], "evictions")
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        Drops every entry of the given namespaces.
+
+        Args:
+            *namespaces (str): The namespaces to clear.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in namespaces]:
+                self._remove(key)
+            listeners = [
+                listener
+                for namespace in namespaces
+                for listener in self._listeners.get(namespace, [])
+            ]
+        for listener in listeners:
+            listener()
+
+    def on_invalidate(self, namespace: str, listener: Callable[[], None]) -> None:
+        """
+        Registers a callback run every time a namespace is invalidated.
+
+        Lets other local stores (e.g. the mailbox mirror) follow the same invalidations.
+
+        Args:
+            namespace (str): The namespace to follow.
+            listener (Callable[[], None]): The callback.
+        """
+        with self._lock:
+            self._listeners.setdefault(namespace, []).append(listener)
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the size of the cache and the hit/miss/eviction counters per namespace.
+
+        Returns:
+            dict: The cache statistics.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "namespaces": {name: dict(counters) for name, counters in self._stats.items()},
+            }
+
+
+response_cache = ResponseCache.from_env()
+
+
+def _approximate_size(value: Any) -> int:
+    # Roughly the length of the value's JSON, without serializing it
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return 2 + sum(len(key) + 4 + _approximate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(1 + _approximate_size(item) for item in value)
+    return 8
+
+
+def _call_key(func, args: tuple, kwargs: dict) -> str:
+    # args[0] is the request instance, which does not change the response
+    return repr((func.__qualname__, args[1:], sorted(kwargs.items())))
+
+
+def _is_error(value: Any) -> bool:
+    # Request methods report handled errors as {"error": ...}
+    return isinstance(value, dict) and "error" in value
+
+
+def cached(namespace: str):
+    """
+    Decorator that caches the result returned by a request method.
+
+    Responses containing an "error" key are not cached.
+
+    Args:
+        namespace (str): The resource namespace, which sets the TTL and groups the invalidations.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _call_key(func, args, kwargs)
+            value = response_cache.get(namespace, key)
+            if value is not None:
+                return value
+            value = func(*args, **kwargs)
+            if value is not None and not _is_error(value):
+                response_cache.set(namespace, key, value)
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidates(*namespaces: str):
+    """
+    Decorator that clears the given namespaces after the wrapped method returns without raising.
+
+    Args:
+        *namespaces (str): The namespaces changed by the method.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            value = func(*args, **kwargs)
+            response_cache.invalidate(*namespaces)
+            return value
+        return wrapper
+    return decorator
+
+
+def get_response_cache_stats() -> dict:
+    """
+    Returns the statistics of the process-wide response cache.
+
+    Returns:
+        dict: Number of entries, total size and hit/miss/eviction counters per namespace.
+    """
+    return response_cache.stats()
@@ -0,0 +1,227 @@
+"""
+Result types of the request methods.
+
+Request methods return plain Python structures (dicts and lists of JSON
+values) instead of JSON strings, so methods that build on others (search and
+filter intersection, de-duplication, batching) work on the objects directly.
+Results are serialized once, when a tool returns them, by the wrapper that
+serialize_tool_outputs installs on every tool of a server.
+
+Large message listings hold MessageRecord objects instead of dicts. They are
+turned into dicts only while the result is encoded.
+"""
+from typing import Any, List, Optional, Tuple, TypedDict, Union
+
+# What a request method returns: a JSON object or array, not yet serialized
+ToolResult = Union[dict, list]
+
+# (name, address) of a sender or recipient
+Person = Tuple[Optional[str], Optional[str]]
+
+_EMPTY: dict = {}
+
+
+def _person(recipient: Optional[dict]) -> Person:
+    address = (recipient or _EMPTY).get("emailAddress") or _EMPTY
+    return (address.get("name"), address.get("address"))
+
+
+class MessageRecord:
+    """
+    Compact form of a message simplified with microsoft_simplify_message.
+
+    One object with slots per message, with the sender and recipients as
+    (name, address) tuples, instead of a dict with a nested dict per person.
+    Values read from Graph (flag, categories) are referenced, not copied.
+    to_dict builds the simplified dict, which the output encoder does on output.
+    Dict-style reads (record["id"], record.get("subject")) are supported so
+    records and simplified dicts can be mixed.
+    """
+
+    __slots__ = (
+        "id",
+        "subject",
+        "sender",
+        "to_recipients",
+        "cc_recipients",
+        "flag",
+        "received_date_time",
+        "categories",
+        "sent_date_time",
+        "is_read",
+        "has_attachments",
+        "importance",
+        "conversation_id",
+        "internet_message_id",
+        "body_preview",
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        subject: Optional[str],
+        sender: Person,
+        to_recipients: Tuple[Person, ...],
+        cc_recipients: Tuple[Person, ...],
+        flag: Optional[dict],
+        received_date_time: Optional[str],
+        categories: Optional[list],
+        sent_date_time: Optional[str],
+        is_read: Optional[bool],
+        has_attachments: Optional[bool],
+        importance: Optional[str],
+        conversation_id: Optional[str],
+        internet_message_id: Optional[str],
+        body_preview: Optional[str],
+    ):
+        self.id = id
+        self.subject = subject
+        self.sender = sender
+        self.to_recipients = to_recipients
+        self.cc_recipients = cc_recipients
+        self.flag = flag
+        self.received_date_time = received_date_time
+        self.categories = categories
+        self.sent_date_time = sent_date_time
+        self.is_read = is_read
+        self.has_attachments = has_attachments
+        self.importance = importance
+        self.conversation_id = conversation_id
+        self.internet_message_id = internet_message_id
+        self.body_preview = body_preview
+
+    @classmethod
+    def from_graph(cls, msg: dict) -> "MessageRecord":
+        """
+        Builds a record from a Graph message.
+
+        Args:
+            msg (dict): The message object from Microsoft Graph API.
+
+        Returns:
+            MessageRecord: The record.
+        """
+        get = msg.get
+        return cls(
+            get("id"),
+            get("subject"),
+            _person(get("from")),
+            tuple(map(_person, get("toRecipients") or ())),
+            tuple(map(_person, get("ccRecipients") or ())),
+            get("flag"),
+            get("receivedDateTime"),
+            get("categories"),
+            get("sentDateTime"),
+            get("isRead"),
+            get("hasAttachments"),
+            get("importance"),
+            get("conversationId"),
+            get("internetMessageId"),
+            get("bodyPreview"),
+        )
+
+    def to_dict(self, body_preview: bool = True) -> dict:
+        """
+        Returns the simplified message dict.
+
+        Args:
+            body_preview (bool, optional): Whether bodyPreview is included. Defaults to True.
+
+        Returns:
+            dict: The message as returned by microsoft_simplify_message.
+        """
+        data = {
+            "id": self.id,
+            "subject": self.subject,
+            "from": {"name": self.sender[0], "address": self.sender[1]},
+            "toRecipients": [{"name": name, "address": address} for name, address in self.to_recipients],
+            "ccRecipients": [{"name": name, "address": address} for name, address in self.cc_recipients],
+            "flag": self.flag,
+            "receivedDateTime": self.received_date_time,
+            "categories": self.categories,
+            "sentDateTime": self.sent_date_time,
+            "isRead": self.is_read,
+            "hasAttachments": self.has_attachments,
+            "importance": self.importance,
+            "conversationId": self.conversation_id,
+            "internetMessageId": self.internet_message_id,
+        }
+        if body_preview:
+            data["bodyPreview"] = self.body_preview
+        return data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read of a simplified message field, e.g. record.get("from")."""
+        attribute = _RECORD_ATTRIBUTES.get(key)
+        if attribute is None:
+            return default
+        value = getattr(self, attribute)
+        if key == "from":
+            return {"name": value[0], "address": value[1]}
+        if key in ("toRecipients", "ccRecipients"):
+            return [{"name": name, "address": address} for name, address in value]
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _RECORD_ATTRIBUTES:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MessageRecord):
+            return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MessageRecord(id={self.id!r}, subject={self.subject!r})"
+
+
+# Simplified message key -> MessageRecord attribute
+_RECORD_ATTRIBUTES = {
+    "id": "id",
+    "subject": "subject",
+    "from": "sender",
+    "toRecipients": "to_recipients",
+    "ccRecipients": "cc_recipients",
+    "flag": "flag",
+    "receivedDateTime": "received_date_time",
+    "categories": "categories",
+    "sentDateTime": "sent_date_time",
+    "isRead": "is_read",
+    "hasAttachments": "has_attachments",
+    "importance": "importance",
+    "conversationId": "conversation_id",
+    "internetMessageId": "internet_message_id",
+    "bodyPreview": "body_preview",
+}
+
+
+class ErrorResult(TypedDict):
+    """A handled error, as returned by handle_microsoft_errors."""
+
+    error: str
+
+
+class EventListResult(TypedDict, total=False):
+    """The simplified events of a query."""
+
+    events: List[dict]
+    # True if the page budget ran out before number_events events were found
+    truncated: bool
+    # Start of the last event read when truncated; a query starting there continues the scan
+    scannedUntil: str
+
+
+class MessageListResult(TypedDict, total=False):
+    """A page of simplified messages."""
+
+    messages: List[Union[dict, MessageRecord]]
+    nextLink: str
+    # Opaque form of nextLink, accepted back by EmailQuery.cursor
+    cursor: str
+    # Total number of matching messages, when $count was requested
+    count: int
+    # True if the page budget ran out before the requested number of messages was found
+    truncated: bool
@@ -0,0 +1,113 @@
+"""
+Start-up profiling of the MCP servers.
+
+Running a server with ``--profile-startup`` starts it in a fresh interpreter
+with ``python -X importtime``, lists its tools (the first thing an MCP client
+asks for) and prints:
+    - the time to import the server module and the time to the first tool list,
+    - the import time spent in each top-level package,
+    - the slowest individual imports.
+
+No credentials are acquired: the servers only request a token when a tool is called.
+"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+_CHILD = """
+import asyncio, importlib, json, sys, time
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+tools = asyncio.run(module.mcp.list_tools())
+listed = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_tool_list_ms": (listed - start) * 1000,
+    "tools": len(tools),
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, float, float]]:
+    """
+    Parses the output of ``python -X importtime``.
+
+    Args:
+        stderr (str): The standard error of the profiled process.
+
+    Returns:
+        List[Tuple[str, float, float]]: (module, self ms, cumulative ms) of every imported module.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        imports.append((module.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return imports
+
+
+def profile_startup(module_name: str, top: int = 15) -> str:
+    """
+    Profiles the start-up of a server module in a fresh interpreter.
+
+    Args:
+        module_name (str): The server module, e.g. "outlook_mail_mcp".
+        top (int, optional): Number of packages and modules listed. Defaults to 15.
+
+    Returns:
+        str: The report.
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", _CHILD, module_name],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+    )
+    total_ms = (time.perf_counter() - start) * 1000
+    if process.returncode != 0:
+        return f"Profiling {module_name} failed:\n{process.stderr[-2000:]}"
+    timings = json.loads(process.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(process.stderr)
+
+    packages: Dict[str, float] = {}
+    for module, self_ms, _ in imports:
+        package = module.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_ms
+
+    lines = [
+        f"Start-up profile of {module_name}",
+        f"  process launch to exit:  {total_ms:8.1f} ms",
+        f"  import of the server:    {timings['import_ms']:8.1f} ms",
+        f"  time to first tool list: {timings['first_tool_list_ms']:8.1f} ms ({timings['tools']} tools)",
+        "",
+        f"Import time by top-level package (top {top}):",
+    ]
+    for package, self_ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"  {self_ms:8.1f} ms  {package}")
+    lines += ["", f"Slowest imports, including their own imports (top {top}):"]
+    for module, _, cumulative_ms in sorted(imports, key=lambda item: item[2], reverse=True)[:top]:
+        lines.append(f"  {cumulative_ms:8.1f} ms  {module}")
+    return "\n".join(lines)
+
+
+def run_server(mcp, server_file: str) -> None:
+    """
+    Entry point of the server scripts: runs the server, or prints its start-up profile
+    when started with ``--profile-startup``.
+
+    Args:
+        mcp (FastMCP): The server.
+        server_file (str): The __file__ of the server module.
+    """
+    if "--profile-startup" in sys.argv:
+        print(profile_startup(Path(server_file).stem))
+        return
+    mcp.run()
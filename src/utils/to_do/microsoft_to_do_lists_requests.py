@@ -1,8 +1,9 @@
-import json
-
 from ..helper_functions.helpers_email import *
 from ..constants import TODO_LISTS_URL
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
+from ..response_cache import cached, invalidates
 
 
 class MicrosoftToDoListsRequests(MicrosoftBaseRequest):
@@ -12,7 +13,8 @@ class MicrosoftToDoListsRequests(MicrosoftBaseRequest):
     """
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_todo_lists(self) -> str:
+    @cached("todo_lists")
+    def get_todo_lists(self) -> ToolResult:
         """
         Get the list of to-do lists.
 
@@ -21,10 +23,11 @@ class MicrosoftToDoListsRequests(MicrosoftBaseRequest):
         """
         status_code, response = self.microsoft_get(TODO_LISTS_URL, self.token_manager.get_token())
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def create_todo_list(self, list_name: str) -> str:
+    @invalidates("todo_lists")
+    def create_todo_list(self, list_name: str) -> ToolResult:
         """
         Create a new to-do list.
 
@@ -32,15 +35,16 @@ class MicrosoftToDoListsRequests(MicrosoftBaseRequest):
             list_name (str): Name of the new to-do list.
 
         Returns:
-            str: JSON response with the created to-do list details.
+            ToolResult: The created to-do list details.
         """
         data = {"displayName": list_name}
         status_code, response = self.microsoft_post(TODO_LISTS_URL, self.token_manager.get_token(), data=data)
 
-        return json.dumps(response, indent=2)
+        return response
     
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_todo_list(self, list_id: str) -> str:
+    @invalidates("todo_lists")
+    def delete_todo_list(self, list_id: str) -> ToolResult:
         """
         Delete a to-do list by its ID.
 
@@ -48,12 +52,15 @@ class MicrosoftToDoListsRequests(MicrosoftBaseRequest):
             list_id (str): ID of the to-do list to delete.
 
         Returns:
-            str: Confirmation message or error details.
+            ToolResult: A confirmation message or the error details.
         """
         url = f"{TODO_LISTS_URL}/{list_id}"
         status_code, response = self.microsoft_delete(url, self.token_manager.get_token())
 
         if status_code == 204:
-            return json.dumps({"message": "To-do list deleted successfully."}, indent=2)
+            return {"message": "To-do list deleted successfully."}
         else:
-            return json.dumps({"error": response}, indent=2)
\ No newline at end of file
+            return {"error": response}
+
+
+AsyncMicrosoftToDoListsRequests = make_async_requests(MicrosoftToDoListsRequests)
@@ -1,10 +1,13 @@
-import json
 from typing import Optional
 
 from ..param_types import TaskCreateRequest, TodoTaskFilter
 from ..helper_functions.helpers_email import *
+from ..helper_functions.helpers_to_do import simplify_task
+from ..graph_projection import select_params
 from ..constants import TODO_TASK, TODO_TASK_BY_ID
+from ..async_microsoft_base_request import make_async_requests
 from ..microsoft_base_request import MicrosoftBaseRequest
+from ..results import ToolResult
 
 
 class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
@@ -13,41 +16,33 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
     Inherits from MicrosoftBaseRequest to manage authentication and token retrieval.
     """
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_tasks_in_list(self, todo_list_id: str, task_filter: TodoTaskFilter = None, top: int = 100) -> str:
+    def get_tasks_in_list(self, todo_list_id: str, task_filter: TodoTaskFilter = None, top: int = 100) -> ToolResult:
         """
         Retrieve tasks from a specified to-do list with optional filtering.
 
         Args:
             todo_list_id (str): ID of the to-do list.
             task_filter (TodoTaskFilter, optional): Filter criteria for tasks.
+            top (int, optional): Maximum number of tasks to return. Defaults to 100.
 
         Returns:
-            str: JSON response containing the list of tasks.
+            ToolResult: The list of tasks.
         """
         url = TODO_TASK(todo_list_id)
-        params = task_filter.to_odata_filter() if task_filter else None
-
-        if params:
-            params["$top"] = top
-        else:
-            params = {"$top": top}
-        status_code, response = self.microsoft_get(
-            url, self.token_manager.get_token(), params=params
+        params = {"$top": top}
+        odata_filter = task_filter.to_odata_filter() if task_filter else None
+        if odata_filter:
+            params["$filter"] = odata_filter
+        tasks = self.microsoft_paginate(
+            url, params=select_params(simplify_task, params), max_items=top
         )
 
-        simplified_tasks = [
-            {
-                "id": task["id"],
-                "title": task["title"],
-                "status": task["status"]
-            }
-            for task in response.get("value", [])
-        ]
+        simplified_tasks = [simplify_task(task) for task in tasks]
 
-        return json.dumps(simplified_tasks, indent=2)
+        return simplified_tasks
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def get_task_in_list(self, todo_list_id: str, task_id: str) -> str:
+    def get_task_in_list(self, todo_list_id: str, task_id: str) -> ToolResult:
         """
         Retrieve details of a specific task in a specified to-do list.
 
@@ -56,7 +51,7 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
             task_id (str): ID of the task to retrieve.
 
         Returns:
-            str: JSON response containing the task details.
+            ToolResult: The task details.
         """
         url = TODO_TASK_BY_ID(todo_list_id, task_id)
 
@@ -64,12 +59,12 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token()
         )
 
-        return json.dumps(response, indent=2)
+        return response
     
     @MicrosoftBaseRequest.handle_microsoft_errors
     def create_update_task_in_list(
         self, todo_list_id: str, task_create_requests: TaskCreateRequest, task_id: str = None
-    ) -> str:
+    ) -> ToolResult:
         """
         Create a new task in a specified to-do list.
 
@@ -79,7 +74,7 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
             task_id (str, optional): ID of the task to update. If provided, it will update the existing task.
 
         Returns:
-            str: JSON response with the created task details.
+            ToolResult: The created task details.
         """
         if task_id:
             return self._update_task_in_list(todo_list_id, task_id, task_create_requests)
@@ -91,7 +86,7 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
 
     def _update_task_in_list(
         self, todo_list_id: str, task_id: str, task_update_request: TaskCreateRequest
@@ -114,10 +109,10 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token(), data=data
         )
 
-        return json.dumps(response, indent=2)
+        return response
 
     @MicrosoftBaseRequest.handle_microsoft_errors
-    def delete_task_in_list(self, todo_list_id: str, task_id: str) -> str:
+    def delete_task_in_list(self, todo_list_id: str, task_id: str) -> ToolResult:
         """
         Delete a task from a specified to-do list.
 
@@ -126,7 +121,7 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
             task_id (str): ID of the task to delete.
 
         Returns:
-            str: Confirmation message or error details.
+            ToolResult: A confirmation message or the error details.
         """
         url = TODO_TASK_BY_ID(todo_list_id, task_id)
 
@@ -134,4 +129,7 @@ class MicrosoftToDoTasksRequests(MicrosoftBaseRequest):
             url, self.token_manager.get_token()
         )
 
-        return json.dumps(response, indent=2) if response else "Task deleted successfully."
\ No newline at end of file
+        return response if response else "Task deleted successfully."
+
+
+AsyncMicrosoftToDoTasksRequests = make_async_requests(MicrosoftToDoTasksRequests)
@@ -0,0 +1,356 @@
+"""
+Token broker shared by the MCP server processes.
+
+Every server (mail, calendar, contacts, to-do, categories, mailbox settings) runs
+in its own process. Instead of each one building a TokenManager, contending on
+the token_cache.json lock and refreshing on its own, the first process to start
+becomes the broker: it owns the only TokenManager and serves tokens over a local
+socket (a UNIX socket, or a named pipe on Windows). The other processes ask it
+for tokens and keep them in memory until they are about to expire, so a refresh
+happens once for all the servers. If the broker process exits, the next process
+that needs a token takes its place.
+
+Connections are authenticated with a random key. The socket, the key and the
+lock file live in a directory only the current user can access ($XDG_RUNTIME_DIR
+or a 0700 directory in the temporary folder), and a key file or socket owned by
+another user, or open to group or other, is refused. Requests and replies are
+JSON, so nothing received from the socket is ever unpickled.
+
+The broker can be tuned through environment variables:
+    - TOKEN_BROKER_ENABLED: "false" to make every process use its own TokenManager. Defaults to "true".
+    - TOKEN_BROKER_ADDRESS: Socket path (or pipe name on Windows). Defaults to a socket in the
+      private directory of the current user.
+"""
+import atexit
+import getpass
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from typing import Iterable, Optional, Tuple
+
+from filelock import FileLock
+
+from .token_manager import TokenManager, load_env_file
+
+BROKER_FAMILY = "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+# Largest request or reply accepted from the socket
+MAX_MESSAGE_BYTES = 1 << 16
+
+
+def _check_private(path: str, st: os.stat_result) -> None:
+    # Ownership and permission bits only mean something on POSIX systems
+    if not hasattr(os, "getuid"):
+        return
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(
+            f"{path} must be owned by the current user and not accessible by group or others"
+        )
+
+
+def get_private_dir() -> str:
+    """
+    Returns the directory of the broker files, creating it if needed.
+
+    Returns:
+        str: $XDG_RUNTIME_DIR/aisecretary, or a per-user 0700 directory in the temporary folder.
+
+    Raises:
+        PermissionError: If the directory is a symlink, belongs to another user or is open to group or others.
+    """
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        path = os.path.join(runtime_dir, "aisecretary")
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"aisecretary-{getpass.getuser()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    _check_private(path, st)
+    return path
+
+
+def get_broker_address() -> str:
+    """
+    Returns the address the broker listens on.
+
+    Returns:
+        str: TOKEN_BROKER_ADDRESS if set, otherwise a socket in get_private_dir() (or a per-user pipe name on Windows).
+    """
+    address = os.getenv("TOKEN_BROKER_ADDRESS")
+    if address:
+        return address
+    if BROKER_FAMILY == "AF_PIPE":
+        return rf"\\.\pipe\aisecretary-token-broker-{getpass.getuser()}"
+    return os.path.join(get_private_dir(), "token-broker.sock")
+
+
+def _state_path(address: str, suffix: str) -> str:
+    # Named pipes do not live in the file system, so their key and lock files go to the private dir
+    if BROKER_FAMILY == "AF_PIPE":
+        return os.path.join(get_private_dir(), address.rsplit("\\", 1)[-1] + suffix)
+    return address + suffix
+
+
+def _write_authkey(address: str) -> bytes:
+    authkey = os.urandom(32)
+    path = _state_path(address, ".key")
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    # O_EXCL: a file created in between by someone else is never reused with its permissions
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(path, flags, 0o600)
+    with os.fdopen(fd, "wb") as file:
+        file.write(authkey)
+    return authkey
+
+
+def _read_authkey(address: str) -> bytes:
+    path = _state_path(address, ".key")
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    with os.fdopen(fd, "rb") as file:
+        _check_private(path, os.fstat(file.fileno()))
+        return file.read()
+
+
+def _check_socket(address: str) -> None:
+    if BROKER_FAMILY != "AF_UNIX":
+        return
+    st = os.lstat(address)
+    if not stat.S_ISSOCK(st.st_mode):
+        raise PermissionError(f"{address} is not a socket")
+    _check_private(address, st)
+
+
+def _send(connection, message: dict) -> None:
+    connection.send_bytes(json.dumps(message).encode())
+
+
+def _recv(connection) -> dict:
+    message = json.loads(connection.recv_bytes(MAX_MESSAGE_BYTES))
+    if not isinstance(message, dict):
+        raise ValueError("Malformed token broker message")
+    return message
+
+
+class TokenBroker:
+    """
+    Serves the tokens of a TokenManager to other processes over a local socket.
+
+    Every request is a JSON object {"scopes": Optional[list]} and every reply is either
+    {"token": str, "expires_on": float} or {"error": str}.
+    """
+
+    def __init__(self, token_manager: TokenManager, address: str, authkey: bytes):
+        """
+        Initializes the broker. Nothing is bound until start is called.
+
+        Args:
+            token_manager (TokenManager): The manager that owns the tokens and their refresh.
+            address (str): The socket path or pipe name.
+            authkey (bytes): The key clients must prove they know.
+        """
+        self.token_manager = token_manager
+        self.address = address
+        self._authkey = authkey
+        self._listener: Optional[Listener] = None
+        self._connections: set = set()
+
+    def start(self) -> None:
+        """Binds the socket and serves clients from a daemon thread."""
+        self._listener = Listener(self.address, family=BROKER_FAMILY, authkey=self._authkey)
+        if BROKER_FAMILY == "AF_UNIX":
+            os.chmod(self.address, 0o600)
+        threading.Thread(target=self._serve, name="token-broker", daemon=True).start()
+        atexit.register(self.close)
+
+    def _serve(self) -> None:
+        while self._listener is not None:
+            try:
+                connection = self._listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection) -> None:
+        self._connections.add(connection)
+        with connection:
+            while self._listener is not None:
+                try:
+                    request = _recv(connection)
+                except (EOFError, OSError, TypeError, ValueError):
+                    # TypeError: the connection was closed by close() while waiting for a request
+                    # ValueError: not a JSON object, the client is dropped
+                    return
+                try:
+                    token, expires_on = self.token_manager.get_token_with_expiry(
+                        request.get("scopes")
+                    )
+                    _send(connection, {"token": token, "expires_on": expires_on})
+                except Exception as e:
+                    _send(connection, {"error": str(e)})
+
+    def close(self) -> None:
+        """Stops accepting clients and removes the socket."""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            # Closing a UNIX listener also unlinks its socket file
+            listener.close()
+        for connection in list(self._connections):
+            connection.close()
+        self._connections.clear()
+
+
+class BrokerTokenManager:
+    """
+    Drop-in replacement of TokenManager backed by the shared token broker.
+
+    Tokens are kept in memory until they are about to expire, so get_token is a
+    dictionary read on the hot path. When a token is needed, this process either
+    asks the broker or, if no broker is running, becomes the broker itself.
+
+    Attributes:
+        owner (Optional[TokenManager]): The local TokenManager when this process is the broker.
+    """
+
+    def __init__(self, address: Optional[str] = None, margin_seconds: int = 500):
+        """
+        Initializes the manager. The broker is only contacted when the first token is needed.
+
+        Args:
+            address (Optional[str]): The broker address. Defaults to get_broker_address().
+            margin_seconds (int, optional): Time in seconds before actual expiration to refresh the token. Defaults to 500.
+        """
+        self.address = address or get_broker_address()
+        self.margin_seconds = margin_seconds
+        self.owner: Optional[TokenManager] = None
+        self._broker: Optional[TokenBroker] = None
+        self._connection = None
+        self._tokens: dict = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> bool:
+        try:
+            authkey = _read_authkey(self.address)
+            _check_socket(self.address)
+        except PermissionError:
+            # Planted by someone else: never connect to it, and never replace it silently
+            raise
+        except OSError:
+            self._connection = None
+            return False
+        try:
+            self._connection = Client(self.address, family=BROKER_FAMILY, authkey=authkey)
+        except (OSError, EOFError, AuthenticationError):
+            self._connection = None
+            return False
+        return True
+
+    def _become_broker(self) -> None:
+        self.owner = TokenManager(margin_seconds=self.margin_seconds)
+        if BROKER_FAMILY == "AF_UNIX" and os.path.lexists(self.address):
+            # Left behind by a broker that did not exit cleanly
+            _check_socket(self.address)
+            os.unlink(self.address)
+        self._broker = TokenBroker(self.owner, self.address, _write_authkey(self.address))
+        self._broker.start()
+
+    def _ensure_source(self) -> None:
+        if self.owner is not None or self._connection is not None:
+            return
+        # Only one process at a time decides whether to connect or to become the broker
+        with FileLock(_state_path(self.address, ".lock")):
+            if not self._connect():
+                self._become_broker()
+
+    def _fetch(self, scopes: Optional[list]) -> Tuple[str, float]:
+        for attempt in range(2):
+            self._ensure_source()
+            if self.owner is not None:
+                return self.owner.get_token_with_expiry(scopes)
+            try:
+                _send(self._connection, {"scopes": scopes})
+                reply = _recv(self._connection)
+            except (OSError, EOFError):
+                # The broker went away: connect to its successor or take its place
+                self._connection = None
+                if attempt:
+                    raise
+                continue
+            if "error" in reply:
+                raise Exception(reply["error"])
+            return reply["token"], reply["expires_on"]
+
+    def get_token(self, scopes: Optional[Iterable[str]] = None) -> str:
+        """
+        Returns a valid access token, asking the broker only when the one in memory is about to expire.
+
+        Args:
+            scopes (Optional[Iterable[str]]): The scopes of the token. Defaults to the configured SCOPES.
+
+        Returns:
+            str: The access token.
+        """
+        key = tuple(sorted(scopes)) if scopes else None
+        entry = self._tokens.get(key)
+        if entry is not None and time.time() + self.margin_seconds < entry[1]:
+            return entry[0]
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None or time.time() + self.margin_seconds >= entry[1]:
+                entry = self._fetch(list(key) if key else None)
+                self._tokens[key] = entry
+        return entry[0]
+
+    def close(self) -> None:
+        """Closes the connection to the broker, or stops serving if this process is the broker."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._broker is not None:
+            self._broker.close()
+            self._broker = None
+        if self.owner is not None:
+            self.owner.close()
+
+
+_token_manager = None
+_token_manager_lock = threading.Lock()
+
+
+def get_token_manager(margin_seconds: int = 500):
+    """
+    Returns the token manager of the process, creating it on first use.
+
+    Every server module calls this at import time; they share the same manager when
+    several servers are mounted in one process.
+
+    Args:
+        margin_seconds (int, optional): Time in seconds before actual expiration to refresh the token. Defaults to 500.
+
+    Returns:
+        BrokerTokenManager | TokenManager: A broker-backed manager, or a local TokenManager if
+        TOKEN_BROKER_ENABLED is "false".
+    """
+    global _token_manager
+    if _token_manager is None:
+        with _token_manager_lock:
+            if _token_manager is None:
+                load_env_file()
+                if os.getenv("TOKEN_BROKER_ENABLED", "true").lower() == "false":
+                    _token_manager = TokenManager(margin_seconds=margin_seconds)
+                else:
+                    _token_manager = BrokerTokenManager(margin_seconds=margin_seconds)
+    return _token_manager
@@ -1,28 +1,54 @@
 import os
-import json
 import time
+import threading
 from pathlib import Path
-import msal
+from typing import Dict, Iterable, Optional, Tuple
 from dotenv import load_dotenv
-from filelock import FileLock, Timeout
+from filelock import FileLock
+
+
+def load_env_file() -> Path:
+    """
+    Loads the project .env file into the environment (variables already set win).
+
+    Returns:
+        Path: The path of the .env file.
+    """
+    dotenv_path = Path(__file__).resolve().parents[2] / ".env"
+    load_dotenv(dotenv_path=dotenv_path)
+    return dotenv_path
+
 
 class TokenManager:
     """
     Manages Microsoft authentication, token caching, and automatic refresh.
 
-    Loads configuration from .env automatically.
+    Loads configuration from .env automatically. A single MSAL application is
+    kept for the life of the process and the token of every scope set is held in
+    memory with its expiry, so get_token is a plain dictionary read until the
+    token is about to expire. Refreshes are single-flight: concurrent callers
+    (threads) wait for the one refresh in progress instead of
+    starting their own. A background timer refreshes the default token before
+    it expires, so tool calls rarely wait for the identity provider.
+
+    Nothing is acquired when the manager is built: msal is imported, the token
+    cache is read and the first token is requested on the first get_token call,
+    so servers start without waiting for the network or a browser sign-in.
+
+    The background refresh can be disabled with TOKEN_BACKGROUND_REFRESH=false.
     """
 
-    def __init__(self, margin_seconds: int = 500):
+    def __init__(self, margin_seconds: int = 500, background_refresh: Optional[bool] = None):
         """
-        Initializes the TokenManager, loads environment variables and token cache.
-        
+        Initializes the TokenManager and loads environment variables. No token is requested yet.
+
         Args:
             margin_seconds (int, optional): Time in seconds before actual expiration to refresh the token. Defaults to 500.
+            background_refresh (Optional[bool]): Whether the default token is refreshed by a timer before it
+                expires. Defaults to the TOKEN_BACKGROUND_REFRESH environment variable ("true").
         """
         # Load .env
-        dotenv_path = Path(__file__).resolve().parents[2] / ".env"
-        load_dotenv(dotenv_path=dotenv_path)
+        dotenv_path = load_env_file()
         self.ENV_BASE_DIR = dotenv_path.parent
 
         # Config
@@ -34,80 +60,161 @@ class TokenManager:
         self.TOKEN_CACHE_FILE = (self.ENV_BASE_DIR / raw_token_cache_path).resolve()
 
         self.margin_seconds = margin_seconds
-
-        # Load cache
-        self.cache = self._load_cache()
-
-        # Load initial token
-        self.token = self._get_access_token()
-        self.expires_on = self._load_expiration_time_from_file()
+        if background_refresh is None:
+            background_refresh = os.getenv("TOKEN_BACKGROUND_REFRESH", "true").lower() != "false"
+        self.background_refresh = background_refresh
+
+        # (token, expires_on) by scope set. Replaced as a whole, so readers never need a lock
+        self._tokens: Dict[Tuple[str, ...], Tuple[str, float]] = {}
+        self._refresh_locks: Dict[Tuple[str, ...], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        # A single (reentrant) lock object: a second FileLock on the same path would wait for this one
+        self._file_lock = FileLock(str(self.TOKEN_CACHE_FILE) + ".lock")
+
+        self.cache = None
+        self.app = None
+
+    @property
+    def token(self) -> Optional[str]:
+        """The current token of the default scopes."""
+        entry = self._tokens.get(self._scope_key())
+        return entry[0] if entry else None
+
+    @property
+    def expires_on(self) -> float:
+        """Expiry (epoch seconds) of the current token of the default scopes, or 0."""
+        entry = self._tokens.get(self._scope_key())
+        return entry[1] if entry else 0
+
+    def _scope_key(self, scopes: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+        return tuple(sorted(scopes or self.SCOPES))
+
+    def _ensure_app(self) -> None:
+        # Imported here: msal (and the requests stack it pulls in) is only needed to refresh a token
+        import msal
+
+        if self.app is None:
+            # One MSAL application for the whole process
+            self.cache = msal.SerializableTokenCache()
+            self.app = msal.PublicClientApplication(
+                self.CLIENT_ID, authority=self.AUTHORITY, token_cache=self.cache
+            )
 
     def _save_cache(self):
         if self.cache.has_state_changed:
-            lock_path = str(self.TOKEN_CACHE_FILE) + ".lock"
-            with FileLock(lock_path):
+            with self._file_lock:
                 with open(self.TOKEN_CACHE_FILE, "w") as f:
                     f.write(self.cache.serialize())
+            self.cache.has_state_changed = False
 
     def _load_cache(self):
-        cache = msal.SerializableTokenCache()
+        # Other server processes share the file, so it is reloaded before every refresh
         if os.path.exists(self.TOKEN_CACHE_FILE):
-            lock_path = str(self.TOKEN_CACHE_FILE) + ".lock"
-            with FileLock(lock_path):
+            with self._file_lock:
                 with open(self.TOKEN_CACHE_FILE, "r") as f:
-                    cache.deserialize(f.read())
-        return cache
-
-    def _get_access_token(self):
-        """Obtains an access token, using the cache if possible."""
-        self.cache = self._load_cache()
-        app = msal.PublicClientApplication(
-            self.CLIENT_ID, authority=self.AUTHORITY, token_cache=self.cache
+                    self.cache.deserialize(f.read())
+
+    def _is_fresh(self, entry: Optional[Tuple[str, float]]) -> bool:
+        return entry is not None and time.time() + self.margin_seconds < entry[1]
+
+    def _acquire(
+        self, scopes: list, interactive: bool = True, force: bool = False
+    ) -> Optional[dict]:
+        accounts = self.app.get_accounts()
+        if not accounts:
+            return self.app.acquire_token_interactive(scopes) if interactive else None
+        result = self.app.acquire_token_silent(
+            scopes, account=accounts[0], force_refresh=force
         )
+        # MSAL serves a cached token until 5 minutes before it expires, which can be inside our margin
+        if not force and result and result.get("expires_in", 0) <= self.margin_seconds:
+            result = self.app.acquire_token_silent(
+                scopes, account=accounts[0], force_refresh=True
+            )
+        if not result and interactive:
+            result = self.app.acquire_token_interactive(scopes)
+        return result
+
+    def _refresh(
+        self, key: Tuple[str, ...], interactive: bool = True, force: bool = False
+    ) -> str:
+        with self._locks_guard:
+            lock = self._refresh_locks.setdefault(key, threading.Lock())
+        with lock:
+            # Another caller may have refreshed the token while this one waited
+            entry = self._tokens.get(key)
+            if not force and self._is_fresh(entry):
+                return entry[0]
+            with self._file_lock:
+                self._ensure_app()
+                self._load_cache()
+                result = self._acquire(list(key), interactive=interactive, force=force)
+                self._save_cache()
+
+            if not result or "access_token" not in result:
+                raise Exception(
+                    f"Error in authentication: {result.get('error_description') if result else 'No token found'}"
+                )
+            expires_on = time.time() + int(result.get("expires_in", 0))
+            self._tokens[key] = (result["access_token"], expires_on)
+        if key == self._scope_key():
+            self._schedule_refresh(expires_on)
+        return result["access_token"]
+
+    def _schedule_refresh(self, expires_on: float) -> None:
+        if not self.background_refresh:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        # Wake up shortly before get_token would consider the token stale
+        delay = max(1.0, expires_on - self.margin_seconds - time.time() - 30)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self._refresh(self._scope_key(), interactive=False, force=True)
+        except Exception:
+            # Keep the current token; the next get_token call refreshes it (interactively if needed)
+            pass
 
-        accounts = app.get_accounts()
-        if accounts:
-            result = app.acquire_token_silent(self.SCOPES, account=accounts[0])
-        else:
-            result = app.acquire_token_interactive(self.SCOPES)
+    def get_token(self, scopes: Optional[Iterable[str]] = None) -> str:
+        """
+        Returns a valid access token, refreshing it only when it is about to expire.
 
-        self._save_cache()
+        Args:
+            scopes (Optional[Iterable[str]]): The scopes of the token. Defaults to the configured SCOPES.
 
-        if result and "access_token" in result:
-            return result["access_token"]
-        else:
-            raise Exception(
-                f"Error in authentication: {result.get('error_description') if result else 'No token found'}"
-            )
+        Returns:
+            str: The access token.
+        """
+        key = self._scope_key(scopes)
+        entry = self._tokens.get(key)
+        if self._is_fresh(entry):
+            return entry[0]
+        return self._refresh(key)
 
-    def _load_expiration_time_from_file(self):
-        if not os.path.exists(self.TOKEN_CACHE_FILE):
-            return 0
+    def get_token_with_expiry(self, scopes: Optional[Iterable[str]] = None) -> Tuple[str, float]:
+        """
+        Returns a valid access token together with its expiry.
 
-        lock_path = str(self.TOKEN_CACHE_FILE) + ".lock"
-        try:
-            with FileLock(lock_path, timeout=5):
-                with open(self.TOKEN_CACHE_FILE, "r") as f:
-                    data = json.load(f)
-        except Timeout:
-            # Si no puede obtener lock en 5 seg, leer sin lock como fallback
-            with open(self.TOKEN_CACHE_FILE, "r") as f:
-                data = json.load(f)
-
-        access_token_data = list(data.get("AccessToken", {}).values())
-        if access_token_data:
-            return int(access_token_data[0]["expires_on"])
-        return 0
-
-    def get_token(self) -> str:
-        now = int(time.time())
-        if now + self.margin_seconds >= self.expires_on:
-            lock_path = str(self.TOKEN_CACHE_FILE) + ".lock"
-            with FileLock(lock_path):
-                # recarga la expiración después de obtener lock
-                self.expires_on = self._load_expiration_time_from_file()
-                now = int(time.time())
-                if now + self.margin_seconds >= self.expires_on:
-                    self.token = self._get_access_token()
-                    self.expires_on = self._load_expiration_time_from_file()
-        return self.token
+        Args:
+            scopes (Optional[Iterable[str]]): The scopes of the token. Defaults to the configured SCOPES.
+
+        Returns:
+            Tuple[str, float]: The access token and its expiry in epoch seconds.
+        """
+        key = self._scope_key(scopes)
+        entry = self._tokens.get(key)
+        if self._is_fresh(entry):
+            return entry
+        self._refresh(key)
+        return self._tokens[key]
+
+    def close(self) -> None:
+        """Stops the background refresh timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,11 @@
+import pytest
+
+from src.utils.response_cache import response_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # Cached responses must not leak between tests that mock the same endpoint
+    response_cache.clear()
+    yield
+    response_cache.clear()
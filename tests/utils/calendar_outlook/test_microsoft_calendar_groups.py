@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -27,7 +26,7 @@ def test_get_calendar_groups(mock_get, mock_token_manager):
 
     params = CalendarGroupParams(top=2, filter_name=None)
     client = MicrosoftCalendarGroupsRequests(mock_token_manager)
-    response = json.loads(client.get_calendar_groups(params))
+    response = client.get_calendar_groups(params)
 
     assert isinstance(response, list)
     assert len(response) == 2
@@ -47,7 +46,7 @@ def test_get_calendar_groups_with_filter(mock_get, mock_token_manager):
 
     params = CalendarGroupParams(top=1, filter_name="Eventos")
     client = MicrosoftCalendarGroupsRequests(mock_token_manager)
-    response = json.loads(client.get_calendar_groups(params))
+    response = client.get_calendar_groups(params)
 
     assert isinstance(response, list)
     assert len(response) == 1
@@ -62,7 +61,7 @@ def test_create_calendar_group(mock_post, mock_token_manager):
     )
 
     client = MicrosoftCalendarGroupsRequests(mock_token_manager)
-    response = json.loads(client.create_calendar_group("Nuevo Grupo"))
+    response = client.create_calendar_group("Nuevo Grupo")
 
     assert response["id"] == "new123"
     assert response["name"] == "Nuevo Grupo"
@@ -75,7 +74,7 @@ def test_update_calendar_group(mock_patch, mock_token_manager):
     )
 
     client = MicrosoftCalendarGroupsRequests(mock_token_manager)
-    response = json.loads(client.update_calendar_group("grp123", "Nombre Actualizado"))
+    response = client.update_calendar_group("grp123", "Nombre Actualizado")
 
     assert response["id"] == "grp123"
     assert response["name"] == "Nombre Actualizado"
@@ -85,6 +84,6 @@ def test_delete_calendar_group_success(mock_delete, mock_token_manager):
     mock_delete.return_value = (204, None)
 
     client = MicrosoftCalendarGroupsRequests(mock_token_manager)
-    response = json.loads(client.delete_calendar_group("grp123"))
+    response = client.delete_calendar_group("grp123")
 
     assert response["status"] == "deleted"
@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -26,7 +25,7 @@ def test_get_calendars(mock_get, mock_token_manager):
     )
 
     client = MicrosoftCalendarRequests(mock_token_manager)
-    result = json.loads(client.get_calendars())
+    result = client.get_calendars()
 
     assert isinstance(result["calendars: "], list)
     assert result["calendars: "][0]["id"] == "1"
@@ -45,7 +44,7 @@ def test_get_calendars_with_name_filter(mock_get, mock_token_manager):
     )
 
     client = MicrosoftCalendarRequests(mock_token_manager)
-    result = json.loads(client.get_calendars(name="Filtrado"))
+    result = client.get_calendars(name="Filtrado")
 
     assert len(result["calendars: "]) == 1
     assert result["calendars: "][0]["name"] == "Filtrado"
@@ -59,7 +58,7 @@ def test_get_calendar(mock_get, mock_token_manager):
     )
 
     client = MicrosoftCalendarRequests(mock_token_manager)
-    result = json.loads(client.get_calendar("123"))
+    result = client.get_calendar("123")
 
     assert result["id"] == "123"
     assert result["name"] == "Personal"
@@ -73,7 +72,7 @@ def test_create_calendar(mock_post, mock_token_manager):
     )
 
     client = MicrosoftCalendarRequests(mock_token_manager)
-    result = json.loads(client.create_calendar("Nuevo Calendario"))
+    result = client.create_calendar("Nuevo Calendario")
 
     assert result["id"] == "new123"
     assert result["name"] == "Nuevo Calendario"
@@ -88,7 +87,7 @@ def test_update_calendar(mock_patch, mock_token_manager):
 
     update_params = CalendarUpdateParams(name="Actualizado")
     client = MicrosoftCalendarRequests(mock_token_manager)
-    result = json.loads(client.update_calendar("cal123", update_params))
+    result = client.update_calendar("cal123", update_params)
 
     assert result["id"] == "cal123"
     assert result["name"] == "Actualizado"
@@ -99,7 +98,7 @@ def test_delete_calendar_success(mock_delete, mock_token_manager):
     mock_delete.return_value = (204, None)
 
     client = MicrosoftCalendarRequests(mock_token_manager)
-    result = json.loads(client.delete_calendar("cal123"))
+    result = client.delete_calendar("cal123")
 
     assert result["message"] == "Calendar deleted successfully"
     assert result["status_code"] == 204
@@ -127,7 +126,7 @@ def test_get_schedule(mock_post, mock_token_manager):
     )
 
     client = MicrosoftCalendarRequests(mock_token_manager)
-    result = json.loads(client.get_schedule(schedule_params))
+    result = client.get_schedule(schedule_params)
 
     assert "value" in result
     assert result["value"][0]["scheduleId"] == "user@example.com"
@@ -1,8 +1,18 @@
-import json
+from datetime import datetime
+import requests
 import pytest
 from unittest.mock import patch, MagicMock
 from src.utils.calendar_outlook.microsoft_events_requests import MicrosoftEventsRequests
-from src.utils.param_types import EventChangesParams, EventParams, EventQuery, EventResponseParams
+from src.utils.graph_batch import BatchResponse
+from src.utils.param_types import (
+    DateFilter,
+    EventChangesParams,
+    EventFilters,
+    EventParams,
+    EventQuery,
+    EventResponseParams,
+    EventSearchParams,
+)
 
 
 @pytest.fixture
@@ -24,8 +34,106 @@ def test_get_events_dates(mock_simplify, mock_query_params, mock_get, mock_token
 
     client = MicrosoftEventsRequests(mock_token_manager)
     query = EventQuery()
-    result = json.loads(client.get_events(query))
-    assert result == [{"id": "1"}]
+    result = client.get_events(query)
+    assert result == {"events": [{"id": "1"}]}
+
+
+def _event(event_id, subject="Sync", **extra):
+    return {
+        "id": event_id,
+        "subject": subject,
+        "start": {"dateTime": "2025-01-01T10:00:00"},
+        "end": {"dateTime": "2025-01-01T11:00:00"},
+        **extra,
+    }
+
+
+@patch.object(MicrosoftEventsRequests, "microsoft_get")
+def test_get_events_filters_calendar_view_locally_in_one_request(mock_get, mock_token_manager):
+    next_link = "https://graph.microsoft.com/v1.0/me/calendarView?$skip=3"
+    mock_get.side_effect = [
+        (
+            200,
+            {
+                "value": [
+                    _event("1", isAllDay=True),
+                    _event("2", subject="Team Sync"),
+                    _event("3", subject="Lunch"),
+                ],
+                "@odata.nextLink": next_link,
+            },
+        ),
+        (200, {"value": [_event("4", subject="sync review"), _event("5")]}),
+    ]
+    query = EventQuery(
+        filters=EventFilters(
+            date_filter=DateFilter(start_date=datetime(2025, 1, 1), end_date=datetime(2025, 1, 31)),
+            is_all_day=False,
+        ),
+        search=EventSearchParams(subject="sync"),
+        number_events=2,
+    )
+
+    client = MicrosoftEventsRequests(mock_token_manager)
+    result = client.get_events(query)
+
+    assert [event["id"] for event in result["events"]] == ["2", "4"]
+    assert mock_get.call_count == 2
+    url, _ = mock_get.call_args_list[0].args
+    params = mock_get.call_args_list[0].kwargs["params"]
+    assert url == "https://graph.microsoft.com/v1.0/me/calendarView"
+    assert params["startDateTime"] == "2025-01-01T00:00:00"
+    assert params["endDateTime"] == "2025-01-31T00:00:00"
+    assert params["$select"] == "id,subject,start,end,isAllDay"
+    assert "$filter" not in params
+
+
+@patch.object(MicrosoftEventsRequests, "microsoft_get")
+def test_get_events_with_open_range_uses_calendar_view(mock_get, mock_token_manager):
+    mock_get.return_value = (200, {"value": [_event("1")]})
+    query = EventQuery(filters=EventFilters(date_filter=DateFilter(start_date=datetime(2025, 1, 1))))
+
+    client = MicrosoftEventsRequests(mock_token_manager)
+    result = client.get_events(query, calendar_id="cal1")
+
+    assert [event["id"] for event in result["events"]] == ["1"]
+    assert mock_get.call_args.args[0] == "https://graph.microsoft.com/v1.0/me/calendars/cal1/calendarView"
+    assert mock_get.call_args.kwargs["params"]["endDateTime"] == "2026-01-01T00:00:00"
+
+
+@patch.object(MicrosoftEventsRequests, "microsoft_get")
+def test_get_events_without_dates_filters_on_graph(mock_get, mock_token_manager):
+    mock_get.return_value = (200, {"value": [_event("1"), _event("2"), _event("3")]})
+    query = EventQuery(filters=EventFilters(importance="high"), number_events=2)
+
+    client = MicrosoftEventsRequests(mock_token_manager)
+    result = client.get_events(query)
+
+    assert [event["id"] for event in result["events"]] == ["1", "2"]
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"]["$filter"] == "importance eq 'high'"
+
+
+@patch.object(MicrosoftEventsRequests, "microsoft_get")
+def test_get_events_marks_a_scan_stopped_by_the_page_budget(mock_get, mock_token_manager, monkeypatch):
+    monkeypatch.setenv("GRAPH_MAX_PAGES", "1")
+    mock_get.return_value = (
+        200,
+        {
+            "value": [_event("1", subject="Lunch"), _event("2", subject="Review")],
+            "@odata.nextLink": "https://graph.microsoft.com/v1.0/me/calendarView?$skip=2",
+        },
+    )
+    query = EventQuery(
+        filters=EventFilters(date_filter=DateFilter(start_date=datetime(2025, 1, 1), end_date=datetime(2025, 1, 31))),
+        search=EventSearchParams(subject="sync"),
+    )
+
+    client = MicrosoftEventsRequests(mock_token_manager)
+    result = client.get_events(query)
+
+    assert result == {"events": [], "truncated": True, "scannedUntil": "2025-01-01T10:00:00"}
+    assert mock_get.call_count == 1
 
 
 @patch.object(MicrosoftEventsRequests, "microsoft_post")
@@ -42,7 +150,7 @@ def test_create_event_success(mock_simplify, mock_params_to_dict, mock_post, moc
         start={"dateTime": "2024-01-01T10:00:00", "timeZone": "UTC"},
         end={"dateTime": "2024-01-01T11:00:00", "timeZone": "UTC"}
     )
-    result = json.loads(client.create_event(event_params))
+    result = client.create_event(event_params)
 
     assert result == {"id": "123"}
 
@@ -61,7 +169,7 @@ def test_update_event_success(mock_simplify, mock_params_to_dict, mock_patch, mo
         start={"dateTime": "2024-01-01T10:00:00", "timeZone": "UTC"},
         end={"dateTime": "2024-01-01T11:00:00", "timeZone": "UTC"}
     )
-    result = json.loads(client.update_event("123", event_params))
+    result = client.update_event("123", event_params)
 
     assert result == {"id": "123"}
 
@@ -70,7 +178,7 @@ def test_update_event_success(mock_simplify, mock_params_to_dict, mock_patch, mo
 def test_delete_event_success(mock_delete, mock_token_manager):
     mock_delete.return_value = (204, {})
     client = MicrosoftEventsRequests(mock_token_manager)
-    result = json.loads(client.delete_event("123"))
+    result = client.delete_event("123")
     assert result == {"message": "Event deleted successfully"}
 
 
@@ -78,25 +186,25 @@ def test_delete_event_success(mock_delete, mock_token_manager):
 def test_delete_event_attachment_failure(mock_delete, mock_token_manager):
     mock_delete.return_value = (500, {})
     client = MicrosoftEventsRequests(mock_token_manager)
-    result = json.loads(client.delete_event_attachment("event-id", "attachment-id"))
+    result = client.delete_event_attachment("event-id", "attachment-id")
     assert result == {"error": "Failed to delete attachment"}
 
 @patch.object(MicrosoftEventsRequests, "download_attachments")
-@patch("src.utils.calendar_outlook.microsoft_events_requests.simplify_event_with_attachment_names")
-@patch.object(MicrosoftEventsRequests, "microsoft_get")
-def test_get_event_success(mock_get, mock_simplify, mock_download, mock_token_manager):
-    # Primer GET (event)
-    mock_get.side_effect = [
-        (200, {"id": "event123"}),  # event data
-        (200, {"value": [{"name": "file1.pdf"}]})  # attachments
-    ]
-    mock_simplify.return_value = {"id": "event123", "subject": "Meeting"}
+@patch.object(MicrosoftEventsRequests, "microsoft_batch")
+def test_get_event_success(mock_batch, mock_download, mock_token_manager):
+    # Event and attachments come back from a single batch
+    mock_batch.return_value = {
+        "event": BatchResponse("event", 200, {"id": "event123", "subject": "Meeting", "hasAttachments": True}),
+        "attachments": BatchResponse("attachments", 200, {"value": [{"name": "file1.pdf"}]}),
+    }
     mock_download.return_value = ["file1.pdf"]
 
     client = MicrosoftEventsRequests(mock_token_manager)
-    result = json.loads(client.get_event("event123"))
+    result = client.get_event("event123")
 
+    assert mock_batch.call_count == 1
     assert result["id"] == "event123"
+    assert result["attachment_names"] == ["file1.pdf"]
     assert result["attachments"] == ["file1.pdf"]
 
 
@@ -104,7 +212,7 @@ def test_get_event_success(mock_get, mock_simplify, mock_download, mock_token_ma
 def test_accept_event_invitation_success(mock_post, mock_token_manager):
     mock_post.return_value = (202, {})
     client = MicrosoftEventsRequests(mock_token_manager)
-    response = json.loads(client.accept_event_invitation("event123", EventResponseParams(send_response=True, comment="See you")))
+    response = client.accept_event_invitation("event123", EventResponseParams(send_response=True, comment="See you"))
     assert response == {"message": "Event invitation accepted"}
 
 
@@ -112,7 +220,7 @@ def test_accept_event_invitation_success(mock_post, mock_token_manager):
 def test_decline_event_invitation_success(mock_post, mock_token_manager):
     mock_post.return_value = (202, {})
     client = MicrosoftEventsRequests(mock_token_manager)
-    response = json.loads(client.decline_event_invitation("event123", EventChangesParams(event_response_params=EventResponseParams(send_response=True, comment="See you"))))
+    response = client.decline_event_invitation("event123", EventChangesParams(event_response_params=EventResponseParams(send_response=True, comment="See you")))
     assert response == {"message": "Event invitation declined"}
 
 
@@ -120,14 +228,14 @@ def test_decline_event_invitation_success(mock_post, mock_token_manager):
 def test_tentative_accept_event_invitation_success(mock_post, mock_token_manager):
     mock_post.return_value = (202, {})
     client = MicrosoftEventsRequests(mock_token_manager)
-    response = json.loads(client.tentatively_accept_event_invitation("event123", EventChangesParams(event_response_params=EventResponseParams(send_response=True, comment="Maybe"))))
+    response = client.tentatively_accept_event_invitation("event123", EventChangesParams(event_response_params=EventResponseParams(send_response=True, comment="Maybe")))
     assert response == {"message": "Event invitation tentatively accepted"}  
 
 @patch.object(MicrosoftEventsRequests, "microsoft_post")
 def test_cancel_event_success(mock_post, mock_token_manager):
     mock_post.return_value = (202, {})
     client = MicrosoftEventsRequests(mock_token_manager)
-    response = json.loads(client.cancel_event("event123", comment="Cancelled"))
+    response = client.cancel_event("event123", comment="Cancelled")
     assert response == {"message": "Event canceled"}
 
 
@@ -135,11 +243,13 @@ def test_cancel_event_success(mock_post, mock_token_manager):
 @patch("src.utils.calendar_outlook.microsoft_events_requests.event_params_to_dict")
 @patch("src.utils.calendar_outlook.microsoft_events_requests.simplify_event")
 @patch.object(MicrosoftEventsRequests, "read_file_and_encode_base64")
-def test_create_event_attachment_failure(mock_encode, mock_simplify, mock_params_to_dict, mock_post, mock_token_manager):
+def test_create_event_attachment_failure(mock_encode, mock_simplify, mock_params_to_dict, mock_post, mock_token_manager, tmp_path):
+    attachment = tmp_path / "test.pdf"
+    attachment.write_bytes(b"%PDF")
     mock_params_to_dict.return_value = {"subject": "Test"}
     mock_post.side_effect = [
         (201, {"id": "event456"}),  # event creation
-        (500, {})  # attachment failure
+        requests.HTTPError("500 Server Error"),  # attachment failure
     ]
     mock_simplify.return_value = {"id": "event456"}
     mock_encode.return_value = ("test.pdf", "encoded-content")
@@ -149,8 +259,37 @@ def test_create_event_attachment_failure(mock_encode, mock_simplify, mock_params
         subject="Test",
         start={"dateTime": "2024-01-01T10:00:00", "timeZone": "UTC"},
         end={"dateTime": "2024-01-01T11:00:00", "timeZone": "UTC"},
-        attachments=["fakepath/test.pdf"]
+        attachments=[str(attachment)]
+    )
+    result = client.create_event(event_params)
+
+    assert result["error"] == "Failed to add 1 of 1 attachments"
+    assert result["attachments"][0]["success"] is False
+
+@patch.object(MicrosoftEventsRequests, "microsoft_post")
+@patch("src.utils.calendar_outlook.microsoft_events_requests.event_params_to_dict")
+def test_create_event_uploads_every_attachment(mock_params_to_dict, mock_post, mock_token_manager, tmp_path):
+    files = [tmp_path / "agenda.pdf", tmp_path / "photo.png", tmp_path / "notes.txt"]
+    for file in files:
+        file.write_bytes(b"data")
+    mock_params_to_dict.return_value = {"subject": "Test"}
+
+    def post(url, token, data=None):
+        if url.endswith("/attachments"):
+            return 201, {"id": f"att-{data['name']}", "name": data["name"], "contentType": data["contentType"], "size": 4}
+        return 201, {"id": "event456", "subject": "Test"}
+
+    mock_post.side_effect = post
+    client = MicrosoftEventsRequests(mock_token_manager)
+    event_params = EventParams(
+        subject="Test",
+        start={"dateTime": "2024-01-01T10:00:00", "timeZone": "UTC"},
+        end={"dateTime": "2024-01-01T11:00:00", "timeZone": "UTC"},
+        attachments=[str(file) for file in files],
     )
-    result = json.loads(client.create_event(event_params))
+    result = client.create_event(event_params)
 
-    assert result == {"error": "Failed to add attachments"}
\ No newline at end of file
+    assert "error" not in result
+    assert [a["attachment_id"] for a in result["attachments"]] == ["att-agenda.pdf", "att-photo.png", "att-notes.txt"]
+    assert [a["contentType"] for a in result["attachments"]] == ["application/pdf", "image/png", "text/plain"]
+    assert mock_post.call_count == 4
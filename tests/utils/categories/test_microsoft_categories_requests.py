@@ -1,6 +1,5 @@
 # tests/test_categories.py
 
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -30,7 +29,7 @@ def test_get_categories(mock_get, service):
     )
 
     result = service.get_categories_microsoft_api()
-    data = json.loads(result)
+    data = result
     assert isinstance(data, list)
     assert data[0]["displayName"] == "Category 1"
 
@@ -41,7 +40,7 @@ def test_create_category(mock_post, service):
     params = CategoryParams(category_name="New Category", preset_color="preset1", category_id=None)
     result = service.create_edit_category_microsoft_api(params)
 
-    data = json.loads(result)
+    data = result
     assert data["id"] == "123"
 
 @patch.object(MicrosoftCategoriesRequests, "microsoft_patch")
@@ -51,7 +50,7 @@ def test_edit_category(mock_patch, service):
     params = CategoryParams(category_name="Updated Category", preset_color="preset2", category_id="123")
     result = service.create_edit_category_microsoft_api(params)
 
-    data = json.loads(result)
+    data = result
     assert data["displayName"] == "Updated Category"
 
 @patch.object(MicrosoftCategoriesRequests, "microsoft_delete")
@@ -59,7 +58,7 @@ def test_delete_category(mock_delete, service):
     mock_delete.return_value = (204, {})
 
     result = service.delete_category_microsoft_api("123")
-    data = json.loads(result)
+    data = result
     assert "deleted successfully" in data["message"]
 
 @patch.object(MicrosoftCategoriesRequests, "microsoft_get")
@@ -75,7 +74,7 @@ def test_add_category_to_resource(mock_patch, mock_get, service):
     )
 
     result = service.add_delete_category_to_email(params)
-    data = json.loads(result)
+    data = result
     assert "New" in data["categories"]
 
 @patch("src.utils.categories.microsoft_categories_requests.get_preset_color_scheme")
@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -18,7 +17,7 @@ def test_create_contact_folder(mock_post, mock_token_manager):
     )
 
     client = MicrosoftContactFoldersRequests(mock_token_manager)
-    response = json.loads(client.create_contact_folder("Clientes"))
+    response = client.create_contact_folder("Clientes")
 
     assert response["id"] == "folder123"
     assert response["displayName"] == "Clientes"
@@ -37,7 +36,7 @@ def test_get_contact_folders(mock_get, mock_token_manager):
     )
 
     client = MicrosoftContactFoldersRequests(mock_token_manager)
-    response = json.loads(client.get_contact_folders())
+    response = client.get_contact_folders()
 
     assert isinstance(response, dict)
     assert "value" in response
@@ -50,7 +49,7 @@ def test_delete_contact_folder_success(mock_delete, mock_token_manager):
     mock_delete.return_value = (204, None)
 
     client = MicrosoftContactFoldersRequests(mock_token_manager)
-    response = json.loads(client.delete_contact_folder("folder1"))
+    response = client.delete_contact_folder("folder1")
 
     assert response["message"] == "Contact folder deleted successfully."
 
@@ -60,6 +59,6 @@ def test_delete_contact_folder_not_found(mock_delete, mock_token_manager):
     mock_delete.return_value = (404, None)
 
     client = MicrosoftContactFoldersRequests(mock_token_manager)
-    response = json.loads(client.delete_contact_folder("folder999"))
+    response = client.delete_contact_folder("folder999")
 
     assert response["error"] == "Contact folder not found."
@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -26,7 +25,7 @@ def test_get_contacts(mock_get, mock_token_manager):
     )
 
     client = MicrosoftContactsRequests(mock_token_manager)
-    response = json.loads(client.get_contacts())
+    response = client.get_contacts()
 
     assert isinstance(response, list)
     assert response[0]["givenName"] == "Juan"
@@ -45,7 +44,7 @@ def test_get_contacts_with_name_filter(mock_get, mock_token_manager):
     )
 
     client = MicrosoftContactsRequests(mock_token_manager)
-    response = json.loads(client.get_contacts(name="Pedro"))
+    response = client.get_contacts(name="Pedro")
 
     assert isinstance(response, list)
     assert len(response) == 1
@@ -60,7 +59,7 @@ def test_get_contact_info(mock_get, mock_token_manager):
     )
 
     client = MicrosoftContactsRequests(mock_token_manager)
-    response = json.loads(client.get_contact_info("abc123"))
+    response = client.get_contact_info("abc123")
 
     assert response["id"] == "abc123"
     assert response["givenName"] == "Laura"
@@ -81,7 +80,7 @@ def test_create_contact(mock_post, mock_token_manager):
     )
 
     client = MicrosoftContactsRequests(mock_token_manager)
-    response = json.loads(client.create_edit_contact(contact))
+    response = client.create_edit_contact(contact)
 
     assert response["id"] == "new456"
     assert response["surname"] == "Ruiz"
@@ -103,7 +102,7 @@ def test_edit_contact(mock_patch, mock_token_manager):
     )
 
     client = MicrosoftContactsRequests(mock_token_manager)
-    response = json.loads(client.create_edit_contact(contact, contact_id="c123"))
+    response = client.create_edit_contact(contact, contact_id="c123")
 
     assert response["givenName"] == "María"
     assert response["id"] == "c123"
@@ -114,7 +113,7 @@ def test_delete_contact_success(mock_delete, mock_token_manager):
     mock_delete.return_value = (204, None)
 
     client = MicrosoftContactsRequests(mock_token_manager)
-    response = json.loads(client.delete_contact("id567"))
+    response = client.delete_contact("id567")
 
     assert response["message"] == "Contact deleted successfully."
 
@@ -124,6 +123,6 @@ def test_delete_contact_failure(mock_delete, mock_token_manager):
     mock_delete.return_value = (404, None)
 
     client = MicrosoftContactsRequests(mock_token_manager)
-    response = json.loads(client.delete_contact("nonexistent_id"))
+    response = client.delete_contact("nonexistent_id")
 
     assert response["error"] == "Failed to delete contact."
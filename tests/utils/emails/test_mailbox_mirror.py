@@ -0,0 +1,191 @@
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src.utils.email.mailbox_mirror import MailboxMirror
+from src.utils.email.microsoft_messages_requests import MicrosoftMessagesRequests
+from src.utils.param_types import DateFilter, EmailFilters, EmailQuery, SearchParams
+
+
+def _message(message_id, subject, received, **extra):
+    return {
+        "id": message_id,
+        "subject": subject,
+        "from": {"emailAddress": {"name": "Ana", "address": "Ana@Example.com"}},
+        "receivedDateTime": received,
+        "isRead": False,
+        "conversationId": "conv1",
+        "parentFolderId": "AAInbox",
+        "bodyPreview": f"Preview of {subject}",
+        **extra,
+    }
+
+
+@pytest.fixture
+def mirror():
+    mirror = MailboxMirror(":memory:", ["inbox"])
+    yield mirror
+    mirror.close()
+
+
+def test_initial_sync_then_incremental_delta(mirror):
+    get = MagicMock(side_effect=[
+        (200, {
+            "value": [_message("m1", "Invoice", "2025-06-01T10:00:00Z")],
+            "@odata.nextLink": "https://graph/next",
+        }),
+        (200, {
+            "value": [_message("m2", "Lunch", "2025-06-02T10:00:00Z", isRead=True)],
+            "@odata.deltaLink": "https://graph/delta?token=1",
+        }),
+        (200, {
+            "value": [{"id": "m1", "@removed": {"reason": "deleted"}}],
+            "@odata.deltaLink": "https://graph/delta?token=2",
+        }),
+    ])
+
+    mirror.sync(get, lambda: "tok")
+    assert mirror.is_fresh()
+    assert mirror.covers("AAInbox")
+    assert "$select" in get.call_args_list[0].kwargs["params"]
+    assert [m["id"] for m in mirror.search(EmailQuery())] == ["m2", "m1"]
+
+    mirror.mark_stale()
+    mirror.sync(get, lambda: "tok")
+    assert get.call_args_list[2].args[0] == "https://graph/delta?token=1"
+    assert [m["id"] for m in mirror.search(EmailQuery())] == ["m2"]
+
+
+def test_search_applies_filters_locally(mirror):
+    get = MagicMock(return_value=(200, {
+        "value": [
+            _message("m1", "Invoice June", "2025-06-01T10:00:00Z", categories=["Finance"]),
+            _message("m2", "Invoice May", "2025-05-01T10:00:00Z", isRead=True),
+            _message("m3", "Lunch", "2025-06-03T10:00:00Z"),
+        ],
+        "@odata.deltaLink": "https://graph/delta",
+    }))
+    mirror.sync(get, lambda: "tok")
+
+    query = EmailQuery(
+        filters=EmailFilters(
+            sender="ana@example.com",
+            unread_only=True,
+            date_filter=DateFilter(start_date=datetime(2025, 5, 15)),
+        ),
+        search=SearchParams(keyword="invoice"),
+    )
+    assert [m["id"] for m in mirror.search(query)] == ["m1"]
+    assert mirror.search(EmailQuery(filters=EmailFilters(categories=["Finance"])))[0]["id"] == "m1"
+    assert mirror.search(EmailQuery(folder_id="archive")) == []
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_messages_requests_answer_from_fresh_mirror(mock_get, mirror):
+    mock_get.return_value = (200, {
+        "value": [_message("m1", "Invoice", "2025-06-01T10:00:00Z")],
+        "@odata.deltaLink": "https://graph/delta",
+    })
+    token_manager = MagicMock()
+    token_manager.get_token.return_value = "tok"
+    client = MicrosoftMessagesRequests(token_manager)
+
+    with patch(
+        "src.utils.email.microsoft_messages_requests.get_mailbox_mirror",
+        return_value=mirror,
+    ):
+        first = client.get_messages_from_folder_microsoft_api(EmailQuery())
+        conversation = client.get_conversation_messages_microsoft_api(
+            {"$top": 5}, conversation_id="conv1"
+        )
+
+    assert [m["id"] for m in first["messages"]] == ["m1"]
+    assert first["messages"][0]["bodyPreview"] == "Preview of Invoice"
+    assert [m["id"] for m in conversation["messages"]] == ["m1"]
+    # The second read is served by the fresh mirror without a new delta round
+    assert mock_get.call_count == 1
+
+
+def test_keyword_search_uses_the_index_with_filters(mirror):
+    get = MagicMock(return_value=(200, {
+        "value": [
+            _message("m1", "Quarterly report", "2025-06-01T10:00:00Z", isRead=True),
+            _message("m2", "Report", "2025-06-02T10:00:00Z"),
+            _message("m3", "Lunch", "2025-06-03T10:00:00Z"),
+        ],
+        "@odata.deltaLink": "https://graph/delta",
+    }))
+    mirror.sync(get, lambda: "tok")
+
+    query = EmailQuery(
+        search=SearchParams(keyword="report"),
+        filters=EmailFilters(unread_only=True),
+        number_emails=50,
+    )
+    assert [m["id"] for m in mirror.search(query)] == ["m2"]
+
+    get.return_value = (200, {
+        "value": [_message("m4", "Report v2", "2025-06-04T10:00:00Z")],
+        "@odata.deltaLink": "https://graph/delta2",
+    })
+    mirror.mark_stale()
+    mirror.sync(get, lambda: "tok")
+    assert sorted(m["id"] for m in mirror.search(query)) == ["m2", "m4"]
+
+
+def _http_error(status_code, code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps({"error": {"code": code}}).encode()
+    return requests.HTTPError(response=response)
+
+
+def test_expired_delta_link_triggers_full_resync(mirror):
+    get = MagicMock(side_effect=[
+        (200, {
+            "value": [_message("m1", "Invoice", "2025-06-01T10:00:00Z")],
+            "@odata.deltaLink": "https://graph/delta?token=1",
+        }),
+        _http_error(410, "syncStateNotFound"),
+        (200, {
+            "value": [_message("m2", "Lunch", "2025-06-02T10:00:00Z")],
+            "@odata.deltaLink": "https://graph/delta?token=2",
+        }),
+    ])
+    mirror.sync(get, lambda: "tok")
+
+    mirror.mark_stale()
+    mirror.sync(get, lambda: "tok")
+
+    assert get.call_args_list[1].args[0] == "https://graph/delta?token=1"
+    assert "$select" in get.call_args_list[2].kwargs["params"]
+    assert mirror.is_fresh()
+    # The full download replaces the folder, so messages deleted meanwhile are gone
+    assert [m["id"] for m in mirror.search(EmailQuery())] == ["m2"]
+
+
+def test_first_sync_is_spread_over_several_reads():
+    mirror = MailboxMirror(":memory:", ["inbox"], max_sync_pages=1)
+    get = MagicMock(side_effect=[
+        (200, {
+            "value": [_message("m1", "Invoice", "2025-06-01T10:00:00Z")],
+            "@odata.nextLink": "https://graph/next",
+        }),
+        (200, {
+            "value": [_message("m2", "Lunch", "2025-06-02T10:00:00Z")],
+            "@odata.deltaLink": "https://graph/delta",
+        }),
+    ])
+
+    mirror.sync(get, lambda: "tok")
+    assert get.call_count == 1
+    assert not mirror.is_fresh()
+
+    mirror.sync(get, lambda: "tok")
+    assert get.call_args_list[1].args[0] == "https://graph/next"
+    assert mirror.is_fresh()
+    assert [m["id"] for m in mirror.search(EmailQuery())] == ["m2", "m1"]
+    mirror.close()
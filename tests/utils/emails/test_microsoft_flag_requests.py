@@ -1,8 +1,8 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
 from src.utils.email.microsoft_flag_requests import MicrosoftFlagRequests
+from src.utils.microsoft_base_request import MicrosoftBaseRequest
 
 
 @pytest.fixture
@@ -29,7 +29,7 @@ def test_manage_flags_valid_flag(mock_patch, mock_simplify, mock_token_manager):
     response = client.manage_flags_microsoft_api(email_id, flag)
 
     # Assert
-    assert json.loads(response) == expected_response
+    assert response == expected_response
     mock_patch.assert_called_once_with(
         f"https://graph.microsoft.com/v1.0/me/messages/{email_id}",
         "mocked_token",
@@ -43,4 +43,30 @@ def test_manage_flags_invalid_flag(mock_token_manager):
 
     response = client.manage_flags_microsoft_api("12345", "invalid_flag")
 
-    assert json.loads(response) == {"error": "Not valid flag submited"}
+    assert response == {"error": "Not valid flag submited"}
+
+
+@patch.object(MicrosoftBaseRequest, "microsoft_post")
+def test_bulk_manage_flags_batches_and_summarizes(mock_post, mock_token_manager):
+    mock_post.return_value = (200, {"responses": [
+        {"id": "0", "status": 200, "body": {"id": "a"}},
+        {"id": "1", "status": 404, "body": {"error": {"code": "ErrorItemNotFound", "message": "Not found"}}},
+    ]})
+
+    client = MicrosoftFlagRequests(mock_token_manager)
+    response = client.bulk_manage_flags_microsoft_api(["a", "b", "a"], "complete")
+
+    assert response["succeeded"] == 1
+    assert response["failed"] == 1
+    assert response["results"][1] == {"id": "b", "status": 404, "success": False, "error": "Not found"}
+    sent = mock_post.call_args.args[2]["requests"]
+    assert [r["url"] for r in sent] == ["/me/messages/a", "/me/messages/b"]
+    assert sent[0]["body"] == {"flag": {"flagStatus": "complete"}}
+
+
+def test_bulk_manage_flags_invalid_flag(mock_token_manager):
+    client = MicrosoftFlagRequests(mock_token_manager)
+
+    response = client.bulk_manage_flags_microsoft_api(["a"], "urgent")
+
+    assert response == {"error": "Not valid flag submited"}
@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -15,23 +14,48 @@ def mock_token_manager():
 
 @patch.object(MicrosoftFoldersRequests, "microsoft_get")
 def test_get_folder_names(mock_get, mock_token_manager):
+    mock_get.side_effect = [
+        (
+            200,
+            {
+                "value": [
+                    {"id": "1", "displayName": "Inbox", "totalItemCount": 10},
+                    {"id": "2", "displayName": "Sent", "totalItemCount": 5},
+                ],
+                "@odata.nextLink": "https://next.link",
+            },
+        ),
+        (200, {"value": [{"id": "3", "displayName": "Archive", "totalItemCount": 1}]}),
+    ]
+
+    client = MicrosoftFoldersRequests(mock_token_manager)
+    response = client.get_folder_names()
+
+    assert "folders" in response
+    assert len(response["folders"]) == 3
+    assert "nextLink" not in response
+    assert mock_get.call_args_list[1].args[0] == "https://next.link"
+
+
+@patch.dict("os.environ", {"GRAPH_MAX_PAGES": "1"})
+@patch.object(MicrosoftFoldersRequests, "microsoft_get")
+def test_get_folder_names_returns_next_link_when_page_budget_is_reached(
+    mock_get, mock_token_manager
+):
     mock_get.return_value = (
         200,
         {
-            "value": [
-                {"id": "1", "displayName": "Inbox", "totalItemCount": 10},
-                {"id": "2", "displayName": "Sent", "totalItemCount": 5},
-            ],
+            "value": [{"id": "1", "displayName": "Inbox", "totalItemCount": 10}],
             "@odata.nextLink": "https://next.link",
         },
     )
 
     client = MicrosoftFoldersRequests(mock_token_manager)
-    response = json.loads(client.get_folder_names())
+    response = client.get_folder_names()
 
-    assert "folders" in response
-    assert len(response["folders"]) == 2
+    assert len(response["folders"]) == 1
     assert response["nextLink"] == "https://next.link"
+    mock_get.assert_called_once()
 
 
 @patch.object(MicrosoftFoldersRequests, "microsoft_get")
@@ -42,7 +66,7 @@ def test_get_subfolders(mock_get, mock_token_manager):
     )
 
     client = MicrosoftFoldersRequests(mock_token_manager)
-    response = json.loads(client.get_subfolders_microsoft_api("folder123"))
+    response = client.get_subfolders_microsoft_api("folder123")
 
     assert "folders" in response
     assert response["folders"][0]["folder_id"] == "sub1"
@@ -54,7 +78,7 @@ def test_create_folder(mock_post, mock_token_manager):
 
     params = FolderParams(folder_name="NewFolder")
     client = MicrosoftFoldersRequests(mock_token_manager)
-    response = json.loads(client.create_edit_folder_microsoft_api(params))
+    response = client.create_edit_folder_microsoft_api(params)
 
     assert response["id"] == "new123"
 
@@ -65,7 +89,7 @@ def test_edit_folder(mock_patch, mock_token_manager):
 
     params = FolderParams(folder_name="EditedFolder", folder_id="edit123")
     client = MicrosoftFoldersRequests(mock_token_manager)
-    response = json.loads(client.create_edit_folder_microsoft_api(params))
+    response = client.create_edit_folder_microsoft_api(params)
 
     assert response["id"] == "edit123"
 
@@ -76,7 +100,7 @@ def test_create_subfolder(mock_post, mock_token_manager):
 
     params = FolderParams(folder_name="SubFolder", parent_folder_id="parent456")
     client = MicrosoftFoldersRequests(mock_token_manager)
-    response = json.loads(client.create_edit_folder_microsoft_api(params))
+    response = client.create_edit_folder_microsoft_api(params)
 
     assert response["id"] == "sub123"
 
@@ -86,7 +110,7 @@ def test_delete_folder_success(mock_delete, mock_token_manager):
     mock_delete.return_value = (204, {})
 
     client = MicrosoftFoldersRequests(mock_token_manager)
-    response = json.loads(client.delete_folder_microsoft_api("folder123"))
+    response = client.delete_folder_microsoft_api("folder123")
 
     assert "message" in response
     assert "deleted successfully" in response["message"]
@@ -97,6 +121,6 @@ def test_delete_folder_failure(mock_delete, mock_token_manager):
     mock_delete.return_value = (400, {"error": "Failed"})
 
     client = MicrosoftFoldersRequests(mock_token_manager)
-    response = json.loads(client.delete_folder_microsoft_api("folder123"))
+    response = client.delete_folder_microsoft_api("folder123")
 
     assert "error" in response
@@ -1,13 +1,18 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
 from src.utils.email.microsoft_messages_requests import MicrosoftMessagesRequests
+from src.utils.graph_batch import BatchResponse
 from src.utils.param_types import (
     EmailQuery,
+    EmailFilters,
+    EmailOrder,
+    SearchParams,
     DraftEmailData,
     EmailRecipients,
     EmailOperationParams,
+    BulkEmailOperationParams,
+    BulkHandleCategoryParams,
     EmailReplyParams,
     EmailForwardParams,
 )
@@ -27,20 +32,18 @@ def client(mock_token_manager):
 
 
 @patch.object(MicrosoftMessagesRequests, "microsoft_get")
-@patch("src.utils.email.microsoft_messages_requests.microsoft_simplify_message")
-def test_get_messages_from_folder(mock_simplify, mock_get, client):
+def test_get_messages_from_folder(mock_get, client):
     # Simula dos mensajes con el mismo ID para probar que se eliminan duplicados
     mock_get.return_value = (
         200,
         {"value": [{"id": "msg1"}, {"id": "msg1"}], "@odata.nextLink": "next"},
     )
-    mock_simplify.return_value = {"id": "msg1"}  # Ambos mensajes se simplifican igual
 
     params = {}
     email_params = EmailQuery(folder_id=None)
-    response = json.loads(
-        client.get_messages_from_folder_microsoft_api(params, email_params)
-    )
+    response = client.get_messages_from_folder_microsoft_api(
+            email_query=email_params, params=params
+        )
 
     assert "messages" in response
     assert (
@@ -49,18 +52,185 @@ def test_get_messages_from_folder(mock_simplify, mock_get, client):
     assert response["messages"][0]["id"] == "msg1"
 
 
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_ordered_filter_query_returns_count_and_cursor(mock_get, client):
+    next_link = "https://graph.microsoft.com/v1.0/me/messages?$skip=2"
+    mock_get.side_effect = [
+        (200, {"value": [{"id": "a"}, {"id": "b"}], "@odata.count": 7, "@odata.nextLink": next_link}),
+        (200, {"value": [{"id": "c"}]}),
+    ]
+    query = EmailQuery(
+        filters=EmailFilters(unread_only=True),
+        number_emails=2,
+        order_by=EmailOrder(),
+        include_count=True,
+    )
+
+    response = client.get_messages_from_folder_microsoft_api(email_query=query)
+
+    params = mock_get.call_args.kwargs["params"]
+    assert params["$orderby"] == "receivedDateTime desc"
+    assert params["$filter"] == "receivedDateTime ge 1970-01-01T00:00:00Z and isRead eq false"
+    assert params["$count"] == "true"
+    assert response["count"] == 7
+    assert [m["id"] for m in response["messages"]] == ["a", "b"]
+
+    next_page = client.get_messages_from_folder_microsoft_api(
+        email_query=EmailQuery(cursor=response["cursor"], number_emails=2)
+    )
+
+    assert mock_get.call_args.args[0] == next_link
+    assert not mock_get.call_args.kwargs["params"]
+    assert [m["id"] for m in next_page["messages"]] == ["c"]
+    assert "cursor" not in next_page
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_cursor_must_point_to_graph(mock_get, client):
+    query = EmailQuery(cursor="aHR0cHM6Ly9ldmlsLmV4YW1wbGUvbWU")
+
+    assert client.get_messages_from_folder_microsoft_api(email_query=query) == {"error": "Invalid cursor"}
+    mock_get.assert_not_called()
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_search_first_filters_streamed_pages_and_stops_early(mock_get, client):
+    next_link = "https://graph.microsoft.com/v1.0/me/messages?$skiptoken=2"
+    mock_get.side_effect = [
+        (200, {"value": [{"id": "a", "isRead": True}, {"id": "b", "isRead": False}], "@odata.nextLink": next_link}),
+        (200, {"value": [{"id": "c", "isRead": False}, {"id": "d", "isRead": False}], "@odata.nextLink": next_link}),
+    ]
+    query = EmailQuery(
+        search=SearchParams(keyword="report"),
+        filters=EmailFilters(unread_only=True),
+        number_emails=2,
+    )
+
+    response = client.get_messages_from_folder_microsoft_api(email_query=query)
+
+    assert [message["id"] for message in response["messages"]] == ["b", "c"]
+    assert mock_get.call_count == 2
+    params = mock_get.call_args_list[0].kwargs["params"]
+    assert params["$search"] == '"report"'
+    assert "$filter" not in params
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_filter_first_matches_search_terms_locally(mock_get, client):
+    mock_get.return_value = (
+        200,
+        {"value": [{"id": "a", "subject": "Lunch"}, {"id": "b", "subject": "Weekly Report"}, {"id": "c", "subject": "report"}]},
+    )
+    query = EmailQuery(
+        search=SearchParams(keyword="report"),
+        filters=EmailFilters(sender="boss@example.com"),
+        number_emails=1,
+    )
+
+    response = client.get_messages_from_folder_microsoft_api(email_query=query)
+
+    assert [message["id"] for message in response["messages"]] == ["b"]
+    params = mock_get.call_args.kwargs["params"]
+    assert params["$filter"] == "from/emailAddress/address eq 'boss@example.com'"
+    assert "$search" not in params
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_filter_first_keyword_matches_the_full_body(mock_get, client):
+    mock_get.return_value = (
+        200,
+        {"value": [
+            {"id": "a", "subject": "Lunch", "body": {"content": "<p>See you</p>"}},
+            {"id": "b", "subject": "Notes", "body": {"content": "<p>The quarterly <b>report</b></p>"}},
+        ]},
+    )
+    query = EmailQuery(
+        search=SearchParams(keyword="report"),
+        filters=EmailFilters(sender="boss@example.com"),
+    )
+
+    response = client.get_messages_from_folder_microsoft_api(email_query=query)
+
+    assert [message["id"] for message in response["messages"]] == ["b"]
+    assert "body" in mock_get.call_args.kwargs["params"]["$select"].split(",")
+    assert "truncated" not in response
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_streamed_query_is_marked_truncated_when_the_page_budget_runs_out(mock_get, client, monkeypatch):
+    monkeypatch.setenv("GRAPH_MAX_PAGES", "2")
+    next_link = "https://graph.microsoft.com/v1.0/me/messages?$skiptoken=2"
+    mock_get.return_value = (200, {"value": [{"id": "a", "isRead": True}], "@odata.nextLink": next_link})
+    query = EmailQuery(
+        search=SearchParams(keyword="report"),
+        filters=EmailFilters(unread_only=True),
+    )
+
+    response = client.get_messages_from_folder_microsoft_api(email_query=query)
+
+    assert response == {"messages": [], "truncated": True}
+    assert mock_get.call_count == 2
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_get")
+def test_count_is_rejected_when_search_and_filters_are_combined(mock_get, client):
+    query = EmailQuery(
+        search=SearchParams(keyword="report"),
+        filters=EmailFilters(unread_only=True),
+        include_count=True,
+    )
+
+    response = client.get_messages_from_folder_microsoft_api(email_query=query)
+
+    assert "error" in response
+    mock_get.assert_not_called()
+
+
 @patch.object(MicrosoftMessagesRequests, "microsoft_patch")
 @patch.object(MicrosoftMessagesRequests, "microsoft_get")
 def test_mark_as_read(mock_get, mock_patch, client):
-    mock_get.return_value = (200, {"id": "msg1", "subject": "Hi"})
+    mock_patch.return_value = (200, {"id": "msg1", "subject": "Hi", "isRead": True})
     with patch(
         "src.utils.email.microsoft_messages_requests.microsoft_simplify_message",
         return_value={"id": "msg1"},
     ):
-        response = json.loads(
-            client.mark_as_read_unread_microsoft_api("msg1", is_read=True)
-        )
+        response = client.mark_as_read_unread_microsoft_api("msg1", is_read=True)
     assert response["id"] == "msg1"
+    mock_get.assert_not_called()
+
+
+@patch.object(MicrosoftMessagesRequests, "download_attachments")
+@patch.object(MicrosoftMessagesRequests, "microsoft_batch")
+def test_get_full_message_and_attachments(mock_batch, mock_download, client):
+    mock_batch.return_value = {
+        "message": BatchResponse("message", 200, {"id": "msg1", "body": {"content": "Hi"}}),
+        "attachments": BatchResponse(
+            "attachments", 200, {"value": [{"id": "att1", "name": "file.pdf"}]}
+        ),
+    }
+    mock_download.return_value = [{"name": "file.pdf", "path": "/tmp/file.pdf"}]
+
+    response = client.get_full_message_and_attachments("msg1")
+
+    assert mock_batch.call_count == 1
+    assert response["body"]["content"] == "Hi"
+    assert response["attachments"][0]["attachment_id"] == "att1"
+    # Attachments are listed without their content, which is streamed from $value
+    assert mock_batch.call_args.args[0][1].params == {"$select": "id,name,contentType,size"}
+    url_builder = mock_download.call_args.args[1]
+    assert url_builder("att1").endswith("/messages/msg1/attachments/att1/$value")
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_batch")
+def test_get_full_message_sub_request_error(mock_batch, client):
+    mock_batch.return_value = {
+        "message": BatchResponse("message", 404, {"error": {"code": "ErrorItemNotFound"}}),
+        "attachments": BatchResponse("attachments", 404, {}),
+    }
+
+    response = client.get_full_message_and_attachments("missing")
+
+    assert response["error"].startswith("HTTP error: 404")
 
 
 @patch.object(MicrosoftMessagesRequests, "microsoft_get")
@@ -70,7 +240,7 @@ def test_get_conversation_messages(mock_get, client):
         "src.utils.email.microsoft_messages_requests.microsoft_simplify_message",
         return_value={"id": "conv1"},
     ):
-        response = json.loads(client.get_conversation_messages_microsoft_api({}))
+        response = client.get_conversation_messages_microsoft_api({})
     assert response["messages"][0]["id"] == "conv1"
 
 
@@ -85,32 +255,45 @@ def test_create_edit_draft(mock_patch, mock_get, client):
         draft_id="draft123",
         email_recipients=EmailRecipients([], []),
     )
-    response = json.loads(client.create_edit_draft_microsoft_api(data))
+    response = client.create_edit_draft_microsoft_api(data)
     assert response["id"] == "draft123"
 
 
 @patch.object(MicrosoftMessagesRequests, "microsoft_post")
 def test_send_draft_email(mock_post, client):
     mock_post.return_value = (202, {})
-    response = json.loads(client.send_draft_email_microsoft_api("draft123"))
+    response = client.send_draft_email_microsoft_api("draft123")
     assert response["message"] == "Email sent successfully."
 
 @patch.object(MicrosoftMessagesRequests, "read_file_and_encode_base64")
 @patch.object(MicrosoftMessagesRequests, "microsoft_post")
-def test_add_attachment_to_draft(mock_post, mock_read, client):
+def test_add_attachment_to_draft(mock_post, mock_read, client, tmp_path):
+    attachment = tmp_path / "file.txt"
+    attachment.write_text("content")
     mock_read.return_value = ("file.txt", "base64encoded")
     mock_post.return_value = (
         200,
         {"id": "att123", "name": "file.txt", "contentType": "text/plain", "size": 123},
     )
-    response = json.loads(
-        client.add_attachment_to_draft_microsoft_api(
-            "draft123", "path/to/file.txt", "text/plain"
+    response = client.add_attachment_to_draft_microsoft_api(
+            "draft123", str(attachment), "text/plain"
         )
-    )
     assert response["attachment_id"] == "att123"
 
 
+@patch.object(MicrosoftMessagesRequests, "read_file_and_encode_base64")
+@patch.object(MicrosoftMessagesRequests, "microsoft_post")
+def test_add_attachment_to_draft_guesses_content_type(mock_post, mock_read, client, tmp_path):
+    attachment = tmp_path / "report.pdf"
+    attachment.write_bytes(b"%PDF")
+    mock_read.return_value = ("report.pdf", "base64encoded")
+    mock_post.return_value = (201, {"id": "att123", "name": "report.pdf", "size": 4})
+
+    client.add_attachment_to_draft_microsoft_api("draft123", str(attachment))
+
+    assert mock_post.call_args.kwargs["data"]["contentType"] == "application/pdf"
+
+
 @patch.object(MicrosoftMessagesRequests, "microsoft_post")
 def test_forward_email(mock_post, client):
     mock_post.return_value = (200, {"status": "ok"})
@@ -121,7 +304,7 @@ def test_forward_email(mock_post, client):
             to_recipients=["a@example.com"], cc_recipients=[]
         ),
     )
-    response = json.loads(client.forward_email_microsoft_api(params))
+    response = client.forward_email_microsoft_api(params)
     assert response["status"] == "ok"
 
 
@@ -131,7 +314,7 @@ def test_reply_to_email(mock_post, client):
     params = EmailReplyParams(
         email_id="email123", body="Reply content", reply_all=False
     )
-    response = json.loads(client.reply_to_email_microsoft_api(params))
+    response = client.reply_to_email_microsoft_api(params)
     assert response["id"] == "reply1"
 
 
@@ -141,12 +324,71 @@ def test_move_email(mock_post, client):
     params = EmailOperationParams(
         email_id="email1", destination_folder_id="dest123", move=True
     )
-    response = json.loads(client.move_or_copy_email_microsoft_api(params))
+    response = client.move_or_copy_email_microsoft_api(params)
     assert response["id"] == "movedEmail"
 
 
 @patch.object(MicrosoftMessagesRequests, "microsoft_delete")
 def test_delete_message(mock_delete, client):
     mock_delete.return_value = (204, {})
-    response = json.loads(client.delete_message_microsoft_api("msg123"))
+    response = client.delete_message_microsoft_api("msg123")
     assert "deleted successfully" in response["message"]
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_batch")
+def test_bulk_mark_as_read(mock_batch, client):
+    mock_batch.return_value = {
+        "0": BatchResponse(id="0", status=200, body={"id": "m1"}),
+        "1": BatchResponse(id="1", status=0),
+    }
+    response = client.bulk_mark_as_read_unread_microsoft_api(["m1", "m2"])
+
+    assert response["succeeded"] == 1
+    assert response["results"][1]["error"] == "Request was not processed"
+    requests = mock_batch.call_args.args[0]
+    assert [r.method for r in requests] == ["PATCH", "PATCH"]
+    assert requests[1].body == {"isRead": True}
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_batch")
+def test_bulk_move_emails_reports_new_ids(mock_batch, client):
+    mock_batch.return_value = {"0": BatchResponse(id="0", status=201, body={"id": "new1"})}
+    params = BulkEmailOperationParams(email_ids=["m1"], destination_folder_id="archive")
+
+    response = client.bulk_move_or_copy_emails_microsoft_api(params)
+
+    assert response["results"][0]["new_id"] == "new1"
+    request = mock_batch.call_args.args[0][0]
+    assert request.url.endswith("/messages/m1/move")
+    assert request.body == {"destinationId": "archive"}
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_batch")
+def test_bulk_add_category_reads_then_patches(mock_batch, client):
+    mock_batch.side_effect = [
+        {
+            "0": BatchResponse(id="0", status=200, body={"categories": ["Red"]}),
+            "1": BatchResponse(id="1", status=404, body={"error": {"message": "Not found"}}),
+        },
+        {"0": BatchResponse(id="0", status=200, body={"id": "m1"})},
+    ]
+    params = BulkHandleCategoryParams(email_ids=["m1", "m2"], category_names=["Blue"])
+
+    response = client.bulk_add_delete_category_microsoft_api(params)
+
+    assert response["succeeded"] == 1
+    assert response["results"][1]["error"] == "Not found"
+    patches = mock_batch.call_args_list[1].args[0]
+    assert len(patches) == 1
+    assert patches[0].body == {"categories": ["Red", "Blue"]}
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_batch")
+def test_bulk_delete_messages(mock_batch, client):
+    mock_batch.return_value = {"0": BatchResponse(id="0", status=204, body=None)}
+    response = client.bulk_delete_messages_microsoft_api(["m1"])
+    assert response == {
+        "succeeded": 1,
+        "failed": 0,
+        "results": [{"id": "m1", "status": 204, "success": True}],
+    }
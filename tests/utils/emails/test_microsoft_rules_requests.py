@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 from src.utils.email.microsoft_rules_requests import MicrosoftRulesRequests
@@ -21,8 +20,7 @@ def test_get_message_rules_microsoft_api(mock_get, client):
     fake_response = {"value": [{"id": "rule1", "displayName": "Rule 1"}]}
     mock_get.return_value = (200, fake_response)
 
-    result = client.get_message_rules_microsoft_api()
-    data = json.loads(result)
+    data = client.get_message_rules_microsoft_api()
 
     mock_get.assert_called_once()
     assert "value" in data
@@ -35,8 +33,7 @@ def test_create_message_rule_microsoft_api_post(mock_post, client):
     fake_response = {"id": "new_rule", "displayName": "Test Rule"}
     mock_post.return_value = (201, fake_response)
 
-    result = client.create_message_rule_microsoft_api(mail_rule)
-    data = json.loads(result)
+    data = client.create_message_rule_microsoft_api(mail_rule)
 
     mock_post.assert_called_once()
     assert data["id"] == "new_rule"
@@ -48,8 +45,7 @@ def test_create_message_rule_microsoft_api_patch(mock_patch, client):
     fake_response = {"id": "rule123", "displayName": "Test Rule"}
     mock_patch.return_value = (200, fake_response)
 
-    result = client.create_message_rule_microsoft_api(mail_rule, rule_id="rule123")
-    data = json.loads(result)
+    data = client.create_message_rule_microsoft_api(mail_rule, rule_id="rule123")
 
     mock_patch.assert_called_once()
     assert data["id"] == "rule123"
@@ -59,8 +55,7 @@ def test_create_message_rule_microsoft_api_patch(mock_patch, client):
 def test_delete_message_rule_microsoft_api_success(mock_delete, client):
     mock_delete.return_value = (204, None)
 
-    result = client.delete_message_rule_microsoft_api("rule123")
-    data = json.loads(result)
+    data = client.delete_message_rule_microsoft_api("rule123")
 
     mock_delete.assert_called_once()
     assert "message" in data
@@ -70,8 +65,7 @@ def test_delete_message_rule_microsoft_api_success(mock_delete, client):
 def test_delete_message_rule_microsoft_api_failure(mock_delete, client):
     mock_delete.return_value = (400, {"error": "Bad Request"})
 
-    result = client.delete_message_rule_microsoft_api("rule123")
-    data = json.loads(result)
+    data = client.delete_message_rule_microsoft_api("rule123")
 
     mock_delete.assert_called_once()
     assert "error" in data
@@ -85,8 +79,7 @@ def test_get_next_link_microsoft_api(mock_get, client):
     next_link = (
         "https://graph.microsoft.com/v1.0/me/mailFolders/inbox/messageRules?$skip=10"
     )
-    result = client.get_next_link_microsoft_api(next_link)
-    data = json.loads(result)
+    data = client.get_next_link_microsoft_api(next_link)
 
     mock_get.assert_called_once_with(next_link, "fake-token")
     assert "value" in data
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from src.utils.email.query_planner import (
+    FILTER_FIRST,
+    SEARCH_FIRST,
+    estimate_filter_selectivity,
+    estimate_search_selectivity,
+    plan_email_query,
+)
+from src.utils.email.search_index import message_matches_text
+from src.utils.param_types import DateFilter, EmailFilters, EmailOrder, EmailQuery, SearchParams
+
+NOW = datetime(2025, 6, 30, tzinfo=timezone.utc)
+
+
+def test_filter_selectivity():
+    assert estimate_filter_selectivity(None) == 1.0
+    assert estimate_filter_selectivity(EmailFilters(unread_only=True, has_attachments=True)) == 0.3 * 0.2
+    week = DateFilter(start_date=datetime(2025, 6, 23))
+    assert estimate_filter_selectivity(EmailFilters(date_filter=week), NOW) == 7 / 365
+
+
+def test_search_selectivity_grows_with_terms():
+    assert estimate_search_selectivity(SearchParams(keyword="report")) == 0.05
+    assert estimate_search_selectivity(SearchParams(keyword="quarterly report")) < 0.05
+
+
+def test_plan_sends_the_more_selective_side():
+    search = SearchParams(keyword="report")
+
+    assert plan_email_query(EmailQuery(search=search, filters=EmailFilters(unread_only=True))) == SEARCH_FIRST
+    assert plan_email_query(EmailQuery(search=search, filters=EmailFilters(sender="a@example.com"))) == FILTER_FIRST
+    narrow = EmailFilters(date_filter=DateFilter(start_date=datetime(2025, 6, 29)))
+    assert plan_email_query(EmailQuery(search=search, filters=narrow), NOW) == FILTER_FIRST
+    ordered = EmailQuery(search=search, filters=EmailFilters(unread_only=True), order_by=EmailOrder())
+    assert plan_email_query(ordered) == FILTER_FIRST
+
+
+def test_message_matches_text():
+    message = {"subject": "Reunión semanal", "from": {"name": "Ana", "address": "ana@example.com"}}
+
+    assert message_matches_text(message, "reunion ana")
+    assert not message_matches_text(message, "reunion ana", fields=["subject"])
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from src.utils.email.search_index import MailSearchIndex, tokenize
+from src.utils.helper_functions.helpers_email import message_matches_filters
+from src.utils.param_types import DateFilter, EmailFilters
+
+
+def _message(message_id, subject, preview="", received="2025-06-01T10:00:00Z", **extra):
+    return {
+        "id": message_id,
+        "subject": subject,
+        "from": {"name": "Ana Pérez", "address": "ana@example.com"},
+        "toRecipients": [{"name": "Luis", "address": "luis@example.com"}],
+        "bodyPreview": preview,
+        "receivedDateTime": received,
+        "categories": extra.pop("categories", []),
+        "isRead": extra.pop("isRead", False),
+        **extra,
+    }
+
+
+def test_tokenize_removes_case_and_accents():
+    assert tokenize("Reunión del Lunes!") == ["reunion", "del", "lunes"]
+
+
+def test_ranks_by_bm25_and_requires_every_term():
+    index = MailSearchIndex()
+    index.add(_message("m1", "Budget review", "Please review the budget budget"))
+    index.add(_message("m2", "Team lunch", "Budget for the lunch"))
+    index.add(_message("m3", "Holidays", "Nothing related"))
+
+    assert [m["id"] for m in index.search("budget")] == ["m1", "m2"]
+    assert [m["id"] for m in index.search("budget lunch")] == ["m2"]
+    assert len(index.search("luis perez")) == 3
+    assert index.search("budget", fields=["subject"])[0]["id"] == "m1"
+    assert len(index.search("budget", fields=["subject"])) == 1
+
+
+def test_search_applies_filters_and_groups():
+    index = MailSearchIndex()
+    index.add(_message("m1", "Invoice", received="2025-06-01T10:00:00Z"), "inbox")
+    index.add(_message("m2", "Invoice", received="2025-04-01T10:00:00Z"), "inbox")
+    index.add(_message("m3", "Invoice", isRead=True), "sentitems")
+
+    filters = EmailFilters(unread_only=True, date_filter=DateFilter(start_date=datetime(2025, 5, 1)))
+    assert [m["id"] for m in index.search("invoice", filters=filters)] == ["m1"]
+    assert [m["id"] for m in index.search("invoice", groups=["sentitems"])] == ["m3"]
+
+
+def test_updates_replace_and_remove_documents():
+    index = MailSearchIndex()
+    index.add(_message("m1", "Old subject"))
+    index.add(_message("m1", "New subject"))
+
+    assert index.search("old") == []
+    assert index.search("new")[0]["id"] == "m1"
+    index.remove("m1")
+    assert index.search("new") == []
+    assert len(index) == 0
+
+
+def test_message_matches_filters():
+    message = _message("m1", "Report", categories=["Work"], importance="High", hasAttachments=True)
+
+    assert message_matches_filters(message, EmailFilters(categories=["Work", "Home"]))
+    assert message_matches_filters(message, EmailFilters(importance="high", has_attachments=True))
+    assert message_matches_filters(message, EmailFilters(sender="ANA@example.com"))
+    assert not message_matches_filters(message, EmailFilters(categories=["Home"]))
+    assert not message_matches_filters(
+        message, EmailFilters(date_filter=DateFilter(end_date=datetime(2025, 5, 1)))
+    )
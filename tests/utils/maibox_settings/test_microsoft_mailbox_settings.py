@@ -1,4 +1,3 @@
-import json
 from types import SimpleNamespace
 import pytest
 from unittest.mock import patch, MagicMock
@@ -24,7 +23,7 @@ def test_get_mailbox_settings_success(mock_get, mock_token_manager):
     client = MicrosoftMailboxSettings(mock_token_manager)
     result = client.get_mailbox_settings()
 
-    result = json.loads(client.get_mailbox_settings())
+    result = client.get_mailbox_settings()
     assert result == expected_response
 
 @patch.object(MicrosoftMailboxSettings, "microsoft_patch")
@@ -57,6 +56,6 @@ def test_update_mailbox_settings_success(mock_patch, mock_token_manager):
 
     client = MicrosoftMailboxSettings(mock_token_manager)
     result = client.update_mailbox_settings(params)
-    result = json.loads(client.get_mailbox_settings())
+    result = client.get_mailbox_settings()
     assert result == expected_response
   
@@ -0,0 +1,77 @@
+import asyncio
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+@pytest.fixture
+def combined_server(monkeypatch):
+    # The server modules import "utils" as a top-level package, as when they are run
+    monkeypatch.syspath_prepend(str(SRC))
+    return importlib.import_module("outlook_aisecretary_mcp")
+
+
+def _subsystem_module(name: str) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.mcp = FastMCP(name)
+
+    @module.mcp.tool()
+    def get_things() -> list:
+        """Lists the things."""
+        return ["thing"]
+
+    @module.mcp.resource("outlook://things")
+    def things() -> str:
+        return "things"
+
+    @module.mcp.resource("outlook://things/{thing_id}")
+    def thing(thing_id: str) -> str:
+        return thing_id
+
+    @module.mcp.prompt()
+    def things_prompt() -> str:
+        return "List the things"
+
+    return module
+
+
+def test_mount_subsystems_mounts_tools_resources_and_prompts(monkeypatch, combined_server):
+    for name in ("fake_a", "fake_b"):
+        monkeypatch.setitem(sys.modules, name, _subsystem_module(name))
+    monkeypatch.setattr(combined_server, "SUBSYSTEMS", {"a": "fake_a", "b": "fake_b"})
+    server = FastMCP("combined")
+
+    assert combined_server.mount_subsystems(server, ["a", "b"]) == ["get_things"]
+
+    assert [t.name for t in asyncio.run(server.list_tools())] == ["get_things"]
+    assert [str(r.uri) for r in asyncio.run(server.list_resources())] == ["outlook://things"]
+    assert [t.uriTemplate for t in asyncio.run(server.list_resource_templates())] == ["outlook://things/{thing_id}"]
+    assert [p.name for p in asyncio.run(server.list_prompts())] == ["things_prompt"]
+    assert asyncio.run(server.call_tool("get_things", {}))
+    assert asyncio.run(server.read_resource("outlook://things/7"))[0].content == "7"
+
+
+def test_combined_server_exposes_every_prompt_and_resource(combined_server):
+    server = combined_server.mcp
+
+    assert len(asyncio.run(server.list_tools())) == 70
+    assert {p.name for p in asyncio.run(server.list_prompts())} == {
+        "get_emails_sender",
+        "get_emails_keyword",
+        "create_edit_rules",
+        "create_draft_email",
+        "create_event_at_calendar_prompt",
+        "create_edit_category_prompt",
+    }
+    assert {str(r.uri) for r in asyncio.run(server.list_resources())} == {
+        "outlook://root/folders",
+        "outlook://calendars",
+        "outlook://categories",
+        "outlook://preset/colors",
+    }
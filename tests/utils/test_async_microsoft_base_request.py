@@ -0,0 +1,32 @@
+import asyncio
+from unittest.mock import patch, MagicMock
+
+from src.utils.async_microsoft_base_request import make_async_requests
+from src.utils.email.microsoft_messages_requests import (
+    AsyncMicrosoftMessagesRequests,
+    MicrosoftMessagesRequests,
+)
+
+
+def test_async_variant_exposes_public_methods():
+    assert AsyncMicrosoftMessagesRequests.__name__ == "AsyncMicrosoftMessagesRequests"
+    assert asyncio.iscoroutinefunction(
+        AsyncMicrosoftMessagesRequests.get_messages_from_folder_microsoft_api
+    )
+    assert not hasattr(AsyncMicrosoftMessagesRequests, "_get_and_format_messages")
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_delete")
+def test_async_variant_delegates_to_sync_logic(mock_delete):
+    mock_delete.return_value = (204, "")
+    token_manager = MagicMock()
+    token_manager.get_token.return_value = "tok"
+    client = make_async_requests(MicrosoftMessagesRequests)(token_manager)
+
+    response = asyncio.run(client.delete_message_microsoft_api("msg1"))
+
+    assert response["message"] == "Message with ID msg1 deleted successfully."
+
+
+def test_async_variant_does_not_expose_the_sync_verbs():
+    assert not hasattr(AsyncMicrosoftMessagesRequests, "microsoft_get")
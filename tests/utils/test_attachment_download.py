@@ -0,0 +1,91 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src.utils.microsoft_base_request import MicrosoftBaseRequest
+
+
+def _streaming_response(chunks):
+    response = MagicMock()
+    response.status_code = 200
+    response.ok = True
+    response.headers = {}
+    response.iter_content.return_value = iter(chunks)
+    response.__enter__.return_value = response
+    return response
+
+
+@patch("src.utils.microsoft_base_request.get_graph_session")
+def test_download_streams_chunks_to_disk(mock_session, tmp_path):
+    response = _streaming_response([b"abc", b"def"])
+    mock_session.return_value.get.return_value = response
+    target = tmp_path / "file.bin"
+
+    written = MicrosoftBaseRequest.microsoft_download("https://graph/x/$value", "tok", str(target), chunk_size=3)
+
+    assert written == 6
+    assert target.read_bytes() == b"abcdef"
+    assert not (tmp_path / "file.bin.part").exists()
+    assert mock_session.return_value.get.call_args.kwargs["stream"] is True
+    response.iter_content.assert_called_once_with(chunk_size=3)
+
+
+@patch("src.utils.microsoft_base_request.get_graph_session")
+def test_download_broken_mid_stream_leaves_no_partial_file(mock_session, tmp_path):
+    def chunks():
+        yield b"abc"
+        raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+    response = _streaming_response([])
+    response.iter_content.return_value = chunks()
+    mock_session.return_value.get.return_value = response
+    target = tmp_path / "file.bin"
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        MicrosoftBaseRequest.microsoft_download("https://graph/x/$value", "tok", str(target))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@patch.object(MicrosoftBaseRequest, "microsoft_download")
+def test_download_attachments_skips_non_file_attachments(mock_download, tmp_path, monkeypatch):
+    monkeypatch.setenv("ATTACHMENTS_DOWNLOAD_DIR", str(tmp_path))
+    token_manager = MagicMock()
+    token_manager.get_token.return_value = "tok"
+    client = MicrosoftBaseRequest(token_manager)
+    attachments = [
+        {"@odata.type": "#microsoft.graph.fileAttachment", "id": "a1", "name": "../report.pdf", "contentType": "application/pdf"},
+        {"@odata.type": "#microsoft.graph.itemAttachment", "id": "a2", "name": "Meeting"},
+    ]
+
+    downloaded = client.download_attachments(attachments, lambda att_id: f"https://graph/att/{att_id}/$value")
+
+    assert downloaded == [{
+        "name": "../report.pdf",
+        "contentType": "application/pdf",
+        "path": str(tmp_path / "report.pdf"),
+        "attachment_id": "a1",
+    }]
+    mock_download.assert_called_once_with("https://graph/att/a1/$value", "tok", str(tmp_path / "report.pdf"))
+
+
+@patch.object(MicrosoftBaseRequest, "microsoft_download")
+def test_download_attachments_never_overwrite_files_with_the_same_name(mock_download, tmp_path, monkeypatch):
+    monkeypatch.setenv("ATTACHMENTS_DOWNLOAD_DIR", str(tmp_path))
+    (tmp_path / "report.pdf").write_bytes(b"earlier download")
+    token_manager = MagicMock()
+    token_manager.get_token.return_value = "tok"
+    client = MicrosoftBaseRequest(token_manager)
+    attachments = [
+        {"id": "a1", "name": "report.pdf"},
+        {"id": "a2", "name": "report.pdf"},
+    ]
+
+    downloaded = client.download_attachments(attachments, lambda att_id: f"https://graph/att/{att_id}/$value")
+
+    assert [att["path"] for att in downloaded] == [
+        str(tmp_path / "report (1).pdf"),
+        str(tmp_path / "report (2).pdf"),
+    ]
+    assert (tmp_path / "report.pdf").read_bytes() == b"earlier download"
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.utils import microsoft_base_request
+from src.utils.microsoft_base_request import MicrosoftBaseRequest
+
+UPLOAD_URL = "https://outlook.office.com/api/v2.0/Users('me')/Messages('m1')/AttachmentSessions('s1')?authtoken=x"
+
+
+def _response(status_code, json_data=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.headers = headers or {}
+    response.json.return_value = json_data or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} error")
+    return response
+
+
+def _client():
+    token_manager = MagicMock()
+    token_manager.get_token.return_value = "tok"
+    return MicrosoftBaseRequest(token_manager)
+
+
+@patch("src.utils.microsoft_base_request.get_graph_session")
+def test_upload_session_sends_ranged_chunks(mock_session, tmp_path):
+    source = tmp_path / "big.bin"
+    source.write_bytes(b"abcdefgh")
+    mock_session.return_value.put.side_effect = [
+        _response(200, {"nextExpectedRanges": ["3-"]}),
+        _response(200, {"nextExpectedRanges": ["6-"]}),
+        _response(201, headers={"Location": "https://outlook.office.com/api/v2.0/Users('me')/Messages('m1')/Attachments('att1')"}),
+    ]
+
+    attachment_id = MicrosoftBaseRequest.microsoft_upload_session(UPLOAD_URL, str(source), chunk_size=3)
+
+    assert attachment_id == "att1"
+    calls = mock_session.return_value.put.call_args_list
+    assert [call.kwargs["headers"]["Content-Range"] for call in calls] == [
+        "bytes 0-2/8", "bytes 3-5/8", "bytes 6-7/8",
+    ]
+    assert [call.kwargs["data"] for call in calls] == [b"abc", b"def", b"gh"]
+    # The upload URL is pre-authenticated and must not receive the bearer token
+    assert all("Authorization" not in call.kwargs["headers"] for call in calls)
+
+
+@patch("src.utils.microsoft_base_request.get_graph_session")
+def test_upload_session_resumes_from_next_expected_range(mock_session, tmp_path):
+    source = tmp_path / "big.bin"
+    source.write_bytes(b"abcdefgh")
+    mock_session.return_value.put.side_effect = [
+        _response(416),
+        _response(200),
+        _response(201, headers={"Location": "Attachments('att1')"}),
+    ]
+    mock_session.return_value.get.return_value = _response(200, {"nextExpectedRanges": ["2-"]})
+
+    attachment_id = MicrosoftBaseRequest.microsoft_upload_session(UPLOAD_URL, str(source), chunk_size=4)
+
+    assert attachment_id == "att1"
+    calls = mock_session.return_value.put.call_args_list
+    assert [call.kwargs["headers"]["Content-Range"] for call in calls] == [
+        "bytes 0-3/8", "bytes 2-5/8", "bytes 6-7/8",
+    ]
+    assert calls[1].kwargs["data"] == b"cdef"
+
+
+@patch.object(MicrosoftBaseRequest, "microsoft_upload_session")
+@patch.object(MicrosoftBaseRequest, "microsoft_post")
+def test_upload_attachment_uses_session_for_large_files(mock_post, mock_upload, tmp_path, monkeypatch):
+    monkeypatch.setattr(microsoft_base_request, "LARGE_ATTACHMENT_THRESHOLD", 4)
+    source = tmp_path / "video.mp4"
+    source.write_bytes(b"0123456789")
+    mock_post.return_value = (201, {"uploadUrl": UPLOAD_URL})
+    mock_upload.return_value = "att1"
+
+    attachment = _client().upload_attachment("https://graph/me/messages/m1/attachments", str(source), "video/mp4")
+
+    assert attachment == {"attachment_id": "att1", "name": "video.mp4", "contentType": "video/mp4", "size": 10}
+    url, token = mock_post.call_args.args
+    assert url == "https://graph/me/messages/m1/attachments/createUploadSession"
+    assert mock_post.call_args.kwargs["data"]["AttachmentItem"]["size"] == 10
+    mock_upload.assert_called_once_with(UPLOAD_URL, str(source))
+
+
+@patch.object(MicrosoftBaseRequest, "microsoft_post")
+def test_upload_attachments_reports_every_file(mock_post, tmp_path):
+    source = tmp_path / "notes.txt"
+    source.write_bytes(b"hello")
+    mock_post.return_value = (201, {"id": "att1", "name": "notes.txt", "contentType": "text/plain", "size": 5})
+
+    results = _client().upload_attachments("https://graph/att", [str(source), str(tmp_path / "missing.txt")])
+
+    assert results[0]["success"] is True
+    assert results[0]["attachment_id"] == "att1"
+    assert results[1]["success"] is False
+    assert "does not exist" in results[1]["error"]
+    assert mock_post.call_count == 1
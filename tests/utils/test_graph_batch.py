@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+from src.utils.graph_batch import BatchRequest, chunk_batch_requests
+from src.utils.microsoft_base_request import MicrosoftBaseRequest
+
+
+def test_to_json_makes_url_relative_and_encodes_params():
+    request = BatchRequest(
+        id="1",
+        method="patch",
+        url="https://graph.microsoft.com/v1.0/me/messages/abc",
+        params={"$select": "id,subject"},
+        body={"isRead": True},
+        depends_on=["0"],
+    )
+
+    assert request.to_json() == {
+        "id": "1",
+        "method": "PATCH",
+        "url": "/me/messages/abc?$select=id,subject",
+        "body": {"isRead": True},
+        "headers": {"Content-Type": "application/json"},
+        "dependsOn": ["0"],
+    }
+
+
+def test_chunks_keep_dependency_groups_together():
+    requests = [BatchRequest(id=str(i), method="GET", url="/me") for i in range(19)]
+    requests.append(BatchRequest(id="a", method="GET", url="/me"))
+    requests.append(BatchRequest(id="b", method="GET", url="/me", depends_on=["a"]))
+
+    batches = chunk_batch_requests(requests)
+
+    assert [len(batch) for batch in batches] == [19, 2]
+    assert [r.id for r in batches[1]] == ["a", "b"]
+
+
+def test_chunks_reject_unknown_dependency():
+    with pytest.raises(ValueError):
+        chunk_batch_requests([BatchRequest(id="a", method="GET", url="/me", depends_on=["x"])])
+
+
+@patch("src.utils.microsoft_base_request.time.sleep")
+@patch.object(MicrosoftBaseRequest, "microsoft_post")
+def test_batch_retries_throttled_sub_requests(mock_post, mock_sleep):
+    mock_post.side_effect = [
+        (200, {"responses": [
+            {"id": "1", "status": 200, "body": {"id": "m1"}},
+            {"id": "2", "status": 429, "headers": {"Retry-After": "3"}, "body": {}},
+        ]}),
+        (200, {"responses": [{"id": "2", "status": 200, "body": {"id": "m2"}}]}),
+    ]
+    requests = [
+        BatchRequest(id="1", method="GET", url="/me/messages/m1"),
+        BatchRequest(id="2", method="GET", url="/me/messages/m2"),
+    ]
+
+    responses = MicrosoftBaseRequest.microsoft_batch(requests, "tok")
+
+    assert responses["1"].body == {"id": "m1"}
+    assert responses["2"].body == {"id": "m2"}
+    mock_sleep.assert_called_once_with(3.0)
+    retried = mock_post.call_args_list[1].args[2]["requests"]
+    assert [r["id"] for r in retried] == ["2"]
+
+
+@patch("src.utils.microsoft_base_request.wait_for_rate_limit")
+@patch.object(MicrosoftBaseRequest, "microsoft_post")
+def test_batch_is_charged_one_token_per_sub_request(mock_post, mock_wait):
+    mock_post.return_value = (200, {"responses": [{"id": str(i), "status": 200, "body": {}} for i in range(20)]})
+    requests = [BatchRequest(id=str(i), method="GET", url=f"/me/messages/m{i}") for i in range(20)]
+
+    MicrosoftBaseRequest.microsoft_batch(requests, "tok")
+
+    urls = list(mock_wait.call_args.args[0])
+    assert len(urls) == 20
+    assert urls[0] == "https://graph.microsoft.com/v1.0/me/messages/m0"
+
+
+@patch.object(MicrosoftBaseRequest, "microsoft_post")
+def test_batch_does_not_retry_non_idempotent_server_errors(mock_post):
+    mock_post.return_value = (200, {"responses": [{"id": "1", "status": 503, "body": {}}]})
+
+    responses = MicrosoftBaseRequest.microsoft_batch(
+        [BatchRequest(id="1", method="POST", url="/me/messages/m1/move", body={})], "tok"
+    )
+
+    assert responses["1"].status == 503
+    assert not responses["1"].ok
+    assert mock_post.call_count == 1
+
+
+@pytest.mark.parametrize("configured, expected", [(None, 1), ("2", 2)])
+def test_batches_in_flight_are_bounded(configured, expected, monkeypatch):
+    if configured is None:
+        monkeypatch.delenv("GRAPH_BATCH_CONCURRENCY", raising=False)
+    else:
+        monkeypatch.setenv("GRAPH_BATCH_CONCURRENCY", configured)
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def post(url, token, data):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return 200, {"responses": [{"id": r["id"], "status": 200, "body": {}} for r in data["requests"]]}
+
+    requests = [BatchRequest(id=str(i), method="GET", url=f"/me/messages/m{i}") for i in range(100)]
+    with patch.object(MicrosoftBaseRequest, "microsoft_post", side_effect=post), \
+            patch("src.utils.microsoft_base_request.wait_for_rate_limit"):
+        responses = MicrosoftBaseRequest.microsoft_batch(requests, "tok")
+
+    assert len(responses) == 100
+    assert in_flight["max"] == expected
@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.utils.graph_pagination import GraphPaginator, decode_cursor, encode_cursor
+
+
+def _pages(*pages):
+    get = MagicMock()
+    get.side_effect = [(200, page) for page in pages]
+    return get
+
+
+def test_follows_next_links_lazily():
+    get = _pages(
+        {"value": [1, 2], "@odata.nextLink": "https://graph/next"},
+        {"value": [3]},
+    )
+    paginator = GraphPaginator(get, lambda: "tok", "https://graph/items", page_size=2)
+
+    iterator = iter(paginator)
+    assert next(iterator) == 1
+    assert get.call_count == 1
+
+    assert list(iterator) == [2, 3]
+    assert get.call_args_list[0].kwargs["params"] == {"$top": 2}
+    assert get.call_args_list[1].args[:2] == ("https://graph/next", "tok")
+    assert get.call_args_list[1].kwargs["params"] is None
+    assert paginator.next_link is None
+    assert not paginator.truncated
+
+
+def test_max_items_stops_at_page_boundary_and_keeps_next_link():
+    get = _pages(
+        {"value": [1, 2], "@odata.nextLink": "https://graph/p2"},
+        {"value": [3, 4], "@odata.nextLink": "https://graph/p3"},
+    )
+    paginator = GraphPaginator(get, lambda: "tok", "https://graph/items", max_items=2)
+
+    assert list(paginator) == [1, 2]
+    assert paginator.truncated
+    assert paginator.next_link == "https://graph/p2"
+    assert get.call_count == 1
+
+
+def test_max_items_inside_a_page_drops_the_link():
+    get = _pages({"value": [1, 2, 3], "@odata.nextLink": "https://graph/p2"})
+    paginator = GraphPaginator(get, lambda: "tok", "https://graph/items", max_items=2)
+
+    assert list(paginator) == [1, 2]
+    assert paginator.truncated
+    assert paginator.next_link is None
+
+
+def test_max_pages_budget():
+    get = _pages(
+        {"value": [1], "@odata.nextLink": "https://graph/p2"},
+        {"value": [2], "@odata.nextLink": "https://graph/p3"},
+    )
+    paginator = GraphPaginator(get, lambda: "tok", "https://graph/items", max_pages=2)
+
+    assert list(paginator) == [1, 2]
+    assert paginator.pages_fetched == 2
+    assert paginator.next_link == "https://graph/p3"
+
+
+def test_cursor_round_trip():
+    link = "https://graph.microsoft.com/v1.0/me/messages?$skiptoken=abc%3D&$top=10"
+
+    cursor = encode_cursor(link)
+
+    assert "/" not in cursor and "=" not in cursor
+    assert decode_cursor(cursor) == link
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("https://example.com/steal"))
+    with pytest.raises(ValueError):
+        decode_cursor("%%%")
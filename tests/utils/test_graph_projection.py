@@ -0,0 +1,40 @@
+from unittest.mock import MagicMock, patch
+
+from src.utils.contacts.microsoft_contacts_requests import MicrosoftContactsRequests
+from src.utils.graph_projection import projection, select_params
+from src.utils.helper_functions.helpers_email import microsoft_simplify_message
+
+
+@projection("id", "name", expand="attachments")
+def _simplify(resource):
+    return resource
+
+
+def test_select_params_adds_projection_without_touching_params():
+    params = {"$top": 5}
+
+    result = select_params(_simplify, params, extra_fields=("body", "id"))
+
+    assert result == {"$top": 5, "$select": "id,name,body", "$expand": "attachments"}
+    assert params == {"$top": 5}
+
+
+def test_select_params_keeps_caller_select():
+    assert select_params(_simplify, {"$select": "id"})["$select"] == "id"
+
+
+def test_message_projection_covers_simplified_fields():
+    simplified = microsoft_simplify_message({})
+    assert set(simplified) <= set(microsoft_simplify_message.select_fields)
+
+
+@patch.object(MicrosoftContactsRequests, "microsoft_get")
+def test_contacts_are_requested_with_select(mock_get):
+    mock_get.return_value = (200, {"value": [{"id": "c1", "givenName": "Ana", "surname": "Paz"}]})
+    token_manager = MagicMock()
+    token_manager.get_token.return_value = "tok"
+
+    contacts = MicrosoftContactsRequests(token_manager).get_contacts()
+
+    assert contacts == [{"id": "c1", "givenName": "Ana", "surname": "Paz"}]
+    assert mock_get.call_args.kwargs["params"]["$select"] == "id,givenName,surname"
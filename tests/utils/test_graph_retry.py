@@ -0,0 +1,136 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src.utils.graph_retry import (
+    RetryPolicy,
+    TokenBucket,
+    configure_retry_policy,
+    mailbox_key,
+    retry_after_seconds,
+    retry_metrics,
+    send_with_retry,
+)
+
+POLICY = RetryPolicy(max_retries=2, backoff_base=0.1, rate_limit=0)
+
+
+def _response(status, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.ok = 200 <= status < 300
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    retry_metrics.reset()
+    yield
+    retry_metrics.reset()
+
+
+@patch("src.utils.graph_retry.time.sleep")
+def test_honors_retry_after_and_counts_success(mock_sleep):
+    send = MagicMock(side_effect=[_response(429, {"Retry-After": "2"}), _response(200)])
+
+    response = send_with_retry("POST", "https://graph.microsoft.com/v1.0/me/sendMail", send, POLICY)
+
+    assert response.status_code == 200
+    mock_sleep.assert_called_once_with(2.0)
+    assert retry_metrics.snapshot() == {
+        "retries_attempted": 1,
+        "retries_succeeded": 1,
+        "retries_given_up": 0,
+        "throttled": 1,
+    }
+
+
+@patch("src.utils.graph_retry.time.sleep")
+def test_server_errors_are_not_retried_for_non_idempotent_methods(mock_sleep):
+    send = MagicMock(return_value=_response(503))
+
+    response = send_with_retry("POST", "https://graph.microsoft.com/v1.0/me/messages", send, POLICY)
+
+    assert response.status_code == 503
+    assert send.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch("src.utils.graph_retry.time.sleep")
+def test_gives_up_after_max_retries_with_backoff(mock_sleep):
+    send = MagicMock(return_value=_response(504))
+
+    response = send_with_retry("GET", "https://graph.microsoft.com/v1.0/me/messages", send, POLICY)
+
+    assert response.status_code == 504
+    assert send.call_count == 3
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert 0 <= delays[0] <= 0.1 and 0 <= delays[1] <= 0.2
+    assert retry_metrics.snapshot()["retries_given_up"] == 1
+
+
+@patch("src.utils.graph_retry.time.sleep")
+def test_connection_errors_are_retried_for_get(mock_sleep):
+    send = MagicMock(side_effect=[requests.ConnectionError("reset"), _response(200)])
+
+    response = send_with_retry("GET", "https://graph.microsoft.com/v1.0/me/events", send, POLICY)
+
+    assert response.status_code == 200
+    assert send.call_count == 2
+
+
+@patch("src.utils.graph_retry.time.sleep")
+def test_retried_streamed_response_is_closed(mock_sleep):
+    throttled, ok = _response(429, {"Retry-After": "1"}), _response(200)
+    send = MagicMock(side_effect=[throttled, ok])
+
+    response = send_with_retry("GET", "https://graph.microsoft.com/v1.0/me/messages/m1/$value", send, POLICY)
+
+    assert response is ok
+    throttled.close.assert_called_once()
+    ok.close.assert_not_called()
+
+
+def test_token_bucket_asks_to_wait_once_empty():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_mailbox_key():
+    assert mailbox_key("https://graph.microsoft.com/v1.0/me/messages") == "me"
+    assert mailbox_key("https://graph.microsoft.com/v1.0/users/Ana@x.com/events") == "users/ana@x.com"
+    assert mailbox_key("https://graph.microsoft.com/v1.0/$batch") is None
+    assert mailbox_key("https://outlook.office.com/api/v2.0/me/uploadSession?authtoken=x") is None
+    assert mailbox_key("http://127.0.0.1:8000/v1.0/me/messages") is None
+
+
+def test_token_bucket_takes_several_tokens_at_once():
+    bucket = TokenBucket(rate=10, capacity=20)
+
+    assert bucket.reserve(20) == 0
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.01)
+
+
+@patch("src.utils.graph_retry.time.sleep")
+def test_only_mailbox_urls_are_rate_limited(mock_sleep):
+    configure_retry_policy(RetryPolicy(rate_limit=1, rate_burst=1))
+    try:
+        for _ in range(3):
+            send_with_retry("PUT", "https://upload.example.com/session", MagicMock(return_value=_response(200)))
+        mock_sleep.assert_not_called()
+
+        for _ in range(2):
+            send_with_retry("GET", "https://graph.microsoft.com/v1.0/me/messages", MagicMock(return_value=_response(200)))
+        mock_sleep.assert_called_once()
+    finally:
+        configure_retry_policy(RetryPolicy.from_env())
+
+
+def test_retry_after_accepts_http_dates():
+    assert retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+    assert retry_after_seconds({}) is None
@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.utils import graph_session
+from src.utils.graph_session import (
+    GraphSessionConfig,
+    close_graph_session,
+    configure_graph_session,
+    get_graph_session,
+)
+from src.utils.microsoft_base_request import MicrosoftBaseRequest
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    close_graph_session()
+    graph_session._config = None
+    yield
+    close_graph_session()
+    graph_session._config = None
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("GRAPH_POOL_MAXSIZE", "4")
+    monkeypatch.setenv("GRAPH_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("GRAPH_KEEP_ALIVE", "false")
+
+    config = GraphSessionConfig.from_env()
+
+    assert config.pool_maxsize == 4
+    assert config.timeout == (1.5, 60.0)
+    assert config.keep_alive is False
+
+
+def test_session_is_shared():
+    assert get_graph_session() is get_graph_session()
+
+
+def test_configure_rebuilds_session():
+    first = get_graph_session()
+    configure_graph_session(GraphSessionConfig(pool_maxsize=2, keep_alive=False))
+    second = get_graph_session()
+
+    assert first is not second
+    assert second.get_adapter("https://graph.microsoft.com")._pool_maxsize == 2
+    assert second.headers["Connection"] == "close"
+
+
+def test_microsoft_get_uses_pooled_session():
+    configure_graph_session(GraphSessionConfig(connect_timeout=2, read_timeout=7))
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"value": []}
+
+    with patch.object(get_graph_session(), "get", return_value=response) as mock_get:
+        status_code, data = MicrosoftBaseRequest.microsoft_get("https://x", "tok")
+
+    assert (status_code, data) == (200, {"value": []})
+    assert mock_get.call_args.kwargs["timeout"] == (2, 7)
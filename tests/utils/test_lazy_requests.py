@@ -0,0 +1,21 @@
+import sys
+from unittest.mock import MagicMock
+
+from src.utils.lazy_requests import LazyRequests
+
+MODULE = "src.utils.contacts.microsoft_contacts_requests"
+
+
+def test_module_is_imported_on_first_use(monkeypatch):
+    monkeypatch.delitem(sys.modules, MODULE, raising=False)
+    token_manager = MagicMock()
+    contacts = LazyRequests(".contacts.microsoft_contacts_requests", "AsyncMicrosoftContactsRequests", token_manager)
+
+    assert not contacts.loaded
+    assert MODULE not in sys.modules
+
+    method = contacts.get_contacts
+    assert contacts.loaded
+    assert MODULE in sys.modules
+    assert callable(method)
+    assert contacts.token_manager is token_manager
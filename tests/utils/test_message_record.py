@@ -0,0 +1,64 @@
+import json
+
+from src.utils.helper_functions.helpers_email import (
+    microsoft_simplify_message,
+    remove_duplicate_messages,
+)
+from src.utils.output_encoder import encode_output
+from src.utils.results import MessageRecord
+
+GRAPH_MESSAGE = {
+    "id": "m1",
+    "subject": "Reunión",
+    "from": {"emailAddress": {"name": "Ana", "address": "ana@example.com"}},
+    "toRecipients": [
+        {"emailAddress": {"name": "Luis", "address": "luis@example.com"}},
+        {"emailAddress": {"address": "team@example.com"}},
+    ],
+    "ccRecipients": [],
+    "flag": {"flagStatus": "flagged"},
+    "receivedDateTime": "2024-05-01T10:00:00Z",
+    "categories": ["Work"],
+    "isRead": False,
+    "importance": "high",
+    "conversationId": "c1",
+    "bodyPreview": "Hola",
+}
+
+
+def test_record_keeps_people_as_tuples():
+    record = MessageRecord.from_graph(GRAPH_MESSAGE)
+
+    assert record.sender == ("Ana", "ana@example.com")
+    assert record.to_recipients == (("Luis", "luis@example.com"), (None, "team@example.com"))
+    assert not hasattr(record, "__dict__")
+
+
+def test_record_converts_to_the_simplified_message():
+    record = MessageRecord.from_graph(GRAPH_MESSAGE)
+
+    assert record.to_dict() == microsoft_simplify_message(GRAPH_MESSAGE)
+    assert record == microsoft_simplify_message(GRAPH_MESSAGE)
+    assert record["from"] == {"name": "Ana", "address": "ana@example.com"}
+    assert record.get("missing", "default") == "default"
+
+
+def test_records_are_encoded_as_dicts_in_every_mode():
+    expected = {"messages": [microsoft_simplify_message(GRAPH_MESSAGE)]}
+    result = {"messages": [MessageRecord.from_graph(GRAPH_MESSAGE)]}
+
+    for mode in ("pretty", "compact", "fast"):
+        assert json.loads(encode_output(result, mode)) == expected
+
+
+def test_records_are_deduplicated_by_id():
+    records = [MessageRecord.from_graph(GRAPH_MESSAGE), MessageRecord.from_graph(GRAPH_MESSAGE)]
+
+    assert remove_duplicate_messages(records) == records[:1]
+
+
+def test_missing_people_are_tolerated():
+    record = MessageRecord.from_graph({"id": "m2", "from": None})
+
+    assert record.to_dict()["from"] == {"name": None, "address": None}
+    assert record.to_dict()["toRecipients"] == []
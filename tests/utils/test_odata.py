@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.utils.helper_functions.helpers_calendar import event_query_to_graph_params
+from src.utils.helper_functions.helpers_email import build_filter_params, build_search_params
+from src.utils.odata import ODataFilter, _clause_template, literal, search_phrase
+from src.utils.param_types import (
+    DateFilter,
+    EmailFilters,
+    EventFilters,
+    EventQuery,
+    EventSearchParams,
+    SearchParams,
+    TodoTaskFilter,
+)
+
+
+def test_literals():
+    assert literal("O'Brien") == "'O''Brien'"
+    assert literal(True) == "true"
+    assert literal(3) == "3"
+    assert literal(None) == "null"
+    assert literal(datetime(2025, 6, 19, 10, 0)) == "2025-06-19T10:00:00Z"
+    assert literal(datetime(2025, 6, 19, 12, 0, tzinfo=timezone(timedelta(hours=2)))) == "2025-06-19T10:00:00Z"
+    with pytest.raises(ValueError):
+        literal(object())
+
+
+def test_search_phrase_escapes_quotes():
+    assert search_phrase('say "hi"') == '"say \\"hi\\""'
+    assert search_phrase("report", "subject") == '"subject:report"'
+
+
+def test_invalid_paths_and_operators_are_rejected():
+    with pytest.raises(ValueError, match="path"):
+        ODataFilter().eq("subject) or (true", "x")
+    with pytest.raises(ValueError, match="operator"):
+        ODataFilter().compare("subject", "like", "x")
+
+
+def test_none_values_are_skipped_and_clause_shapes_are_cached():
+    _clause_template.cache_clear()
+
+    for name in ("Ann", "Bob"):
+        odata_filter = ODataFilter().eq("importance", None).startswith("displayName", name)
+    assert odata_filter.build() == "startswith(displayName, 'Bob')"
+    assert _clause_template.cache_info().hits == 1
+    assert ODataFilter().eq("importance", None).build() is None
+    assert ODataFilter().params() == {}
+
+
+def test_email_filters_escape_every_value():
+    filters = EmailFilters(
+        date_filter=DateFilter(start_date=datetime(2025, 1, 1)),
+        senderName="Conan O'Brien",
+        sender="o'brien@example.com",
+        unread_only=True,
+        categories=["Kid's", "Work"],
+    )
+
+    assert build_filter_params(filters) == {
+        "$filter": "receivedDateTime ge 2025-01-01T00:00:00Z"
+        " and from/emailAddress/name eq 'Conan O''Brien'"
+        " and from/emailAddress/address eq 'o''brien@example.com'"
+        " and isRead eq false"
+        " and (categories/any(c:c eq 'Kid''s') or categories/any(c:c eq 'Work'))"
+    }
+    assert build_filter_params(EmailFilters()) == {}
+    assert build_search_params(SearchParams(subject='"Q3"')) == {"$search": '"subject:\\"Q3\\""'}
+
+
+def test_event_query_params():
+    query = EventQuery(
+        filters=EventFilters(is_all_day=False, categories=["A", "B"]),
+        search=EventSearchParams(subject="Rock'n'roll"),
+        number_events=5,
+    )
+
+    assert event_query_to_graph_params(query) == {
+        "$top": "5",
+        "$filter": "isAllDay eq false and categories/any(c:c eq 'A')"
+        " and categories/any(c:c eq 'B') and contains(subject, 'Rock''n''roll')",
+    }
+
+
+def test_todo_filter():
+    task_filter = TodoTaskFilter(importance="high", is_reminder_on=True, due_before=datetime(2025, 7, 1))
+
+    assert task_filter.to_odata_filter() == (
+        "importance eq 'high' and isReminderOn eq true and dueDateTime/dateTime lt 2025-07-01T00:00:00Z"
+    )
+    assert TodoTaskFilter().to_odata_filter() is None
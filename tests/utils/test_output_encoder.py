@@ -0,0 +1,103 @@
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.utils import output_encoder
+from src.utils.microsoft_base_request import MicrosoftBaseRequest
+from src.utils.output_encoder import serialize_tool_outputs, encode_output, get_output_mode
+from src.utils.response_cache import _is_error
+
+DATA = {"messages": [{"subject": "Reunión", "to": ["a@example.com"], "count": 2}]}
+
+
+def test_pretty_is_the_default(monkeypatch):
+    monkeypatch.delenv("GRAPH_OUTPUT_MODE", raising=False)
+
+    assert encode_output(DATA) == json.dumps(DATA, indent=2)
+
+
+def test_compact_and_fast_modes_have_no_whitespace(monkeypatch):
+    compact = encode_output(DATA, "compact")
+
+    assert compact == '{"messages":[{"subject":"Reunión","to":["a@example.com"],"count":2}]}'
+    assert encode_output(DATA, "fast") == compact
+    monkeypatch.setattr(output_encoder, "orjson", None)
+    assert encode_output(DATA, "fast") == compact
+
+
+def test_fast_mode_falls_back_on_values_orjson_rejects():
+    assert json.loads(encode_output({"big": 2**70}, "fast")) == {"big": 2**70}
+
+
+def test_tool_mode_overrides_global_mode(monkeypatch):
+    monkeypatch.setenv("GRAPH_OUTPUT_MODE", "compact")
+    monkeypatch.setenv("GRAPH_OUTPUT_MODE_LIST_EMAILS", "Pretty")
+
+    assert get_output_mode() == "compact"
+    assert get_output_mode("list_emails") == "pretty"
+
+
+def test_unknown_mode_is_rejected(monkeypatch):
+    monkeypatch.setenv("GRAPH_OUTPUT_MODE", "tiny")
+
+    with pytest.raises(ValueError, match="tiny"):
+        get_output_mode()
+
+
+def test_bound_tools_encode_with_their_own_mode(monkeypatch):
+    monkeypatch.setenv("GRAPH_OUTPUT_MODE_COMPACT_TOOL", "compact")
+    server = FastMCP("test")
+
+    @server.tool()
+    async def compact_tool() -> str:
+        return await asyncio.to_thread(encode_output, {"a": 1})
+
+    @server.tool()
+    async def pretty_tool() -> str:
+        return encode_output({"a": 1})
+
+    serialize_tool_outputs(server)
+    serialize_tool_outputs(server)
+
+    assert asyncio.run(server._tool_manager.call_tool("compact_tool", {})) == '{"a":1}'
+    assert asyncio.run(server._tool_manager.call_tool("pretty_tool", {})) == '{\n  "a": 1\n}'
+
+
+def test_resources_are_serialized_too():
+    server = FastMCP("test")
+
+    @server.resource("test://colors")
+    async def colors() -> dict:
+        return {"preset0": "Red"}
+
+    serialize_tool_outputs(server)
+
+    resource = server._resource_manager.list_resources()[0]
+    assert asyncio.run(resource.read()) == '{\n  "preset0": "Red"\n}'
+
+
+@patch.object(MicrosoftBaseRequest, "microsoft_get", side_effect=RuntimeError("boom"))
+def test_handled_errors_are_structured_until_the_tool_returns(mock_get, monkeypatch):
+    monkeypatch.setenv("GRAPH_OUTPUT_MODE", "compact")
+    requests = MicrosoftBaseRequest(MagicMock())
+    server = FastMCP("test")
+
+    @MicrosoftBaseRequest.handle_microsoft_errors
+    def failing():
+        return requests.microsoft_get("url", requests.token_manager.get_token())
+
+    @server.tool()
+    async def failing_tool() -> str:
+        return failing()
+
+    serialize_tool_outputs(server)
+
+    assert failing() == {"error": "Internal error: boom"}
+    assert _is_error(failing())
+    assert (
+        asyncio.run(server._tool_manager.call_tool("failing_tool", {}))
+        == '{"error":"Internal error: boom"}'
+    )
@@ -0,0 +1,107 @@
+from dataclasses import asdict, is_dataclass
+from unittest.mock import MagicMock, patch
+
+from src.utils.contacts.microsoft_contacts_requests import MicrosoftContactsRequests
+from src.utils.param_types import (
+    Contact,
+    DateTimeTimeZone,
+    EmailAddress,
+    EmailAddressContact,
+    EmailAddressValue,
+    ItemBody,
+    MailRule,
+    PatternedRecurrence,
+    RuleActions,
+    RuleConditions,
+    TaskCreateRequest,
+    dataclass_to_clean_dict,
+)
+
+
+def _legacy_clean(obj):
+    # The asdict-based cleaner this one replaced, kept as the reference behavior
+    if is_dataclass(obj):
+        result = {}
+        for k, v in asdict(obj).items():
+            cleaned = _legacy_clean(v)
+            if cleaned is not None:
+                result[k] = cleaned
+        return result or None
+    if isinstance(obj, list):
+        cleaned_list = [_legacy_clean(i) for i in obj if _legacy_clean(i) is not None]
+        return cleaned_list or None
+    if isinstance(obj, dict):
+        return {k: _legacy_clean(v) for k, v in obj.items() if _legacy_clean(v) is not None}
+    return obj
+
+
+def _address(address):
+    return EmailAddress(emailAddress=EmailAddressValue(address=address))
+
+
+def test_mail_rule_is_cleaned_like_before():
+    rule = MailRule(
+        displayName="Invoices",
+        sequence=1,
+        conditions=RuleConditions(
+            subjectContains=["invoice"],
+            bodyContains=[],
+            fromAddresses=[_address("billing@example.com")],
+        ),
+        actions=RuleActions(moveToFolder="folder1", forwardTo=[_address("me@example.com")]),
+    )
+
+    cleaned = dataclass_to_clean_dict(rule)
+
+    assert cleaned == _legacy_clean(rule)
+    assert cleaned["conditions"] == {
+        "subjectContains": ["invoice"],
+        "fromAddresses": [{"emailAddress": {"address": "billing@example.com"}}],
+    }
+
+
+def test_empty_values_are_dropped():
+    assert dataclass_to_clean_dict(RuleActions()) is None
+    assert dataclass_to_clean_dict({"a": None, "b": [None], "c": {"d": 1}}) == {"c": {"d": 1}}
+    assert dataclass_to_clean_dict("text") == "text"
+
+
+def test_task_json_object_has_no_unset_fields():
+    task = TaskCreateRequest(
+        title="Pay rent",
+        body=ItemBody(content="Before the 5th"),
+        dueDateTime=DateTimeTimeZone(dateTime="2025-07-01T09:00:00", timeZone="UTC"),
+        recurrence=PatternedRecurrence(
+            pattern={"type": "absoluteMonthly", "interval": 1, "dayOfMonth": 1},
+            range={"type": "noEnd", "startDate": "2025-07-01", "endDate": None},
+        ),
+    )
+
+    assert task.to_json_object() == {
+        "title": "Pay rent",
+        "body": {"content": "Before the 5th", "contentType": "text"},
+        "dueDateTime": {"dateTime": "2025-07-01T09:00:00", "timeZone": "UTC"},
+        "importance": "normal",
+        "recurrence": {
+            "pattern": {"type": "absoluteMonthly", "interval": 1, "dayOfMonth": 1},
+            "range": {"type": "noEnd", "startDate": "2025-07-01"},
+        },
+        "status": "notStarted",
+    }
+
+
+@patch.object(MicrosoftContactsRequests, "microsoft_post")
+def test_contact_is_sent_without_unset_fields(mock_post):
+    mock_post.return_value = (201, {"id": "c1"})
+    contact = Contact(
+        givenName="Ana", surname="Paz", emailAddresses=[EmailAddressContact(address="ana@example.com")]
+    )
+
+    MicrosoftContactsRequests(MagicMock()).create_edit_contact(contact)
+
+    assert mock_post.call_args.kwargs["data"] == {
+        "givenName": "Ana",
+        "surname": "Paz",
+        "emailAddresses": [{"address": "ana@example.com"}],
+        "mobilePhone": "",
+    }
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock, patch
+
+from src.utils.email.microsoft_folders_requests import MicrosoftFoldersRequests
+from src.utils.email.microsoft_messages_requests import MicrosoftMessagesRequests
+from src.utils.response_cache import ResponseCache, response_cache
+
+
+def _client():
+    token_manager = MagicMock()
+    token_manager.get_token.return_value = "tok"
+    return MicrosoftFoldersRequests(token_manager)
+
+
+@patch.object(MicrosoftFoldersRequests, "microsoft_delete")
+@patch.object(MicrosoftFoldersRequests, "microsoft_get")
+def test_folders_are_cached_until_a_folder_is_deleted(mock_get, mock_delete):
+    mock_get.return_value = (200, {"value": [{"id": "1", "displayName": "Inbox"}]})
+    mock_delete.return_value = (204, "")
+    client = _client()
+
+    first = client.get_folder_names()
+    second = client.get_folder_names()
+    assert first == second
+    assert mock_get.call_count == 1
+    assert response_cache.stats()["namespaces"]["mail_folders"]["hits"] == 1
+
+    client.delete_folder_microsoft_api("1")
+    client.get_folder_names()
+    assert mock_get.call_count == 2
+
+
+@patch.object(MicrosoftMessagesRequests, "microsoft_delete")
+@patch.object(MicrosoftFoldersRequests, "microsoft_get")
+def test_folder_counts_are_refreshed_after_a_message_is_deleted(mock_get, mock_delete):
+    mock_get.return_value = (200, {"value": [{"id": "1", "displayName": "Inbox", "totalItemCount": 3}]})
+    mock_delete.return_value = (204, "")
+    client = _client()
+
+    client.get_folder_names()
+    MicrosoftMessagesRequests(client.token_manager).delete_message_microsoft_api("m1")
+    client.get_folder_names()
+    assert mock_get.call_count == 2
+
+
+@patch.object(MicrosoftFoldersRequests, "microsoft_get")
+def test_errors_are_not_cached(mock_get):
+    mock_get.side_effect = [Exception("boom"), (200, {"value": []})]
+    client = _client()
+
+    assert "error" in client.get_folder_names()
+    assert client.get_folder_names() == {"folders": []}
+
+
+def test_lru_eviction_and_size_limit():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("ns", "a", "1")
+    cache.set("ns", "b", "2")
+    cache.get("ns", "a")
+    cache.set("ns", "c", "3")
+
+    assert cache.get("ns", "b") is None
+    assert cache.get("ns", "a") == "1"
+    cache.set("ns", "big", "x" * 11)
+    assert cache.get("ns", "big") is None
+    assert cache.stats()["namespaces"]["ns"]["evictions"] == 1
+
+
+@patch("src.utils.response_cache.time.monotonic")
+def test_entries_expire_after_ttl(mock_monotonic):
+    cache = ResponseCache()
+    mock_monotonic.return_value = 0
+    cache.set("mail_folders", "k", "v")
+
+    mock_monotonic.return_value = 299
+    assert cache.get("mail_folders", "k") == "v"
+    mock_monotonic.return_value = 301
+    assert cache.get("mail_folders", "k") is None
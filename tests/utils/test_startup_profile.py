@@ -0,0 +1,17 @@
+from src.utils.startup_profile import parse_importtime
+
+
+def test_parse_importtime():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   _io",
+        "import time:      1500 |       4500 |     msal.application",
+        "some warning line",
+        "import time:      3000 |      12000 | msal",
+    ])
+
+    assert parse_importtime(stderr) == [
+        ("_io", 0.12, 0.12),
+        ("msal.application", 1.5, 4.5),
+        ("msal", 3.0, 12.0),
+    ]
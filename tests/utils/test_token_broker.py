@@ -0,0 +1,120 @@
+import json
+import os
+import time
+from multiprocessing.connection import Client
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils.token_broker import (
+    BrokerTokenManager,
+    TokenBroker,
+    _read_authkey,
+    _write_authkey,
+    get_broker_address,
+    get_private_dir,
+)
+
+
+def _fake_manager(token="tok"):
+    manager = MagicMock()
+    manager.get_token_with_expiry.return_value = (token, time.time() + 3600)
+    return manager
+
+
+@pytest.fixture
+def address(tmp_path):
+    return str(tmp_path / "broker.sock")
+
+
+def test_client_gets_tokens_from_broker_and_keeps_them_in_memory(address):
+    owner = _fake_manager()
+    broker = TokenBroker(owner, address, _write_authkey(address))
+    broker.start()
+    client = BrokerTokenManager(address)
+    try:
+        assert client.get_token() == "tok"
+        assert client.get_token() == "tok"
+        assert client.owner is None
+        owner.get_token_with_expiry.assert_called_once_with(None)
+    finally:
+        client.close()
+        broker.close()
+
+
+def test_first_process_becomes_the_broker(address):
+    owner = _fake_manager()
+    with patch("src.utils.token_broker.TokenManager", return_value=owner) as token_manager:
+        first = BrokerTokenManager(address)
+        second = BrokerTokenManager(address)
+        try:
+            assert first.get_token() == "tok"
+            assert second.get_token(["Mail.Read"]) == "tok"
+            assert first.owner is owner
+            assert second.owner is None
+            assert token_manager.call_count == 1
+            owner.get_token_with_expiry.assert_called_with(["Mail.Read"])
+        finally:
+            second.close()
+            first.close()
+
+
+def test_client_takes_over_when_the_broker_exits(address):
+    broker = TokenBroker(_fake_manager("old"), address, _write_authkey(address))
+    broker.start()
+    client = BrokerTokenManager(address, margin_seconds=4000)  # every token is stale, so each call asks
+    try:
+        assert client.get_token() == "old"
+        broker.close()
+        with patch("src.utils.token_broker.TokenManager", return_value=_fake_manager("new")):
+            assert client.get_token() == "new"
+        assert client.owner is not None
+    finally:
+        client.close()
+
+
+def test_broker_speaks_json(address):
+    authkey = _write_authkey(address)
+    broker = TokenBroker(_fake_manager(), address, authkey)
+    broker.start()
+    try:
+        with Client(address, family="AF_UNIX", authkey=authkey) as connection:
+            connection.send_bytes(json.dumps({"scopes": None}).encode())
+            assert json.loads(connection.recv_bytes())["token"] == "tok"
+        assert os.stat(address).st_mode & 0o777 == 0o600
+    finally:
+        broker.close()
+
+
+def test_key_file_open_to_others_is_refused(address):
+    _write_authkey(address)
+    os.chmod(address + ".key", 0o644)
+
+    with pytest.raises(PermissionError):
+        _read_authkey(address)
+    with pytest.raises(PermissionError):
+        BrokerTokenManager(address).get_token()
+
+
+def test_socket_open_to_others_is_refused(address):
+    broker = TokenBroker(_fake_manager(), address, _write_authkey(address))
+    broker.start()
+    os.chmod(address, 0o666)
+    try:
+        with pytest.raises(PermissionError):
+            BrokerTokenManager(address).get_token()
+    finally:
+        broker.close()
+
+
+def test_default_address_is_in_a_private_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("TOKEN_BROKER_ADDRESS", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    address = get_broker_address()
+
+    assert os.path.dirname(address) == str(tmp_path / "aisecretary")
+    assert os.stat(tmp_path / "aisecretary").st_mode & 0o777 == 0o700
+    os.chmod(tmp_path / "aisecretary", 0o755)
+    with pytest.raises(PermissionError):
+        get_private_dir()
@@ -0,0 +1,70 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.token_manager import TokenManager
+
+
+@pytest.fixture
+def msal_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("TOKEN_CACHE_FILE", str(tmp_path / "token_cache.json"))
+    with patch("msal.PublicClientApplication") as app_class:
+        app = app_class.return_value
+        app.get_accounts.return_value = [{"username": "me"}]
+        app.acquire_token_silent.return_value = {"access_token": "tok1", "expires_in": 3600}
+        yield app_class
+
+
+def test_no_credentials_are_acquired_until_first_use(msal_app):
+    manager = TokenManager(background_refresh=False)
+
+    assert msal_app.call_count == 0
+    assert manager.token is None
+    assert manager.get_token() == "tok1"
+
+
+def test_single_app_and_in_memory_hot_path(msal_app):
+    manager = TokenManager(background_refresh=False)
+    app = msal_app.return_value
+
+    assert [manager.get_token() for _ in range(5)] == ["tok1"] * 5
+    assert msal_app.call_count == 1
+    assert app.acquire_token_silent.call_count == 1
+    assert manager.expires_on == pytest.approx(time.time() + 3600, abs=5)
+
+
+def test_stale_token_is_refreshed_once_for_concurrent_callers(msal_app):
+    manager = TokenManager(background_refresh=False)
+    app = msal_app.return_value
+    app.acquire_token_silent.reset_mock()
+    manager._tokens[manager._scope_key()] = ("tok1", time.time() + 10)
+    started = threading.Event()
+
+    def slow_refresh(*args, **kwargs):
+        started.set()
+        time.sleep(0.05)
+        return {"access_token": "tok2", "expires_in": 3600}
+
+    app.acquire_token_silent.side_effect = slow_refresh
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get_token())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["tok2"] * 8
+    assert app.acquire_token_silent.call_count == 1
+
+
+def test_background_refresh_forces_a_new_token(msal_app):
+    manager = TokenManager(background_refresh=False)
+    app = msal_app.return_value
+    app.acquire_token_silent.return_value = {"access_token": "tok2", "expires_in": 3600}
+
+    manager._background_refresh()
+
+    assert manager.token == "tok2"
+    assert app.acquire_token_silent.call_args.kwargs["force_refresh"] is True
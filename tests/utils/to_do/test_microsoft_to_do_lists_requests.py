@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -23,7 +22,7 @@ def test_get_todo_lists(mock_get, mock_token_manager):
     )
 
     client = MicrosoftToDoListsRequests(mock_token_manager)
-    response = json.loads(client.get_todo_lists())
+    response = client.get_todo_lists()
 
     assert isinstance(response, list)
     assert response[0]["id"] == "1"
@@ -35,7 +34,7 @@ def test_create_todo_list(mock_post, mock_token_manager):
     mock_post.return_value = (201, {"id": "new123", "displayName": "NewList"})
 
     client = MicrosoftToDoListsRequests(mock_token_manager)
-    response = json.loads(client.create_todo_list("NewList"))
+    response = client.create_todo_list("NewList")
 
     assert response["id"] == "new123"
     assert response["displayName"] == "NewList"
@@ -46,7 +45,7 @@ def test_delete_todo_list_success(mock_delete, mock_token_manager):
     mock_delete.return_value = (204, {})
 
     client = MicrosoftToDoListsRequests(mock_token_manager)
-    response = json.loads(client.delete_todo_list("list123"))
+    response = client.delete_todo_list("list123")
 
     assert "message" in response
     assert "deleted successfully" in response["message"]
@@ -57,7 +56,7 @@ def test_delete_todo_list_failure(mock_delete, mock_token_manager):
     mock_delete.return_value = (400, {"error": "Failed to delete"})
 
     client = MicrosoftToDoListsRequests(mock_token_manager)
-    response = json.loads(client.delete_todo_list("list123"))
+    response = client.delete_todo_list("list123")
 
     assert "error" in response
     assert response["error"]["error"] == "Failed to delete"
@@ -1,4 +1,3 @@
-import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -26,7 +25,7 @@ def test_get_tasks_in_list(mock_get, mock_token_manager):
     )
 
     client = MicrosoftToDoTasksRequests(mock_token_manager)
-    response = json.loads(client.get_tasks_in_list("list123"))
+    response = client.get_tasks_in_list("list123")
 
     assert isinstance(response, list)
     assert response[0]["title"] == "Task 1"
@@ -41,7 +40,7 @@ def test_get_task_in_list(mock_get, mock_token_manager):
     )
 
     client = MicrosoftToDoTasksRequests(mock_token_manager)
-    response = json.loads(client.get_task_in_list("list123", "1"))
+    response = client.get_task_in_list("list123", "1")
 
     assert response["id"] == "1"
     assert response["title"] == "My Task"
@@ -62,7 +61,7 @@ def test_create_task_in_list(mock_post, mock_token_manager):
     }
 
     client = MicrosoftToDoTasksRequests(mock_token_manager)
-    response = json.loads(client.create_update_task_in_list("list123", mock_task))
+    response = client.create_update_task_in_list("list123", mock_task)
 
     assert response["id"] == "new-task"
     assert response["title"] == "New Task"
@@ -82,7 +81,7 @@ def test_update_task_in_list(mock_patch, mock_token_manager):
     }
 
     client = MicrosoftToDoTasksRequests(mock_token_manager)
-    response = json.loads(client.create_update_task_in_list("list123", mock_task, task_id="task-id"))
+    response = client.create_update_task_in_list("list123", mock_task, task_id="task-id")
 
     assert response["id"] == "task-id"
     assert response["title"] == "Updated Task"
@@ -96,3 +95,16 @@ def test_delete_task_in_list(mock_delete, mock_token_manager):
     response = client.delete_task_in_list("list123", "task-id")
 
     assert response == "Task deleted successfully."
+
+
+@patch.object(MicrosoftToDoTasksRequests, "microsoft_get")
+def test_get_tasks_in_list_with_filter(mock_get, mock_token_manager):
+    mock_get.return_value = (200, {"value": [{"id": "1", "title": "Task 1", "status": "completed"}]})
+
+    client = MicrosoftToDoTasksRequests(mock_token_manager)
+    response = client.get_tasks_in_list("list123", TodoTaskFilter(status="completed"), top=5)
+
+    assert response[0]["id"] == "1"
+    params = mock_get.call_args.kwargs["params"]
+    assert params["$filter"] == "status eq 'completed'"
+    assert params["$top"] == 5